@@ -17,12 +17,38 @@ from .backtesting import (
     Trade
 )
 
+# Export fast historical data loading
+from .columnar_loader import (
+    convert_to_npy,
+    load_columns,
+    load_day_index
+)
+
+# Export seeded backtest result cache
+from .result_cache import (
+    load_cached_result,
+    result_cache_key,
+    save_cached_result
+)
+
 # Export backtest runner functions
 from .run_backtest import (
     run_backtest,
     initialize_rl_brains_for_backtest
 )
 
+# Export walk-forward (parallel windowed) runner
+from .walk_forward import (
+    run_walk_forward,
+    split_walk_forward_windows
+)
+
+# Export capitulation parameter sweep
+from .parameter_sweep import (
+    build_feature_matrix,
+    run_sweep
+)
+
 __all__ = [
     'BacktestConfig',
     'BacktestEngine',
@@ -30,6 +56,16 @@ __all__ = [
     'PerformanceMetrics',
     'ReportGenerator',
     'Trade',
+    'convert_to_npy',
+    'load_columns',
+    'load_day_index',
+    'load_cached_result',
+    'result_cache_key',
+    'save_cached_result',
     'run_backtest',
-    'initialize_rl_brains_for_backtest'
+    'initialize_rl_brains_for_backtest',
+    'run_walk_forward',
+    'split_walk_forward_windows',
+    'build_feature_matrix',
+    'run_sweep'
 ]
@@ -3,20 +3,23 @@ Backtesting Framework for Capitulation Reversal Bot
 Supports historical data loading, order simulation, and performance analysis
 """
 
-import csv
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from collections import deque
 from dataclasses import dataclass, field
+import numpy as np
 import pytz
 import os
 
+from columnar_loader import datetime_to_ns, iter_column_chunks, load_columns, load_day_index, to_datetimes
+from bid_ask_manager import BidAskQuote, ExitOrderOptimizer
+
 # Export parameter optimization classes
 __all__ = [
-    'BacktestConfig', 'BacktestEngine', 'HistoricalDataLoader', 
-    'PerformanceMetrics', 'ReportGenerator', 'Trade'
+    'BacktestConfig', 'BacktestEngine', 'HistoricalDataLoader', 'IntrabarFillSimulator',
+    'PerformanceMetrics', 'ReportGenerator', 'SimulatedFill', 'Trade'
 ]
 
 
@@ -36,6 +39,8 @@ class Trade:
     pnl: float
     ticks: float
     duration_minutes: float
+    mae_ticks: Optional[float] = None  # Max adverse excursion (bot-tracked bar closes)
+    mfe_ticks: Optional[float] = None  # Max favorable excursion
     
 
 @dataclass
@@ -56,6 +61,7 @@ class BacktestConfig:
     data_source: str = "csv"  # "csv" for local files (no API needed)
     data_path: str = "data/historical_data"
     use_tick_data: bool = False  # Use tick-by-tick replay (default: bar-by-bar with 1min bars)
+    intrabar_fills: bool = False  # Resolve fills on the intrabar path (default: bot prices / bar close)
     
 
 class HistoricalDataLoader:
@@ -100,19 +106,16 @@ class HistoricalDataLoader:
             
         return start_date, end_date
         
-    def load_tick_data(self, symbol: str) -> List[Dict[str, Any]]:
+    def _tick_data_file(self, symbol: str) -> Optional[str]:
         """
-        Load tick data from CSV file.
-        Expected CSV format: timestamp,price,size (or volume)
+        Locate the tick data file for a symbol.
         
         Args:
             symbol: Instrument symbol
             
         Returns:
-            List of tick dictionaries
+            File path, or None if no tick data exists
         """
-        ticks = []
-        
         # Try enhanced tick data first (has realistic intra-bar price movement)
         filepath = os.path.join(self.config.data_path, f"{symbol}_ticks_enhanced.csv")
         if not os.path.exists(filepath):
@@ -120,30 +123,56 @@ class HistoricalDataLoader:
             filepath = os.path.join(self.config.data_path, f"{symbol}_ticks.csv")
             if not os.path.exists(filepath):
                 self.logger.warning(f"Tick data file not found: {filepath}")
-                return ticks
+                return None
             else:
                 self.logger.debug(f"Using regular tick data (enhanced not available)")
         else:
             self.logger.debug(f"Using ENHANCED tick data for realistic ATR calculation")
+        return filepath
+    
+    def _tick_volume_column(self, filepath: str) -> Optional[str]:
+        """Volume column of a tick file - 'size' or 'volume' (None means 1 per tick)."""
+        header = load_day_index(filepath).columns
+        return 'size' if 'size' in header else ('volume' if 'volume' in header else None)
+    
+    def load_tick_data(self, symbol: str) -> List[Dict[str, Any]]:
+        """
+        Load tick data from CSV file.
+        Expected CSV format: timestamp,price,size (or volume)
+        
+        Holds every tick in memory - use iter_ticks() / iter_tick_minutes()
+        to replay long ranges.
+        
+        Args:
+            symbol: Instrument symbol
+            
+        Returns:
+            List of tick dictionaries
+        """
+        ticks = []
+        
+        filepath = self._tick_data_file(symbol)
+        if filepath is None:
+            return ticks
             
         try:
             start_date, end_date = self._normalize_date_range()
             
-            with open(filepath, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    timestamp = datetime.fromisoformat(row['timestamp'])
-                    timestamp = self._normalize_timestamp(timestamp)
-                    
-                    # Filter by date range
-                    if start_date <= timestamp <= end_date:
-                        # Handle both 'size' and 'volume' column names
-                        volume = int(row.get('size', row.get('volume', 1)))
-                        ticks.append({
-                            'timestamp': timestamp,
-                            'price': float(row['price']),
-                            'volume': volume
-                        })
+            # Handle both 'size' and 'volume' column names (default 1 per tick)
+            volume_column = self._tick_volume_column(filepath)
+            
+            # Typed columns for the date range only (indexed CSV seek or .npy copy)
+            rows = load_columns(
+                filepath, datetime_to_ns(start_date), datetime_to_ns(end_date),
+                ['price'] + ([volume_column] if volume_column else [])
+            )
+            timestamps = to_datetimes(rows['timestamp_ns'], pytz.timezone('US/Eastern'))
+            prices = rows['price'].tolist()
+            volumes = rows[volume_column].tolist() if volume_column else [1] * len(rows)
+            ticks = [
+                {'timestamp': timestamp, 'price': price, 'volume': volume}
+                for timestamp, price, volume in zip(timestamps, prices, volumes)
+            ]
                         
             self.logger.debug(f"Loaded {len(ticks):,} ticks for {symbol}")
             
@@ -152,6 +181,90 @@ class HistoricalDataLoader:
             
         return ticks
     
+    def iter_ticks(self, symbol: str) -> Iterator[Tuple[float, int, int]]:
+        """
+        Stream ticks in the configured date range without loading the whole file.
+        Only one chunk of typed columns is in memory at a time.
+        
+        Args:
+            symbol: Instrument symbol
+            
+        Yields:
+            (price, volume, timestamp_ms) tuples in file order
+        """
+        filepath = self._tick_data_file(symbol)
+        if filepath is None:
+            return
+        
+        try:
+            start_date, end_date = self._normalize_date_range()
+            volume_column = self._tick_volume_column(filepath)
+            tick_count = 0
+            
+            for chunk in iter_column_chunks(
+                filepath, datetime_to_ns(start_date), datetime_to_ns(end_date),
+                ['price'] + ([volume_column] if volume_column else [])
+            ):
+                prices = chunk['price'].tolist()
+                volumes = chunk[volume_column].tolist() if volume_column else [1] * len(chunk)
+                timestamps_ms = (chunk['timestamp_ns'] // 1_000_000).tolist()
+                tick_count += len(chunk)
+                yield from zip(prices, volumes, timestamps_ms)
+            
+            self.logger.debug(f"Streamed {tick_count:,} ticks for {symbol}")
+            
+        except Exception as e:
+            self.logger.error(f"Error streaming tick data: {e}")
+    
+    def iter_tick_minutes(self, symbol: str) -> Iterator[Tuple[Dict[str, Any], List[Tuple[float, int, int]]]]:
+        """
+        Stream ticks grouped into 1-minute bars.
+        
+        Each item is the minute's OHLCV bar (same format as load_bar_data) and
+        the ticks that made it, so a replay can feed the ticks to the engine one
+        by one and still do per-bar bookkeeping. Only one minute of ticks is
+        held at a time.
+        
+        Args:
+            symbol: Instrument symbol
+            
+        Yields:
+            (bar, ticks) with ticks as (price, volume, timestamp_ms) tuples
+        """
+        eastern = pytz.timezone('US/Eastern')
+        current_minute = None
+        bar = None
+        ticks: List[Tuple[float, int, int]] = []
+        
+        for tick in self.iter_ticks(symbol):
+            price, volume, timestamp_ms = tick
+            minute = timestamp_ms // 60000
+            if minute != current_minute:
+                if bar is not None:
+                    yield bar, ticks
+                current_minute = minute
+                bar = {
+                    'timestamp': to_datetimes([minute * 60_000_000_000], eastern)[0],
+                    'open': price,
+                    'high': price,
+                    'low': price,
+                    'close': price,
+                    'volume': volume
+                }
+                ticks = [tick]
+                continue
+            
+            if price > bar['high']:
+                bar['high'] = price
+            elif price < bar['low']:
+                bar['low'] = price
+            bar['close'] = price
+            bar['volume'] += volume
+            ticks.append(tick)
+        
+        if bar is not None:
+            yield bar, ticks
+    
     def load_bar_data(self, symbol: str, timeframe: str = "1min") -> List[Dict[str, Any]]:
         """
         Load bar data from CSV file.
@@ -175,22 +288,19 @@ class HistoricalDataLoader:
         try:
             start_date, end_date = self._normalize_date_range()
             
-            with open(filepath, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    timestamp = datetime.fromisoformat(row['timestamp'])
-                    timestamp = self._normalize_timestamp(timestamp)
-                    
-                    # Filter by date range
-                    if start_date <= timestamp <= end_date:
-                        bars.append({
-                            'timestamp': timestamp,
-                            'open': float(row['open']),
-                            'high': float(row['high']),
-                            'low': float(row['low']),
-                            'close': float(row['close']),
-                            'volume': int(row['volume'])
-                        })
+            # Typed columns for the date range only (indexed CSV seek or .npy copy)
+            rows = load_columns(
+                filepath, datetime_to_ns(start_date), datetime_to_ns(end_date),
+                ['open', 'high', 'low', 'close', 'volume']
+            )
+            timestamps = to_datetimes(rows['timestamp_ns'], pytz.timezone('US/Eastern'))
+            bars = [
+                {'timestamp': timestamp, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+                for timestamp, open_, high, low, close, volume in zip(
+                    timestamps, rows['open'].tolist(), rows['high'].tolist(), rows['low'].tolist(),
+                    rows['close'].tolist(), rows['volume'].tolist()
+                )
+            ]
                         
             self.logger.debug(f"Loaded {len(bars)} {timeframe} bars for {symbol} (from {filepath})")
             if len(bars) == 0:
@@ -390,47 +500,406 @@ class OrderFillSimulator:
         return None
 
 
+@dataclass
+class SimulatedFill:
+    """Result of an intrabar order simulation"""
+    side: str  # 'BUY' or 'SELL'
+    order_type: str  # 'market', 'stop' or 'limit'
+    quantity: int
+    fills: List[Tuple[datetime, float, int]] = field(default_factory=list)  # (time, price, contracts)
+    # Working limit orders only
+    limit_price: Optional[float] = None
+    queue_ahead: int = 0  # Contracts resting ahead of the order at its price
+    expires_at: Optional[datetime] = None  # Cancelled after this (passive_order_timeout)
+    working: bool = False  # Still resting (not filled, not cancelled)
+    
+    @property
+    def filled_quantity(self) -> int:
+        """Contracts filled so far"""
+        return sum(qty for _, _, qty in self.fills)
+    
+    @property
+    def average_price(self) -> Optional[float]:
+        """Volume-weighted fill price (None if nothing filled)"""
+        filled = self.filled_quantity
+        if filled == 0:
+            return None
+        return sum(price * qty for _, price, qty in self.fills) / filled
+    
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        """Time of the last fill (None if nothing filled)"""
+        return self.fills[-1][0] if self.fills else None
+    
+    @property
+    def status(self) -> str:
+        """'filled', 'partial' or 'unfilled'"""
+        filled = self.filled_quantity
+        if filled >= self.quantity:
+            return 'filled'
+        return 'partial' if filled > 0 else 'unfilled'
+
+
+class IntrabarFillSimulator:
+    """
+    Resolves orders against the price path inside a bar instead of the bar close.
+    
+    The path is the minute's actual ticks when they are available. Otherwise a
+    synthetic path is walked one tick at a time through the OHLC points:
+    open -> low -> high -> close for an up bar, open -> high -> low -> close for
+    a down bar, with time proportional to distance travelled and the bar volume
+    spread evenly over the points.
+    
+    Backtests have no quote stream, so book depth and queue position come from
+    the same settings BidAskManager uses live (max_queue_size,
+    passive_order_timeout), or from a BidAskQuote when the caller has one.
+    """
+    
+    BAR_SECONDS = 60
+    PRICE_MOVE_THRESHOLD = 2  # Ticks away before a passive order is cancelled (PassiveOrderTracker)
+    
+    def __init__(self, tick_size: float, tick_value: float, slippage_ticks: float = 0.5,
+                 config: Optional[Dict[str, Any]] = None, level_size: int = 100):
+        """
+        Initialize simulator.
+        
+        Args:
+            tick_size: Instrument tick size
+            tick_value: Dollar value of one tick
+            slippage_ticks: Distance from last trade to the touch when no quote is given
+            config: Bot configuration (max_queue_size, passive_order_timeout)
+            level_size: Contracts displayed per price level when no quote is given
+        """
+        config = config or {}
+        self.tick_size = tick_size
+        self.tick_value = tick_value
+        self.slippage_ticks = slippage_ticks
+        self.level_size = level_size
+        self.max_queue_size = config.get("max_queue_size", 100)
+        self.passive_order_timeout = config.get("passive_order_timeout", 10)
+        self.logger = logging.getLogger(__name__)
+    
+    def price_path(self, bar: Dict[str, Any],
+                   ticks: Optional[List[Tuple[float, int, int]]] = None) -> List[Tuple[datetime, float, int]]:
+        """
+        Build the intrabar price path.
+        
+        Args:
+            bar: 1-minute bar (timestamp is the start of the minute)
+            ticks: The minute's ticks as (price, volume, timestamp_ms), if available
+            
+        Returns:
+            List of (time, price, volume) points in time order
+        """
+        start = bar['timestamp']
+        if ticks:
+            tz = start.tzinfo
+            return [
+                (datetime.fromtimestamp(timestamp_ms / 1000.0, tz=pytz.UTC).astimezone(tz), price, volume)
+                for price, volume, timestamp_ms in ticks
+            ]
+        
+        if bar['close'] >= bar['open']:
+            waypoints = [bar['open'], bar['low'], bar['high'], bar['close']]
+        else:
+            waypoints = [bar['open'], bar['high'], bar['low'], bar['close']]
+        
+        # Walk each leg one tick at a time
+        prices = [waypoints[0]]
+        for leg_start, leg_end in zip(waypoints, waypoints[1:]):
+            steps = int(round(abs(leg_end - leg_start) / self.tick_size))
+            direction = 1 if leg_end > leg_start else -1
+            for step in range(1, steps + 1):
+                prices.append(leg_start + direction * step * self.tick_size)
+            if steps:
+                prices[-1] = leg_end
+        
+        # Time proportional to distance travelled; volume spread evenly
+        moves = len(prices) - 1
+        volume = int(bar.get('volume', 0))
+        base_volume, extra = divmod(volume, len(prices))
+        path = []
+        for i, price in enumerate(prices):
+            offset = self.BAR_SECONDS * i / moves if moves else 0.0
+            path.append((start + timedelta(seconds=offset), price, base_volume + (1 if i < extra else 0)))
+        return path
+    
+    def simulate_market_order(self, side: str, quantity: int, path: List[Tuple[datetime, float, int]],
+                              index: int = -1, quote: Optional[Any] = None,
+                              order_type: str = 'market') -> SimulatedFill:
+        """
+        Fill a market order at a point of the path, walking the book for size.
+        
+        Args:
+            side: 'BUY' or 'SELL'
+            quantity: Contracts
+            path: Intrabar path from price_path()
+            index: Path point where the order arrives (default: last point)
+            quote: Optional BidAskQuote for spread and displayed size
+            order_type: Order type recorded on the result
+            
+        Returns:
+            SimulatedFill (always fully filled)
+        """
+        timestamp, price, _ = path[index]
+        direction = 1 if side == 'BUY' else -1
+        
+        if quote is not None:
+            touch = quote.ask_price if side == 'BUY' else quote.bid_price
+            displayed = quote.ask_size if side == 'BUY' else quote.bid_size
+        else:
+            touch = price + direction * self.slippage_ticks * self.tick_size
+            displayed = self.level_size
+        displayed = max(int(displayed), 1)
+        
+        fill = SimulatedFill(side=side, order_type=order_type, quantity=quantity)
+        remaining = quantity
+        level = 0
+        while remaining > 0:
+            take = min(remaining, displayed)
+            fill.fills.append((timestamp, touch + direction * level * self.tick_size, take))
+            remaining -= take
+            level += 1
+        return fill
+    
+    def simulate_stop_order(self, side: str, quantity: int, stop_price: float,
+                            path: List[Tuple[datetime, float, int]],
+                            quote: Optional[Any] = None) -> SimulatedFill:
+        """
+        Trigger a stop at the first path point that reaches it, then fill as a market order.
+        
+        A path that gaps through the stop triggers at the gapped price, not the stop.
+        
+        Args:
+            side: 'BUY' or 'SELL'
+            quantity: Contracts
+            stop_price: Stop trigger price
+            path: Intrabar path from price_path()
+            quote: Optional BidAskQuote for spread and displayed size
+            
+        Returns:
+            SimulatedFill ('unfilled' if the stop was never reached)
+        """
+        for index, (_, price, _) in enumerate(path):
+            if (side == 'BUY' and price >= stop_price) or (side == 'SELL' and price <= stop_price):
+                return self.simulate_market_order(side, quantity, path, index, quote, order_type='stop')
+        return SimulatedFill(side=side, order_type='stop', quantity=quantity)
+    
+    def simulate_limit_order(self, side: str, quantity: int, limit_price: float, placed_at: datetime,
+                             path: List[Tuple[datetime, float, int]],
+                             quote: Optional[Any] = None, timeout: Optional[float] = None) -> SimulatedFill:
+        """
+        Rest a passive limit order at the back of the queue and fill it from traded volume.
+        
+        Volume traded at the limit first works through the queue ahead of the
+        order, then fills it (partially if there is not enough). Trading through
+        the limit fills whatever is left. The order is cancelled after `timeout`
+        seconds (default passive_order_timeout), or when price moves PRICE_MOVE_THRESHOLD+
+        ticks away from it. An order still working at the end of `path` can be
+        continued on later prices with work_limit_order().
+        
+        Args:
+            side: 'BUY' or 'SELL'
+            quantity: Contracts
+            limit_price: Limit price
+            placed_at: Time the order was placed
+            path: Price points after the order was placed
+            quote: Optional BidAskQuote for the size already resting at the limit
+            timeout: Seconds before the order is cancelled
+            
+        Returns:
+            SimulatedFill ('filled', 'partial' or 'unfilled'; working=True if still resting)
+        """
+        if quote is not None:
+            resting = quote.bid_size if side == 'BUY' else quote.ask_size
+        else:
+            resting = self.level_size
+        
+        fill = SimulatedFill(
+            side=side, order_type='limit', quantity=quantity, limit_price=limit_price,
+            queue_ahead=min(int(resting), self.max_queue_size),
+            expires_at=placed_at + timedelta(seconds=self.passive_order_timeout if timeout is None else timeout),
+            working=True
+        )
+        self.work_limit_order(fill, path)
+        return fill
+    
+    def work_limit_order(self, fill: SimulatedFill, path: List[Tuple[datetime, float, int]]) -> Optional[int]:
+        """
+        Continue a working limit order over more price points.
+        
+        Args:
+            fill: Working order from simulate_limit_order()
+            path: Price points after the ones already worked
+            
+        Returns:
+            Index of the point in `path` where the order was cancelled (timeout
+            or price moved away), or None if it filled or is still working
+        """
+        half_tick = self.tick_size / 2.0
+        limit_price = fill.limit_price
+        buying = fill.side == 'BUY'
+        
+        for index, (timestamp, price, volume) in enumerate(path):
+            if not fill.working:
+                break
+            
+            if timestamp > fill.expires_at:
+                fill.working = False
+                return index
+            
+            remaining = fill.quantity - fill.filled_quantity
+            traded_through = price < limit_price - half_tick if buying else price > limit_price + half_tick
+            if traded_through:
+                fill.fills.append((timestamp, limit_price, remaining))
+                fill.working = False
+                break
+            
+            if abs(price - limit_price) <= half_tick:
+                consumed = min(fill.queue_ahead, volume)
+                fill.queue_ahead -= consumed
+                traded = volume - consumed
+                if traded > 0:
+                    take = min(remaining, traded)
+                    fill.fills.append((timestamp, limit_price, take))
+                    if take == remaining:
+                        fill.working = False
+                continue
+            
+            # Bidding: price ran away above us / offering: price fell away below us
+            distance = (price - limit_price) if buying else (limit_price - price)
+            if distance / self.tick_size > self.PRICE_MOVE_THRESHOLD:
+                fill.working = False
+                return index
+        
+        return None
+
+
 class PerformanceMetrics:
-    """Calculates and tracks backtest performance metrics"""
+    """
+    Calculates and tracks backtest performance metrics.
+    
+    Summary statistics are running totals updated once per trade in
+    add_trade(): P&L sums, win/loss counts, Welford mean/variance of trade
+    P&L for the Sharpe ratio and the running equity peak/trough for
+    drawdown. get_summary() therefore costs the same for 10 trades as for
+    100,000, and metrics for consecutive runs (e.g. walk-forward windows)
+    can be combined with merge() without replaying trades.
+    
+    Post-run analytics (daily returns, rolling Sharpe, MAE/MFE distributions)
+    are computed in a single NumPy pass over the recorded trades.
+    """
     
     def __init__(self, initial_equity: float, tick_value: float, commission_per_contract: float):
         self.initial_equity = initial_equity
         self.tick_value = tick_value
         self.commission_per_contract = commission_per_contract
         self.trades: List[Trade] = []
-        self.equity_curve: List[Tuple[datetime, float]] = [(datetime.now(), initial_equity)]
+        # Starts at the first trade's entry (seeded in add_trade)
+        self.equity_curve: List[Tuple[datetime, float]] = []
+        
+        # Running totals
+        self.total_pnl = 0.0
+        self.win_count = 0
+        self.loss_count = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0  # Sum of losing P&L (negative)
+        self.time_in_position = 0.0  # Minutes
+        self._pnl_mean = 0.0
+        self._pnl_m2 = 0.0  # Welford sum of squared deviations
+        
+        # Running equity extremes
+        self.equity = initial_equity
+        self.peak_equity = initial_equity
+        self.trough_equity = initial_equity
+        self.max_drawdown = 0.0
         
     def add_trade(self, trade: Trade) -> None:
         """Add a completed trade to the metrics"""
+        if not self.equity_curve:
+            self.equity_curve.append((trade.entry_time, self.equity))
         self.trades.append(trade)
         
-        # Update equity curve
-        if len(self.equity_curve) > 0:
-            last_equity = self.equity_curve[-1][1]
-        else:
-            last_equity = self.initial_equity
-            
-        new_equity = last_equity + trade.pnl
-        self.equity_curve.append((trade.exit_time, new_equity))
+        pnl = trade.pnl
+        self.total_pnl += pnl
+        if pnl > 0:
+            self.win_count += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.loss_count += 1
+            self.gross_loss += pnl
+        self.time_in_position += trade.duration_minutes
+        
+        # Welford update for trade P&L variance
+        delta = pnl - self._pnl_mean
+        self._pnl_mean += delta / len(self.trades)
+        self._pnl_m2 += delta * (pnl - self._pnl_mean)
+        
+        # Update equity curve and drawdown
+        self.equity += pnl
+        self.equity_curve.append((trade.exit_time, self.equity))
+        if self.equity > self.peak_equity:
+            self.peak_equity = self.equity
+        if self.equity < self.trough_equity:
+            self.trough_equity = self.equity
+        drawdown = self.peak_equity - self.equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+    
+    def merge(self, other: 'PerformanceMetrics') -> None:
+        """
+        Append another run's metrics as if its trades followed this run's.
+        
+        The other run's equity is re-based onto this run's final equity, so
+        drawdowns that span the boundary are accounted for.
+        
+        Args:
+            other: Metrics of a later run (same instrument and costs)
+        """
+        if not other.trades:
+            return
+        offset = self.equity - other.initial_equity
+        
+        # Drawdown: within either run, or from this run's peak into the other's trough
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown,
+                                self.peak_equity - (other.trough_equity + offset))
+        self.peak_equity = max(self.peak_equity, other.peak_equity + offset)
+        self.trough_equity = min(self.trough_equity, other.trough_equity + offset)
+        self.equity = other.equity + offset
+        
+        # Combine Welford accumulators (Chan et al.)
+        count_a = len(self.trades)
+        count_b = len(other.trades)
+        total = count_a + count_b
+        delta = other._pnl_mean - self._pnl_mean
+        self._pnl_mean += delta * count_b / total
+        self._pnl_m2 += other._pnl_m2 + delta * delta * count_a * count_b / total
+        
+        self.total_pnl += other.total_pnl
+        self.win_count += other.win_count
+        self.loss_count += other.loss_count
+        self.gross_profit += other.gross_profit
+        self.gross_loss += other.gross_loss
+        self.time_in_position += other.time_in_position
+        
+        self.trades.extend(other.trades)
+        curve = other.equity_curve if not self.equity_curve else other.equity_curve[1:]
+        self.equity_curve.extend((timestamp, equity + offset) for timestamp, equity in curve)
         
     def calculate_total_pnl(self) -> float:
         """Calculate total profit/loss"""
-        return sum(t.pnl for t in self.trades)
+        return self.total_pnl
     
     def calculate_win_rate(self) -> float:
         """Calculate percentage of winning trades"""
         if len(self.trades) == 0:
             return 0.0
-        wins = sum(1 for t in self.trades if t.pnl > 0)
-        return (wins / len(self.trades)) * 100
+        return (self.win_count / len(self.trades)) * 100
     
     def calculate_average_win_loss(self) -> Tuple[float, float]:
         """Calculate average win and average loss"""
-        wins = [t.pnl for t in self.trades if t.pnl > 0]
-        losses = [t.pnl for t in self.trades if t.pnl < 0]
-        
-        avg_win = sum(wins) / len(wins) if wins else 0.0
-        avg_loss = sum(losses) / len(losses) if losses else 0.0
+        avg_win = self.gross_profit / self.win_count if self.win_count else 0.0
+        avg_loss = self.gross_loss / self.loss_count if self.loss_count else 0.0
         
         return avg_win, avg_loss
     
@@ -441,21 +910,9 @@ class PerformanceMetrics:
         Returns:
             Tuple of (max_drawdown_dollars, max_drawdown_percent)
         """
-        if len(self.equity_curve) == 0:
-            return 0.0, 0.0
-            
-        peak = self.initial_equity
-        max_dd = 0.0
-        
-        for _, equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            drawdown = peak - equity
-            if drawdown > max_dd:
-                max_dd = drawdown
-                
-        max_dd_percent = (max_dd / peak * 100) if peak > 0 else 0.0
-        return max_dd, max_dd_percent
+        peak = self.peak_equity
+        max_dd_percent = (self.max_drawdown / peak * 100) if peak > 0 else 0.0
+        return self.max_drawdown, max_dd_percent
     
     def calculate_sharpe_ratio(self, risk_free_rate: float = 0.0) -> float:
         """
@@ -467,62 +924,50 @@ class PerformanceMetrics:
         Returns:
             Sharpe ratio
         """
-        if len(self.trades) < 2:
+        count = len(self.trades)
+        if count < 2:
             return 0.0
             
-        # Calculate daily returns
-        returns = [t.pnl for t in self.trades]
-        
-        # Calculate statistics
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / (len(returns) - 1)
-        std_dev = variance ** 0.5
+        # Per-trade returns from the running Welford accumulators
+        std_dev = (self._pnl_m2 / (count - 1)) ** 0.5
         
         if std_dev == 0:
             return 0.0
             
         # Annualize (assuming ~252 trading days)
-        sharpe = (mean_return - risk_free_rate) / std_dev
+        sharpe = (self._pnl_mean - risk_free_rate) / std_dev
         sharpe_annualized = sharpe * (252 ** 0.5)
         
         return sharpe_annualized
     
     def calculate_profit_factor(self) -> float:
         """Calculate profit factor (gross profit / gross loss)"""
-        gross_profit = sum(t.pnl for t in self.trades if t.pnl > 0)
-        gross_loss = abs(sum(t.pnl for t in self.trades if t.pnl < 0))
+        gross_loss = abs(self.gross_loss)
         
         if gross_loss == 0:
-            return float('inf') if gross_profit > 0 else 0.0
+            return float('inf') if self.gross_profit > 0 else 0.0
             
-        return gross_profit / gross_loss
+        return self.gross_profit / gross_loss
     
     def calculate_time_in_market(self) -> float:
-        """Calculate percentage of time spent in positions"""
-        if len(self.trades) == 0:
+        """Calculate percentage of time spent in positions (first entry to last exit)"""
+        if len(self.equity_curve) < 2:
             return 0.0
             
-        total_time_in_position = sum(t.duration_minutes for t in self.trades)
+        start_time = self.equity_curve[0][0]
+        end_time = self.equity_curve[-1][0]
         
-        # Calculate total backtest duration
-        if len(self.equity_curve) > 1:
-            start_time = self.equity_curve[0][0]
-            end_time = self.equity_curve[-1][0]
+        # Normalize to timezone-naive for comparison
+        if start_time.tzinfo is not None:
+            start_time = start_time.replace(tzinfo=None)
+        if end_time.tzinfo is not None:
+            end_time = end_time.replace(tzinfo=None)
             
-            # Normalize to timezone-naive for comparison
-            if start_time.tzinfo is not None:
-                start_time = start_time.replace(tzinfo=None)
-            if end_time.tzinfo is not None:
-                end_time = end_time.replace(tzinfo=None)
-                
-            total_duration = (end_time - start_time).total_seconds() / 60.0
-        else:
+        total_duration = (end_time - start_time).total_seconds() / 60.0
+        if total_duration <= 0:
             return 0.0
             
-        if total_duration == 0:
-            return 0.0
-            
-        return (total_time_in_position / total_duration) * 100
+        return (self.time_in_position / total_duration) * 100
     
     def get_summary(self) -> Dict[str, Any]:
         """Get comprehensive performance summary"""
@@ -531,7 +976,7 @@ class PerformanceMetrics:
         
         return {
             'total_trades': len(self.trades),
-            'total_pnl': self.calculate_total_pnl(),
+            'total_pnl': self.total_pnl,
             'win_rate': self.calculate_win_rate(),
             'average_win': avg_win,
             'average_loss': avg_loss,
@@ -540,9 +985,97 @@ class PerformanceMetrics:
             'sharpe_ratio': self.calculate_sharpe_ratio(),
             'profit_factor': self.calculate_profit_factor(),
             'time_in_market_percent': self.calculate_time_in_market(),
-            'final_equity': self.equity_curve[-1][1] if self.equity_curve else self.initial_equity,
-            'total_return': ((self.equity_curve[-1][1] / self.initial_equity - 1) * 100) if self.equity_curve else 0.0
+            'final_equity': self.equity,
+            'total_return': (self.equity / self.initial_equity - 1) * 100
         }
+    
+    def trade_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Recorded trades as NumPy columns for batch analytics.
+        
+        Returns:
+            Dict with 'pnl', 'ticks', 'duration_minutes', 'mae_ticks', 'mfe_ticks'
+            (NaN where the bot did not track excursions) and 'exit_day'
+            (datetime64[D], exit date in the trade's own timezone)
+        """
+        nan = float('nan')
+        trades = self.trades
+        return {
+            'pnl': np.fromiter((t.pnl for t in trades), dtype=np.float64, count=len(trades)),
+            'ticks': np.fromiter((t.ticks for t in trades), dtype=np.float64, count=len(trades)),
+            'duration_minutes': np.fromiter((t.duration_minutes for t in trades), dtype=np.float64, count=len(trades)),
+            'mae_ticks': np.fromiter((nan if t.mae_ticks is None else t.mae_ticks for t in trades),
+                                     dtype=np.float64, count=len(trades)),
+            'mfe_ticks': np.fromiter((nan if t.mfe_ticks is None else t.mfe_ticks for t in trades),
+                                     dtype=np.float64, count=len(trades)),
+            'exit_day': np.array([t.exit_time.date() for t in trades], dtype='datetime64[D]')
+        }
+    
+    def daily_returns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Daily P&L and returns (relative to equity at the start of each day).
+        
+        Returns:
+            Tuple of (days as datetime64[D], daily P&L, daily returns)
+        """
+        columns = self.trade_arrays()
+        days, day_index = np.unique(columns['exit_day'], return_inverse=True)
+        daily_pnl = np.bincount(day_index, weights=columns['pnl'], minlength=len(days)).astype(np.float64)
+        start_equity = self.initial_equity + np.concatenate(([0.0], np.cumsum(daily_pnl)[:-1]))
+        return days, daily_pnl, daily_pnl / start_equity
+    
+    def rolling_sharpe(self, window: int = 20) -> np.ndarray:
+        """
+        Annualized Sharpe ratio over a rolling window of trades.
+        
+        Uses the same per-trade convention as calculate_sharpe_ratio().
+        
+        Args:
+            window: Trades per window (at least 2)
+            
+        Returns:
+            Array with one value per full window (0.0 where P&L did not vary)
+        """
+        pnl = self.trade_arrays()['pnl']
+        if window < 2 or len(pnl) < window:
+            return np.empty(0)
+        
+        # Rolling sums via cumulative sums, centred on the overall mean for precision
+        centred = pnl - pnl.mean()
+        sums = np.cumsum(np.concatenate(([0.0], centred)))
+        squares = np.cumsum(np.concatenate(([0.0], centred * centred)))
+        window_sum = sums[window:] - sums[:-window]
+        window_squares = squares[window:] - squares[:-window]
+        variance = np.maximum((window_squares - window_sum * window_sum / window) / (window - 1), 0.0)
+        std_dev = np.sqrt(variance)
+        mean = window_sum / window + pnl.mean()
+        
+        sharpe = np.zeros_like(mean)
+        nonzero = std_dev > 1e-12
+        sharpe[nonzero] = mean[nonzero] / std_dev[nonzero] * (252 ** 0.5)
+        return sharpe
+    
+    def excursion_distribution(self, percentiles: Tuple[float, ...] = (25, 50, 75, 90, 95)) -> Dict[str, Dict[str, float]]:
+        """
+        MAE/MFE distribution (in ticks) over trades with tracked excursions.
+        
+        Args:
+            percentiles: Percentiles to report
+            
+        Returns:
+            Dict keyed by 'mae_ticks' and 'mfe_ticks' with count, mean and pNN values
+        """
+        columns = self.trade_arrays()
+        distribution = {}
+        for name in ('mae_ticks', 'mfe_ticks'):
+            values = columns[name][~np.isnan(columns[name])]
+            stats: Dict[str, float] = {'count': float(len(values))}
+            if len(values):
+                stats['mean'] = float(values.mean())
+                for pct, value in zip(percentiles, np.percentile(values, percentiles)):
+                    stats[f"p{pct:g}"] = float(value)
+            distribution[name] = stats
+        return distribution
 
 
 class BacktestEngine:
@@ -560,6 +1093,18 @@ class BacktestEngine:
     No broker connection or API token is needed for backtesting.
     """
     
+    # Exit routing used live by handle_exit_orders (volume surges are not modelled)
+    EXIT_TYPES = {
+        "stop_loss": "stop",
+        "time_based_profit_take": "time_flatten",
+        "time_based_loss_cut": "time_flatten",
+        "signal_reversal": "partial",
+        "early_profit_lock": "partial",
+        "trailing_stop_failure_emergency": "emergency"
+    }
+    HIGH_URGENCY_EXITS = ("stop_loss", "proactive_stop", "signal_reversal",
+                          "emergency_forced_flatten", "time_based_loss_cut")
+    
     def __init__(self, config: BacktestConfig, bot_config: Dict[str, Any]):
         self.config = config
         self.bot_config = bot_config
@@ -572,6 +1117,16 @@ class BacktestEngine:
             tick_value=bot_config.get('tick_value', 1.25),
             slippage_ticks=config.slippage_ticks
         )
+        self.fill_simulator: Optional[IntrabarFillSimulator] = None
+        self.exit_optimizer: Optional[ExitOrderOptimizer] = None
+        if config.intrabar_fills:
+            self.fill_simulator = IntrabarFillSimulator(
+                tick_size=bot_config.get('tick_size', 0.25),
+                tick_value=bot_config.get('tick_value', 1.25),
+                slippage_ticks=config.slippage_ticks,
+                config=bot_config
+            )
+            self.exit_optimizer = ExitOrderOptimizer(bot_config)
         self.metrics = PerformanceMetrics(
             initial_equity=config.initial_equity,
             tick_value=bot_config.get('tick_value', 1.25),
@@ -581,7 +1136,9 @@ class BacktestEngine:
         # Backtest state
         self.current_equity = config.initial_equity
         self.current_position: Optional[Dict[str, Any]] = None
+        self.bot_position: Optional[Dict[str, Any]] = None  # Bot's own position dict while mirrored
         self.pending_orders: List[Dict[str, Any]] = []
+        self.pending_exit: Optional[Dict[str, Any]] = None  # Passive exit still resting (intrabar fills only)
         
         # RL brain tracking
         self.initial_signal_count = 0
@@ -600,13 +1157,16 @@ class BacktestEngine:
         """
         return self.run_with_strategy(strategy_func)
     
-    def run_with_strategy(self, strategy_func: Any) -> Dict[str, Any]:
+    def run_with_strategy(self, strategy_func: Any, tick_strategy_func: Any = None) -> Dict[str, Any]:
         """
         Run the backtest with integrated bot strategy.
         
         Args:
             strategy_func: Function that receives bars and executes strategy logic.
                           Should be: func(bars_1min: List[Dict], bars_15min: List[Dict]) -> None
+            tick_strategy_func: Optional tick replay used when use_tick_data is set.
+                          Should be: func(minutes: Iterator[Tuple[Dict, List[Tuple]]], bars_15min: List[Dict]) -> None
+                          where minutes comes from HistoricalDataLoader.iter_tick_minutes()
             
         Returns:
             Performance metrics dictionary
@@ -620,7 +1180,8 @@ class BacktestEngine:
         self.logger.debug(f"Symbols: {', '.join(self.config.symbols)}")
         
         for symbol in self.config.symbols:
-            self._run_symbol_backtest_integrated(symbol, strategy_func)
+            self._run_symbol_backtest_integrated(symbol, strategy_func, tick_strategy_func)
+            self.finish_pending_exit()
             
         # Calculate and return metrics
         results = self.metrics.get_summary()
@@ -639,7 +1200,7 @@ class BacktestEngine:
         """
         return self._run_symbol_backtest_integrated(symbol, strategy_func)
     
-    def _run_symbol_backtest_integrated(self, symbol: str, strategy_func: Any) -> None:
+    def _run_symbol_backtest_integrated(self, symbol: str, strategy_func: Any, tick_strategy_func: Any = None) -> None:
         """
         Run backtest for a single symbol with integrated bot strategy.
         By default uses bar-by-bar replay with 1-minute bars.
@@ -649,25 +1210,33 @@ class BacktestEngine:
             symbol: Symbol to backtest
             strategy_func: Function that receives bars and executes strategy.
                           Signature: func(bars_1min: List[Dict], bars_15min: List[Dict]) -> None
+            tick_strategy_func: Optional streaming tick replay (see run_with_strategy)
         """
         # Suppress verbose logging during backtest
         self.logger.debug(f"\nBacktesting {symbol}...")
         
         # Load data based on replay mode
         if self.config.use_tick_data:
-            # TICK-BY-TICK MODE: Load actual tick data
-            ticks = self.data_loader.load_tick_data(symbol)
-            if len(ticks) == 0:
-                self.logger.warning(f"No tick data available for {symbol}")
-                return
-            self.logger.debug(f"Running TICK-BY-TICK replay with {len(ticks):,} actual ticks")
-            
+            # TICK-BY-TICK MODE: Stream ticks from disk (never held in memory all at once)
             # Still load bar data for higher timeframe analysis
             bars_15min = self.data_loader.load_bar_data(symbol, "15min")
+            minutes = self.data_loader.iter_tick_minutes(symbol)
             
-            # Convert ticks to 1-min bars for compatibility with strategy
-            bars_1min = self.data_loader._aggregate_ticks_to_bars(ticks, "1min")
-            self.logger.debug(f"Aggregated {len(ticks):,} ticks into {len(bars_1min)} 1-minute bars")
+            if tick_strategy_func is not None:
+                self.logger.debug(f"Running streaming TICK-BY-TICK replay")
+                try:
+                    tick_strategy_func(minutes, bars_15min)
+                except Exception as e:
+                    self.logger.error(f"Error running strategy: {e}", exc_info=True)
+                    raise
+                return
+            
+            # Bar strategies get the 1-min bars aggregated from the tick stream
+            bars_1min = [bar for bar, _ in minutes]
+            if len(bars_1min) == 0:
+                self.logger.warning(f"No tick data available for {symbol}")
+                return
+            self.logger.debug(f"Aggregated tick stream into {len(bars_1min)} 1-minute bars")
         else:
             # BAR-BY-BAR MODE: Load pre-aggregated bars (default)
             bars_1min = self.data_loader.load_bar_data(symbol, "1min")
@@ -697,7 +1266,216 @@ class BacktestEngine:
             raise
 
     
-    def _close_position(self, exit_time: datetime, exit_price: float, reason: str) -> None:
+    def open_bot_position(self, symbol: str, pos: Dict[str, Any], timestamp: datetime,
+                          bar: Optional[Dict[str, Any]] = None,
+                          ticks: Optional[List[Tuple[float, int, int]]] = None) -> None:
+        """
+        Mirror a position the bot just opened.
+        
+        With intrabar fills enabled the entry is re-filled as a market order at
+        the point the bot acted: the bar close, or the last of `ticks` in tick
+        replay. Otherwise the bot's own entry price is used.
+        
+        Args:
+            symbol: Instrument symbol
+            pos: The bot's position dict (state[symbol]['position'])
+            timestamp: Current replay time
+            bar: Bar being replayed
+            ticks: Ticks of the minute up to the current one (tick replay only)
+        """
+        quantity = pos.get('quantity', 1)
+        entry_price = pos['entry_price']
+        
+        if self.pending_exit is not None:
+            # The bot is flat as far as it knows - send what is left of the exit first
+            self.finish_pending_exit()
+        
+        if self.fill_simulator is not None and bar is not None:
+            side = 'BUY' if pos['side'] == 'long' else 'SELL'
+            path = self.fill_simulator.price_path(bar, ticks)
+            entry_price = self.fill_simulator.simulate_market_order(side, quantity, path).average_price
+        
+        self.current_position = {
+            'symbol': symbol,
+            'side': pos['side'],
+            'quantity': quantity,
+            'entry_price': entry_price,
+            'entry_time': pos.get('entry_time', timestamp),
+            'stop_price': pos.get('stop_price'),
+            'target_price': pos.get('target_price'),
+            'highest_price': entry_price,
+            'lowest_price': entry_price
+        }
+        self.bot_position = pos
+    
+    def update_excursion(self, high: float, low: float) -> None:
+        """
+        Extend the open position's price extremes (used for MAE/MFE).
+        
+        Call once per bar (bar high/low) or per tick (price, price) while the
+        position is open.
+        
+        Args:
+            high: Highest price since the last update
+            low: Lowest price since the last update
+        """
+        pos = self.current_position
+        if pos is None:
+            return
+        if high > pos['highest_price']:
+            pos['highest_price'] = high
+        if low < pos['lowest_price']:
+            pos['lowest_price'] = low
+    
+    def close_bot_position(self, timestamp: datetime, price: float, reason: str,
+                           bar: Optional[Dict[str, Any]] = None,
+                           ticks: Optional[List[Tuple[float, int, int]]] = None) -> None:
+        """
+        Close the mirrored position after the bot exited and record the trade.
+        
+        With intrabar fills enabled, stop-loss exits in bar replay are resolved
+        as a stop order at the bot's final stop over the bar's price path, so
+        the exit gets the price and time the stop was actually reached. Exits
+        the bot routes passively live (ExitOrderOptimizer) rest as a limit order
+        that work_pending_exit() fills from later prices. Other exits (and every
+        exit in tick replay) are market orders at the point the bot acted.
+        Otherwise the trade closes at `price` and `timestamp`.
+        
+        MAE/MFE come from the extremes fed to update_excursion() while the
+        position was open, the exit bar's price path up to the fill (intrabar
+        fills only) and the exit price.
+        
+        Args:
+            timestamp: Current replay time
+            price: Exit price used without intrabar fills (bar close / tick price)
+            reason: Bot exit reason
+            bar: Bar being replayed
+            ticks: Ticks of the minute up to the current one (tick replay only)
+        """
+        if self.current_position is None or self.pending_exit is not None:
+            return
+        
+        if self.fill_simulator is not None and bar is not None:
+            side = 'SELL' if self.current_position['side'] == 'long' else 'BUY'
+            quantity = self.current_position['quantity']
+            path = self.fill_simulator.price_path(bar, ticks)
+            
+            strategy = self._exit_strategy(reason, path[-1][1])
+            if strategy['order_type'] == 'passive' and strategy.get('timeout', 0) > 0:
+                order = self.fill_simulator.simulate_limit_order(
+                    side, quantity, strategy['limit_price'], path[-1][0], [],
+                    quote=self._exit_quote(path[-1][1]), timeout=strategy['timeout']
+                )
+                self.pending_exit = {'order': order, 'reason': reason, 'last_point': path[-1]}
+                return
+            
+            fill = None
+            stop_price = (self.bot_position or {}).get('stop_price')
+            if reason == 'stop_loss' and stop_price is not None and not ticks:
+                fill = self.fill_simulator.simulate_stop_order(side, quantity, stop_price, path)
+            if fill is None or fill.status != 'filled':
+                fill = self.fill_simulator.simulate_market_order(side, quantity, path)
+            
+            timestamp = fill.timestamp
+            price = fill.average_price
+            
+            # The exit bar counts up to the fill
+            path_prices = [p for t, p, _ in path if t <= timestamp]
+            if path_prices:
+                self.update_excursion(max(path_prices), min(path_prices))
+        
+        self._record_exit(timestamp, price, reason)
+    
+    def _exit_quote(self, price: float) -> BidAskQuote:
+        """
+        Synthetic quote around a traded price: bid and ask one slippage distance
+        either side, rounded out to the tick grid, with level_size displayed.
+        """
+        tick_size = self.fill_simulator.tick_size
+        offset = max(self.fill_simulator.slippage_ticks, 0.5) * tick_size
+        bid = np.floor((price - offset) / tick_size + 1e-9) * tick_size
+        ask = np.ceil((price + offset) / tick_size - 1e-9) * tick_size
+        size = self.fill_simulator.level_size
+        return BidAskQuote(float(bid), float(ask), size, size, price, 0)
+    
+    def _exit_strategy(self, reason: str, price: float) -> Dict[str, Any]:
+        """Exit order the bot would send live for this reason (see handle_exit_orders)."""
+        urgency = "high" if reason in self.HIGH_URGENCY_EXITS else "normal"
+        exit_type = self.EXIT_TYPES.get(reason, "stop")
+        return self.exit_optimizer.get_exit_strategy(
+            exit_type, self._exit_quote(price), self.current_position['side'], urgency
+        )
+    
+    def work_pending_exit(self, bar: Dict[str, Any],
+                          ticks: Optional[List[Tuple[float, int, int]]] = None) -> None:
+        """
+        Work a resting passive exit against newly replayed prices.
+        
+        Call with each new bar (bar replay) or each new tick (tick replay,
+        `ticks` holding just that tick). When the order times out or price
+        moves away, the unfilled rest is sent as a market order at that point,
+        as escalate_passive_order does live.
+        
+        Args:
+            bar: Bar being replayed
+            ticks: New ticks since the last call (tick replay only)
+        """
+        if self.pending_exit is None:
+            return
+        order = self.pending_exit['order']
+        path = self.fill_simulator.price_path(bar, ticks)
+        
+        cancel_index = self.fill_simulator.work_limit_order(order, path)
+        worked = path if cancel_index is None else path[:cancel_index + 1]
+        if order.working:
+            worked_prices = [p for _, p, _ in worked]
+        else:
+            end = order.timestamp if cancel_index is None else path[cancel_index][0]
+            worked_prices = [p for t, p, _ in worked if t <= end]
+        if worked_prices:
+            self.update_excursion(max(worked_prices), min(worked_prices))
+        if path:
+            self.pending_exit['last_point'] = path[-1] if cancel_index is None else path[cancel_index]
+        
+        if not order.working:
+            self.finish_pending_exit()
+    
+    def finish_pending_exit(self) -> None:
+        """
+        Complete a passive exit: send any unfilled rest as a market order at the
+        last worked point and record the trade. No-op without a pending exit.
+        """
+        if self.pending_exit is None:
+            return
+        pending = self.pending_exit
+        order = pending['order']
+        self.pending_exit = None
+        
+        remaining = order.quantity - order.filled_quantity
+        if remaining > 0:
+            order.working = False
+            market = self.fill_simulator.simulate_market_order(order.side, remaining, [pending['last_point']])
+            order.fills.extend(market.fills)
+        self._record_exit(order.timestamp, order.average_price, pending['reason'])
+    
+    def _record_exit(self, timestamp: datetime, price: float, reason: str) -> None:
+        """Close the mirrored position at the final exit fill and record MAE/MFE."""
+        # Excursions from the extremes seen while the position was open
+        pos = self.current_position
+        self.update_excursion(price, price)
+        tick_size = self.bot_config.get('tick_size', 0.25)
+        if pos['side'] == 'long':
+            mfe_ticks = (pos['highest_price'] - pos['entry_price']) / tick_size
+            mae_ticks = (pos['entry_price'] - pos['lowest_price']) / tick_size
+        else:
+            mfe_ticks = (pos['entry_price'] - pos['lowest_price']) / tick_size
+            mae_ticks = (pos['highest_price'] - pos['entry_price']) / tick_size
+        
+        self.bot_position = None
+        self._close_position(timestamp, price, reason, mae_ticks, mfe_ticks)
+    
+    def _close_position(self, exit_time: datetime, exit_price: float, reason: str,
+                        mae_ticks: Optional[float] = None, mfe_ticks: Optional[float] = None) -> None:
         """Close the current position and record the trade"""
         if self.current_position is None:
             return
@@ -739,7 +1517,9 @@ class BacktestEngine:
             exit_reason=reason,
             pnl=pnl,
             ticks=ticks,
-            duration_minutes=duration
+            duration_minutes=duration,
+            mae_ticks=mae_ticks,
+            mfe_ticks=mfe_ticks
         )
         
         # Record trade
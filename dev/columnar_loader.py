@@ -0,0 +1,609 @@
+"""
+Columnar Historical Data Loader
+===============================
+Fast loading of historical bar/tick CSV files for backtests.
+
+The CSV files are sorted by time, so instead of parsing every row with
+csv.DictReader and filtering afterwards, this module:
+
+- Builds a sidecar day index (<file>.csv.days.json) with the byte offset and
+  row count of every trading date in the file. The index is built once with a
+  vectorized scan and rebuilt automatically when the CSV changes.
+- Seeks straight to the days covering the requested date range and parses
+  only those bytes into typed NumPy columns (numpy's C CSV parser plus a
+  vectorized ISO-8601 timestamp parser).
+- Optionally converts a CSV once to a compact binary file (<file>.npy, NumPy
+  structured array). When an up-to-date .npy exists it is memory-mapped and
+  the date range is found with a binary search, so only the requested slice
+  is ever read.
+
+Timestamps are stored as int64 UTC nanoseconds. Naive CSV timestamps are
+treated as UTC, the same as HistoricalDataLoader always did.
+
+Usage:
+    python dev/columnar_loader.py data/historical_data/ES_1min.csv        # build index
+    python dev/columnar_loader.py data/historical_data/ES_ticks.csv --npy # convert to .npy
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Bump when the sidecar index layout changes
+INDEX_VERSION = 1
+
+# Bytes read per step while building the day index or streaming a CSV
+INDEX_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Rows per chunk when streaming an .npy file
+STREAM_CHUNK_ROWS = 500_000
+
+# Columns stored as integers; everything else except the timestamp is float
+INTEGER_COLUMNS = ("volume", "size")
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+_NS_PER_SECOND = 1_000_000_000
+
+
+@dataclass
+class DayIndex:
+    """Byte offset and row count of each date in a sorted CSV file."""
+    size: int  # CSV size in bytes when indexed
+    mtime_ns: int  # CSV modification time when indexed
+    columns: List[str]
+    rows: int = 0
+    first_timestamp: Optional[str] = None  # Raw text of the first data row's timestamp
+    last_timestamp: Optional[str] = None  # Raw text of the last data row's timestamp
+    days: List[Tuple[str, int, int]] = field(default_factory=list)  # (YYYY-MM-DD, byte offset, rows)
+    data_end: int = 0  # Byte offset just past the last data row
+    is_sorted: bool = True  # False if a date appears in more than one block
+    version: int = INDEX_VERSION
+
+    def byte_range(self, first_day: str, last_day: str) -> Tuple[int, int]:
+        """
+        Byte range covering all rows dated first_day..last_day (inclusive).
+
+        Args:
+            first_day: First date (YYYY-MM-DD)
+            last_day: Last date (YYYY-MM-DD)
+
+        Returns:
+            (start, end) byte offsets; start == end if no rows fall in the range
+        """
+        start = end = None
+        for i, (day, offset, _) in enumerate(self.days):
+            if day < first_day:
+                continue
+            if day > last_day:
+                break
+            if start is None:
+                start = offset
+            end = self.days[i + 1][1] if i + 1 < len(self.days) else self.data_end
+        if start is None:
+            return 0, 0
+        return start, end
+
+
+def index_path(csv_path: str) -> str:
+    """Path of the sidecar day index for a CSV file."""
+    return f"{csv_path}.days.json"
+
+
+def npy_path(csv_path: str) -> str:
+    """Path of the binary (.npy) copy of a CSV file."""
+    return f"{os.path.splitext(csv_path)[0]}.npy"
+
+
+def _index_block(block: bytes, base_offset: int, days: List[List[Any]]) -> bool:
+    """
+    Add the rows of a block of complete lines to the day list.
+
+    Args:
+        block: Bytes ending with a newline
+        base_offset: File offset of the block's first byte
+        days: [day, offset, rows] entries, extended in place
+
+    Returns:
+        False if a date reappears after another date (file not sorted)
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    ends = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    keep = (ends - starts) >= 10
+    starts = starts[keep]
+    if len(starts) == 0:
+        return True
+
+    keys = buf[starts[:, None] + np.arange(10)].copy().view("S10").ravel()
+    breaks = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    block_starts = np.concatenate(([0], breaks))
+    block_rows = np.diff(np.concatenate((block_starts, [len(keys)])))
+
+    is_sorted = True
+    for first, rows in zip(block_starts.tolist(), block_rows.tolist()):
+        day = keys[first].decode("ascii", errors="replace")
+        if days and days[-1][0] == day:
+            days[-1][2] += rows
+            continue
+        if days and day < days[-1][0]:
+            is_sorted = False
+        days.append([day, base_offset + int(starts[first]), rows])
+    return is_sorted
+
+
+def build_day_index(csv_path: str) -> DayIndex:
+    """
+    Scan a CSV file and build its day index (does not save it).
+
+    Args:
+        csv_path: Path to a CSV file whose first column is an ISO timestamp
+
+    Returns:
+        DayIndex for the file
+    """
+    stat = os.stat(csv_path)
+    days: List[List[Any]] = []
+    is_sorted = True
+
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        columns = [name.strip() for name in header.decode("utf-8-sig").strip().split(",")]
+        offset = len(header)
+        pending = b""
+        while True:
+            chunk = f.read(INDEX_CHUNK_BYTES)
+            if not chunk:
+                break
+            data = pending + chunk
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                pending = data
+                continue
+            is_sorted &= _index_block(data[:cut], offset, days)
+            offset += cut
+            pending = data[cut:]
+        if pending.strip():
+            is_sorted &= _index_block(pending + b"\n", offset, days)
+            offset += len(pending)
+
+    index = DayIndex(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        columns=columns,
+        rows=sum(rows for _, _, rows in days),
+        days=[(day, start, rows) for day, start, rows in days],
+        data_end=offset,
+        is_sorted=is_sorted
+    )
+
+    if days:
+        with open(csv_path, "rb") as f:
+            f.seek(days[0][1])
+            index.first_timestamp = f.readline().split(b",")[0].decode().strip()
+            f.seek(max(days[-1][1], offset - 4096))
+            tail = [line for line in f.read(offset - f.tell()).splitlines() if line.strip()]
+            index.last_timestamp = tail[-1].split(b",")[0].decode().strip()
+
+    return index
+
+
+def load_day_index(csv_path: str, rebuild: bool = False) -> DayIndex:
+    """
+    Load the sidecar day index, building and saving it if missing or stale.
+
+    Args:
+        csv_path: Path to the CSV file
+        rebuild: Force a rebuild
+
+    Returns:
+        DayIndex for the file
+    """
+    path = index_path(csv_path)
+    stat = os.stat(csv_path)
+
+    if not rebuild and os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            index = DayIndex(**data)
+            index.days = [tuple(day) for day in index.days]
+            if (index.version == INDEX_VERSION and index.size == stat.st_size
+                    and index.mtime_ns == stat.st_mtime_ns):
+                return index
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Rebuilding unreadable day index {path}: {e}")
+
+    index = build_day_index(csv_path)
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(asdict(index), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not save day index {path}: {e}")
+    return index
+
+
+def _parse_fixed_timestamps(chars: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Vectorized parse of fixed-width 'YYYY-MM-DD HH:MM:SS[.fff][Z|+HH:MM]' rows.
+
+    Args:
+        chars: (rows, width) uint8 matrix, one timestamp per row
+
+    Returns:
+        int64 UTC nanoseconds, or None if the layout is not supported
+    """
+    width = chars.shape[1]
+    first = chars[0]
+    if width < 19 or first[4] != 45 or first[7] != 45 or first[10] not in (32, 84) \
+            or first[13] != 58 or first[16] != 58:
+        return None
+    for col in (4, 7, 13, 16):
+        if not (chars[:, col] == first[col]).all():
+            return None
+
+    digits = chars.astype(np.int64) - 48
+    try:
+        days = chars[:, :10].copy().view("S10").ravel().astype("datetime64[D]").astype(np.int64)
+    except ValueError:
+        return None
+    seconds = (days * 86400
+               + (digits[:, 11] * 10 + digits[:, 12]) * 3600
+               + (digits[:, 14] * 10 + digits[:, 15]) * 60
+               + digits[:, 17] * 10 + digits[:, 18])
+    nanos = seconds * _NS_PER_SECOND
+
+    pos = 19
+    if pos < width and first[pos] == 46:  # fractional seconds
+        end = pos + 1
+        while end < width and 48 <= first[end] <= 57:
+            end += 1
+        fraction = digits[:, pos + 1:end]
+        if ((fraction < 0) | (fraction > 9)).any():
+            return None
+        scale = 10 ** (9 - np.arange(1, fraction.shape[1] + 1))
+        keep = scale >= 1
+        nanos += (fraction[:, keep] * scale[keep]).sum(axis=1)
+        pos = end
+
+    suffix = width - pos
+    if suffix == 0:
+        return nanos
+    if suffix == 1 and (chars[:, pos] == 90).all():  # 'Z'
+        return nanos
+    if suffix == 6 and (chars[:, pos + 3] == 58).all():  # +HH:MM / -HH:MM
+        sign = np.where(chars[:, pos] == 45, -1, 1)
+        if not np.isin(chars[:, pos], (43, 45)).all():
+            return None
+        offset = ((digits[:, pos + 1] * 10 + digits[:, pos + 2]) * 3600
+                  + (digits[:, pos + 4] * 10 + digits[:, pos + 5]) * 60)
+        return nanos - sign * offset * _NS_PER_SECOND
+    return None
+
+
+def datetime_to_ns(timestamp: datetime) -> int:
+    """
+    Convert a datetime to UTC nanoseconds (naive datetimes are treated as UTC).
+
+    Args:
+        timestamp: Datetime to convert
+
+    Returns:
+        Nanoseconds since the epoch
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    delta = timestamp - _EPOCH_UTC
+    return (delta.days * 86400 + delta.seconds) * _NS_PER_SECOND + delta.microseconds * 1000
+
+
+def parse_iso_timestamps(values: np.ndarray) -> np.ndarray:
+    """
+    Parse ISO-8601 timestamp strings to int64 UTC nanoseconds.
+    Naive timestamps are treated as UTC.
+
+    Args:
+        values: Array of bytes/str timestamps
+
+    Returns:
+        int64 array of nanoseconds since the epoch
+    """
+    values = np.asarray(values).astype("S")
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    values = np.char.strip(values)
+    lengths = np.char.str_len(values)
+    width = int(lengths.max())
+    if width > 0 and (lengths == width).all():
+        values = values.astype(f"S{width}")
+        parsed = _parse_fixed_timestamps(values.view(np.uint8).reshape(len(values), width))
+        if parsed is not None:
+            return parsed
+
+    # Mixed widths or unusual layout - parse row by row
+    return np.array(
+        [datetime_to_ns(datetime.fromisoformat(value.decode())) for value in values],
+        dtype=np.int64
+    )
+
+
+def _column_dtype(name: str) -> str:
+    return "i8" if name in INTEGER_COLUMNS else "f8"
+
+
+def _parse_csv_bytes(data: bytes, header: List[str], columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Parse CSV data rows (no header) into a structured array.
+
+    Args:
+        data: Raw CSV rows
+        header: Column names from the file header (first column is the timestamp)
+        columns: Numeric columns to load (default: all columns after the timestamp)
+
+    Returns:
+        Structured array with 'timestamp_ns' and one field per loaded column
+    """
+    if columns is None:
+        columns = header[1:]
+    dtype = np.dtype([("timestamp_ns", "i8")] + [(name, _column_dtype(name)) for name in columns])
+    if not data.strip():
+        return np.zeros(0, dtype=dtype)
+
+    raw = np.loadtxt(
+        io.StringIO(data.decode("utf-8")),
+        delimiter=",",
+        dtype=[("timestamp", "S40")] + [(name, _column_dtype(name)) for name in columns],
+        usecols=[0] + [header.index(name) for name in columns],
+        ndmin=1
+    )
+    result = np.empty(len(raw), dtype=dtype)
+    result["timestamp_ns"] = parse_iso_timestamps(raw["timestamp"])
+    for name in columns:
+        result[name] = raw[name]
+    return result
+
+
+def _day_bounds(start_ns: int, end_ns: int) -> Tuple[str, str]:
+    # One day of margin either side so timestamps written with a UTC offset are covered
+    first = datetime.fromtimestamp(start_ns // _NS_PER_SECOND, tz=timezone.utc) - timedelta(days=1)
+    last = datetime.fromtimestamp(end_ns // _NS_PER_SECOND, tz=timezone.utc) + timedelta(days=1)
+    return first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")
+
+
+def read_csv_range(csv_path: str, start_ns: Optional[int] = None, end_ns: Optional[int] = None,
+                   columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Read the rows of a CSV file whose timestamps fall in [start_ns, end_ns].
+
+    Only the days covering the range are read, using the sidecar day index.
+
+    Args:
+        csv_path: Path to the CSV file
+        start_ns: Inclusive start (UTC nanoseconds), None for the beginning
+        end_ns: Inclusive end (UTC nanoseconds), None for the end
+        columns: Numeric columns to load (default: all columns after the timestamp)
+
+    Returns:
+        Structured array with 'timestamp_ns' and one field per loaded column
+    """
+    index = load_day_index(csv_path)
+    if not index.days:
+        return _parse_csv_bytes(b"", index.columns, columns)
+    begin, finish = index.days[0][1], index.data_end
+    if index.is_sorted and start_ns is not None and end_ns is not None:
+        begin, finish = index.byte_range(*_day_bounds(start_ns, end_ns))
+
+    with open(csv_path, "rb") as f:
+        f.seek(begin)
+        data = f.read(finish - begin)
+
+    rows = _parse_csv_bytes(data, index.columns, columns)
+    return _filter_range(rows, start_ns, end_ns)
+
+
+def _filter_range(rows: np.ndarray, start_ns: Optional[int], end_ns: Optional[int]) -> np.ndarray:
+    timestamps = rows["timestamp_ns"]
+    if len(timestamps) > 1 and (np.diff(timestamps) >= 0).all():
+        lo = 0 if start_ns is None else int(np.searchsorted(timestamps, start_ns, side="left"))
+        hi = len(rows) if end_ns is None else int(np.searchsorted(timestamps, end_ns, side="right"))
+        return rows[lo:hi]
+    mask = np.ones(len(rows), dtype=bool)
+    if start_ns is not None:
+        mask &= timestamps >= start_ns
+    if end_ns is not None:
+        mask &= timestamps <= end_ns
+    return rows[mask]
+
+
+def convert_to_npy(csv_path: str) -> str:
+    """
+    Convert a CSV file to a NumPy structured array file next to it.
+
+    Rows are converted one indexed day at a time into a memory-mapped output,
+    so files larger than memory can be converted.
+
+    Args:
+        csv_path: Path to the CSV file
+
+    Returns:
+        Path of the written .npy file
+    """
+    index = load_day_index(csv_path)
+    dtype = np.dtype([("timestamp_ns", "i8")] + [(name, _column_dtype(name)) for name in index.columns[1:]])
+    path = npy_path(csv_path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    output = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(index.rows,))
+    written = 0
+    with open(csv_path, "rb") as f:
+        for i, (_, offset, _) in enumerate(index.days):
+            end = index.days[i + 1][1] if i + 1 < len(index.days) else index.data_end
+            f.seek(offset)
+            rows = _parse_csv_bytes(f.read(end - offset), index.columns)
+            output[written:written + len(rows)] = rows
+            written += len(rows)
+    output.flush()
+    del output
+
+    if not index.is_sorted:
+        data = np.load(tmp_path)
+        data = data[np.argsort(data["timestamp_ns"], kind="stable")]
+        with open(tmp_path, "wb") as f:
+            np.save(f, data)
+    os.replace(tmp_path, path)
+    logger.info(f"Converted {written:,} rows: {csv_path} -> {path}")
+    return path
+
+
+def load_columns(csv_path: str, start_ns: Optional[int] = None, end_ns: Optional[int] = None,
+                 columns: Optional[List[str]] = None) -> np.ndarray:
+    """
+    Load rows in [start_ns, end_ns] as typed columns.
+
+    Uses the .npy copy when it is at least as new as the CSV (memory-mapped,
+    binary search for the range), otherwise the indexed CSV reader.
+
+    Args:
+        csv_path: Path to the CSV file
+        start_ns: Inclusive start (UTC nanoseconds), None for the beginning
+        end_ns: Inclusive end (UTC nanoseconds), None for the end
+        columns: Numeric columns to load (default: all columns after the timestamp)
+
+    Returns:
+        Structured array with 'timestamp_ns' and one field per loaded column
+    """
+    rows = _open_npy(csv_path, columns)
+    if rows is not None:
+        return _select_columns(_filter_range(rows, start_ns, end_ns), columns)
+    return read_csv_range(csv_path, start_ns, end_ns, columns)
+
+
+def _open_npy(csv_path: str, columns: Optional[List[str]]) -> Optional[np.ndarray]:
+    """Memory-map the .npy copy if it is up to date and has the requested columns."""
+    binary_path = npy_path(csv_path)
+    if not os.path.exists(binary_path) or os.path.getmtime(binary_path) < os.path.getmtime(csv_path):
+        return None
+    try:
+        rows = np.load(binary_path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable {binary_path}: {e}")
+        return None
+    if columns is not None and not all(name in rows.dtype.names for name in columns):
+        return None
+    return rows
+
+
+def _select_columns(rows: np.ndarray, columns: Optional[List[str]]) -> np.ndarray:
+    """Copy the timestamp and requested columns into a new in-memory array."""
+    names = ["timestamp_ns"] + list(columns if columns is not None else rows.dtype.names[1:])
+    result = np.empty(len(rows), dtype=[(name, rows.dtype[name]) for name in names])
+    for name in names:
+        result[name] = rows[name]
+    return result
+
+
+def iter_column_chunks(csv_path: str, start_ns: Optional[int] = None, end_ns: Optional[int] = None,
+                       columns: Optional[List[str]] = None) -> Iterator[np.ndarray]:
+    """
+    Stream rows in [start_ns, end_ns] as a sequence of typed column chunks.
+
+    Only one chunk (at most INDEX_CHUNK_BYTES of CSV or STREAM_CHUNK_ROWS rows
+    of .npy) is held in memory at a time, so files of any size can be replayed.
+
+    Args:
+        csv_path: Path to the CSV file
+        start_ns: Inclusive start (UTC nanoseconds), None for the beginning
+        end_ns: Inclusive end (UTC nanoseconds), None for the end
+        columns: Numeric columns to load (default: all columns after the timestamp)
+
+    Yields:
+        Structured arrays with 'timestamp_ns' and one field per loaded column, in file order
+    """
+    rows = _open_npy(csv_path, columns)
+    if rows is not None:
+        lo = 0 if start_ns is None else int(np.searchsorted(rows["timestamp_ns"], start_ns, side="left"))
+        hi = len(rows) if end_ns is None else int(np.searchsorted(rows["timestamp_ns"], end_ns, side="right"))
+        for chunk_start in range(lo, hi, STREAM_CHUNK_ROWS):
+            yield _select_columns(rows[chunk_start:min(chunk_start + STREAM_CHUNK_ROWS, hi)], columns)
+        return
+
+    index = load_day_index(csv_path)
+    if not index.days:
+        return
+    begin, finish = index.days[0][1], index.data_end
+    if index.is_sorted and start_ns is not None and end_ns is not None:
+        begin, finish = index.byte_range(*_day_bounds(start_ns, end_ns))
+
+    with open(csv_path, "rb") as f:
+        f.seek(begin)
+        remaining = finish - begin
+        pending = b""
+        while remaining > 0 or pending:
+            data = pending + f.read(min(INDEX_CHUNK_BYTES, remaining))
+            remaining = finish - f.tell()
+            cut = len(data) if remaining <= 0 else data.rfind(b"\n") + 1
+            if cut == 0:
+                pending = data
+                continue
+            pending = data[cut:]
+            chunk = _filter_range(_parse_csv_bytes(data[:cut], index.columns, columns), start_ns, end_ns)
+            if len(chunk):
+                yield chunk
+
+
+def to_datetimes(timestamps_ns: np.ndarray, tz: Any = pytz.UTC) -> List[datetime]:
+    """
+    Convert UTC nanosecond timestamps to timezone-aware datetimes.
+
+    The timezone conversion is done once per minute and reused for the rows in
+    that minute (UTC offsets only change on whole minutes).
+
+    Args:
+        timestamps_ns: int64 UTC nanoseconds
+        tz: Target timezone (pytz)
+
+    Returns:
+        List of datetimes in tz (microsecond precision)
+    """
+    result = []
+    anchor_minute = None
+    for micros in (np.asarray(timestamps_ns) // 1000).tolist():
+        minute = micros // 60_000_000
+        if minute != anchor_minute:
+            anchor_minute = minute
+            anchor_micros = minute * 60_000_000
+            anchor = (_EPOCH_UTC + timedelta(microseconds=anchor_micros)).astimezone(tz)
+        result.append(anchor + timedelta(microseconds=micros - anchor_micros))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index or convert historical CSV data for fast loading")
+    parser.add_argument("csv_files", nargs="+", help="Historical CSV files")
+    parser.add_argument("--npy", action="store_true", help="Also write a .npy binary copy")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the day index even if up to date")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for csv_path in args.csv_files:
+        index = load_day_index(csv_path, rebuild=args.rebuild)
+        print(f"{csv_path}: {index.rows:,} rows, {len(index.days)} days "
+              f"({index.first_timestamp} to {index.last_timestamp})")
+        if args.npy:
+            print(f"  -> {convert_to_npy(csv_path)}")
+
+
+if __name__ == "__main__":
+    main()
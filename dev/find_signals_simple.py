@@ -5,16 +5,21 @@ Uses minimal dependencies to avoid import errors.
 """
 
 import csv
+import os
+import sys
 from datetime import datetime
 from collections import deque
 
-# Configuration from capitulation_detector.py
-MIN_FLUSH_TICKS = 8
-MIN_VELOCITY = 1.5
-FLUSH_LOOKBACK_BARS = 7
-NEAR_EXTREME_TICKS = 12
-VOLUME_SPIKE_THRESHOLD = 1.2
-RSI_OVERSOLD_EXTREME = 45
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from capitulation_detector import CapitulationDetector
+
+# Configuration from capitulation_detector.py (single source of truth)
+MIN_FLUSH_TICKS = CapitulationDetector.MIN_FLUSH_TICKS
+MIN_VELOCITY = CapitulationDetector.MIN_VELOCITY_TICKS_PER_BAR
+FLUSH_LOOKBACK_BARS = CapitulationDetector.FLUSH_LOOKBACK_BARS
+NEAR_EXTREME_TICKS = CapitulationDetector.NEAR_EXTREME_TICKS
+VOLUME_SPIKE_THRESHOLD = CapitulationDetector.VOLUME_SPIKE_THRESHOLD
+RSI_OVERSOLD_EXTREME = CapitulationDetector.RSI_OVERSOLD_EXTREME
 TICK_SIZE = 0.25
 
 # Load data
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Capitulation Parameter Sweep - Grid Search Over CapitulationDetector Thresholds
+
+Evaluates many CapitulationDetector configurations against the same
+historical bars without replaying the full trading engine for each one.
+
+How it works:
+1. One pass over the bars computes every per-bar input the 9 entry conditions
+   need (RSI, session VWAP, 20-bar average volume, regime, and the rolling
+   high/low for each flush lookback in the grid) using the engine's own
+   indicator classes. This feature matrix is shared by all configurations.
+2. Each configuration turns the matrix into long/short signal masks with
+   vectorized threshold comparisons, then simulates one position at a time:
+   stop beyond the flush extreme, breakeven, trailing stop and time stop.
+3. Configurations are evaluated in parallel worker processes and returned as
+   a ranked table.
+
+The simulation only models the detector's conditions and trade management.
+Engine-level gates (trading hours, daily limits, RL confidence, max stop loss)
+are not applied, so confirm the best configurations with a full backtest.
+
+Usage:
+    python dev/parameter_sweep.py --start 2025-11-03 --end 2025-11-28 \\
+        --grid MIN_FLUSH_TICKS=6,8,10,12 --grid RSI_OVERSOLD_EXTREME=35,40,45
+    python dev/parameter_sweep.py --days 30 --grid-file sweep.json --top 20 --output sweep.csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import pytz
+
+# Add parent directory to path to import from src/
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+# Import backtesting framework from dev
+from backtesting import BacktestConfig, HistoricalDataLoader
+
+# Import production bot modules
+from config import load_config
+from capitulation_detector import CapitulationDetector
+from indicator_engine import IndicatorEngine, SessionVWAP
+from regime_detection import StreamingRegimeDetector
+
+
+# Columns used to rank configurations
+RANK_COLUMNS = ('total_pnl', 'profit_factor', 'win_rate', 'avg_pnl', 'trades')
+
+# Engine requirements before any signal check (check_*_signal_conditions / detect_regime)
+MIN_SIGNAL_BARS = 10
+MIN_REGIME_BARS = 114
+
+
+@dataclass
+class FeatureMatrix:
+    """Per-bar inputs to the capitulation conditions (all arrays have one entry per bar)"""
+    tick_size: float
+    tick_value: float
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    rsi: np.ndarray  # NaN until available
+    vwap: np.ndarray  # NaN until the session has volume
+    avg_volume_20: np.ndarray
+    regime_ok: np.ndarray  # Condition 9
+    bar_index: np.ndarray  # Position of each bar in the replay (for warm-up checks)
+    range_high: Dict[int, np.ndarray] = field(default_factory=dict)  # lookback -> rolling max high
+    range_low: Dict[int, np.ndarray] = field(default_factory=dict)  # lookback -> rolling min low
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+def build_feature_matrix(bars: List[Dict[str, Any]], bot_config: Dict[str, Any],
+                         lookbacks: List[int]) -> FeatureMatrix:
+    """
+    Compute the shared per-bar feature matrix.
+
+    Mirrors how the engine feeds CapitulationDetector: Wilder RSI and ATR from
+    IndicatorEngine, session VWAP reset at 6 PM ET, 20-bar average volume
+    including the current bar, and the regime from StreamingRegimeDetector.
+
+    Args:
+        bars: 1-minute bars in chronological order
+        bot_config: Bot configuration dict (tick size/value, indicator periods)
+        lookbacks: Flush lookback lengths to precompute rolling high/low for
+
+    Returns:
+        FeatureMatrix for the bars
+    """
+    count = len(bars)
+    atr_period = bot_config.get('atr_period', 14)
+    indicators = IndicatorEngine(
+        rsi_period=bot_config.get('rsi_period', 10),
+        atr_period=atr_period,
+        volume_lookback=bot_config.get('volume_lookback', 20)
+    )
+    vwap_session = SessionVWAP()
+    regime_detector = StreamingRegimeDetector(atr_period)
+    eastern_tz = pytz.timezone("US/Eastern")
+    reset_time = datetime.strptime("18:00", "%H:%M").time()
+
+    rsi = np.full(count, np.nan)
+    vwap = np.full(count, np.nan)
+    regime_ok = np.zeros(count, dtype=bool)
+    trading_day = None
+
+    for i, bar in enumerate(bars):
+        # Daily reset / new VWAP session (same rule as check_daily_reset)
+        timestamp_eastern = bar['timestamp'].astimezone(eastern_tz)
+        current_date = timestamp_eastern.date()
+        if trading_day is None:
+            trading_day = current_date
+        elif trading_day != current_date and timestamp_eastern.time() >= reset_time:
+            trading_day = current_date
+            vwap_session.reset(session=current_date)
+
+        indicators.update(bar)
+        regime_detector.update(bar)
+        vwap_session.update(bar)
+
+        if indicators.rsi is not None:
+            rsi[i] = indicators.rsi
+        if vwap_session.vwap is not None:
+            vwap[i] = vwap_session.vwap
+
+        regime = "NORMAL"
+        if regime_detector.bar_count >= MIN_REGIME_BARS and indicators.atr is not None:
+            regime = regime_detector.detect_regime(indicators.atr).name
+        regime_ok[i] = regime in CapitulationDetector.TRADEABLE_REGIMES
+
+    high = np.array([bar['high'] for bar in bars], dtype=np.float64)
+    low = np.array([bar['low'] for bar in bars], dtype=np.float64)
+    volume = np.array([bar['volume'] for bar in bars], dtype=np.float64)
+
+    matrix = FeatureMatrix(
+        tick_size=bot_config.get('tick_size', 0.25),
+        tick_value=bot_config.get('tick_value', 12.50),
+        open=np.array([bar['open'] for bar in bars], dtype=np.float64),
+        high=high,
+        low=low,
+        close=np.array([bar['close'] for bar in bars], dtype=np.float64),
+        volume=volume,
+        rsi=rsi,
+        vwap=vwap,
+        avg_volume_20=_trailing_mean(volume, 20),
+        regime_ok=regime_ok,
+        bar_index=np.arange(count)
+    )
+    for lookback in sorted(set(int(lb) for lb in lookbacks)):
+        matrix.range_high[lookback] = _rolling_extreme(high, lookback, np.max)
+        matrix.range_low[lookback] = _rolling_extreme(low, lookback, np.min)
+    return matrix
+
+
+def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` values including the current one (fewer at the start)"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reducer: Any) -> np.ndarray:
+    """Rolling max/min over the last `window` values (NaN until the window is full)"""
+    result = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    result[window - 1:] = reducer(windows, axis=1)
+    return result
+
+
+def signal_masks(features: FeatureMatrix, params: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate the 9 long and short conditions for every bar.
+
+    Args:
+        features: Shared feature matrix
+        params: Complete CapitulationDetector parameter set
+
+    Returns:
+        Tuple of (long_mask, short_mask) boolean arrays
+    """
+    tick_size = features.tick_size
+    lookback = int(params['FLUSH_LOOKBACK_BARS'])
+    highest_high = features.range_high[lookback]
+    lowest_low = features.range_low[lookback]
+
+    with np.errstate(invalid='ignore'):
+        flush_range_ticks = (highest_high - lowest_low) / tick_size
+        velocity = flush_range_ticks / lookback
+        ready = (features.bar_index >= max(MIN_SIGNAL_BARS, lookback) - 1) & ~np.isnan(features.vwap)
+        flush_ok = (flush_range_ticks >= params['MIN_FLUSH_TICKS']) & (velocity >= params['MIN_VELOCITY_TICKS_PER_BAR'])
+        volume_ok = features.volume >= features.avg_volume_20 * params['VOLUME_SPIKE_THRESHOLD']
+        base = ready & flush_ok & volume_ok & features.regime_ok
+
+        prev_low = np.concatenate(([np.inf], features.low[:-1]))
+        prev_high = np.concatenate(([-np.inf], features.high[:-1]))
+
+        long_mask = (
+            base
+            & ((features.close - lowest_low) / tick_size <= params['NEAR_EXTREME_TICKS'])
+            & (features.rsi < params['RSI_OVERSOLD_EXTREME'])
+            & (features.low >= prev_low)
+            & (features.close > features.open)
+            & (features.close < features.vwap)
+        )
+        short_mask = (
+            base
+            & ((highest_high - features.close) / tick_size <= params['NEAR_EXTREME_TICKS'])
+            & (features.rsi > params['RSI_OVERBOUGHT_EXTREME'])
+            & (features.high <= prev_high)
+            & (features.close < features.open)
+            & (features.close > features.vwap)
+        )
+    return long_mask, short_mask
+
+
+def simulate_trades(features: FeatureMatrix, params: Dict[str, float],
+                    commission_per_contract: float = 2.50) -> List[Dict[str, Any]]:
+    """
+    Simulate one position at a time from the signal masks.
+
+    Entry at the signal bar close; stop STOP_BUFFER_TICKS beyond the flush
+    extreme; breakeven, then trailing once in profit; time stop after
+    MAX_HOLD_BARS. Each bar first checks the stop from the previous bar, then
+    updates breakeven/trailing from its high/low (conservative ordering).
+
+    Args:
+        features: Shared feature matrix
+        params: Complete CapitulationDetector parameter set
+        commission_per_contract: Round-trip commission per trade
+
+    Returns:
+        List of trade dicts (index, side, entry, exit, ticks, pnl, reason)
+    """
+    long_mask, short_mask = signal_masks(features, params)
+    signals = np.flatnonzero(long_mask | short_mask)
+
+    tick_size = features.tick_size
+    lookback = int(params['FLUSH_LOOKBACK_BARS'])
+    stop_buffer = params['STOP_BUFFER_TICKS'] * tick_size
+    breakeven_trigger = params['BREAKEVEN_TRIGGER_TICKS'] * tick_size
+    breakeven_offset = params['BREAKEVEN_OFFSET_TICKS'] * tick_size
+    trailing_trigger = params['TRAILING_TRIGGER_TICKS'] * tick_size
+    trailing_distance = params['TRAILING_DISTANCE_TICKS'] * tick_size
+    max_hold = int(params['MAX_HOLD_BARS'])
+
+    highs, lows, closes = features.high, features.low, features.close
+    last_bar = len(features) - 1
+    trades = []
+    next_free = 0
+
+    for i in signals:
+        if i < next_free or i >= last_bar:
+            continue
+        is_long = bool(long_mask[i])
+        entry = closes[i]
+        if is_long:
+            stop = features.range_low[lookback][i] - stop_buffer
+            peak = entry
+        else:
+            stop = features.range_high[lookback][i] + stop_buffer
+            peak = entry
+        breakeven = False
+        exit_price = None
+        reason = 'time_stop'
+        j = i
+
+        for j in range(i + 1, min(i + max_hold, last_bar) + 1):
+            if is_long:
+                if lows[j] <= stop:
+                    exit_price, reason = stop, ('trailing_stop' if breakeven and stop > entry + breakeven_offset else 'stop_loss')
+                    break
+                peak = max(peak, highs[j])
+                profit = peak - entry
+                if not breakeven and profit >= breakeven_trigger:
+                    breakeven = True
+                    stop = max(stop, entry + breakeven_offset)
+                if breakeven and profit >= trailing_trigger:
+                    stop = max(stop, peak - trailing_distance)
+            else:
+                if highs[j] >= stop:
+                    exit_price, reason = stop, ('trailing_stop' if breakeven and stop < entry - breakeven_offset else 'stop_loss')
+                    break
+                peak = min(peak, lows[j])
+                profit = entry - peak
+                if not breakeven and profit >= breakeven_trigger:
+                    breakeven = True
+                    stop = min(stop, entry - breakeven_offset)
+                if breakeven and profit >= trailing_trigger:
+                    stop = min(stop, peak + trailing_distance)
+
+        if exit_price is None:
+            exit_price = closes[j]
+        ticks = ((exit_price - entry) if is_long else (entry - exit_price)) / tick_size
+        trades.append({
+            'index': int(i),
+            'side': 'long' if is_long else 'short',
+            'entry_price': float(entry),
+            'exit_price': float(exit_price),
+            'ticks': float(ticks),
+            'pnl': float(ticks * features.tick_value - commission_per_contract),
+            'reason': reason,
+            'bars_held': int(j - i)
+        })
+        next_free = j + 1
+    return trades
+
+
+def summarize_trades(trades: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Aggregate simulated trades into sweep metrics.
+
+    Args:
+        trades: Output of simulate_trades
+
+    Returns:
+        Dict with trades, win_rate, total_pnl, avg_pnl, profit_factor, max_drawdown
+    """
+    if not trades:
+        return {'trades': 0, 'win_rate': 0.0, 'total_pnl': 0.0, 'avg_pnl': 0.0,
+                'profit_factor': 0.0, 'max_drawdown': 0.0}
+
+    pnl = np.array([trade['pnl'] for trade in trades])
+    gross_profit = pnl[pnl > 0].sum()
+    gross_loss = -pnl[pnl < 0].sum()
+    equity = np.cumsum(pnl)
+    drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity
+
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = float('inf') if gross_profit > 0 else 0.0
+
+    return {
+        'trades': len(trades),
+        'win_rate': float((pnl > 0).mean() * 100),
+        'total_pnl': float(pnl.sum()),
+        'avg_pnl': float(pnl.mean()),
+        'profit_factor': float(profit_factor),
+        'max_drawdown': float(drawdown.max())
+    }
+
+
+def expand_grid(grid: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """
+    Expand a parameter grid into complete parameter sets.
+
+    Args:
+        grid: Parameter name -> list of values (unlisted parameters keep their defaults)
+
+    Returns:
+        List of parameter dicts in deterministic (itertools.product) order
+    """
+    defaults = CapitulationDetector.default_parameters()
+    for name in grid:
+        if name not in defaults:
+            raise ValueError(f"Unknown capitulation parameter: {name}")
+
+    names = sorted(grid)
+    configs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(defaults)
+        params.update(zip(names, values))
+        configs.append(params)
+    return configs
+
+
+# Feature matrix for worker processes (set once per worker by _init_worker)
+_worker_features: Optional[FeatureMatrix] = None
+
+
+def _init_worker(features: FeatureMatrix) -> None:
+    global _worker_features
+    _worker_features = features
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, Dict[str, float]]]) -> List[Dict[str, Any]]:
+    results = []
+    for config_id, params in chunk:
+        row = {'config_id': config_id, **params}
+        row.update(summarize_trades(simulate_trades(_worker_features, params)))
+        results.append(row)
+    return results
+
+
+def run_sweep(features: FeatureMatrix, grid: Dict[str, List[float]], workers: Optional[int] = None,
+              rank_by: str = 'total_pnl', min_trades: int = 1) -> List[Dict[str, Any]]:
+    """
+    Evaluate every configuration in the grid and rank the results.
+
+    Args:
+        features: Shared feature matrix (must include every FLUSH_LOOKBACK_BARS in the grid)
+        grid: Parameter name -> list of values
+        workers: Worker processes (default: one per CPU; 1 = run in this process)
+        rank_by: Metric to sort by (descending), one of RANK_COLUMNS
+        min_trades: Configurations with fewer trades are ranked last
+
+    Returns:
+        One result row per configuration (parameters + metrics), best first
+    """
+    if rank_by not in RANK_COLUMNS:
+        raise ValueError(f"rank_by must be one of {RANK_COLUMNS}")
+
+    configs = list(enumerate(expand_grid(grid)))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(configs) == 1:
+        _init_worker(features)
+        rows = _evaluate_chunk(configs)
+    else:
+        # A few chunks per worker keeps them busy without per-config overhead
+        chunk_size = max(1, len(configs) // (workers * 4))
+        chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(features,)) as executor:
+            rows = [row for chunk_rows in executor.map(_evaluate_chunk, chunks) for row in chunk_rows]
+
+    rows.sort(key=lambda row: (row['trades'] < min_trades, -row[rank_by], row['config_id']))
+    return rows
+
+
+def format_results_table(rows: List[Dict[str, Any]], grid: Dict[str, List[float]], top: int = 10) -> str:
+    """
+    Format the best rows as a text table (swept parameters + metrics).
+
+    Args:
+        rows: Ranked rows from run_sweep
+        grid: The swept grid (its parameters are shown as columns)
+        top: Number of rows to show
+
+    Returns:
+        Table as a string
+    """
+    param_columns = sorted(grid)
+    metric_columns = ['trades', 'win_rate', 'total_pnl', 'avg_pnl', 'profit_factor', 'max_drawdown']
+    header = ['#'] + param_columns + metric_columns
+    lines = []
+    for rank, row in enumerate(rows[:top], start=1):
+        cells = [str(rank)]
+        cells += [f"{row[name]:g}" for name in param_columns]
+        cells += [
+            str(row['trades']),
+            f"{row['win_rate']:.1f}%",
+            f"${row['total_pnl']:+,.2f}",
+            f"${row['avg_pnl']:+,.2f}",
+            f"{row['profit_factor']:.2f}",
+            f"${row['max_drawdown']:,.2f}"
+        ]
+        lines.append(cells)
+
+    widths = [max(len(header[c]), *(len(line[c]) for line in lines)) if lines else len(header[c])
+              for c in range(len(header))]
+    output = ["  ".join(header[c].rjust(widths[c]) for c in range(len(header)))]
+    output.append("  ".join("-" * width for width in widths))
+    output += ["  ".join(line[c].rjust(widths[c]) for c in range(len(header))) for line in lines]
+    return "\n".join(output)
+
+
+def _parse_value(text: str) -> float:
+    value = float(text)
+    return int(value) if value.is_integer() and '.' not in text else value
+
+
+def parse_grid(grid_args: List[str], grid_file: Optional[str]) -> Dict[str, List[float]]:
+    """
+    Build the grid from --grid NAME=v1,v2,... arguments and/or a JSON file.
+
+    Args:
+        grid_args: List of "NAME=v1,v2,..." strings
+        grid_file: Optional JSON file mapping names to value lists
+
+    Returns:
+        Parameter name -> list of values
+    """
+    grid: Dict[str, List[float]] = {}
+    if grid_file:
+        with open(grid_file, 'r') as f:
+            grid.update({name: list(values) for name, values in json.load(f).items()})
+    for arg in grid_args or []:
+        name, _, values = arg.partition('=')
+        if not values:
+            raise ValueError(f"Invalid --grid entry (expected NAME=v1,v2,...): {arg}")
+        grid[name.strip()] = [_parse_value(value.strip()) for value in values.split(',')]
+    return grid
+
+
+def parse_arguments():
+    """Parse command-line arguments for the parameter sweep"""
+    parser = argparse.ArgumentParser(
+        description='Grid search over CapitulationDetector thresholds',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"Tunable parameters: {', '.join(CapitulationDetector.TUNABLE_PARAMETERS)}"
+    )
+    parser.add_argument('--start', type=str, help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, help='End date (YYYY-MM-DD)')
+    parser.add_argument('--days', type=int, help='Last N days (alternative to --start/--end)')
+    parser.add_argument('--symbol', type=str, help='Override trading symbol (default: from config)')
+    parser.add_argument('--data-path', type=str, default=None,
+                        help='Path to historical data directory (default: <project_root>/data/historical_data)')
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=V1,V2,...',
+                        help='Values to sweep for one parameter (repeatable)')
+    parser.add_argument('--grid-file', type=str, help='JSON file with {"NAME": [values, ...]}')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--rank-by', choices=RANK_COLUMNS, default='total_pnl', help='Ranking metric')
+    parser.add_argument('--min-trades', type=int, default=5, help='Rank configs with fewer trades last')
+    parser.add_argument('--top', type=int, default=10, help='Rows to print')
+    parser.add_argument('--output', type=str, help='Write all ranked rows to this CSV file')
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point for the parameter sweep"""
+    args = parse_arguments()
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    logging.getLogger('regime_detection').setLevel(logging.WARNING)
+
+    grid = parse_grid(args.grid, args.grid_file)
+    if not grid:
+        print("No parameters to sweep - pass --grid NAME=v1,v2,... or --grid-file")
+        sys.exit(1)
+
+    bot_config = load_config(backtest_mode=True)
+    if args.symbol:
+        bot_config.instrument = args.symbol
+    symbol = bot_config.instrument
+    data_path = args.data_path if args.data_path else os.path.join(PROJECT_ROOT, "data/historical_data")
+
+    if args.start and args.end:
+        start_date = datetime.strptime(args.start, '%Y-%m-%d')
+        end_date = datetime.strptime(args.end, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+    else:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=args.days or 30)
+
+    loader = HistoricalDataLoader(BacktestConfig(
+        start_date=start_date, end_date=end_date, symbols=[symbol], data_path=data_path
+    ))
+    bars = loader.load_bar_data(symbol, "1min")
+    if not bars:
+        print(f"No bars for {symbol} between {start_date} and {end_date}")
+        sys.exit(1)
+
+    lookbacks = grid.get('FLUSH_LOOKBACK_BARS', [CapitulationDetector.FLUSH_LOOKBACK_BARS])
+    features = build_feature_matrix(bars, bot_config.to_dict(), lookbacks)
+    configs = len(expand_grid(grid))
+    print(f"{symbol}: {len(bars):,} bars, {configs:,} configurations")
+
+    rows = run_sweep(features, grid, workers=args.workers, rank_by=args.rank_by, min_trades=args.min_trades)
+    print(format_results_table(rows, grid, top=args.top))
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Saved {len(rows):,} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
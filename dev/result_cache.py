@@ -0,0 +1,182 @@
+"""
+Backtest Result Cache
+=====================
+Content-addressed store for seeded (deterministic) backtest results:
+
+    data/backtest_cache/<key>.json
+
+The key hashes every input that can change a seeded backtest's outcome:
+the market data files, the RL experiences the run starts from (the JSON file
+and its columnar store directory), the bot configuration, the backtest
+settings, the seed and the code version (a hash of the src/ and dev/ Python
+sources). Rerunning an identical configuration returns the stored result
+without replaying; changing any input produces a new key, so stale entries
+are never returned. A cache hit does not replay, so it adds no RL
+experiences - the starting experiences are part of the key, so any run that
+learned something changes the key for the next one.
+
+Only the hash of the inputs is stored, never the inputs themselves (the bot
+configuration can contain credentials).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from feature_cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# Bump when the stored result layout changes
+RESULT_CACHE_VERSION = 1
+
+# Source trees whose contents define the code version
+CODE_DIRS = ("src", "dev")
+
+_code_version: Optional[str] = None
+
+
+def code_version(project_root: str = PROJECT_ROOT) -> str:
+    """
+    Hash of all Python sources that take part in a backtest (computed once per process).
+
+    Args:
+        project_root: Repository root
+
+    Returns:
+        Hex digest
+    """
+    global _code_version
+    if _code_version is not None:
+        return _code_version
+
+    digest = hashlib.sha256()
+    for code_dir in CODE_DIRS:
+        base = os.path.join(project_root, code_dir)
+        for root, dirs, files in os.walk(base):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            for name in sorted(files):
+                if not name.endswith(".py"):
+                    continue
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, project_root).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    _code_version = digest.hexdigest()
+    return _code_version
+
+
+def path_digest(path: str) -> Optional[str]:
+    """
+    SHA-256 of a file, or of every file under a directory (names and contents).
+
+    Args:
+        path: File or directory
+
+    Returns:
+        Hex digest, or None if the path does not exist
+    """
+    if os.path.isfile(path):
+        return file_digest(path)
+    if not os.path.isdir(path):
+        return None
+
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, path).encode())
+            digest.update(file_digest(file_path).encode())
+    return digest.hexdigest()
+
+
+def result_cache_key(data_files: Iterable[str], config: Dict[str, Any],
+                     settings: Dict[str, Any], seed: int) -> str:
+    """
+    Cache key for a backtest run.
+
+    Args:
+        data_files: Files and directories the run reads (market data, starting
+                    experience file and store); missing paths are keyed as absent
+        config: Bot configuration dict
+        settings: Backtest settings (date range, symbol, replay mode, ...)
+        seed: Random seed the run is replayed with
+
+    Returns:
+        Hex key
+    """
+    files = {}
+    for path in data_files:
+        files[os.path.basename(path)] = path_digest(path)
+
+    key_data = {
+        "version": RESULT_CACHE_VERSION,
+        "code": code_version(),
+        "files": files,
+        "config": config,
+        "settings": settings,
+        "seed": seed,
+    }
+    encoded = json.dumps(key_data, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return value
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+def load_cached_result(cache_dir: str, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a stored result.
+
+    Args:
+        cache_dir: Cache directory
+        key: result_cache_key()
+
+    Returns:
+        Stored result dict, or None on a miss or unreadable entry
+    """
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f, object_hook=_decode)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable result cache entry {path}: {e}")
+        return None
+
+
+def save_cached_result(cache_dir: str, key: str, result: Dict[str, Any]) -> None:
+    """
+    Store a result (datetimes are preserved, including their UTC offset).
+
+    Args:
+        cache_dir: Cache directory
+        key: result_cache_key()
+        result: JSON-compatible dict (datetimes allowed)
+    """
+    path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f, default=_encode)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not save result cache entry {path}: {e}")
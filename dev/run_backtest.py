@@ -18,7 +18,8 @@ import sys
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import asdict
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from types import ModuleType
 import pytz
 
@@ -36,11 +37,16 @@ sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 # Import backtesting framework from dev
 from backtesting import BacktestConfig, BacktestEngine, ReportGenerator
 from backtest_reporter import reset_reporter, get_reporter
+from columnar_loader import load_day_index
 
 # Import production bot modules
+import diagnostics
 from config import load_config
 from monitoring import setup_logging
 from signal_confidence import SignalConfidenceRL
+from experience_store import store_path_for
+from feature_cache import load_or_build_feature_cache
+from result_cache import load_cached_result, result_cache_key, save_cached_result
 
 
 def parse_arguments():
@@ -59,6 +65,15 @@ Examples:
   # Run backtest with tick-by-tick replay (requires tick data)
   python dev/run_backtest.py --days 7 --use-tick-data
   
+  # Fill stops/entries on the intrabar price path instead of the bar close
+  python dev/run_backtest.py --days 7 --intrabar-fills
+  
+  # Reproducible run (identical reruns return the cached result)
+  python dev/run_backtest.py --days 7 --seed 42
+  
+  # Skip per-bar signal diagnostics (faster; trade summary is unchanged)
+  python dev/run_backtest.py --days 30 --quiet
+  
   # Save backtest report to file
   python dev/run_backtest.py --days 30 --report backtest_results.txt
 
@@ -104,6 +119,36 @@ Note: All trading parameters (account_size, max_contracts, rl_exploration_rate,
         help='Use tick-by-tick replay instead of bar-by-bar (requires tick data files)'
     )
     
+    parser.add_argument(
+        '--intrabar-fills',
+        action='store_true',
+        help='Fill entries/exits on the intrabar price path (stops at the tick they trigger) instead of bot prices / bar close'
+    )
+    
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed RL exploration for a reproducible run (enables the result cache)'
+    )
+    
+    parser.add_argument(
+        '--no-result-cache',
+        action='store_true',
+        help='Always replay seeded runs instead of returning a stored result from data/backtest_cache'
+    )
+    
+    parser.add_argument(
+        '--no-feature-cache',
+        action='store_true',
+        help='Recompute indicators and regimes for every bar instead of using data/feature_cache'
+    )
+    
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Skip per-bar signal diagnostics (condition dumps, RL decision prints) before they are formatted'
+    )
+    
     parser.add_argument(
         '--symbol',
         type=str,
@@ -232,19 +277,16 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
         csv_path = os.path.join(data_path, f"{symbol}_1min.csv")
         
         if os.path.exists(csv_path):
-            # Read last line to get actual end date from data
-            with open(csv_path, 'r') as f:
-                lines = f.readlines()
-                if len(lines) > 1:  # Skip header
-                    last_line = lines[-1]
-                    last_timestamp = last_line.split(',')[0]
-                    # Handle timezone-aware timestamp format (e.g., "2025-11-27 18:00:00+00:00")
-                    if '+' in last_timestamp:
-                        last_timestamp = last_timestamp.split('+')[0]  # Remove timezone offset
-                    end_date = datetime.strptime(last_timestamp, '%Y-%m-%d %H:%M:%S')
-                    end_date = tz.localize(end_date.replace(hour=23, minute=59, second=59))
-                else:
-                    end_date = datetime.now(tz)
+            # Last timestamp comes from the sidecar day index (no full read of the CSV)
+            last_timestamp = load_day_index(csv_path).last_timestamp
+            if last_timestamp:
+                # Handle timezone-aware timestamp format (e.g., "2025-11-27 18:00:00+00:00")
+                if '+' in last_timestamp:
+                    last_timestamp = last_timestamp.split('+')[0]  # Remove timezone offset
+                end_date = datetime.strptime(last_timestamp, '%Y-%m-%d %H:%M:%S')
+                end_date = tz.localize(end_date.replace(hour=23, minute=59, second=59))
+            else:
+                end_date = datetime.now(tz)
         else:
             end_date = datetime.now(tz)
         
@@ -271,9 +313,37 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
         initial_equity=bot_config.account_size,
         symbols=[symbol],
         data_path=data_path,
-        use_tick_data=args.use_tick_data
+        use_tick_data=args.use_tick_data,
+        intrabar_fills=args.intrabar_fills
     )
     
+    # Seeded runs are deterministic - identical inputs return the stored result
+    result_cache_dir = os.path.join(PROJECT_ROOT, "data/backtest_cache")
+    result_key = None
+    if args.seed is not None and not args.no_result_cache:
+        experience_file = os.path.join(PROJECT_ROOT, f"experiences/{symbol}/signal_experience.json")
+        data_files = [
+            os.path.join(data_path, f"{symbol}_1min.csv"),
+            experience_file,
+            store_path_for(experience_file)  # The RL brain loads (and autosaves to) the columnar store
+        ]
+        if args.use_tick_data:
+            data_files += [os.path.join(data_path, f"{symbol}_ticks_enhanced.csv"),
+                           os.path.join(data_path, f"{symbol}_ticks.csv")]
+        settings = {k: v for k, v in asdict(backtest_config).items() if k != 'data_path'}
+        result_key = result_cache_key(data_files, bot_config_dict, settings, args.seed)
+        
+        cached = load_cached_result(result_cache_dir, result_key)
+        if cached is not None:
+            print(f"Using cached result for seed {args.seed} (identical inputs already replayed)")
+            for trade_dict in cached['trades']:
+                reporter.record_trade(trade_dict)
+            reporter.signals_approved = cached['signals_approved']
+            reporter.signals_rejected = cached['signals_rejected']
+            reporter.total_bars = cached['total_bars']
+            reporter.print_summary()
+            return cached['results']
+    
     # Suppress verbose logger output - keep only essential info
     logger.setLevel(logging.CRITICAL)
     
@@ -287,6 +357,13 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
     # Initialize RL brain and bot module with config values
     rl_brain, bot_module = initialize_rl_brains_for_backtest(bot_config)
     
+    if args.seed is not None:
+        bot_module.seed_backtest(args.seed)
+    
+    # Quiet mode: diagnostics are skipped at the call site instead of formatted and discarded
+    if args.quiet:
+        diagnostics.set_quiet(True)
+    
     # Track initial experience count to show how many were added during backtest
     initial_experience_count = len(rl_brain.experiences) if rl_brain else 0
     
@@ -297,6 +374,7 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
     check_exit_conditions = bot_module.check_exit_conditions
     check_daily_reset = bot_module.check_daily_reset
     check_vwap_reset = bot_module.check_vwap_reset
+    handle_tick_event = bot_module.handle_tick_event
     state = bot_module.state
     
     # Initialize bot state for backtesting
@@ -325,6 +403,66 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
     last_exit_reason = 'bot_exit'  # Track last exit reason
     prev_position_active = False
     
+    def track_bot_position(timestamp: datetime, price: float, bar: Dict[str, Any],
+                           ticks: Optional[List[Tuple[float, int, int]]] = None) -> None:
+        """
+        Mirror the bot's position into the backtest engine and record entry confidence/regime.
+        
+        Args:
+            timestamp: Current replay time
+            price: Current price (used as exit price when the bot has just closed)
+            bar: Bar being replayed (intrabar fill path)
+            ticks: Ticks of the minute up to the current one (tick replay only)
+        """
+        nonlocal prev_position_active, last_exit_reason
+        
+        # Bar replay: a passive exit left resting works against this bar first
+        # (tick replay feeds it tick by tick)
+        if ticks is None:
+            engine.work_pending_exit(bar)
+        
+        if symbol in state and 'position' in state[symbol]:
+            pos = state[symbol]['position']
+            current_active = pos.get('active', False)
+            
+            # Capture exit reason while position is still active or just closed
+            if current_active or (not current_active and prev_position_active):
+                # Check state for last_exit_reason (persists after position reset)
+                if 'last_exit_reason' in state[symbol]:
+                    last_exit_reason = state[symbol]['last_exit_reason']
+            
+            # Capture confidence and regime when position opens
+            if current_active and not prev_position_active:
+                # Position just opened - save the confidence and regime
+                entry_time = pos.get('entry_time', timestamp)
+                entry_time_key = str(entry_time)
+                confidence = state[symbol].get('entry_rl_confidence', 0.5)
+                # Convert to percentage
+                if confidence <= 1.0:
+                    confidence = confidence * 100
+                trade_confidences[entry_time_key] = confidence
+                
+                # Track regime at entry
+                regime = state[symbol].get('current_regime', 'UNKNOWN')
+                trade_confidences[f"{entry_time_key}_regime"] = regime
+            
+            prev_position_active = current_active
+            
+            # Update backtest engine with current position from bot state
+            # (a new entry while the last passive exit is still resting completes that exit first)
+            if pos.get('active') and (engine.current_position is None or engine.pending_exit is not None):
+                engine.open_bot_position(symbol, pos, timestamp, bar, ticks)
+                
+            # If bot closed position (active=False), close it in backtest engine too
+            elif not pos.get('active') and engine.current_position is not None and engine.pending_exit is None:
+                # Use the last captured exit reason
+                engine.close_bot_position(timestamp, price, last_exit_reason, bar, ticks)
+                last_exit_reason = 'bot_exit'  # Reset for next trade
+            
+            # Bar replay: a bar the position was held through extends its MAE/MFE
+            elif engine.current_position is not None and ticks is None:
+                engine.update_excursion(bar['high'], bar['low'])
+    
     def capitulation_strategy_backtest(bars_1min: List[Dict[str, Any]], bars_15min: List[Dict[str, Any]]) -> None:
         """
         Capitulation Reversal strategy integrated with backtest engine.
@@ -337,9 +475,19 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
         - All trade management (stops, targets, breakeven, trailing)
         - UTC maintenance and flatten rules
         """
-        nonlocal prev_position_active, bars_processed, total_bars, last_exit_reason
+        nonlocal bars_processed, total_bars
         total_bars = len(bars_1min)
         
+        # Reuse precomputed per-bar indicators/regimes (bar replay only)
+        if not args.use_tick_data and not args.no_feature_cache:
+            feature_cache = load_or_build_feature_cache(
+                bars_1min, bot_module.CONFIG,
+                os.path.join(data_path, f"{symbol}_1min.csv"),
+                os.path.join(PROJECT_ROOT, "data/feature_cache")
+            )
+            if feature_cache is not None:
+                bot_module.attach_feature_cache(symbol, feature_cache)
+        
         for bar_idx, bar in enumerate(bars_1min):
             bars_processed = bar_idx + 1
             
@@ -364,58 +512,42 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
             inject_complete_bar(symbol, bar)
             
             # Track previous position state
-            if symbol in state and 'position' in state[symbol]:
-                pos = state[symbol]['position']
-                current_active = pos.get('active', False)
-                
-                # Capture exit reason while position is still active or just closed
-                if current_active or (not current_active and prev_position_active):
-                    # Check state for last_exit_reason (persists after position reset)
-                    if 'last_exit_reason' in state[symbol]:
-                        last_exit_reason = state[symbol]['last_exit_reason']
-                
-                # Capture confidence and regime when position opens
-                if current_active and not prev_position_active:
-                    # Position just opened - save the confidence and regime
-                    entry_time = pos.get('entry_time', timestamp)
-                    entry_time_key = str(entry_time)
-                    confidence = state[symbol].get('entry_rl_confidence', 0.5)
-                    # Convert to percentage
-                    if confidence <= 1.0:
-                        confidence = confidence * 100
-                    trade_confidences[entry_time_key] = confidence
-                    
-                    # Track regime at entry
-                    regime = state[symbol].get('current_regime', 'UNKNOWN')
-                    trade_confidences[f"{entry_time_key}_regime"] = regime
-                
-                prev_position_active = current_active
-                
-                # Update backtest engine with current position from bot state
-                if pos.get('active') and engine.current_position is None:
-                    engine.current_position = {
-                        'symbol': symbol,
-                        'side': pos['side'],
-                        'quantity': pos.get('quantity', 1),
-                        'entry_price': pos['entry_price'],
-                        'entry_time': pos.get('entry_time', timestamp),
-                        'stop_price': pos.get('stop_price'),
-                        'target_price': pos.get('target_price')
-                    }
-                    
-                # If bot closed position (active=False), close it in backtest engine too
-                elif not pos.get('active') and engine.current_position is not None:
-                    exit_price = bar['close']  # Use bar close price for exit
-                    exit_time = timestamp
-                    # Use the last captured exit reason
-                    engine._close_position(exit_time, exit_price, last_exit_reason)
-                    last_exit_reason = 'bot_exit'  # Reset for next trade
+            track_bot_position(timestamp, bar['close'], bar)
         
         # Ensure final progress is shown
         print()  # New line after progress
+    
+    def capitulation_strategy_tick_replay(minutes: Iterator[Tuple[Dict[str, Any], List[Tuple[float, int, int]]]],
+                                          bars_15min: List[Dict[str, Any]]) -> None:
+        """
+        Tick-by-tick replay through the bot's live tick path (handle_tick_event).
+        
+        Ticks are streamed from disk one minute at a time, so memory stays
+        bounded, and the bot builds its own bars and checks stops, breakeven
+        and trailing on every tick exactly as it does live.
+        """
+        nonlocal bars_processed
+        
+        for bar, ticks in minutes:
+            bars_processed += 1
+            
+            # Daily/VWAP resets at the start of each minute (same as bar replay)
+            timestamp_eastern = bar['timestamp'].astimezone(eastern_tz)
+            check_daily_reset(symbol, timestamp_eastern)
+            check_vwap_reset(symbol, timestamp_eastern)
+            
+            for tick_idx, (price, volume, timestamp_ms) in enumerate(ticks):
+                handle_tick_event({"symbol": symbol, "price": price, "volume": volume, "timestamp": timestamp_ms})
+                engine.work_pending_exit(bar, ticks[tick_idx:tick_idx + 1])
+                
+                # Entries and exits can happen on any tick - mirror them at the tick price
+                if state[symbol]['position'].get('active', False) != prev_position_active:
+                    track_bot_position(bot_module.get_current_time(), price, bar, ticks[:tick_idx + 1])
+                elif engine.current_position is not None:
+                    engine.update_excursion(price, price)
         
     # Run backtest with integrated strategy
-    results = engine.run_with_strategy(capitulation_strategy_backtest)
+    results = engine.run_with_strategy(capitulation_strategy_backtest, capitulation_strategy_tick_replay)
     
     # Get trades from engine metrics and add to reporter
     if hasattr(engine, 'metrics') and hasattr(engine.metrics, 'trades'):
@@ -443,16 +575,25 @@ def run_backtest(args: argparse.Namespace) -> Dict[str, Any]:
     
     # Update reporter totals from results
     if results:
-        reporter.total_bars = total_bars
+        reporter.total_bars = total_bars or bars_processed
     
     # Print clean summary
     reporter.print_summary()
     
+    if result_key is not None:
+        save_cached_result(result_cache_dir, result_key, {
+            'results': results,
+            'trades': reporter.trades,
+            'signals_approved': reporter.signals_approved,
+            'signals_rejected': reporter.signals_rejected,
+            'total_bars': reporter.total_bars
+        })
+    
     # Save RL experiences at the end
     print("Saving RL experiences...")
     experience_path = f"experiences/{symbol}/signal_experience.json"
     if rl_brain is not None and hasattr(rl_brain, 'save_experience'):
-        rl_brain.save_experience()
+        rl_brain.save_experience(export_json=True)
         final_experience_count = len(rl_brain.experiences)
         new_experiences = final_experience_count - initial_experience_count
         print(f"[OK] Signal RL experiences saved to {experience_path}")
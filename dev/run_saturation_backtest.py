@@ -29,7 +29,6 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from types import ModuleType
 import pytz
-import json
 
 # CRITICAL: Set backtest mode BEFORE any imports that load the bot module
 os.environ['BOT_BACKTEST_MODE'] = 'true'
@@ -43,10 +42,14 @@ sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
 # Import backtesting framework from dev
 from backtesting import BacktestConfig, BacktestEngine
 from backtest_reporter import reset_reporter, get_reporter
+from columnar_loader import load_day_index
 
 # Import production bot modules
+import diagnostics
 from config import load_config
 from signal_confidence import SignalConfidenceRL
+from feature_cache import load_or_build_feature_cache
+from experience_store import load_experiences
 
 
 def parse_arguments():
@@ -105,6 +108,12 @@ Examples:
         help='Number of consecutive zero-gain iterations before stopping. Default: 3'
     )
     
+    parser.add_argument(
+        '--intrabar-fills',
+        action='store_true',
+        help='Fill entries/exits on the intrabar price path instead of the bar close'
+    )
+    
     # Note: --log-level is not used because output is suppressed for clean progress display
     # Keeping for potential future use or debugging
     parser.add_argument(
@@ -161,7 +170,8 @@ def initialize_rl_brain(symbol: str, exploration_rate: float) -> Tuple[SignalCon
 
 def run_single_backtest(bot_module: ModuleType, rl_brain: SignalConfidenceRL, 
                         symbol: str, bot_config: Dict[str, Any],
-                        start_date: datetime, end_date: datetime) -> int:
+                        start_date: datetime, end_date: datetime,
+                        intrabar_fills: bool = False) -> int:
     """
     Run a single backtest and return the number of new experiences added.
     
@@ -172,13 +182,11 @@ def run_single_backtest(bot_module: ModuleType, rl_brain: SignalConfidenceRL,
         bot_config: Bot configuration dict
         start_date: Backtest start date
         end_date: Backtest end date
+        intrabar_fills: Resolve fills on the intrabar price path instead of the bar close
     
     Returns:
         Number of new experiences added
     """
-    import io
-    import contextlib
-    
     # Count experiences before
     initial_count = len(rl_brain.experiences)
     
@@ -191,7 +199,8 @@ def run_single_backtest(bot_module: ModuleType, rl_brain: SignalConfidenceRL,
         initial_equity=50000.0,
         symbols=[symbol],
         data_path=data_path,
-        use_tick_data=False
+        use_tick_data=False,
+        intrabar_fills=intrabar_fills
     )
     
     # Create backtest engine
@@ -224,6 +233,15 @@ def run_single_backtest(bot_module: ModuleType, rl_brain: SignalConfidenceRL,
     def strategy_func(bars_1min: List[Dict[str, Any]], bars_15min: List[Dict[str, Any]]) -> None:
         nonlocal prev_position_active, last_exit_reason
         
+        # Indicators/regimes are identical every iteration - computed once, then loaded from disk
+        feature_cache = load_or_build_feature_cache(
+            bars_1min, bot_module.CONFIG,
+            os.path.join(data_path, f"{symbol}_1min.csv"),
+            os.path.join(PROJECT_ROOT, "data/feature_cache")
+        )
+        if feature_cache is not None:
+            bot_module.attach_feature_cache(symbol, feature_cache)
+        
         for bar in bars_1min:
             timestamp = bar['timestamp']
             timestamp_eastern = timestamp.astimezone(eastern_tz)
@@ -235,6 +253,9 @@ def run_single_backtest(bot_module: ModuleType, rl_brain: SignalConfidenceRL,
             # Inject bar data
             inject_complete_bar(symbol, bar)
             
+            # A passive exit left resting works against this bar first
+            engine.work_pending_exit(bar)
+            
             # Track position state
             if symbol in state and 'position' in state[symbol]:
                 pos = state[symbol]['position']
@@ -247,25 +268,17 @@ def run_single_backtest(bot_module: ModuleType, rl_brain: SignalConfidenceRL,
                 prev_position_active = current_active
                 
                 # Update backtest engine position tracking
-                if pos.get('active') and engine.current_position is None:
-                    engine.current_position = {
-                        'symbol': symbol,
-                        'side': pos['side'],
-                        'quantity': pos.get('quantity', 1),
-                        'entry_price': pos['entry_price'],
-                        'entry_time': pos.get('entry_time', timestamp),
-                        'stop_price': pos.get('stop_price'),
-                        'target_price': pos.get('target_price')
-                    }
-                elif not pos.get('active') and engine.current_position is not None:
-                    exit_price = bar['close']
-                    engine._close_position(timestamp, exit_price, last_exit_reason)
+                if pos.get('active') and (engine.current_position is None or engine.pending_exit is not None):
+                    engine.open_bot_position(symbol, pos, timestamp, bar)
+                elif not pos.get('active') and engine.current_position is not None and engine.pending_exit is None:
+                    engine.close_bot_position(timestamp, bar['close'], last_exit_reason, bar)
                     last_exit_reason = 'bot_exit'
+                elif engine.current_position is not None:
+                    # A bar the position was held through extends its MAE/MFE
+                    engine.update_excursion(bar['high'], bar['low'])
     
-    # Run backtest with suppressed output
-    # Capture and discard all stdout/stderr from the backtest engine
-    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-        engine.run_with_strategy(strategy_func)
+    # Run backtest with per-bar diagnostics disabled (quiet mode is set in main)
+    engine.run_with_strategy(strategy_func)
     
     # Save experiences
     rl_brain.save_experience()
@@ -294,6 +307,9 @@ def main():
     # Suppress the root logger too
     logging.getLogger().setLevel(logging.CRITICAL)
     
+    # Skip per-bar diagnostics at the source instead of formatting and discarding them
+    diagnostics.set_quiet(True)
+    
     # Load configuration
     bot_config = load_config(backtest_mode=True)
     bot_config.instrument = args.symbol
@@ -309,35 +325,29 @@ def main():
         print(f"ERROR: Historical data file not found: {csv_path}")
         sys.exit(1)
     
-    # Read date range from CSV
+    # Read date range from the sidecar day index (built once, no full read of the CSV)
     tz = pytz.timezone('US/Eastern')
-    with open(csv_path, 'r') as f:
-        lines = f.readlines()
-        if len(lines) < 2:
-            print("ERROR: Historical data file is empty")
-            sys.exit(1)
-        
-        # First data line
-        first_line = lines[1]
-        first_timestamp = first_line.split(',')[0]
-        if '+' in first_timestamp:
-            first_timestamp = first_timestamp.split('+')[0]
-        start_date = datetime.strptime(first_timestamp, '%Y-%m-%d %H:%M:%S')
-        start_date = tz.localize(start_date.replace(hour=0, minute=0, second=0))
-        
-        # Last data line
-        last_line = lines[-1]
-        last_timestamp = last_line.split(',')[0]
-        if '+' in last_timestamp:
-            last_timestamp = last_timestamp.split('+')[0]
-        end_date = datetime.strptime(last_timestamp, '%Y-%m-%d %H:%M:%S')
-        end_date = tz.localize(end_date.replace(hour=23, minute=59, second=59))
-    
-    # Count unique days
-    unique_days = set()
-    for line in lines[1:]:
-        date_str = line.split(',')[0].split(' ')[0]
-        unique_days.add(date_str)
+    day_index = load_day_index(csv_path)
+    if day_index.rows == 0:
+        print("ERROR: Historical data file is empty")
+        sys.exit(1)
+    
+    # First data line
+    first_timestamp = day_index.first_timestamp
+    if '+' in first_timestamp:
+        first_timestamp = first_timestamp.split('+')[0]
+    start_date = datetime.strptime(first_timestamp, '%Y-%m-%d %H:%M:%S')
+    start_date = tz.localize(start_date.replace(hour=0, minute=0, second=0))
+    
+    # Last data line
+    last_timestamp = day_index.last_timestamp
+    if '+' in last_timestamp:
+        last_timestamp = last_timestamp.split('+')[0]
+    end_date = datetime.strptime(last_timestamp, '%Y-%m-%d %H:%M:%S')
+    end_date = tz.localize(end_date.replace(hour=23, minute=59, second=59))
+    
+    # Unique days
+    unique_days = {day for day, _, _ in day_index.days}
     
     # Print header
     print("=" * 70)
@@ -346,7 +356,7 @@ def main():
     print(f"  Symbol:           {args.symbol}")
     print(f"  Date Range:       {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
     print(f"  Trading Days:     {len(unique_days)}")
-    print(f"  Total Bars:       {len(lines) - 1:,}")
+    print(f"  Total Bars:       {day_index.rows:,}")
     print(f"  Exploration Rate: {args.exploration * 100:.0f}%")
     print(f"  Max Iterations:   {args.max_iterations}")
     print(f"  Consecutive Zero Stop: {args.consecutive_zero}")
@@ -355,11 +365,7 @@ def main():
     
     # Load initial experience count
     exp_file = os.path.join(PROJECT_ROOT, f"experiences/{args.symbol}/signal_experience.json")
-    initial_experiences = 0
-    if os.path.exists(exp_file):
-        with open(exp_file, 'r') as f:
-            data = json.load(f)
-            initial_experiences = len(data.get('experiences', []))
+    initial_experiences = len(load_experiences(exp_file))
     
     print(f"  Starting Experiences: {initial_experiences}")
     print()
@@ -384,7 +390,7 @@ def main():
         # Run backtest
         new_experiences = run_single_backtest(
             bot_module, rl_brain, args.symbol, bot_config_dict,
-            start_date, end_date
+            start_date, end_date, intrabar_fills=args.intrabar_fills
         )
         
         total_new_experiences += new_experiences
@@ -410,12 +416,12 @@ def main():
     print("  SATURATION SUMMARY")
     print("  " + "-" * 60)
     
+    # Write the accumulated experiences back to JSON once, after all iterations
+    if iteration > 0:
+        rl_brain.save_experience(export_json=True)
+    
     # Load final experience count
-    final_experiences = 0
-    if os.path.exists(exp_file):
-        with open(exp_file, 'r') as f:
-            data = json.load(f)
-            final_experiences = len(data.get('experiences', []))
+    final_experiences = len(load_experiences(exp_file))
     
     print(f"  Initial Experiences:  {initial_experiences}")
     print(f"  Final Experiences:    {final_experiences}")
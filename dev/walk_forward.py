@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Backtest Runner - Parallel Segmented Replay
+
+Splits a backtest date range into independent windows and replays them in
+parallel worker processes instead of one long single-core replay.
+
+Each window:
+- Starts from a fresh copy of the trading engine module (its own `state`,
+  `rl_brain` and `backtest_current_time` globals)
+- Replays warm-up bars before the window start so indicators, regime and
+  VWAP are primed, without taking any entries
+- Takes entries only inside the window; a position still open at the window
+  end is managed on the following bars until it exits
+- Scores signals against the experience file as it was when the run started
+  (workers never write experiences)
+
+Results are merged in window order, so the same inputs always produce the
+same trade list, metrics and experience file regardless of worker count.
+Because windows do not see each other's new experiences, results can differ
+slightly from a single sequential run of the same range.
+
+Usage:
+    python dev/walk_forward.py --start 2025-11-03 --end 2025-11-28
+    python dev/walk_forward.py --start 2025-11-03 --end 2025-11-28 --window-days 2 --workers 4
+"""
+
+import argparse
+import bisect
+import sys
+import os
+import logging
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+from types import ModuleType
+import pytz
+
+# CRITICAL: Set backtest mode BEFORE any imports that load the bot module
+os.environ['BOT_BACKTEST_MODE'] = 'true'
+os.environ['USE_CLOUD_SIGNALS'] = 'false'
+
+# Add parent directory to path to import from src/
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+# Import backtesting framework from dev
+from backtesting import BacktestConfig, BacktestEngine, HistoricalDataLoader, PerformanceMetrics
+from backtest_reporter import reset_reporter
+
+# Import production bot modules
+import diagnostics
+from config import load_config
+from signal_confidence import SignalConfidenceRL
+from capitulation_detector import reset_capitulation_detector
+
+
+# 1-minute bars per full futures trading day (23 hours)
+BARS_PER_DAY = 1380
+
+# RL settings shared with run_backtest.py
+RL_SETTINGS = {
+    'confidence_threshold': 0.70,
+    'exploration_rate': 0.30,
+    'min_exploration': 0.30,
+    'exploration_decay': 1.0
+}
+
+
+@dataclass
+class WalkForwardWindow:
+    """One independent backtest window (times are UTC, end is exclusive)"""
+    index: int
+    start: datetime
+    end: datetime
+
+
+def split_walk_forward_windows(start_date: datetime, end_date: datetime,
+                               window_days: int = 1) -> List[WalkForwardWindow]:
+    """
+    Split a date range into consecutive windows of window_days each.
+
+    Args:
+        start_date: Range start (naive datetimes are treated as UTC, like the data loader)
+        end_date: Range end (inclusive)
+        window_days: Length of each window in days
+
+    Returns:
+        List of windows in chronological order (the last one may be shorter)
+    """
+    if window_days <= 0:
+        raise ValueError("window_days must be positive")
+
+    start_utc = _to_utc(start_date)
+    end_utc = _to_utc(end_date)
+
+    windows = []
+    window_start = start_utc
+    while window_start <= end_utc:
+        window_end = min(window_start + timedelta(days=window_days), end_utc + timedelta(microseconds=1))
+        windows.append(WalkForwardWindow(index=len(windows), start=window_start, end=window_end))
+        window_start = window_end
+    return windows
+
+
+def _to_utc(timestamp: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC"""
+    if timestamp.tzinfo is None:
+        return pytz.UTC.localize(timestamp)
+    return timestamp.astimezone(pytz.UTC)
+
+
+def load_isolated_engine() -> ModuleType:
+    """
+    Load a fresh copy of the trading engine module.
+
+    Every call executes src/quotrading_engine.py again, so the returned module
+    has its own `state`, `rl_brain` and `backtest_current_time` globals.
+
+    Returns:
+        The loaded trading engine module
+    """
+    spec = importlib.util.spec_from_file_location(
+        "quotrading_engine",
+        os.path.join(PROJECT_ROOT, "src/quotrading_engine.py")
+    )
+    bot_module = importlib.util.module_from_spec(spec)
+    sys.modules['quotrading_engine'] = bot_module
+    sys.modules['capitulation_reversal_bot'] = bot_module
+    spec.loader.exec_module(bot_module)
+    return bot_module
+
+
+def run_walk_forward_window(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replay one window in the current (worker) process.
+
+    Args:
+        task: Window description built by run_walk_forward (window, symbol,
+              bot_config, bars, warmup_count, experience_file, seed, ...)
+
+    Returns:
+        Dictionary with the window index, the window's PerformanceMetrics
+        (closed trades, merged by the parent), per-trade confidence
+        and regime, new RL experiences and the number of window bars replayed
+    """
+    window: WalkForwardWindow = task['window']
+    symbol = task['symbol']
+    bot_config = task['bot_config']
+    bars = task['bars']
+    warmup_count = task['warmup_count']
+
+    # Keep the engine's position state file away from other workers
+    os.environ['SELECTED_ACCOUNT_ID'] = f"walkforward_{os.getpid()}"
+    reset_capitulation_detector()
+    diagnostics.set_quiet(True)  # Per-bar diagnostics are not shown for workers
+
+    bot_module = load_isolated_engine()
+    rl_brain = SignalConfidenceRL(
+        experience_file=task['experience_file'],
+        backtest_mode=True,
+        save_local=False,  # Workers only read; the parent merges and saves
+        **RL_SETTINGS
+    )
+    bot_module.__dict__['rl_brain'] = rl_brain
+    if task.get('seed') is not None:
+        bot_module.seed_backtest(task['seed'] + window.index)
+    initial_experience_count = len(rl_brain.experiences)
+
+    engine = BacktestEngine(
+        BacktestConfig(
+            start_date=window.start,
+            end_date=window.end,
+            initial_equity=task['initial_equity'],
+            symbols=[symbol],
+            data_path=task['data_path']
+        ),
+        bot_config
+    )
+
+    inject_complete_bar = bot_module.inject_complete_bar
+    check_daily_reset = bot_module.check_daily_reset
+    check_vwap_reset = bot_module.check_vwap_reset
+    state = bot_module.state
+    bot_module.initialize_state(symbol)
+
+    eastern_tz = pytz.timezone("US/Eastern")
+    prev_position_active = False
+    last_exit_reason = 'bot_exit'
+    trade_context: Dict[str, Tuple[float, str]] = {}
+    window_bars = 0
+
+    for bar_idx, bar in enumerate(bars):
+        timestamp = bar['timestamp']
+        in_window = bar_idx >= warmup_count and timestamp < window.end
+        pos = state[symbol]['position']
+
+        # Past the window: only keep replaying to manage an open position
+        if bar_idx >= warmup_count and not in_window and not pos.get('active'):
+            break
+        if in_window:
+            window_bars += 1
+
+        timestamp_eastern = timestamp.astimezone(eastern_tz)
+        check_daily_reset(symbol, timestamp_eastern)
+        check_vwap_reset(symbol, timestamp_eastern)
+        inject_complete_bar(symbol, bar, check_signals=in_window)
+
+        pos = state[symbol]['position']
+        current_active = pos.get('active', False)
+
+        if current_active or prev_position_active:
+            if 'last_exit_reason' in state[symbol]:
+                last_exit_reason = state[symbol]['last_exit_reason']
+
+        # Capture confidence and regime when position opens
+        if current_active and not prev_position_active:
+            confidence = state[symbol].get('entry_rl_confidence', 0.5)
+            if confidence <= 1.0:
+                confidence = confidence * 100
+            regime = state[symbol].get('current_regime', 'UNKNOWN')
+            trade_context[str(pos.get('entry_time', timestamp))] = (confidence, regime)
+
+        prev_position_active = current_active
+
+        if current_active and engine.current_position is None:
+            engine.open_bot_position(symbol, pos, timestamp, bar)
+        elif not current_active and engine.current_position is not None:
+            engine.close_bot_position(timestamp, bar['close'], last_exit_reason, bar)
+            last_exit_reason = 'bot_exit'
+        elif engine.current_position is not None:
+            # A bar the position was held through extends its MAE/MFE
+            engine.update_excursion(bar['high'], bar['low'])
+
+    # Remove this worker's position state files
+    account_id = os.environ['SELECTED_ACCOUNT_ID']
+    for suffix in ('.json', '.json.backup'):
+        state_file = bot_module.get_data_file_path(f"data/bot_state_{account_id}{suffix}")
+        if state_file.exists():
+            state_file.unlink()
+
+    return {
+        'index': window.index,
+        'metrics': engine.metrics,
+        'trade_context': trade_context,
+        'experiences': rl_brain.experiences[initial_experience_count:],
+        'bars': window_bars
+    }
+
+
+def run_walk_forward(start_date: datetime, end_date: datetime, symbol: Optional[str] = None,
+                     data_path: Optional[str] = None, window_days: int = 1,
+                     warmup_bars: int = BARS_PER_DAY, workers: Optional[int] = None,
+                     seed: Optional[int] = None, save_experiences: bool = True) -> Dict[str, Any]:
+    """
+    Run a walk-forward backtest with windows replayed in parallel processes.
+
+    Args:
+        start_date: Range start (naive datetimes are treated as UTC)
+        end_date: Range end (inclusive)
+        symbol: Trading symbol (default: instrument from config)
+        data_path: Historical data directory (default: <project_root>/data/historical_data)
+        window_days: Length of each window in days
+        warmup_bars: 1-minute bars replayed before each window without trading
+        workers: Worker processes (default: one per CPU)
+        seed: Base random seed; window i uses seed + i (None = unseeded)
+        save_experiences: Merge new RL experiences into the experience file
+
+    Returns:
+        Performance metrics dictionary plus 'symbol', 'windows', 'total_bars',
+        'new_experiences' and the merged 'trades' (with confidence and regime)
+    """
+    bot_config = load_config(backtest_mode=True)
+
+    # Same backtest overrides as run_backtest.py
+    bot_config.account_size = 50000.0
+    bot_config.max_contracts = 1
+    bot_config.daily_loss_limit = 1000.0
+    bot_config.shadow_mode = False
+    if symbol:
+        bot_config.instrument = symbol
+    symbol = bot_config.instrument
+    bot_config_dict = bot_config.to_dict()
+
+    if data_path is None:
+        data_path = os.path.join(PROJECT_ROOT, "data/historical_data")
+    experience_file = os.path.join(PROJECT_ROOT, f"experiences/{symbol}/signal_experience.json")
+
+    windows = split_walk_forward_windows(start_date, end_date, window_days)
+
+    # Load every bar once (including enough history for the first warm-up and
+    # weekends) and hand each worker only its own slice
+    warmup_days = warmup_bars // BARS_PER_DAY + 4
+    loader = HistoricalDataLoader(BacktestConfig(
+        start_date=windows[0].start - timedelta(days=warmup_days),
+        end_date=end_date,
+        initial_equity=bot_config.account_size,
+        symbols=[symbol],
+        data_path=data_path
+    ))
+    bars = loader.load_bar_data(symbol, "1min")
+    timestamps = [bar['timestamp'] for bar in bars]
+
+    tasks = []
+    for i, window in enumerate(windows):
+        first = bisect.bisect_left(timestamps, window.start)
+        last = bisect.bisect_left(timestamps, window.end)
+        if first == last:
+            continue  # No bars (weekend/holiday)
+        # Bars after the window are only used to manage a carried position
+        carry_end = windows[i + 1].end if i + 1 < len(windows) else window.end
+        carry = bisect.bisect_left(timestamps, carry_end)
+        warmup_start = max(0, first - warmup_bars)
+        tasks.append({
+            'window': window,
+            'symbol': symbol,
+            'bot_config': bot_config_dict,
+            'bars': bars[warmup_start:carry],
+            'warmup_count': first - warmup_start,
+            'experience_file': experience_file,
+            'initial_equity': bot_config.account_size,
+            'data_path': data_path,
+            'seed': seed
+        })
+
+    results: List[Dict[str, Any]] = []
+    if tasks:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(tasks))) as executor:
+            results = list(executor.map(run_walk_forward_window, tasks))
+
+    # Merge in window order
+    metrics = PerformanceMetrics(
+        initial_equity=bot_config.account_size,
+        tick_value=bot_config_dict.get('tick_value', 1.25),
+        commission_per_contract=BacktestConfig.commission_per_contract
+    )
+    trades = []
+    for result in sorted(results, key=lambda r: r['index']):
+        metrics.merge(result['metrics'])
+        for trade in result['metrics'].trades:
+            confidence, regime = result['trade_context'].get(str(trade.entry_time), (50, ""))
+            trades.append({
+                'side': trade.side,
+                'quantity': trade.quantity,
+                'entry_price': trade.entry_price,
+                'exit_price': trade.exit_price,
+                'entry_time': trade.entry_time,
+                'exit_time': trade.exit_time,
+                'pnl': trade.pnl,
+                'exit_reason': trade.exit_reason,
+                'duration_minutes': trade.duration_minutes,
+                'confidence': confidence,
+                'regime': regime
+            })
+
+    new_experiences = 0
+    if save_experiences:
+        rl_brain = SignalConfidenceRL(experience_file=experience_file, backtest_mode=True, **RL_SETTINGS)
+        for result in sorted(results, key=lambda r: r['index']):
+            new_experiences += rl_brain.merge_experiences(result['experiences'])
+        rl_brain.save_experience(export_json=True)
+
+    summary = metrics.get_summary()
+    summary['symbol'] = symbol
+    summary['windows'] = len(tasks)
+    summary['total_bars'] = sum(result['bars'] for result in results)
+    summary['new_experiences'] = new_experiences
+    summary['trades'] = trades
+    return summary
+
+
+def parse_arguments():
+    """Parse command-line arguments for walk-forward backtest"""
+    parser = argparse.ArgumentParser(
+        description='Walk-forward backtest - replays date windows in parallel processes'
+    )
+    parser.add_argument('--start', type=str, required=True, help='Backtest start date (YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, required=True, help='Backtest end date (YYYY-MM-DD)')
+    parser.add_argument('--symbol', type=str, help='Override trading symbol (default: from config)')
+    parser.add_argument('--data-path', type=str, default=None,
+                        help='Path to historical data directory (default: <project_root>/data/historical_data)')
+    parser.add_argument('--window-days', type=int, default=1, help='Days per window (default: 1)')
+    parser.add_argument('--warmup-bars', type=int, default=BARS_PER_DAY,
+                        help=f'1-minute warm-up bars before each window (default: {BARS_PER_DAY})')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for RL exploration')
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point for walk-forward backtest"""
+    args = parse_arguments()
+
+    logging.basicConfig(level=logging.CRITICAL, format='%(message)s')
+    logging.getLogger().setLevel(logging.CRITICAL)
+    import warnings
+    warnings.filterwarnings('ignore')
+
+    start_date = datetime.strptime(args.start, '%Y-%m-%d')
+    end_date = datetime.strptime(args.end, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+
+    results = run_walk_forward(
+        start_date, end_date,
+        symbol=args.symbol,
+        data_path=args.data_path,
+        window_days=args.window_days,
+        warmup_bars=args.warmup_bars,
+        workers=args.workers,
+        seed=args.seed
+    )
+
+    reporter = reset_reporter(starting_balance=50000.0, max_contracts=1)
+    reporter.print_header(start_date=args.start, end_date=args.end, symbol=results['symbol'])
+    for trade in results['trades']:
+        reporter.record_trade(trade)
+    reporter.total_bars = results['total_bars']
+    reporter.print_summary()
+    print(f"Windows: {results['windows']} | New RL experiences: {results['new_experiences']}")
+
+    sys.exit(0 if results['total_trades'] > 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,8 @@
 Comprehensive Experience Deduplication Script
 ==============================================
 Removes truly identical experiences from RL experience files.
+Works on the columnar experience store (signal_experience.cols) when one
+exists, re-exporting signal_experience.json from it; otherwise on the JSON.
 
 Checks ALL significant fields to ensure only exact duplicates are removed:
 - timestamp, symbol, price, pnl, duration, took_trade
@@ -26,6 +28,9 @@ from pathlib import Path
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from experience_store import ExperienceStore, store_path_for
 
 
 def experience_hash(exp):
@@ -82,6 +87,53 @@ def experience_hash(exp):
     return hashlib.md5(key_string.encode()).hexdigest()
 
 
+def unique_experiences(experiences):
+    """
+    Drop exact duplicates, keeping the first occurrence.
+    
+    Args:
+        experiences: List of experience dictionaries
+        
+    Returns:
+        List of unique experiences (original order)
+    """
+    seen_hashes = set()
+    unique = []
+    for exp in experiences:
+        exp_hash = experience_hash(exp)
+        if exp_hash not in seen_hashes:
+            seen_hashes.add(exp_hash)
+            unique.append(exp)
+    return unique
+
+
+def deduplicate_store(store_dir, dry_run=False):
+    """
+    Remove exact duplicates from a columnar experience store (compacts it).
+    
+    Args:
+        store_dir: Path to the .cols store directory
+        dry_run: If True, don't save changes (just report)
+        
+    Returns:
+        Tuple of (original_count, unique_count, duplicates_removed)
+    """
+    try:
+        store = ExperienceStore(str(store_dir))
+        experiences = store.read_all()
+        unique = unique_experiences(experiences)
+        duplicates = len(experiences) - len(unique)
+        
+        if not dry_run and duplicates > 0:
+            store.rewrite(unique, stats=store.stats)
+        
+        return len(experiences), len(unique), duplicates
+        
+    except Exception as e:
+        print(f"❌ Error processing {store_dir}: {e}")
+        return 0, 0, 0
+
+
 def deduplicate_file(filepath, dry_run=False):
     """
     Remove exact duplicates from a single experience file.
@@ -112,27 +164,16 @@ def deduplicate_file(filepath, dry_run=False):
         original_count = len(experiences)
         
         # Use hash set for O(1) duplicate detection
-        seen_hashes = set()
-        unique_experiences = []
-        duplicates = 0
-        
-        for exp in experiences:
-            exp_hash = experience_hash(exp)
-            
-            if exp_hash not in seen_hashes:
-                seen_hashes.add(exp_hash)
-                unique_experiences.append(exp)
-            else:
-                duplicates += 1
-        
-        unique_count = len(unique_experiences)
+        unique = unique_experiences(experiences)
+        unique_count = len(unique)
+        duplicates = original_count - unique_count
         
         # Save if not dry run and duplicates found
         if not dry_run and duplicates > 0:
             if is_wrapped:
-                data['experiences'] = unique_experiences
+                data['experiences'] = unique
             else:
-                data = unique_experiences
+                data = unique
             
             with open(filepath, 'w') as f:
                 json.dump(data, f, indent=2)
@@ -190,12 +231,22 @@ Examples:
     
     for symbol in symbols:
         exp_file = experiences_dir / symbol / 'signal_experience.json'
+        store_dir = Path(store_path_for(str(exp_file)))
+        store = ExperienceStore(str(store_dir))
         
-        if not exp_file.exists():
+        if not exp_file.exists() and not store.exists():
             print(f"⚠️  {symbol}: No experience file found")
             continue
         
-        original, unique, dups = deduplicate_file(exp_file, dry_run=args.dry_run)
+        if store.is_current_with(str(exp_file)):
+            # Columnar store is the working copy - dedupe it and re-export the JSON from it
+            original, unique, dups = deduplicate_store(store_dir, dry_run=args.dry_run)
+            if not args.dry_run and dups > 0:
+                ExperienceStore(str(store_dir)).export_json(str(exp_file))
+        else:
+            # No store yet, or the JSON was edited since - the JSON is authoritative
+            # (the store re-imports it on next load)
+            original, unique, dups = deduplicate_file(exp_file, dry_run=args.dry_run)
         
         total_original += original
         total_unique += unique
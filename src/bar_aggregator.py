@@ -0,0 +1,178 @@
+"""
+Hierarchical Bar Aggregator
+===========================
+Rolls finalized 1-minute bars up into higher timeframes (e.g. 3 and 5 minute
+bars) incrementally, without rereading bar history.
+
+Each timeframe is built from the largest smaller timeframe that divides it
+evenly (15 from 5, 5 from 1, 3 from 1), so a 1-minute bar only touches one
+running bar per level. Buckets are aligned to minutes since midnight of the
+bar timestamp, like update_15min_bar.
+
+The bar of the bucket containing the latest minute is available while it
+forms (current() / current_high_low()); it is reported as completed by
+update() once a bar from a later bucket arrives.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _bucket(timestamp: Any, minutes: int) -> Tuple[Any, int]:
+    """Bucket key of a timestamp: (date, index of the `minutes`-minute slot)."""
+    return timestamp.date(), (timestamp.hour * 60 + timestamp.minute) // minutes
+
+
+def _bucket_start(timestamp: Any, minutes: int) -> Any:
+    """Start time of the `minutes`-minute bucket containing a timestamp."""
+    offset = (timestamp.hour * 60 + timestamp.minute) % minutes
+    return timestamp - timedelta(minutes=offset, seconds=timestamp.second, microseconds=timestamp.microsecond)
+
+
+def _fold(target: Optional[Dict[str, Any]], bar: Dict[str, Any], timestamp: Any) -> Dict[str, Any]:
+    """Merge a bar into a running bar (new dict if target is None)."""
+    if target is None:
+        return {
+            "timestamp": timestamp,
+            "open": bar["open"],
+            "high": bar["high"],
+            "low": bar["low"],
+            "close": bar["close"],
+            "volume": bar["volume"],
+        }
+    if bar["high"] > target["high"]:
+        target["high"] = bar["high"]
+    if bar["low"] < target["low"]:
+        target["low"] = bar["low"]
+    target["close"] = bar["close"]
+    target["volume"] += bar["volume"]
+    return target
+
+
+class _Level:
+    """Running state of one derived timeframe."""
+
+    __slots__ = ("minutes", "source", "bucket", "bucket_start", "closed")
+
+    def __init__(self, minutes: int, source: Optional["_Level"]):
+        self.minutes = minutes
+        self.source = source  # None = built directly from 1-minute bars
+        self.bucket: Optional[Tuple[Any, int]] = None
+        self.bucket_start: Any = None
+        self.closed: Optional[Dict[str, Any]] = None  # Completed source bars of the current bucket
+
+
+class BarAggregator:
+    """
+    Incremental N-minute bars for a set of timeframes, fed with 1-minute bars.
+    """
+
+    def __init__(self, timeframes: Sequence[int]):
+        """
+        Initialize aggregator.
+
+        Args:
+            timeframes: Bar sizes in minutes (values <= 1 are ignored - 1-minute
+                        bars are the input)
+        """
+        self.timeframes: Tuple[int, ...] = tuple(sorted({int(tf) for tf in timeframes if int(tf) > 1}))
+        self._levels: Dict[int, _Level] = {}
+        for minutes in self.timeframes:
+            # Largest smaller timeframe that divides this one
+            sources = [tf for tf in self._levels if minutes % tf == 0]
+            source = self._levels[max(sources)] if sources else None
+            self._levels[minutes] = _Level(minutes, source)
+
+    def reset(self) -> None:
+        """Discard all running bars."""
+        for level in self._levels.values():
+            level.bucket = None
+            level.bucket_start = None
+            level.closed = None
+
+    def update(self, bar: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Add a finalized 1-minute bar.
+
+        Args:
+            bar: Bar dict with timestamp, open, high, low, close, volume
+
+        Returns:
+            (timeframe, bar) for every higher-timeframe bar completed by this
+            bar, in increasing timeframe order
+        """
+        timestamp = bar["timestamp"]
+        completed: List[Tuple[int, Dict[str, Any]]] = []
+        completed_by_level: Dict[int, Dict[str, Any]] = {}
+
+        for minutes, level in self._levels.items():
+            # Bar handed up by the source: the 1-minute bar itself, or the
+            # source level's bar if it completed on this update
+            if level.source is None:
+                source_bar = bar
+            else:
+                source_bar = completed_by_level.get(level.source.minutes)
+
+            if source_bar is not None and level.bucket is not None \
+                    and _bucket(source_bar["timestamp"], minutes) == level.bucket:
+                level.closed = _fold(level.closed, source_bar, level.bucket_start)
+                source_bar = None
+
+            bucket = _bucket(timestamp, minutes)
+            if bucket != level.bucket:
+                if level.closed is not None:
+                    completed.append((minutes, level.closed))
+                    completed_by_level[minutes] = level.closed
+                level.bucket = bucket
+                level.bucket_start = _bucket_start(timestamp, minutes)
+                level.closed = None
+
+            if source_bar is not None and _bucket(source_bar["timestamp"], minutes) == bucket:
+                level.closed = _fold(level.closed, source_bar, level.bucket_start)
+
+        return completed
+
+    def current_high_low(self, minutes: int) -> Optional[Tuple[float, float]]:
+        """
+        High and low of the forming bar (bucket of the latest 1-minute bar).
+
+        Args:
+            minutes: Timeframe
+
+        Returns:
+            (high, low), or None before the first bar
+        """
+        level = self._levels[minutes]
+        high = low = None
+        while level is not None:
+            if level.closed is not None:
+                if high is None or level.closed["high"] > high:
+                    high = level.closed["high"]
+                if low is None or level.closed["low"] < low:
+                    low = level.closed["low"]
+            level = level.source
+        return None if high is None else (high, low)
+
+    def current(self, minutes: int) -> Optional[Dict[str, Any]]:
+        """
+        The forming bar of a timeframe as a new dict.
+
+        Args:
+            minutes: Timeframe
+
+        Returns:
+            Bar dict, or None before the first bar
+        """
+        # Each level's completed bars precede its source's forming bar, so
+        # walking down the source chain keeps open/close in time order
+        level = self._levels[minutes]
+        bucket_start = level.bucket_start
+        result = None
+        while level is not None:
+            if level.closed is not None:
+                result = _fold(result, level.closed, bucket_start)
+            level = level.source
+        return result
@@ -0,0 +1,299 @@
+"""
+Bar Store - Fixed-Capacity Columnar Ring Buffers for Bars and Ticks
+===================================================================
+Replaces deques of per-bar dicts in state[symbol] ("bars_1min", "bars_15min",
+"ticks") with parallel typed columns:
+
+    timestamp -> Python list (datetime objects are kept as-is)
+    open/high/low/close -> array('d')
+    volume -> array('q')
+
+Each column is allocated once at twice the capacity and every value is
+written to slot i and slot i + capacity. Any window of the most recent
+N <= capacity records is therefore contiguous, so tail() returns a
+zero-copy NumPy view instead of building list(bars)[-N:].
+
+For backward compatibility the store behaves like the deque it replaces:
+len(), bool(), bars[-1], bars[-5:], iteration and append(dict) all work,
+with records returned as read-only dict-like RecordView objects.
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# (field name, kind) - kind is an array typecode or "O" for Python objects
+BAR_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "O"),
+    ("open", "d"),
+    ("high", "d"),
+    ("low", "d"),
+    ("close", "d"),
+    ("volume", "q"),
+)
+
+TICK_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("price", "d"),
+    ("volume", "q"),
+    ("timestamp", "q"),
+)
+
+_NUMPY_DTYPES = {"d": np.float64, "q": np.int64}
+
+
+class RecordView(Mapping):
+    """
+    Read-only dict-like view of one record in a ColumnRing.
+    Values are read from the columns on access; the view becomes invalid
+    (raises IndexError) once the ring has overwritten its slot.
+    """
+
+    __slots__ = ("_ring", "_seq")
+
+    def __init__(self, ring: "ColumnRing", seq: int):
+        self._ring = ring
+        self._seq = seq
+
+    def __getitem__(self, key: str) -> Any:
+        return self._ring._value(self._seq, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ring.fields)
+
+    def __len__(self) -> int:
+        return len(self._ring.fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ring._columns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the record as a plain dict."""
+        return {name: self._ring._value(self._seq, name) for name in self._ring.fields}
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class ColumnRing:
+    """
+    Fixed-capacity ring buffer of records stored column-wise.
+    Oldest records are dropped when full (like deque(maxlen=capacity)).
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, str]], capacity: int):
+        """
+        Initialize ring.
+
+        Args:
+            fields: (name, kind) pairs; kind is 'd' (float), 'q' (int) or 'O' (object)
+            capacity: Maximum number of records kept
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.fields: Tuple[str, ...] = tuple(name for name, _ in fields)
+        self._columns: Dict[str, Union[array, List[Any]]] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, kind in fields:
+            if kind == "O":
+                self._columns[name] = [None] * (2 * capacity)
+            else:
+                column = array(kind, [0]) * (2 * capacity)
+                self._columns[name] = column
+                view = np.frombuffer(column, dtype=_NUMPY_DTYPES[kind])
+                view.flags.writeable = False
+                self._arrays[name] = view
+        # (name, column, integer column?) in field order for the append loops
+        self._writers = [(name, self._columns[name], kind == "q") for name, kind in fields]
+        self._count = 0  # Total records ever appended (absolute sequence number of next record)
+
+    @property
+    def maxlen(self) -> int:
+        """Capacity (deque compatibility)."""
+        return self.capacity
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, record: Mapping) -> None:
+        """
+        Append a record (any mapping with all fields).
+
+        Args:
+            record: Dict (or RecordView) with a value for every field
+        """
+        capacity = self.capacity
+        slot = self._count % capacity
+        for name, column, is_int in self._writers:
+            value = record[name]
+            if is_int:
+                value = int(value)
+            column[slot] = value
+            column[slot + capacity] = value
+        self._count += 1
+
+    def append_values(self, *values: Any) -> None:
+        """
+        Append a record given positionally in field order (no dict needed).
+
+        Args:
+            *values: One value per field, in the order of self.fields
+        """
+        capacity = self.capacity
+        slot = self._count % capacity
+        for (name, column, is_int), value in zip(self._writers, values):
+            if is_int:
+                value = int(value)
+            column[slot] = value
+            column[slot + capacity] = value
+        self._count += 1
+
+    def extend(self, records: Any) -> None:
+        """Append several records."""
+        for record in records:
+            self.append(record)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        self._count = 0
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _value(self, seq: int, key: str) -> Any:
+        column = self._columns.get(key)
+        if column is None:
+            raise KeyError(key)
+        if seq < self._count - self.capacity or seq >= self._count:
+            raise IndexError("record is no longer in the ring")
+        return column[seq % self.capacity]
+
+    def _seq_for(self, index: int) -> int:
+        size = len(self)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("ring index out of range")
+        return self._count - size + index
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[RecordView, List[RecordView]]:
+        if isinstance(index, slice):
+            first = self._count - len(self)
+            return [RecordView(self, first + i) for i in range(*index.indices(len(self)))]
+        return RecordView(self, self._seq_for(index))
+
+    def __iter__(self) -> Iterator[RecordView]:
+        first = self._count - len(self)
+        for seq in range(first, self._count):
+            yield RecordView(self, seq)
+
+    def tail(self, field: str, n: int = None) -> Union[np.ndarray, List[Any]]:
+        """
+        Most recent n values of a column, oldest first.
+
+        Numeric columns return a read-only zero-copy NumPy view that is only
+        valid until the next append (copy it to keep it). Object columns
+        return a list.
+
+        Args:
+            field: Column name
+            n: Number of values (default/None = all stored records)
+
+        Returns:
+            Array (or list) of min(n, len(self)) values
+        """
+        size = len(self)
+        if n is None or n > size:
+            n = size
+        start = (self._count - n) % self.capacity
+        array_view = self._arrays.get(field)
+        if array_view is not None:
+            return array_view[start:start + n]
+        return self._columns[field][start:start + n]
+
+    def last(self, field: str) -> Any:
+        """Value of a field in the newest record."""
+        if self._count == 0:
+            raise IndexError("ring is empty")
+        return self._columns[field][(self._count - 1) % self.capacity]
+
+
+class BarStore(ColumnRing):
+    """OHLCV bar ring (timestamp, open, high, low, close, volume)."""
+
+    def __init__(self, capacity: int):
+        super().__init__(BAR_FIELDS, capacity)
+
+
+class TickStore(ColumnRing):
+    """Tick ring (price, volume, timestamp in ms)."""
+
+    def __init__(self, capacity: int):
+        super().__init__(TICK_FIELDS, capacity)
+        self._price = self._columns["price"]
+        self._volume = self._columns["volume"]
+        self._timestamp = self._columns["timestamp"]
+
+    def append_tick(self, price: float, volume: int, timestamp_ms: int) -> None:
+        """
+        Append one tick (hot path - unrolled version of append_values).
+
+        Args:
+            price: Tick price
+            volume: Tick volume
+            timestamp_ms: Timestamp in milliseconds
+        """
+        slot = self._count % self.capacity
+        mirror = slot + self.capacity
+        if type(volume) is not int:
+            volume = int(volume)
+        self._price[slot] = self._price[mirror] = price
+        self._volume[slot] = self._volume[mirror] = volume
+        self._timestamp[slot] = self._timestamp[mirror] = timestamp_ms
+        self._count += 1
+
+
+def tail_column(records: Any, field: str, n: int = None) -> np.ndarray:
+    """
+    Most recent n values of a field from a ColumnRing or any sequence of bar dicts.
+
+    Args:
+        records: ColumnRing, list or deque of dicts
+        field: Field name
+        n: Number of values (default/None = all)
+
+    Returns:
+        NumPy array of values, oldest first
+    """
+    if isinstance(records, ColumnRing):
+        return np.asarray(records.tail(field, n))
+    items = list(records)
+    if n is not None:
+        items = items[-n:] if n > 0 else []
+    return np.array([record[field] for record in items], dtype=np.float64)
+
+
+def tail_true_ranges(records: Any, n: int = None) -> np.ndarray:
+    """
+    True ranges of the most recent bars: max(high - low, |high - prev close|, |low - prev close|).
+
+    Args:
+        records: ColumnRing, list or deque of bar dicts
+        n: Number of true ranges (uses n + 1 bars; default/None = all)
+
+    Returns:
+        NumPy array of up to n true ranges, oldest first
+    """
+    bars_needed = None if n is None else n + 1
+    highs = tail_column(records, "high", bars_needed)[1:]
+    lows = tail_column(records, "low", bars_needed)[1:]
+    prev_closes = tail_column(records, "close", bars_needed)[:-1]
+    return np.maximum(highs - lows, np.maximum(np.abs(highs - prev_closes), np.abs(lows - prev_closes)))
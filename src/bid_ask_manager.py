@@ -4,18 +4,32 @@ Manages real-time bid/ask quotes, spread analysis, and intelligent order placeme
 """
 
 import logging
-from typing import Dict, Any, Optional, Tuple, Deque, List
+import threading
+from typing import Dict, Any, Optional, Tuple, Deque, List, Sequence
 from collections import deque
 from datetime import datetime, time
 from dataclasses import dataclass, field
+from time import monotonic
 import statistics
 
+import pytz
+
+from indicator_engine import RollingExtreme, RollingMean, RollingStats
+
 logger = logging.getLogger(__name__)
 
 
 @dataclass
 class BidAskQuote:
-    """Real-time bid/ask market data."""
+    """
+    Real-time bid/ask market data.
+    
+    BidAskManager keeps one quote per symbol and overwrites it in place on
+    every update (see update()) under its quote lock. Readers on other threads
+    get a copy() taken under the same lock (BidAskManager.get_current_quote).
+    """
+    __slots__ = ("bid_price", "ask_price", "bid_size", "ask_size", "last_trade_price", "timestamp")
+    
     bid_price: float
     ask_price: float
     bid_size: int
@@ -23,6 +37,21 @@ class BidAskQuote:
     last_trade_price: float
     timestamp: int  # milliseconds
     
+    def update(self, bid_price: float, ask_price: float, bid_size: int,
+               ask_size: int, last_trade_price: float, timestamp: int) -> None:
+        """Overwrite all fields with a newer quote."""
+        self.bid_price = bid_price
+        self.ask_price = ask_price
+        self.bid_size = bid_size
+        self.ask_size = ask_size
+        self.last_trade_price = last_trade_price
+        self.timestamp = timestamp
+    
+    def copy(self) -> "BidAskQuote":
+        """Snapshot of the current values."""
+        return BidAskQuote(self.bid_price, self.ask_price, self.bid_size,
+                           self.ask_size, self.last_trade_price, self.timestamp)
+    
     @property
     def spread(self) -> float:
         """Calculate bid/ask spread."""
@@ -186,49 +215,58 @@ class SpreadAnalyzer:
         """
         Initialize spread analyzer.
         
+        Statistics are kept incrementally (sliding-window Welford mean/stdev,
+        monotonic deques for min/max, fixed-size per-hour windows), so each
+        quote costs O(1) regardless of the lookback.
+        
         Args:
             lookback_periods: Number of spread samples to track
             abnormal_multiplier: Multiplier for abnormal spread detection
         """
         self.lookback_periods = lookback_periods
         self.abnormal_multiplier = abnormal_multiplier
-        self.spread_history: Deque[float] = deque(maxlen=lookback_periods)
+        self._stats = RollingStats(lookback_periods)
+        self._min_spread = RollingExtreme(lookback_periods, maximum=False)
+        self._max_spread = RollingExtreme(lookback_periods, maximum=True)
+        self.spread_history: Deque[float] = self._stats.values
         self.average_spread: Optional[float] = None
         self.std_dev_spread: Optional[float] = None
         
         # Requirement 7: Time-of-day spread patterns
-        self.time_of_day_spreads: Dict[int, List[float]] = {}  # hour -> spreads
+        self.time_of_day_spreads: Dict[int, RollingMean] = {}  # hour -> last 100 spreads
         
         # Requirement 8: Spread widening detection
         self.recent_spreads: Deque[float] = deque(maxlen=5)  # Last 5 spreads for widening detection
     
-    def update(self, spread: float, timestamp: Optional[datetime] = None) -> None:
+    def update(self, spread: float, timestamp: Optional[datetime] = None,
+               hour: Optional[int] = None) -> None:
         """
         Update spread history with new spread value.
         
         Args:
             spread: Current bid/ask spread
             timestamp: Optional timestamp for time-of-day tracking
+            hour: Hour of day of the quote (used instead of timestamp.hour if given)
         """
-        self.spread_history.append(spread)
+        stats = self._stats
+        stats.update(spread)
+        self._min_spread.update(spread)
+        self._max_spread.update(spread)
         self.recent_spreads.append(spread)
         
-        # Track time-of-day patterns
-        if timestamp:
+        # Track time-of-day patterns (last 100 spreads per hour)
+        if hour is None and timestamp:
             hour = timestamp.hour
-            if hour not in self.time_of_day_spreads:
-                self.time_of_day_spreads[hour] = []
-            self.time_of_day_spreads[hour].append(spread)
-            
-            # Keep only last 100 spreads per hour
-            if len(self.time_of_day_spreads[hour]) > 100:
-                self.time_of_day_spreads[hour].pop(0)
-        
-        # Recalculate statistics if we have enough data
-        if len(self.spread_history) >= 20:  # Minimum 20 samples for stats
-            self.average_spread = statistics.mean(self.spread_history)
-            if len(self.spread_history) >= 2:
-                self.std_dev_spread = statistics.stdev(self.spread_history)
+        if hour is not None:
+            hour_spreads = self.time_of_day_spreads.get(hour)
+            if hour_spreads is None:
+                hour_spreads = self.time_of_day_spreads[hour] = RollingMean(100)
+            hour_spreads.update(spread)
+        
+        # Publish statistics once we have enough data
+        if stats.count >= 20:  # Minimum 20 samples for stats
+            self.average_spread = stats.mean
+            self.std_dev_spread = stats.stdev
     
     def is_spread_widening(self) -> Tuple[bool, str]:
         """
@@ -262,12 +300,11 @@ class SpreadAnalyzer:
         Returns:
             Expected spread or None if no data
         """
-        hour = timestamp.hour
-        
-        if hour not in self.time_of_day_spreads or not self.time_of_day_spreads[hour]:
+        hour_spreads = self.time_of_day_spreads.get(timestamp.hour)
+        if hour_spreads is None:
             return None
         
-        return statistics.mean(self.time_of_day_spreads[hour])
+        return hour_spreads.mean
     
     def is_spread_acceptable(self, current_spread: float) -> Tuple[bool, str]:
         """
@@ -295,9 +332,9 @@ class SpreadAnalyzer:
         return {
             "average_spread": self.average_spread,
             "std_dev_spread": self.std_dev_spread,
-            "current_samples": len(self.spread_history),
-            "min_spread": min(self.spread_history) if self.spread_history else None,
-            "max_spread": max(self.spread_history) if self.spread_history else None
+            "current_samples": self._stats.count,
+            "min_spread": self._min_spread.value,
+            "max_spread": self._max_spread.value
         }
 
 
@@ -363,6 +400,10 @@ class QueuePositionMonitor:
         
         CRITICAL FIX: When cancellation fails due to asyncio errors, we return
         "cancel_failed" to prevent the caller from placing a duplicate order.
+        
+        This polls and blocks the calling thread until the order resolves. Code
+        running on the event loop uses PassiveOrderTracker instead, which makes
+        the same decisions from quote and fill events without waiting.
         The original order may still be pending at the broker.
         
         Args:
@@ -543,6 +584,198 @@ class OrderRejectionValidator:
         return True, "Order entry validated"
 
 
+@dataclass
+class TrackedOrder:
+    """Working passive limit order watched by PassiveOrderTracker."""
+    order_id: Any
+    symbol: str
+    order_side: str  # 'BUY' (resting bid) or 'SELL' (resting offer)
+    quantity: int
+    limit_price: float
+    timeout: float  # Seconds before cancelling and going aggressive
+    placed_at: float  # time.monotonic() when tracking started
+    filled_quantity: int = 0
+    status: str = "working"  # working -> filled | escalating -> done
+    reason: str = ""  # Why the order was escalated ("price_moved_away" or "timeout")
+    context: Dict[str, Any] = field(default_factory=dict)  # Caller data for the escalation
+    
+    @property
+    def remaining(self) -> int:
+        """Contracts not yet filled."""
+        return max(self.quantity - self.filled_quantity, 0)
+
+
+class PassiveOrderTracker:
+    """
+    Event-driven tracking of passive limit orders.
+    Gap #2: Limit order queue monitoring without blocking
+    
+    Makes the same decisions as QueuePositionMonitor.monitor_limit_order_queue
+    without polling: fills come in through on_fill() (broker fill callbacks),
+    price-moved-away checks run in on_quote() on each quote update, and
+    check_timeouts() is called from the periodic timer for orders on a quiet
+    market. Orders that must be cancelled and sent aggressively are returned
+    to the caller exactly once (status "escalating"); the caller acts on them
+    and then calls finish().
+    
+    on_quote() may run on the market data thread while the other methods run
+    on the event loop, so state changes are made under a lock. Symbols with no
+    working order return immediately without taking it.
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize passive order tracker.
+        
+        Args:
+            config: Bot configuration dictionary
+        """
+        self.tick_size = config.get("tick_size", 0.25)
+        self.price_move_threshold = 2  # Cancel if price moves 2+ ticks away
+        self._orders: Dict[Any, TrackedOrder] = {}
+        self._by_symbol: Dict[str, Dict[Any, TrackedOrder]] = {}
+        self._lock = threading.Lock()
+    
+    def track(self, order_id: Any, symbol: str, order_side: str, quantity: int,
+              limit_price: float, timeout: float,
+              context: Optional[Dict[str, Any]] = None) -> TrackedOrder:
+        """
+        Start watching a passive limit order that was just placed.
+        
+        Args:
+            order_id: Broker order ID
+            symbol: Instrument symbol
+            order_side: 'BUY' or 'SELL'
+            quantity: Order quantity (contracts)
+            limit_price: Limit price
+            timeout: Seconds to wait for a fill before escalating
+            context: Data the caller needs when escalating (e.g. fallback price)
+        
+        Returns:
+            TrackedOrder
+        """
+        order = TrackedOrder(
+            order_id=order_id,
+            symbol=symbol,
+            order_side=order_side,
+            quantity=quantity,
+            limit_price=limit_price,
+            timeout=timeout,
+            placed_at=monotonic(),
+            context=context or {}
+        )
+        with self._lock:
+            self._orders[order_id] = order
+            self._by_symbol.setdefault(symbol, {})[order_id] = order
+        logger.info(f"📊 Queue Monitor: Watching {order_side} limit @ ${limit_price:.2f} "
+                    f"(max wait {timeout}s, cancel if price moves {self.price_move_threshold}+ ticks away)")
+        return order
+    
+    def on_fill(self, order_id: Any, quantity: int) -> Optional[TrackedOrder]:
+        """
+        Record a (partial) fill reported by the broker.
+        
+        Args:
+            order_id: Broker order ID
+            quantity: Contracts filled by this report
+        
+        Returns:
+            The tracked order (status "filled" once complete), or None if the
+            order is not tracked
+        """
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return None
+            order.filled_quantity += quantity
+            if order.remaining == 0 and order.status == "working":
+                order.status = "filled"
+                self._remove(order)
+            return order
+    
+    def on_quote(self, symbol: str, bid_price: float, ask_price: float) -> Sequence[TrackedOrder]:
+        """
+        Check the symbol's working orders against a new quote.
+        
+        Args:
+            symbol: Instrument symbol
+            bid_price: Current bid price
+            ask_price: Current ask price
+        
+        Returns:
+            Orders to cancel and send aggressively (each returned once)
+        """
+        if not self._by_symbol.get(symbol):
+            return ()
+        now = monotonic()
+        escalate = []
+        with self._lock:
+            for order in self._by_symbol.get(symbol, {}).values():
+                if order.status != "working":
+                    continue
+                if order.order_side == "BUY":
+                    # Bidding: cancel if the ask runs away above us
+                    price_distance = (ask_price - order.limit_price) / self.tick_size
+                else:
+                    # Offering: cancel if the bid falls away below us
+                    price_distance = (order.limit_price - bid_price) / self.tick_size
+                if price_distance > self.price_move_threshold:
+                    order.status = "escalating"
+                    order.reason = "price_moved_away"
+                    order.context["price_distance"] = price_distance
+                    escalate.append(order)
+                elif now - order.placed_at >= order.timeout:
+                    order.status = "escalating"
+                    order.reason = "timeout"
+                    escalate.append(order)
+        return escalate
+    
+    def check_timeouts(self) -> List[TrackedOrder]:
+        """
+        Find working orders past their timeout (for markets without quotes).
+        
+        Returns:
+            Orders to cancel and send aggressively (each returned once)
+        """
+        if not self._orders:
+            return []
+        now = monotonic()
+        escalate = []
+        with self._lock:
+            for order in self._orders.values():
+                if order.status == "working" and now - order.placed_at >= order.timeout:
+                    order.status = "escalating"
+                    order.reason = "timeout"
+                    escalate.append(order)
+        return escalate
+    
+    def finish(self, order_id: Any) -> None:
+        """
+        Stop tracking an order once the caller has handled its escalation.
+        
+        Args:
+            order_id: Broker order ID
+        """
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is not None:
+                order.status = "done"
+                self._remove(order)
+    
+    def has_working(self, symbol: str) -> bool:
+        """True while a passive order for the symbol is working or being escalated."""
+        return bool(self._by_symbol.get(symbol))
+    
+    def _remove(self, order: TrackedOrder) -> None:
+        """Drop an order from the indexes (lock must be held)."""
+        self._orders.pop(order.order_id, None)
+        symbol_orders = self._by_symbol.get(order.symbol)
+        if symbol_orders is not None:
+            symbol_orders.pop(order.order_id, None)
+            if not symbol_orders:
+                del self._by_symbol[order.symbol]
+
+
 class OrderPlacementStrategy:
     """
     Intelligent order placement strategy that decides between passive and aggressive approaches.
@@ -1257,14 +1490,23 @@ class BidAskManager:
             config: Bot configuration dictionary
         """
         self.config = config
-        self.quotes: Dict[str, BidAskQuote] = {}
+        self.quotes: Dict[str, BidAskQuote] = {}  # One quote per symbol, updated in place
+        self._quote_lock = threading.Lock()  # Guards in-place quote updates against torn reads
         self.spread_analyzers: Dict[str, SpreadAnalyzer] = {}
+        
+        # Hour of day for time-of-day spread tracking, derived only when a
+        # quote falls outside the cached hour [start_ms, end_ms)
+        self._tz = pytz.timezone(config.get("timezone", "US/Eastern"))
+        self._hour_start_ms = 0
+        self._hour_end_ms = 0
+        self._hour = 0
         self.order_strategy = OrderPlacementStrategy(config)
         self.fill_strategy = DynamicFillStrategy(config)
         
         # New components (Requirements 5-8)
         self.spread_cost_tracker = SpreadCostTracker()
         self.queue_monitor = QueuePositionMonitor(config)
+        self.passive_orders = PassiveOrderTracker(config)
         self.rejection_validator = OrderRejectionValidator(config)
         self.slippage_model = AdaptiveSlippageModel(config)
         
@@ -1299,16 +1541,21 @@ class BidAskManager:
             last_price: Last trade price
             timestamp: Quote timestamp (milliseconds)
         """
-        quote = BidAskQuote(
-            bid_price=bid_price,
-            ask_price=ask_price,
-            bid_size=bid_size,
-            ask_size=ask_size,
-            last_trade_price=last_price,
-            timestamp=timestamp
-        )
-        
-        self.quotes[symbol] = quote
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            quote = BidAskQuote(
+                bid_price=bid_price,
+                ask_price=ask_price,
+                bid_size=bid_size,
+                ask_size=ask_size,
+                last_trade_price=last_price,
+                timestamp=timestamp
+            )
+            with self._quote_lock:
+                self.quotes[symbol] = quote
+        else:
+            with self._quote_lock:
+                quote.update(bid_price, ask_price, bid_size, ask_size, last_price, timestamp)
         
         # Update spread analyzer ONLY if quote is valid (no corrupted data)
         if symbol not in self.spread_analyzers:
@@ -1320,22 +1567,40 @@ class BidAskManager:
         # Validate quote before updating spread history to prevent data corruption
         is_valid, validation_reason = quote.is_valid()
         if is_valid:
-            # Update spread with timestamp for time-of-day tracking
-            from datetime import datetime
-            import pytz
-            tz = pytz.timezone(self.config.get("timezone", "US/Eastern"))
-            dt = datetime.fromtimestamp(timestamp / 1000, tz=tz)
-            self.spread_analyzers[symbol].update(quote.spread, dt)
-        else:
+            # Update spread with hour of day for time-of-day tracking
+            if not self._hour_start_ms <= timestamp < self._hour_end_ms:
+                self._set_quote_hour(timestamp)
+            self.spread_analyzers[symbol].update(quote.spread, hour=self._hour)
+        elif logger.isEnabledFor(logging.DEBUG):
             # Skip invalid quotes to prevent spread history corruption
             logger.debug(f"Skipping spread update for {symbol}: {validation_reason}")
         
-        logger.debug(f"Quote updated for {symbol}: Bid={bid_price:.2f}x{bid_size} "
-                    f"Ask={ask_price:.2f}x{ask_size} Spread={quote.spread:.4f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Quote updated for {symbol}: Bid={bid_price:.2f}x{bid_size} "
+                        f"Ask={ask_price:.2f}x{ask_size} Spread={quote.spread:.4f}")
+    
+    def _set_quote_hour(self, timestamp: int) -> None:
+        """
+        Cache the local hour containing a quote timestamp.
+        
+        Args:
+            timestamp: Quote timestamp (milliseconds)
+        """
+        dt = datetime.fromtimestamp(timestamp / 1000, tz=self._tz)
+        self._hour = dt.hour
+        self._hour_start_ms = timestamp - ((dt.minute * 60 + dt.second) * 1000 + timestamp % 1000)
+        self._hour_end_ms = self._hour_start_ms + 3_600_000
     
     def get_current_quote(self, symbol: str) -> Optional[BidAskQuote]:
-        """Get current quote for symbol."""
-        return self.quotes.get(symbol)
+        """
+        Get a snapshot of the current quote for symbol.
+        
+        The stored quote is updated in place on the market data thread, so
+        readers get a copy taken under the quote lock (never a torn quote).
+        """
+        with self._quote_lock:
+            quote = self.quotes.get(symbol)
+            return quote.copy() if quote is not None else None
     
     def validate_entry_spread(self, symbol: str) -> Tuple[bool, str]:
         """
@@ -1347,7 +1612,7 @@ class BidAskManager:
         Returns:
             Tuple of (is_acceptable, reason)
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             return False, "No bid/ask quote available"
         
@@ -1372,7 +1637,7 @@ class BidAskManager:
         Returns:
             Order parameters dictionary with strategy details
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             raise ValueError(f"No quote available for {symbol}")
         
@@ -1487,7 +1752,7 @@ class BidAskManager:
             quantity: Number of contracts
             order_type: 'passive' or 'aggressive'
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             logger.warning(f"Cannot record execution for {symbol}: no quote data")
             return
@@ -1523,7 +1788,7 @@ class BidAskManager:
         Returns:
             Expected slippage in ticks, or None if not enough data
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         analyzer = self.spread_analyzers.get(symbol)
         
         if quote is None or analyzer is None:
@@ -1543,7 +1808,7 @@ class BidAskManager:
         Returns:
             Tuple of (should_jump, new_price, reason)
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             return False, 0.0, "No quote available"
         
@@ -1561,7 +1826,7 @@ class BidAskManager:
             Tuple of (condition, reason)
             Conditions: "normal", "volatile", "illiquid", "stressed"
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         analyzer = self.spread_analyzers.get(symbol)
         
         if quote is None or analyzer is None:
@@ -1583,7 +1848,7 @@ class BidAskManager:
         Returns:
             Tuple of (fill_probability, expected_wait_seconds, reason)
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             return 0.0, 0.0, "No quote available"
         
@@ -1638,7 +1903,7 @@ class BidAskManager:
         Returns:
             Tuple of (adjusted_contracts, cost_breakdown)
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             return base_contracts, {}
         
@@ -1665,7 +1930,7 @@ class BidAskManager:
         Returns:
             Exit strategy parameters
         """
-        quote = self.quotes.get(symbol)
+        quote = self.get_current_quote(symbol)
         if quote is None:
             return {
                 "order_type": "aggressive",
@@ -10,6 +10,8 @@ from datetime import datetime
 import logging
 import time
 import asyncio
+import threading
+import concurrent.futures
 
 # CRITICAL: Suppress ALL project_x_py loggers BEFORE importing the SDK
 # This catches the root logger and all child loggers (statistics, order_manager, position_manager, etc.)
@@ -50,6 +52,105 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class BrokerEventLoop:
+    """
+    Dedicated broker I/O thread running one persistent asyncio event loop.
+    
+    All SDK coroutines are scheduled onto this loop, so SDK clients, sessions and
+    websockets stay bound to a single loop for the life of the connection instead
+    of creating (and tearing down) a loop per call. Thread-safe: any thread can
+    submit() a coroutine and get a concurrent.futures.Future back.
+    """
+    
+    def __init__(self, name: str = "broker-io"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        """True if the loop thread is alive."""
+        return self.thread is not None and self.thread.is_alive()
+    
+    def in_loop_thread(self) -> bool:
+        """True if called from the broker I/O thread itself."""
+        return threading.current_thread() is self.thread
+    
+    def start(self) -> None:
+        """Start the loop thread (no-op if already running)."""
+        with self._lock:
+            if self.running:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._ready.clear()
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+        self._ready.wait()
+    
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the broker loop.
+        
+        Args:
+            coro: Coroutine to run
+        
+        Returns:
+            Future with the coroutine's result
+        """
+        if not self.running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the broker loop and wait for its result.
+        
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait (None = no limit)
+        
+        Returns:
+            The coroutine's result
+        """
+        if self.in_loop_thread():
+            # Blocking here would deadlock the loop - callers on the loop must await instead
+            coro.close()
+            raise RuntimeError("Blocking broker call made from the broker I/O thread")
+        return self.submit(coro).result(timeout=timeout)
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel outstanding work, stop the loop and join the thread."""
+        if not self.running or self.in_loop_thread():
+            return
+        
+        async def _shutdown():
+            current = asyncio.current_task()
+            pending = [task for task in asyncio.all_tasks() if task is not current]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await self.loop.shutdown_asyncgens()
+        
+        try:
+            self.run(_shutdown(), timeout=timeout)
+        except Exception:
+            pass  # Silent - best-effort cleanup during shutdown
+        
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=timeout)
+        if not self.thread.is_alive():
+            self.loop.close()
+        self.thread = None
+
+
 class BrokerInterface(ABC):
     """
     Abstract base class for broker operations.
@@ -178,6 +279,15 @@ class BrokerInterface(ABC):
         """
         pass
     
+    def subscribe_order_fills(self, callback: Callable[[Any, str, int, float], None]) -> None:
+        """
+        Subscribe to fill reports for the account's orders.
+        
+        Args:
+            callback: Function to call for each fill (order_id, symbol, quantity, price)
+        """
+        pass  # Default implementation - override in subclasses
+    
     @abstractmethod
     def fetch_historical_bars(self, symbol: str, timeframe: int, count: int) -> list:
         """
@@ -240,8 +350,12 @@ class BrokerSDKImplementation(BrokerInterface):
         
         # WebSocket streamer for live data
         self.websocket_streamer: Optional[BrokerWebSocketStreamer] = None
+        self.user_streamer: Optional[BrokerWebSocketStreamer] = None  # Account fills (user hub)
         self._contract_id_cache: Dict[str, str] = {}  # symbol -> contract_id mapping (populated during connection)
         
+        # Persistent broker I/O loop - every SDK call runs here (see BrokerEventLoop)
+        self.io = BrokerEventLoop()
+        
         # Dynamic balance tracking for auto-reconfiguration
         self._last_configured_balance: float = 0.0
         self._balance_change_threshold: float = 0.05  # Reconfigure if balance changes by 5%
@@ -348,49 +462,6 @@ class BrokerSDKImplementation(BrokerInterface):
         
         return None
     
-    @staticmethod
-    def _cleanup_event_loop(loop: asyncio.AbstractEventLoop) -> None:
-        """
-        Properly clean up an asyncio event loop to prevent Windows proactor errors.
-        
-        On Windows, the ProactorEventLoop can have its proactor set to None when
-        the loop is closed before all async operations complete, leading to:
-        AttributeError: 'NoneType' object has no attribute 'send'
-        
-        This method ensures all pending tasks are cancelled and async generators
-        are shut down before closing the loop.
-        
-        Args:
-            loop: The event loop to clean up
-        """
-        try:
-            # Check if loop is already closed
-            if loop.is_closed():
-                return
-            
-            # Cancel all pending tasks
-            pending = asyncio.all_tasks(loop)
-            for task in pending:
-                task.cancel()
-            
-            # Wait for all tasks to complete cancellation
-            if pending:
-                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-            
-            # Shutdown async generators
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            
-            # Now safe to close the loop
-            loop.close()
-        except Exception:
-            # If cleanup fails, still try to close the loop
-            # Suppress any errors as we're in cleanup
-            try:
-                if not loop.is_closed():
-                    loop.close()
-            except Exception:
-                pass
-    
     def _get_position_symbol(self, position: Any) -> str:
         """
         Get the symbol from an SDK Position object.
@@ -451,15 +522,13 @@ class BrokerSDKImplementation(BrokerInterface):
         Returns:
             True if connected, False if all retries failed
         """
-        import asyncio
-        
         if self.circuit_breaker_open:
             logger.error("Circuit breaker is open - cannot connect")
             return False
         
-        # Use the async version wrapped in asyncio.run
+        # Run the async version on the persistent broker loop
         retries = max_retries if max_retries is not None else self.max_retries
-        return asyncio.run(self.connect_async(retries))
+        return self.io.run(self.connect_async(retries))
     
     async def connect_async(self, max_retries: int = 3) -> bool:
         """
@@ -626,8 +695,7 @@ class BrokerSDKImplementation(BrokerInterface):
                     self.config = config
                     self._last_configured_balance = account_balance
                     
-                    # CRITICAL: Cache contract IDs while event loop is still active
-                    # This MUST happen here before asyncio.run() completes and closes the loop
+                    # Cache contract IDs up front so orders don't need a lookup round trip
                     try:
                         instruments = await self.sdk_client.search_instruments(query=self.instrument)
                         if instruments and len(instruments) > 0:
@@ -635,6 +703,7 @@ class BrokerSDKImplementation(BrokerInterface):
                             first_contract = getattr(instruments[0], 'id', None)
                             if first_contract:
                                 self._contract_id_cache[self.instrument] = first_contract
+                                self._contract_id_cache[self.instrument.lstrip('/')] = first_contract
                                 pass  # Silent - contract ID cached
                             else:
                                 logger.warning(f"No contract ID found for {self.instrument}")
@@ -678,13 +747,19 @@ class BrokerSDKImplementation(BrokerInterface):
     def disconnect(self) -> None:
         """Disconnect from TopStep SDK and WebSocket."""
         try:
-            # Disconnect WebSocket streamer first
+            # Disconnect WebSocket streamers first
             if self.websocket_streamer:
                 try:
                     self.websocket_streamer.disconnect()
                     self.websocket_streamer = None
                 except Exception as e:
                     pass  # Silent - websocket disconnect error
+            if self.user_streamer:
+                try:
+                    self.user_streamer.disconnect()
+                    self.user_streamer = None
+                except Exception as e:
+                    pass  # Silent - websocket disconnect error
             
             # Close SDK connections
             if self.trading_suite:
@@ -693,6 +768,9 @@ class BrokerSDKImplementation(BrokerInterface):
             if self.sdk_client:
                 self.sdk_client = None
             self.connected = False
+            
+            # Stop the broker I/O loop (restarted on the next connect)
+            self.io.stop()
             pass  # Silent - disconnected from broker
         except Exception as e:
             logger.error(f"Error disconnecting from TopStep SDK: {e}")
@@ -817,34 +895,20 @@ class BrokerSDKImplementation(BrokerInterface):
         
         try:
             # Use search_open_positions() instead of deprecated get_positions()
-            # This is an async function, so we need to run it in the event loop
-            import asyncio
-            try:
-                loop = asyncio.get_running_loop()
-                # If loop is already running, we can't use run_until_complete
-                # Return 0 and log debug - position reconciliation will happen async
-                pass  # Silent - event loop running
-                return 0
-            except RuntimeError:
-                # No running loop, safe to create one
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    positions = loop.run_until_complete(self.sdk_client.search_open_positions())
-                    for pos in positions:
-                        # Get symbol from position - try multiple attribute names
-                        # Position may use contract_id, instrument, symbol, or symbolId
-                        pos_symbol = self._get_position_symbol(pos)
-                        if pos_symbol == symbol or pos_symbol == symbol.lstrip('/'):
-                            # Return signed quantity (positive for long, negative for short)
-                            # SDK uses 'size' attribute (not 'quantity') and 'is_long' property (not position_type.value)
-                            qty = int(pos.size)
-                            self._record_success()  # Successful position query
-                            return qty if pos.is_long else -qty
-                    self._record_success()  # Successful query (no position)
-                    return 0  # No position found
-                finally:
-                    self._cleanup_event_loop(loop)
+            # This is an async function - run it on the persistent broker loop
+            positions = self.io.run(self.sdk_client.search_open_positions(), timeout=self.timeout)
+            for pos in positions:
+                # Get symbol from position - try multiple attribute names
+                # Position may use contract_id, instrument, symbol, or symbolId
+                pos_symbol = self._get_position_symbol(pos)
+                if pos_symbol == symbol or pos_symbol == symbol.lstrip('/'):
+                    # Return signed quantity (positive for long, negative for short)
+                    # SDK uses 'size' attribute (not 'quantity') and 'is_long' property (not position_type.value)
+                    qty = int(pos.size)
+                    self._record_success()  # Successful position query
+                    return qty if pos.is_long else -qty
+            self._record_success()  # Successful query (no position)
+            return 0  # No position found
         except AttributeError as e:
             # Common Windows asyncio proactor error during shutdown - ignore
             if "'NoneType' object has no attribute 'send'" in str(e):
@@ -877,37 +941,8 @@ class BrokerSDKImplementation(BrokerInterface):
             return []
         
         try:
-            import asyncio
-            from concurrent.futures import ThreadPoolExecutor
-            
-            # Define the async query function
-            async def query_positions_async():
-                return await self.sdk_client.search_open_positions()
-            
-            # Define the sync wrapper that runs in a thread
-            def run_in_thread():
-                thread_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(thread_loop)
-                try:
-                    return thread_loop.run_until_complete(query_positions_async())
-                finally:
-                    BrokerSDKImplementation._cleanup_event_loop(thread_loop)
-            
-            try:
-                loop = asyncio.get_running_loop()
-                # If loop is already running, use ThreadPoolExecutor to run in a separate thread
-                # This is critical for AI Mode which runs position scans from event handlers
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(run_in_thread)
-                    positions = future.result(timeout=10)
-            except RuntimeError:
-                # No running loop, safe to create one directly
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    positions = loop.run_until_complete(query_positions_async())
-                finally:
-                    self._cleanup_event_loop(loop)
+            # Runs on the broker I/O thread, so this is safe to call from event handlers (AI Mode)
+            positions = self.io.run(self.sdk_client.search_open_positions(), timeout=10)
             
             # Process positions
             result = []
@@ -944,28 +979,142 @@ class BrokerSDKImplementation(BrokerInterface):
                 logger.debug(f"Error getting all positions: {e}")
             return []
     
-    def place_market_order(self, symbol: str, side: str, quantity: int) -> Optional[Dict[str, Any]]:
-        """Place market order using TopStep SDK."""
-        if not self.connected or self.trading_suite is None:
-            logger.error("Cannot place order: not connected")
-            return None
+    # ------------------------------------------------------------------
+    # Order API
+    #
+    # Every order runs as one coroutine on the broker I/O loop: cached contract
+    # ID -> token check -> order request. The submit_* methods return futures so
+    # callers can overlap orders with other work; the place_* methods are the
+    # blocking equivalents used by the engine.
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _resolved(value: Any) -> concurrent.futures.Future:
+        """Already-completed future (used when an order is rejected up front)."""
+        future = concurrent.futures.Future()
+        future.set_result(value)
+        return future
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """
+        Schedule any SDK coroutine on the broker I/O thread.
+        
+        Args:
+            coro: Coroutine to run
+        
+        Returns:
+            Future with the coroutine's result
+        """
+        return self.io.submit(coro)
+    
+    def _wait(self, future: concurrent.futures.Future) -> Any:
+        """
+        Block on a broker future.
+        
+        On timeout the request is left running (it may already have reached the
+        broker) and its late result is logged when it arrives.
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.add_done_callback(self._log_late_result)
+            raise
+    
+    @staticmethod
+    def _log_late_result(future: concurrent.futures.Future) -> None:
+        """Log the outcome of a broker request that outlived its timeout."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Timed-out broker request failed late: {error}")
+        else:
+            logger.warning(f"Timed-out broker request completed late: {future.result()}")
+    
+    def _unconfirmed_order(self, order_type: str, symbol: str, side: str, quantity: int,
+                           **prices: float) -> Dict[str, Any]:
+        """
+        Order dict for a request that timed out before the broker answered.
+        
+        The order may be live, so it must not be treated as rejected (callers would
+        resubmit and could double the position). Status is UNKNOWN; position
+        reconciliation settles the real state.
+        """
+        logger.warning(f"{order_type} order {side} {quantity} {symbol} timed out after {self.timeout}s "
+                       f"- status unknown, not resubmitting")
+        order = {
+            "order_id": None,
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "type": order_type,
+            "status": "UNKNOWN",
+            "filled_quantity": 0,
+        }
+        order.update(prices)
+        return order
+    
+    async def _send_order_async(self, make_call: Callable[[], Any]) -> Any:
+        """
+        Send an order request optimistically, probing the connection only on failure.
+        
+        If the request fails and the connection turns out to be dead, reconnect and
+        retry once. Timeouts are never retried (the order may have reached the broker).
         
-        # CRITICAL FIX: Verify connection is still alive before placing order
-        # This prevents errors when websocket has silently disconnected
-        if not self.verify_connection():
-            logger.warning("[ORDER] Connection dead - attempting reconnect before order")
-            if not self.connect():
+        Args:
+            make_call: Zero-arg callable returning the SDK order coroutine
+        
+        Returns:
+            SDK order response
+        """
+        # Refresh token if needed (for long-running bots)
+        await self._ensure_token_fresh()
+        
+        try:
+            return await make_call()
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            raise
+        except Exception as e:
+            if self.verify_connection():
+                raise
+            logger.warning(f"[ORDER] Order failed on dead connection ({e}) - reconnecting")
+            if not await self.connect_async(self.max_retries):
                 logger.error("[ORDER] Reconnect failed - cannot place order")
-                return None
-            logger.info("[ORDER] Reconnected successfully - proceeding with order")
+                raise
+            logger.info("[ORDER] Reconnected successfully - retrying order")
+            await self._ensure_token_fresh()
+            return await make_call()
+    
+    def submit_market_order(self, symbol: str, side: str, quantity: int) -> concurrent.futures.Future:
+        """
+        Place a market order without blocking.
         
+        Returns:
+            Future resolving to the order dict (None on failure)
+        """
+        if not self.connected or self.trading_suite is None:
+            logger.error("Cannot place order: not connected")
+            return self._resolved(None)
+        return self.io.submit(self._place_market_order_async(symbol, side, quantity))
+    
+    def place_market_order(self, symbol: str, side: str, quantity: int) -> Optional[Dict[str, Any]]:
+        """Place market order using TopStep SDK."""
+        try:
+            return self._wait(self.submit_market_order(symbol, side, quantity))
+        except concurrent.futures.TimeoutError:
+            return self._unconfirmed_order("MARKET", symbol, side, quantity)
+        except Exception as e:
+            logger.error(f"Error placing market order: {e}")
+            self._record_failure()
+            return None
+    
+    async def _place_market_order_async(self, symbol: str, side: str, quantity: int) -> Optional[Dict[str, Any]]:
         try:
-            import asyncio
             # Import order enums here to avoid module-level import issues
             from project_x_py import OrderSide, OrderType
             
-            # Get contract ID for the symbol dynamically
-            contract_id = self._get_contract_id_sync(symbol)
+            # Get contract ID for the symbol (cached at connect)
+            contract_id = await self._get_contract_id_async(symbol)
             if not contract_id:
                 logger.error(f"Failed to resolve contract ID for {symbol}")
                 return None
@@ -975,29 +1124,13 @@ class BrokerSDKImplementation(BrokerInterface):
             
             pass  # Silent - order placement is logged at higher level
             
-            # Define async wrapper
-            async def place_order_async():
-                # Refresh token if needed (for long-running bots)
-                await self._ensure_token_fresh()
-                
-                return await self.trading_suite.orders.place_market_order(
+            order_response = await self._send_order_async(
+                lambda: self.trading_suite.orders.place_market_order(
                     contract_id=contract_id,
                     side=order_side,
                     size=quantity
                 )
-            
-            # Run async order placement - check for existing event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If we get here, we're in an async context - use thread pool
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    order_response = pool.submit(
-                        lambda: asyncio.run(place_order_async())
-                    ).result()
-            except RuntimeError:
-                # No running loop - safe to use asyncio.run
-                order_response = asyncio.run(place_order_async())
+            )
             
             logger.debug(f"Order response: {order_response}")
             
@@ -1043,28 +1176,36 @@ class BrokerSDKImplementation(BrokerInterface):
             self._record_failure()
             return None
     
-    def place_limit_order(self, symbol: str, side: str, quantity: int, limit_price: float) -> Optional[Dict[str, Any]]:
-        """Place limit order using TopStep SDK."""
+    def submit_limit_order(self, symbol: str, side: str, quantity: int, limit_price: float) -> concurrent.futures.Future:
+        """
+        Place a limit order without blocking.
+        
+        Returns:
+            Future resolving to the order dict (None on failure)
+        """
         if not self.connected or self.trading_suite is None:
             logger.error("Cannot place order: not connected")
+            return self._resolved(None)
+        return self.io.submit(self._place_limit_order_async(symbol, side, quantity, limit_price))
+    
+    def place_limit_order(self, symbol: str, side: str, quantity: int, limit_price: float) -> Optional[Dict[str, Any]]:
+        """Place limit order using TopStep SDK."""
+        try:
+            return self._wait(self.submit_limit_order(symbol, side, quantity, limit_price))
+        except concurrent.futures.TimeoutError:
+            return self._unconfirmed_order("LIMIT", symbol, side, quantity, limit_price=limit_price)
+        except Exception as e:
+            logger.error(f"Error placing limit order: {e}")
+            self._record_failure()
             return None
-        
-        # CRITICAL FIX: Verify connection is still alive before placing order
-        # This prevents errors when websocket has silently disconnected
-        if not self.verify_connection():
-            logger.warning("[ORDER] Connection dead - attempting reconnect before order")
-            if not self.connect():
-                logger.error("[ORDER] Reconnect failed - cannot place order")
-                return None
-            logger.info("[ORDER] Reconnected successfully - proceeding with order")
-        
+    
+    async def _place_limit_order_async(self, symbol: str, side: str, quantity: int, limit_price: float) -> Optional[Dict[str, Any]]:
         try:
-            import asyncio
             # Import order enums here to avoid module-level import issues
             from project_x_py import OrderSide, OrderType
             
-            # Get contract ID for the symbol dynamically
-            contract_id = self._get_contract_id_sync(symbol)
+            # Get contract ID for the symbol (cached at connect)
+            contract_id = await self._get_contract_id_async(symbol)
             if not contract_id:
                 logger.error(f"Failed to resolve contract ID for {symbol}")
                 return None
@@ -1074,30 +1215,14 @@ class BrokerSDKImplementation(BrokerInterface):
             
             pass  # Silent - limit order placement logged at higher level
             
-            # Define async wrapper
-            async def place_order_async():
-                # Refresh token if needed (for long-running bots)
-                await self._ensure_token_fresh()
-                
-                return await self.trading_suite.orders.place_limit_order(
+            order_response = await self._send_order_async(
+                lambda: self.trading_suite.orders.place_limit_order(
                     contract_id=contract_id,
                     side=order_side,
                     size=quantity,
                     limit_price=limit_price
                 )
-            
-            # Run async order placement - check for existing event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If we get here, we're in an async context - use thread pool
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    order_response = pool.submit(
-                        lambda: asyncio.run(place_order_async())
-                    ).result()
-            except RuntimeError:
-                # No running loop - safe to use asyncio.run
-                order_response = asyncio.run(place_order_async())
+            )
             
             logger.debug(f"Order response: {order_response}")
             
@@ -1145,41 +1270,35 @@ class BrokerSDKImplementation(BrokerInterface):
             self._record_failure()
             return None
     
-    def cancel_order(self, order_id: str) -> bool:
-        """Cancel an open order using TopStep SDK."""
+    def submit_cancel_order(self, order_id: str) -> concurrent.futures.Future:
+        """
+        Cancel an order without blocking.
+        
+        Returns:
+            Future resolving to True if cancelled
+        """
         if not self.connected or self.trading_suite is None:
             logger.error("Cannot cancel order: not connected")
+            return self._resolved(False)
+        return self.io.submit(self._cancel_order_async(order_id))
+    
+    def cancel_order(self, order_id: str) -> bool:
+        """Cancel an open order using TopStep SDK."""
+        try:
+            return self._wait(self.submit_cancel_order(order_id))
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"Cancel of order {order_id} timed out after {self.timeout}s - treating as not cancelled")
             return False
-        
+        except Exception as e:
+            logger.error(f"Error cancelling order: {e}")
+            self._record_failure()
+            return False
+    
+    async def _cancel_order_async(self, order_id: str) -> bool:
         try:
-            import asyncio
-            
-            # Define async wrapper
-            async def cancel_order_async():
-                # Refresh token if needed
-                await self._ensure_token_fresh()
-                return await self.trading_suite.orders.cancel_order(order_id=order_id)
-            
-            # Run async order cancellation - check for existing event loop
-            try:
-                loop = asyncio.get_running_loop()
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    cancel_response = pool.submit(
-                        lambda: asyncio.run(cancel_order_async())
-                    ).result()
-            except RuntimeError as e:
-                # Handle "Event loop is closed" error gracefully
-                if "Event loop is closed" in str(e):
-                    logger.warning("Event loop closed during cancel - creating new loop")
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        cancel_response = loop.run_until_complete(cancel_order_async())
-                    finally:
-                        self._cleanup_event_loop(loop)
-                else:
-                    cancel_response = asyncio.run(cancel_order_async())
+            # Refresh token if needed
+            await self._ensure_token_fresh()
+            cancel_response = await self.trading_suite.orders.cancel_order(order_id=order_id)
             
             if cancel_response and cancel_response.success:
                 self._record_success()  # Successful cancellation
@@ -1199,36 +1318,40 @@ class BrokerSDKImplementation(BrokerInterface):
             self._record_failure()
             return False
         except Exception as e:
-            # Handle event loop closed errors gracefully
-            if "Event loop is closed" in str(e):
-                logger.warning("Event loop closed during cancel order - order may still be pending")
-                return False  # Don't record failure for shutdown issues
             logger.error(f"Error cancelling order: {e}")
             self._record_failure()
             return False
     
-    def place_stop_order(self, symbol: str, side: str, quantity: int, stop_price: float) -> Optional[Dict[str, Any]]:
-        """Place stop order using TopStep SDK."""
+    def submit_stop_order(self, symbol: str, side: str, quantity: int, stop_price: float) -> concurrent.futures.Future:
+        """
+        Place a stop order without blocking.
+        
+        Returns:
+            Future resolving to the order dict (None on failure)
+        """
         if not self.connected or self.trading_suite is None:
             logger.error("Cannot place order: not connected")
+            return self._resolved(None)
+        return self.io.submit(self._place_stop_order_async(symbol, side, quantity, stop_price))
+    
+    def place_stop_order(self, symbol: str, side: str, quantity: int, stop_price: float) -> Optional[Dict[str, Any]]:
+        """Place stop order using TopStep SDK."""
+        try:
+            return self._wait(self.submit_stop_order(symbol, side, quantity, stop_price))
+        except concurrent.futures.TimeoutError:
+            return self._unconfirmed_order("STOP", symbol, side, quantity, stop_price=stop_price)
+        except Exception as e:
+            logger.error(f"Error placing stop order: {e}")
+            self._record_failure()
             return None
-        
-        # CRITICAL FIX: Verify connection is still alive before placing order
-        # This prevents errors when websocket has silently disconnected
-        if not self.verify_connection():
-            logger.warning("[ORDER] Connection dead - attempting reconnect before order")
-            if not self.connect():
-                logger.error("[ORDER] Reconnect failed - cannot place order")
-                return None
-            logger.info("[ORDER] Reconnected successfully - proceeding with order")
-        
+    
+    async def _place_stop_order_async(self, symbol: str, side: str, quantity: int, stop_price: float) -> Optional[Dict[str, Any]]:
         try:
-            import asyncio
             # Import order enums here to avoid module-level import issues
             from project_x_py import OrderSide, OrderType
             
-            # Get contract ID for the symbol dynamically (same as market orders)
-            contract_id = self._get_contract_id_sync(symbol)
+            # Get contract ID for the symbol (same as market orders)
+            contract_id = await self._get_contract_id_async(symbol)
             if not contract_id:
                 logger.error(f"Failed to resolve contract ID for {symbol}")
                 return None
@@ -1236,38 +1359,15 @@ class BrokerSDKImplementation(BrokerInterface):
             # Convert side to SDK enum
             order_side = OrderSide.BUY if side.upper() == "BUY" else OrderSide.SELL
             
-            # Define async wrapper - use contract_id and size (not symbol and quantity)
-            async def place_order_async():
-                # Refresh token if needed (for long-running bots)
-                await self._ensure_token_fresh()
-                
-                return await self.trading_suite.orders.place_stop_order(
+            # Use contract_id and size (not symbol and quantity)
+            order_response = await self._send_order_async(
+                lambda: self.trading_suite.orders.place_stop_order(
                     contract_id=contract_id,
                     side=order_side,
                     size=quantity,
                     stop_price=stop_price
                 )
-            
-            # Run async order placement - check for existing event loop
-            try:
-                loop = asyncio.get_running_loop()
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    order_response = pool.submit(
-                        lambda: asyncio.run(place_order_async())
-                    ).result()
-            except RuntimeError as e:
-                # Handle "Event loop is closed" error gracefully
-                if "Event loop is closed" in str(e):
-                    logger.warning("Event loop closed during stop order - creating new loop")
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        order_response = loop.run_until_complete(place_order_async())
-                    finally:
-                        self._cleanup_event_loop(loop)
-                else:
-                    order_response = asyncio.run(place_order_async())
+            )
             
             # Check for success - SDK may return different response formats
             # Try order_response.order first, then order_response.success + orderId
@@ -1314,10 +1414,6 @@ class BrokerSDKImplementation(BrokerInterface):
             self._record_failure()
             return None
         except Exception as e:
-            # Handle event loop closed errors gracefully
-            if "Event loop is closed" in str(e):
-                logger.warning("Event loop closed during stop order - order may still be pending")
-                return None  # Don't record failure for shutdown issues
             logger.error(f"Error placing stop order: {e}")
             self._record_failure()
             return None
@@ -1466,6 +1562,52 @@ class BrokerSDKImplementation(BrokerInterface):
             logger.error(f"Error subscribing to quotes: {e}")
             self._record_failure()
     
+    def subscribe_order_fills(self, callback: Callable[[Any, str, int, float], None]) -> None:
+        """Subscribe to the account's fill reports via the WebSocket user hub."""
+        if not self.connected:
+            logger.error("Cannot subscribe to order fills: not connected")
+            return
+        
+        try:
+            session_token = self.sdk_client.get_session_token()
+            account_info = self.sdk_client.get_account_info()
+            account_id = str(getattr(account_info, 'id', getattr(account_info, 'account_id', '')))
+            if not session_token or not account_id:
+                logger.warning("Missing session token or account ID - order fill updates unavailable")
+                return
+            
+            # Fills come from the user hub, a separate connection from market data
+            if self.user_streamer is None:
+                user_streamer = BrokerWebSocketStreamer(session_token, hub_url="wss://rtc.topstepx.com/hubs/user")
+                if not user_streamer.connect():
+                    logger.warning("User hub connection failed - order fill updates unavailable")
+                    return
+                self.user_streamer = user_streamer
+            
+            # Define callback wrapper to convert WebSocket data format
+            def fill_callback(data):
+                """Handle fill data from WebSocket: [{trade}] or [{'action': ..., 'data': {trade}}]"""
+                fills = data if isinstance(data, list) else [data]
+                for fill in fills:
+                    if isinstance(fill, dict) and isinstance(fill.get('data'), dict):
+                        fill = fill['data']
+                    if not isinstance(fill, dict) or fill.get('voided'):
+                        continue
+                    order_id = fill.get('orderId')
+                    quantity = int(fill.get('size', 0))
+                    if order_id is None or quantity <= 0:
+                        continue
+                    
+                    symbol = self._extract_trading_symbol_from_contract_id(fill.get('contractId', '')) or self.instrument
+                    callback(order_id, symbol, quantity, float(fill.get('price', 0)))
+            
+            self.user_streamer.subscribe_user_trades(account_id, fill_callback)
+            pass  # Silent - fill subscription is internal
+            
+        except Exception as e:
+            logger.error(f"Error subscribing to order fills: {e}")
+            self._record_failure()
+    
     def get_contract_id(self, symbol: str) -> Optional[str]:
         """
         Public method to get contract ID for a symbol.
@@ -1482,76 +1624,77 @@ class BrokerSDKImplementation(BrokerInterface):
     def _get_contract_id_sync(self, symbol: str) -> Optional[str]:
         """
         Get TopStep contract ID for a symbol (e.g., ES -> CON.F.US.EP.Z25).
-        Uses cache to avoid repeated API calls. Falls back to synchronous lookup if not cached.
+        Uses cache to avoid repeated API calls. Falls back to a lookup on the broker loop if not cached.
         """
-        # Check cache first (populated during connection)
-        if symbol in self._contract_id_cache:
-            pass  # Silent - using cached contract ID
-            return self._contract_id_cache[symbol]
-        
-        # Remove leading slash if present (e.g., /ES -> ES)
-        clean_symbol = symbol.lstrip('/')
-        
-        # Not in cache - need to look it up
-        # This shouldn't happen often if connection caching works properly
-        logger.warning(f"Contract ID for {symbol} not in cache - performing lookup")
+        cached = self._cached_contract_id(symbol)
+        if cached:
+            return cached
         
         try:
-            # Use the SDK's synchronous method if available, otherwise async
-            if hasattr(self.sdk_client, 'search_instruments_sync'):
-                instruments = self.sdk_client.search_instruments_sync(query=clean_symbol)
-            else:
-                # Run async method in a new thread with its own event loop
-                import asyncio
-                from concurrent.futures import ThreadPoolExecutor
-                
-                def run_async_search():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        return loop.run_until_complete(
-                            self.sdk_client.search_instruments(query=clean_symbol)
-                        )
-                    finally:
-                        BrokerSDKImplementation._cleanup_event_loop(loop)
-                
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(run_async_search)
-                    instruments = future.result(timeout=10)
-            
-            if instruments and len(instruments) > 0:
-                # Find exact match or closest match
-                for instr in instruments:
-                    # Use helper method to get instrument symbol
-                    instr_symbol = self._get_instrument_symbol(instr)
-                    if instr_symbol == clean_symbol or instr_symbol.startswith(clean_symbol):
-                        contract_id = self._get_instrument_contract_id(instr)
-                        if contract_id:
-                            self._contract_id_cache[symbol] = contract_id
-                            pass  # Silent - contract ID cached
-                            return contract_id
-                
-                # No exact match - use first result
-                contract_id = self._get_instrument_contract_id(instruments[0])
-                if contract_id:
-                    self._contract_id_cache[symbol] = contract_id
-                    pass  # Silent - using first match
-                    return contract_id
-            
-            logger.error(f"No contracts found for symbol: {symbol}")
-            return None
-            
+            if self.io.in_loop_thread():
+                # Already on the broker loop (e.g. a callback) - blocking here would deadlock
+                if hasattr(self.sdk_client, 'search_instruments_sync'):
+                    return self._match_contract_id(symbol, self.sdk_client.search_instruments_sync(query=symbol.lstrip('/')))
+                logger.error(f"Contract ID for {symbol} not cached and cannot be looked up from the broker loop")
+                return None
+            return self.io.run(self._get_contract_id_async(symbol), timeout=10)
         except Exception as e:
             logger.error(f"Error getting contract ID for {symbol}: {e}")
             import traceback
             traceback.print_exc()
             return None
     
+    def _cached_contract_id(self, symbol: str) -> Optional[str]:
+        """Contract ID from the cache (populated during connection), trying /ES and ES forms."""
+        return self._contract_id_cache.get(symbol) or self._contract_id_cache.get(symbol.lstrip('/'))
+    
+    async def _get_contract_id_async(self, symbol: str) -> Optional[str]:
+        """
+        Contract ID for a symbol - cache hit costs no network round trip.
+        Must run on the broker loop.
+        """
+        cached = self._cached_contract_id(symbol)
+        if cached:
+            pass  # Silent - using cached contract ID
+            return cached
+        
+        # Not in cache - need to look it up
+        # This shouldn't happen often if connection caching works properly
+        logger.warning(f"Contract ID for {symbol} not in cache - performing lookup")
+        
+        # Remove leading slash if present (e.g., /ES -> ES)
+        clean_symbol = symbol.lstrip('/')
+        instruments = await self.sdk_client.search_instruments(query=clean_symbol)
+        return self._match_contract_id(symbol, instruments)
+    
+    def _match_contract_id(self, symbol: str, instruments: Any) -> Optional[str]:
+        """Pick the contract for symbol from a search result and cache it."""
+        clean_symbol = symbol.lstrip('/')
+        if instruments and len(instruments) > 0:
+            # Find exact match or closest match
+            for instr in instruments:
+                # Use helper method to get instrument symbol
+                instr_symbol = self._get_instrument_symbol(instr)
+                if instr_symbol == clean_symbol or instr_symbol.startswith(clean_symbol):
+                    contract_id = self._get_instrument_contract_id(instr)
+                    if contract_id:
+                        self._contract_id_cache[symbol] = contract_id
+                        pass  # Silent - contract ID cached
+                        return contract_id
+            
+            # No exact match - use first result
+            contract_id = self._get_instrument_contract_id(instruments[0])
+            if contract_id:
+                self._contract_id_cache[symbol] = contract_id
+                pass  # Silent - using first match
+                return contract_id
+        
+        logger.error(f"No contracts found for symbol: {symbol}")
+        return None
+    
     def fetch_historical_bars(self, symbol: str, timeframe: str, count: int, 
                              start_date: datetime = None, end_date: datetime = None) -> List[Dict[str, Any]]:
         """Fetch historical bars from TopStep."""
-        import asyncio
-        
         if not self.connected or not self.sdk_client:
             logger.error("Cannot fetch bars: not connected")
             return []
@@ -1569,14 +1712,14 @@ class BrokerSDKImplementation(BrokerInterface):
                 unit = 2
             
             # Fetch historical data using get_bars (async method)
-            bars_df = asyncio.run(self.sdk_client.get_bars(
+            bars_df = self.io.run(self.sdk_client.get_bars(
                 symbol=symbol,
                 interval=interval,
                 unit=unit,
                 limit=count,
                 start_time=start_date,
                 end_time=end_date
-            ))
+            ), timeout=self.timeout)
             
             if bars_df is not None and len(bars_df) > 0:
                 # Convert Polars DataFrame to list of dicts
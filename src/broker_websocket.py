@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 
 class BrokerWebSocketStreamer:
-    """Real-time WebSocket streamer for broker market data via SignalR"""
+    """Real-time WebSocket streamer for broker market data (market hub) or account fills (user hub) via SignalR"""
     
     def __init__(self, session_token: str, hub_url: str = None, max_reconnect_attempts: int = 5):
         """
@@ -33,11 +33,13 @@ class BrokerWebSocketStreamer:
         self.on_quote_callback: Optional[Callable] = None
         self.on_trade_callback: Optional[Callable] = None
         self.on_depth_callback: Optional[Callable] = None
+        self.on_user_trade_callback: Optional[Callable] = None
         
         # Stats
         self.quotes_received = 0
         self.trades_received = 0
         self.depth_updates_received = 0
+        self.user_trades_received = 0
         self.last_message_time = None
         
         # Reconnection tracking
@@ -81,6 +83,7 @@ class BrokerWebSocketStreamer:
         self.connection.on("GatewayQuote", self._on_quote)
         self.connection.on("GatewayTrade", self._on_trade)
         self.connection.on("GatewayDepth", self._on_depth)
+        self.connection.on("GatewayUserTrade", self._on_user_trade)
     
     def _on_open(self):
         """Called when WebSocket connection opens"""
@@ -99,6 +102,8 @@ class BrokerWebSocketStreamer:
                         self.connection.send("SubscribeContractTrades", [symbol])
                     elif sub_type == "depth":
                         self.connection.send("Subscribe", [symbol, "Depth"])
+                    elif sub_type == "user_trades":
+                        self.connection.send("SubscribeTrades", [symbol])
                     pass  # Silent - Resubscribed
                 except Exception as e:
                     logger.error(f"Failed to resubscribe to {sub_type} for {symbol}: {e}")
@@ -184,6 +189,16 @@ class BrokerWebSocketStreamer:
             except Exception as e:
                 logger.error(f"Error in depth callback: {e}")
     
+    def _on_user_trade(self, data):
+        """Handle account fill (execution) reports from the user hub"""
+        self.user_trades_received += 1
+        self.last_message_time = time.time()
+        if self.on_user_trade_callback:
+            try:
+                self.on_user_trade_callback(data)
+            except Exception as e:
+                logger.error(f"Error in user trade callback: {e}")
+    
     def subscribe_quotes(self, symbol: str, callback: Callable):
         """Subscribe to real-time quotes using contract ID"""
         self.on_quote_callback = callback
@@ -233,6 +248,20 @@ class BrokerWebSocketStreamer:
         except Exception as e:
             logger.error(f"Failed to subscribe to depth: {e}", exc_info=True)
     
+    def subscribe_user_trades(self, account_id: str, callback: Callable):
+        """Subscribe to the account's fills (requires a user hub connection)"""
+        self.on_user_trade_callback = callback
+        try:
+            self.connection.send("SubscribeTrades", [account_id])
+            pass  # Silent - Subscribed to account fills
+            
+            # Track subscription for reconnection
+            sub = ("user_trades", account_id)
+            if sub not in self.subscriptions:
+                self.subscriptions.append(sub)
+        except Exception as e:
+            logger.error(f"Failed to subscribe to user trades: {e}", exc_info=True)
+    
     def disconnect(self):
         """Disconnect from WebSocket gracefully"""
         try:
@@ -258,6 +287,7 @@ class BrokerWebSocketStreamer:
             'quotes_received': self.quotes_received,
             'trades_received': self.trades_received,
             'depth_updates_received': self.depth_updates_received,
+            'user_trades_received': self.user_trades_received,
             'last_message_time': self.last_message_time
         }
 
@@ -30,6 +30,12 @@ SHORT SIGNAL CONDITIONS (AFTER FLUSH UP) - ALL 9 MUST BE TRUE:
 8. Price Is Above VWAP - Current close > VWAP
 9. Regime Allows Trading - HIGH_VOL or NORMAL regimes (blocks LOW_VOL)
 
+MULTI-TIMEFRAME FLUSHES (flush_timeframes, default [1]):
+Conditions 1-3 can also be checked on 3/5-minute bars rolled up from the
+1-minute bars, to catch flushes too slow to pass on 1-minute bars. Velocity
+is then ticks per bar of that timeframe; RSI, volume and the reversal candle
+are always read from the current 1-minute bar.
+
 STOP LOSS:
 - Long: 2 ticks below flush low
 - Short: 2 ticks above flush high
@@ -49,12 +55,22 @@ TRADE MANAGEMENT:
 """
 
 import logging
-from typing import Dict, Optional, Tuple, Any
+import random
+from typing import Dict, Optional, Sequence, Tuple, Any
 from collections import deque
 from dataclasses import dataclass
 
+import diagnostics
+from bar_aggregator import BarAggregator
+from bar_store import tail_column
+from indicator_engine import RollingExtreme, RollingMean
+
 logger = logging.getLogger(__name__)
 
+# Sampling for the condition diagnostics - kept apart from the global RNG so
+# diagnostics never shift RL exploration (see seed_diagnostic_sampling)
+_diagnostic_rng = random.Random()
+
 
 @dataclass
 class FlushEvent:
@@ -65,6 +81,80 @@ class FlushEvent:
     flush_size_ticks: float  # Total move in ticks
     flush_velocity: float  # Ticks per bar
     bar_count: int  # Number of bars in the flush
+
+
+# Condition keys in evaluation order (SignalCheck.long_conditions / short_conditions)
+LONG_CONDITION_NAMES = (
+    "1_flush_happened", "2_flush_fast", "3_near_bottom", "4_rsi_oversold", "5_volume_spike",
+    "6_stopped_new_lows", "7_reversal_candle", "8_below_vwap", "9_regime_allows",
+)
+SHORT_CONDITION_NAMES = (
+    "1_pump_happened", "2_pump_fast", "3_near_top", "4_rsi_overbought", "5_volume_spike",
+    "6_stopped_new_highs", "7_reversal_candle", "8_above_vwap", "9_regime_allows",
+)
+
+
+@dataclass
+class SignalCheck:
+    """
+    Flush metrics and the 9 conditions for both directions on one bar.
+    Produced by CapitulationDetector.evaluate_bar().
+    """
+    flush_low: float  # Lowest low of the flush window
+    flush_high: float  # Highest high of the flush window
+    flush_range_ticks: float  # Window range in ticks
+    velocity: float  # Ticks per bar
+    bar_count: int  # Bars in the flush window
+    distance_from_low: float  # Ticks from current price down to flush low
+    distance_from_high: float  # Ticks from current price up to flush high
+    current_volume: float
+    avg_volume_20: float
+    rsi: Optional[float]
+    vwap: float
+    regime: str
+    bar_open: float
+    bar_high: float
+    bar_low: float
+    bar_close: float
+    prev_high: float
+    prev_low: float
+    long_conditions: Tuple[bool, ...]  # In LONG_CONDITION_NAMES order
+    short_conditions: Tuple[bool, ...]  # In SHORT_CONDITION_NAMES order
+    timeframe: int = 1  # Minutes per bar of the flush window
+    
+    @property
+    def long_passed(self) -> bool:
+        """All 9 long conditions met."""
+        return all(self.long_conditions)
+    
+    @property
+    def short_passed(self) -> bool:
+        """All 9 short conditions met."""
+        return all(self.short_conditions)
+    
+    @property
+    def volume_ratio(self) -> float:
+        """Current volume / 20-bar average (0 when the average is 0)."""
+        return self.current_volume / self.avg_volume_20 if self.avg_volume_20 > 0 else 0
+    
+    def flush_event(self, direction: str) -> FlushEvent:
+        """
+        Flush described by this bar's window.
+        
+        Args:
+            direction: "DOWN" (long setup) or "UP" (short setup)
+        
+        Returns:
+            FlushEvent
+        """
+        return FlushEvent(
+            direction=direction,
+            flush_low=self.flush_low,
+            flush_high=self.flush_high,
+            flush_size_ticks=self.flush_range_ticks,
+            flush_velocity=self.velocity,
+            bar_count=self.bar_count
+        )
     
 
 class CapitulationDetector:
@@ -95,17 +185,36 @@ class CapitulationDetector:
     TRAILING_DISTANCE_TICKS = 8  # Trail 8 ticks behind peak
     MAX_HOLD_BARS = 20  # Time stop after 20 bars (optional)
     
-    def __init__(self, tick_size: float = 0.25, tick_value: float = 12.50):
+    # Regimes where condition 9 passes
+    TRADEABLE_REGIMES = frozenset({"HIGH_VOL_TRENDING", "HIGH_VOL_CHOPPY", "NORMAL_TRENDING", "NORMAL_CHOPPY", "NORMAL"})
+    
+    # Constants that can be overridden per instance (see dev/parameter_sweep.py)
+    TUNABLE_PARAMETERS = (
+        "MIN_FLUSH_TICKS", "MIN_VELOCITY_TICKS_PER_BAR", "FLUSH_LOOKBACK_BARS",
+        "NEAR_EXTREME_TICKS", "VOLUME_SPIKE_THRESHOLD",
+        "RSI_OVERSOLD_EXTREME", "RSI_OVERBOUGHT_EXTREME", "STOP_BUFFER_TICKS",
+        "BREAKEVEN_TRIGGER_TICKS", "BREAKEVEN_OFFSET_TICKS",
+        "TRAILING_TRIGGER_TICKS", "TRAILING_DISTANCE_TICKS", "MAX_HOLD_BARS",
+    )
+    
+    def __init__(self, tick_size: float = 0.25, tick_value: float = 12.50,
+                 parameters: Optional[Dict[str, float]] = None):
         """
         Initialize the capitulation detector.
         
         Args:
             tick_size: Price movement per tick (0.25 for ES)
             tick_value: Dollar value per tick ($12.50 for ES)
+            parameters: Optional overrides for TUNABLE_PARAMETERS (e.g. a sweep result)
         """
         self.tick_size = tick_size
         self.tick_value = tick_value
         
+        for name, value in (parameters or {}).items():
+            if name not in self.TUNABLE_PARAMETERS:
+                raise ValueError(f"Unknown capitulation parameter: {name}")
+            setattr(self, name, value)
+        
         # State tracking
         self.last_flush: Optional[FlushEvent] = None
         self.bars_since_flush = 0
@@ -127,58 +236,178 @@ class CapitulationDetector:
         Returns:
             Tuple of (all_conditions_met, condition_details)
         """
-        conditions = {}
-        
         # Get recent bars for flush analysis
         if len(bars) < self.FLUSH_LOOKBACK_BARS:
             return False, {"reason": f"Insufficient bars ({len(bars)}/{self.FLUSH_LOOKBACK_BARS})"}
         
-        recent_bars = list(bars)[-self.FLUSH_LOOKBACK_BARS:]
+        check = self.evaluate_bar(*self._flush_window(bars), avg_volume_20, current_bar, prev_bar,
+                                  rsi, current_price, vwap, regime)
+        return self.long_result(check)
+    
+    def check_all_short_conditions(
+        self,
+        bars: deque,
+        current_bar: Dict[str, Any],
+        prev_bar: Dict[str, Any],
+        rsi: Optional[float],
+        avg_volume_20: float,
+        current_price: float,
+        vwap: float,
+        regime: str
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Check ALL 9 conditions for a SHORT entry signal.
         
-        # Calculate flush metrics
-        highest_high = max(bar["high"] for bar in recent_bars)
-        lowest_low = min(bar["low"] for bar in recent_bars)
-        flush_range = highest_high - lowest_low
-        flush_range_ticks = flush_range / self.tick_size
+        Returns:
+            Tuple of (all_conditions_met, condition_details)
+        """
+        # Get recent bars for flush analysis
+        if len(bars) < self.FLUSH_LOOKBACK_BARS:
+            return False, {"reason": f"Insufficient bars ({len(bars)}/{self.FLUSH_LOOKBACK_BARS})"}
         
-        # CONDITION 1: Flush Happened (range >= 20 ticks)
-        conditions["1_flush_happened"] = flush_range_ticks >= self.MIN_FLUSH_TICKS
+        check = self.evaluate_bar(*self._flush_window(bars), avg_volume_20, current_bar, prev_bar,
+                                  rsi, current_price, vwap, regime)
+        return self.short_result(check)
+    
+    def _flush_window(self, bars: deque) -> Tuple[float, float, int]:
+        """Highest high, lowest low and bar count of the flush lookback window."""
+        # Zero-copy tail views when bars is a BarStore
+        recent_highs = tail_column(bars, "high", self.FLUSH_LOOKBACK_BARS)
+        recent_lows = tail_column(bars, "low", self.FLUSH_LOOKBACK_BARS)
+        return float(recent_highs.max()), float(recent_lows.min()), len(recent_highs)
+    
+    def evaluate_bar(
+        self,
+        highest_high: float,
+        lowest_low: float,
+        bar_count: int,
+        avg_volume_20: float,
+        current_bar: Dict[str, Any],
+        prev_bar: Dict[str, Any],
+        rsi: Optional[float],
+        current_price: float,
+        vwap: float,
+        regime: str,
+        timeframe: int = 1
+    ) -> "SignalCheck":
+        """
+        Evaluate the 9 conditions for both directions in one pass.
         
-        # CONDITION 2: Flush Was Fast (velocity >= 4 ticks per bar)
-        bar_count = len(recent_bars)
-        velocity = flush_range_ticks / bar_count if bar_count > 0 else 0
-        conditions["2_flush_fast"] = velocity >= self.MIN_VELOCITY_TICKS_PER_BAR
+        Flush metrics are shared by the long and short checks, so they are
+        computed once here (from a FlushTracker or the bar window) and the
+        result is turned into the usual (passed, details) pair by
+        long_result() / short_result().
         
-        # CONDITION 3: We Are Near The Bottom (within 5 ticks of flush low)
-        distance_from_low = (current_price - lowest_low) / self.tick_size
-        conditions["3_near_bottom"] = distance_from_low <= self.NEAR_EXTREME_TICKS
+        Args:
+            highest_high: Highest high of the flush lookback window
+            lowest_low: Lowest low of the flush lookback window
+            bar_count: Bars in the flush lookback window
+            avg_volume_20: 20-bar average volume
+            current_bar: Current 1-minute bar
+            prev_bar: Previous 1-minute bar
+            rsi: Current RSI (None if not available)
+            current_price: Current price (bar close)
+            vwap: Current VWAP
+            regime: Current regime name
+            timeframe: Minutes per bar of the flush window (velocity is per
+                       bar of this timeframe)
         
-        # CONDITION 4: RSI Is Extreme Oversold (RSI < 25)
-        if rsi is not None:
-            conditions["4_rsi_oversold"] = rsi < self.RSI_OVERSOLD_EXTREME
-        else:
-            conditions["4_rsi_oversold"] = False
+        Returns:
+            SignalCheck for this bar
+        """
+        tick_size = self.tick_size
         
-        # CONDITION 5: Volume Spiked (current volume >= 1.2x 20-bar average)
+        # Calculate flush metrics
+        flush_range_ticks = (highest_high - lowest_low) / tick_size
+        velocity = flush_range_ticks / bar_count if bar_count > 0 else 0
+        distance_from_low = (current_price - lowest_low) / tick_size
+        distance_from_high = (highest_high - current_price) / tick_size
         current_volume = current_bar.get("volume", 0)
-        conditions["5_volume_spike"] = current_volume >= (avg_volume_20 * self.VOLUME_SPIKE_THRESHOLD)
-        
-        # CONDITION 6: Flush Stopped Making New Lows (current bar low >= prev bar low)
-        conditions["6_stopped_new_lows"] = current_bar["low"] >= prev_bar["low"]
         
-        # CONDITION 7: Reversal Candle (current bar closes green - close > open)
-        conditions["7_reversal_candle"] = current_bar["close"] > current_bar["open"]
+        bar_open = current_bar["open"]
+        bar_high = current_bar["high"]
+        bar_low = current_bar["low"]
+        bar_close = current_bar["close"]
+        prev_high = prev_bar["high"]
+        prev_low = prev_bar["low"]
+        
+        # Conditions shared by both directions
+        flush_happened = flush_range_ticks >= self.MIN_FLUSH_TICKS
+        flush_fast = velocity >= self.MIN_VELOCITY_TICKS_PER_BAR
+        volume_spike = current_volume >= (avg_volume_20 * self.VOLUME_SPIKE_THRESHOLD)
+        regime_allows = regime in self.TRADEABLE_REGIMES
+        
+        long_conditions = (
+            flush_happened,
+            flush_fast,
+            distance_from_low <= self.NEAR_EXTREME_TICKS,
+            rsi is not None and rsi < self.RSI_OVERSOLD_EXTREME,
+            volume_spike,
+            bar_low >= prev_low,
+            bar_close > bar_open,
+            current_price < vwap,
+            regime_allows,
+        )
+        short_conditions = (
+            flush_happened,
+            flush_fast,
+            distance_from_high <= self.NEAR_EXTREME_TICKS,
+            rsi is not None and rsi > self.RSI_OVERBOUGHT_EXTREME,
+            volume_spike,
+            bar_high <= prev_high,
+            bar_close < bar_open,
+            current_price > vwap,
+            regime_allows,
+        )
+        
+        return SignalCheck(
+            flush_low=lowest_low,
+            flush_high=highest_high,
+            flush_range_ticks=flush_range_ticks,
+            velocity=velocity,
+            bar_count=bar_count,
+            distance_from_low=distance_from_low,
+            distance_from_high=distance_from_high,
+            current_volume=current_volume,
+            avg_volume_20=avg_volume_20,
+            rsi=rsi,
+            vwap=vwap,
+            regime=regime,
+            bar_open=bar_open,
+            bar_high=bar_high,
+            bar_low=bar_low,
+            bar_close=bar_close,
+            prev_high=prev_high,
+            prev_low=prev_low,
+            long_conditions=long_conditions,
+            short_conditions=short_conditions,
+            timeframe=timeframe,
+        )
+    
+    def long_result(self, check: "SignalCheck") -> Tuple[bool, Dict[str, Any]]:
+        """
+        Build the LONG (passed, details) result from a SignalCheck.
+        Records the flush in last_flush when all 9 conditions pass.
         
-        # CONDITION 8: Price Is Below VWAP (buying at discount)
-        conditions["8_below_vwap"] = current_price < vwap
+        Args:
+            check: Result of evaluate_bar()
         
-        # CONDITION 9: Regime Allows Trading - RELAXED to allow more regimes
-        # Now allows NORMAL regimes too, to catch daily reversals
-        tradeable_regimes = {"HIGH_VOL_TRENDING", "HIGH_VOL_CHOPPY", "NORMAL_TRENDING", "NORMAL_CHOPPY", "NORMAL"}
-        conditions["9_regime_allows"] = regime in tradeable_regimes
+        Returns:
+            Tuple of (all_conditions_met, condition_details)
+        """
+        conditions = dict(zip(LONG_CONDITION_NAMES, check.long_conditions))
         
         # ALL 9 CONDITIONS MUST BE TRUE
-        all_passed = all(conditions.values())
+        all_passed = check.long_passed
+        
+        rsi = check.rsi
+        vwap = check.vwap
+        regime = check.regime
+        flush_range_ticks = check.flush_range_ticks
+        velocity = check.velocity
+        distance_from_low = check.distance_from_low
+        current_volume = check.current_volume
+        avg_volume_20 = check.avg_volume_20
         
         # Build result details
         details = {
@@ -187,9 +416,9 @@ class CapitulationDetector:
             "velocity": velocity,
             "distance_from_low_ticks": distance_from_low,
             "rsi": rsi,
-            "volume_ratio": current_volume / avg_volume_20 if avg_volume_20 > 0 else 0,
-            "flush_low": lowest_low,
-            "flush_high": highest_high,
+            "volume_ratio": check.volume_ratio,
+            "flush_low": check.flush_low,
+            "flush_high": check.flush_high,
             "vwap": vwap,
             "regime": regime,
             "current_volume": current_volume,
@@ -198,15 +427,8 @@ class CapitulationDetector:
         
         if all_passed:
             # Store flush info for stop calculation
-            self.last_flush = FlushEvent(
-                direction="DOWN",
-                flush_low=lowest_low,
-                flush_high=highest_high,
-                flush_size_ticks=flush_range_ticks,
-                flush_velocity=velocity,
-                bar_count=bar_count
-            )
-            details["stop_price"] = lowest_low - (self.STOP_BUFFER_TICKS * self.tick_size)
+            self.last_flush = check.flush_event("DOWN")
+            details["stop_price"] = check.flush_low - (self.STOP_BUFFER_TICKS * self.tick_size)
             details["target_price"] = vwap
             
             # Log the entry signal
@@ -218,6 +440,8 @@ class CapitulationDetector:
                 logger.info(f"  {status} {key}: {value}")
             logger.info(f"  Flush: {flush_range_ticks:.0f} ticks DOWN")
             logger.info(f"  Velocity: {velocity:.1f} ticks/bar")
+            if check.timeframe > 1:
+                logger.info(f"  Timeframe: {check.timeframe}-minute bars")
             logger.info(f"  RSI: {rsi:.1f}" if rsi else "  RSI: N/A")
             logger.info(f"  Stop: ${details['stop_price']:.2f} | Target: ${vwap:.2f}")
             logger.info("=" * 60)
@@ -226,122 +450,79 @@ class CapitulationDetector:
             failed = [k for k, v in conditions.items() if not v]
             details["failed_conditions"] = failed
             details["reason"] = f"Failed conditions: {', '.join(failed)}"
-            # Log when CLOSE to signal (8 or 9 conditions passed)
             passed_count = 9 - len(failed)
-            if passed_count >= 8:
-                logger.info(f"🎯 CLOSE TO LONG SIGNAL! {passed_count}/9 passed. Failed: {', '.join(failed)}")
-                rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
-                logger.info(f"   flush={flush_range_ticks:.1f}t, vel={velocity:.2f}, rsi={rsi_str}, vol={current_volume:.0f} (avg={avg_volume_20:.0f}, ratio={current_volume/avg_volume_20 if avg_volume_20 > 0 else 0:.2f}x)")
-                logger.info(f"   dist_from_low={distance_from_low:.1f}t, reversal={current_bar['close']:.2f}>{current_bar['open']:.2f}, below_vwap={current_bar['close']:.2f}<{vwap:.2f}")
             
-            # ENHANCED DIAGNOSTIC: Log ALL 9 conditions with actual values every 10 checks
-            # This helps diagnose what's different between backtest and live
-            import random
-            # Check if shutdown is in progress (avoid logging during shutdown)
-            try:
-                from quotrading_engine import _shutdown_in_progress as shutdown_flag
-                skip_diagnostic = shutdown_flag
-            except (ImportError, AttributeError):
-                skip_diagnostic = False
+            # Verbose diagnostics - skipped before any formatting in quiet mode
+            if not diagnostics.QUIET:
+                # Log when CLOSE to signal (8 or 9 conditions passed)
+                if passed_count >= 8:
+                    logger.info(f"🎯 CLOSE TO LONG SIGNAL! {passed_count}/9 passed. Failed: {', '.join(failed)}")
+                    rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
+                    logger.info(f"   flush={flush_range_ticks:.1f}t, vel={velocity:.2f}, rsi={rsi_str}, vol={current_volume:.0f} (avg={avg_volume_20:.0f}, ratio={current_volume/avg_volume_20 if avg_volume_20 > 0 else 0:.2f}x)")
+                    logger.info(f"   dist_from_low={distance_from_low:.1f}t, reversal={check.bar_close:.2f}>{check.bar_open:.2f}, below_vwap={check.bar_close:.2f}<{vwap:.2f}")
             
-            diagnostic_sample = (random.random() < 0.1 or passed_count >= 7) and not skip_diagnostic  # 10% sample OR close to signal
-            if diagnostic_sample:
-                rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
-                print(f"\n🔍 SIGNAL CHECK DIAGNOSTIC (Passed: {passed_count}/9)")
-                print(f"   1. Flush Size: {flush_range_ticks:.1f}t (need >={self.MIN_FLUSH_TICKS}) {'✅' if conditions.get('1_flush_happened') else '❌'}")
-                print(f"   2. Velocity: {velocity:.2f} t/bar (need >={self.MIN_VELOCITY_TICKS_PER_BAR}) {'✅' if conditions.get('2_fast_flush') else '❌'}")
-                print(f"   3. Near Extreme: {distance_from_low:.1f}t from low (need <={self.NEAR_EXTREME_TICKS}) {'✅' if conditions.get('3_near_bottom') else '❌'}")
-                print(f"   4. RSI: {rsi_str} (need <{self.RSI_OVERSOLD_EXTREME}) {'✅' if conditions.get('4_rsi_oversold') else '❌'}")
-                print(f"   5. Volume Spike: {current_volume:.0f} / {avg_volume_20:.0f} = {current_volume/avg_volume_20 if avg_volume_20 > 0 else 0:.2f}x (need >={self.VOLUME_SPIKE_THRESHOLD}x) {'✅' if conditions.get('5_volume_spike') else '❌'}")
-                print(f"   6. Stopped New Lows: cur_low={current_bar['low']:.2f} >= prev_low={prev_bar['low']:.2f} {'✅' if conditions.get('6_stopped_new_lows') else '❌'}")
-                print(f"   7. Reversal Candle: close={current_bar['close']:.2f} > open={current_bar['open']:.2f} {'✅' if conditions.get('7_reversal_candle') else '❌'}")
-                print(f"   8. Below VWAP: close={current_bar['close']:.2f} < vwap={vwap:.2f} {'✅' if conditions.get('8_below_vwap') else '❌'}")
-                print(f"   9. Regime: {regime} (allowed: HIGH_VOL*, NORMAL*) {'✅' if conditions.get('9_regime_allows') else '❌'}")
-                if passed_count >= 7:
-                    print(f"   ⚠️  VERY CLOSE! Only {9-passed_count} condition(s) away from signal!")
+                # ENHANCED DIAGNOSTIC: Log ALL 9 conditions with actual values every 10 checks
+                # This helps diagnose what's different between backtest and live
+                # Check if shutdown is in progress (avoid logging during shutdown)
+                try:
+                    from quotrading_engine import _shutdown_in_progress as shutdown_flag
+                    skip_diagnostic = shutdown_flag
+                except (ImportError, AttributeError):
+                    skip_diagnostic = False
             
-            # DIAGNOSTIC: Log ALL near-misses (8 or 9 conditions) to help debug why 0 signals
-            if passed_count >= 8:
-                rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
-                print(f"⚠️ Near-miss LONG: {passed_count}/9 passed. Failed: {', '.join(failed)}")
-                print(f"   Bar: close={current_bar['close']:.2f}, open={current_bar['open']:.2f}, vol={current_volume:.0f}")
-                print(f"   Flush: {flush_range_ticks:.1f}t (need {self.MIN_FLUSH_TICKS}+), vel={velocity:.2f} (need {self.MIN_VELOCITY_TICKS_PER_BAR}+)")
-                print(f"   RSI: {rsi_str} (need <{self.RSI_OVERSOLD_EXTREME})")
-                print(f"   Volume: {current_volume:.0f} vs avg={avg_volume_20:.0f} (need {current_volume}/{avg_volume_20:.0f} >= {self.VOLUME_SPIKE_THRESHOLD})")
-                print(f"   Distance from low: {distance_from_low:.1f}t (need <={self.NEAR_EXTREME_TICKS})")
-                print(f"   VWAP: close={current_bar['close']:.2f} vs {vwap:.2f} (need below)")
+                diagnostic_sample = (_diagnostic_rng.random() < 0.1 or passed_count >= 7) and not skip_diagnostic  # 10% sample OR close to signal
+                if diagnostic_sample:
+                    rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
+                    print(f"\n🔍 SIGNAL CHECK DIAGNOSTIC (Passed: {passed_count}/9)")
+                    print(f"   1. Flush Size: {flush_range_ticks:.1f}t (need >={self.MIN_FLUSH_TICKS}) {'✅' if conditions.get('1_flush_happened') else '❌'}")
+                    print(f"   2. Velocity: {velocity:.2f} t/bar (need >={self.MIN_VELOCITY_TICKS_PER_BAR}) {'✅' if conditions.get('2_fast_flush') else '❌'}")
+                    print(f"   3. Near Extreme: {distance_from_low:.1f}t from low (need <={self.NEAR_EXTREME_TICKS}) {'✅' if conditions.get('3_near_bottom') else '❌'}")
+                    print(f"   4. RSI: {rsi_str} (need <{self.RSI_OVERSOLD_EXTREME}) {'✅' if conditions.get('4_rsi_oversold') else '❌'}")
+                    print(f"   5. Volume Spike: {current_volume:.0f} / {avg_volume_20:.0f} = {current_volume/avg_volume_20 if avg_volume_20 > 0 else 0:.2f}x (need >={self.VOLUME_SPIKE_THRESHOLD}x) {'✅' if conditions.get('5_volume_spike') else '❌'}")
+                    print(f"   6. Stopped New Lows: cur_low={check.bar_low:.2f} >= prev_low={check.prev_low:.2f} {'✅' if conditions.get('6_stopped_new_lows') else '❌'}")
+                    print(f"   7. Reversal Candle: close={check.bar_close:.2f} > open={check.bar_open:.2f} {'✅' if conditions.get('7_reversal_candle') else '❌'}")
+                    print(f"   8. Below VWAP: close={check.bar_close:.2f} < vwap={vwap:.2f} {'✅' if conditions.get('8_below_vwap') else '❌'}")
+                    print(f"   9. Regime: {regime} (allowed: HIGH_VOL*, NORMAL*) {'✅' if conditions.get('9_regime_allows') else '❌'}")
+                    if passed_count >= 7:
+                        print(f"   ⚠️  VERY CLOSE! Only {9-passed_count} condition(s) away from signal!")
+            
+                # DIAGNOSTIC: Log ALL near-misses (8 or 9 conditions) to help debug why 0 signals
+                if passed_count >= 8:
+                    rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
+                    print(f"⚠️ Near-miss LONG: {passed_count}/9 passed. Failed: {', '.join(failed)}")
+                    print(f"   Bar: close={check.bar_close:.2f}, open={check.bar_open:.2f}, vol={current_volume:.0f}")
+                    print(f"   Flush: {flush_range_ticks:.1f}t (need {self.MIN_FLUSH_TICKS}+), vel={velocity:.2f} (need {self.MIN_VELOCITY_TICKS_PER_BAR}+)")
+                    print(f"   RSI: {rsi_str} (need <{self.RSI_OVERSOLD_EXTREME})")
+                    print(f"   Volume: {current_volume:.0f} vs avg={avg_volume_20:.0f} (need {current_volume}/{avg_volume_20:.0f} >= {self.VOLUME_SPIKE_THRESHOLD})")
+                    print(f"   Distance from low: {distance_from_low:.1f}t (need <={self.NEAR_EXTREME_TICKS})")
+                    print(f"   VWAP: close={check.bar_close:.2f} vs {vwap:.2f} (need below)")
         
         return all_passed, details
     
-    def check_all_short_conditions(
-        self,
-        bars: deque,
-        current_bar: Dict[str, Any],
-        prev_bar: Dict[str, Any],
-        rsi: Optional[float],
-        avg_volume_20: float,
-        current_price: float,
-        vwap: float,
-        regime: str
-    ) -> Tuple[bool, Dict[str, Any]]:
+    def short_result(self, check: "SignalCheck") -> Tuple[bool, Dict[str, Any]]:
         """
-        Check ALL 9 conditions for a SHORT entry signal.
+        Build the SHORT (passed, details) result from a SignalCheck.
+        Records the flush in last_flush when all 9 conditions pass.
+        
+        Args:
+            check: Result of evaluate_bar()
         
         Returns:
             Tuple of (all_conditions_met, condition_details)
         """
-        conditions = {}
-        
-        # Get recent bars for flush analysis
-        if len(bars) < self.FLUSH_LOOKBACK_BARS:
-            return False, {"reason": f"Insufficient bars ({len(bars)}/{self.FLUSH_LOOKBACK_BARS})"}
-        
-        recent_bars = list(bars)[-self.FLUSH_LOOKBACK_BARS:]
-        
-        # Calculate flush metrics
-        highest_high = max(bar["high"] for bar in recent_bars)
-        lowest_low = min(bar["low"] for bar in recent_bars)
-        flush_range = highest_high - lowest_low
-        flush_range_ticks = flush_range / self.tick_size
-        
-        # CONDITION 1: Pump Happened (range >= 20 ticks)
-        conditions["1_pump_happened"] = flush_range_ticks >= self.MIN_FLUSH_TICKS
-        
-        # CONDITION 2: Pump Was Fast (velocity >= 4 ticks per bar)
-        bar_count = len(recent_bars)
-        velocity = flush_range_ticks / bar_count if bar_count > 0 else 0
-        conditions["2_pump_fast"] = velocity >= self.MIN_VELOCITY_TICKS_PER_BAR
-        
-        # CONDITION 3: We Are Near The Top (within 5 ticks of flush high)
-        distance_from_high = (highest_high - current_price) / self.tick_size
-        conditions["3_near_top"] = distance_from_high <= self.NEAR_EXTREME_TICKS
-        
-        # CONDITION 4: RSI Is Extreme Overbought (RSI > 75)
-        if rsi is not None:
-            conditions["4_rsi_overbought"] = rsi > self.RSI_OVERBOUGHT_EXTREME
-        else:
-            conditions["4_rsi_overbought"] = False
-        
-        # CONDITION 5: Volume Spiked (current volume >= 1.2x 20-bar average)
-        current_volume = current_bar.get("volume", 0)
-        conditions["5_volume_spike"] = current_volume >= (avg_volume_20 * self.VOLUME_SPIKE_THRESHOLD)
-        
-        # CONDITION 6: Pump Stopped Making New Highs (current bar high <= prev bar high)
-        conditions["6_stopped_new_highs"] = current_bar["high"] <= prev_bar["high"]
-        
-        # CONDITION 7: Reversal Candle (current bar closes red - close < open)
-        conditions["7_reversal_candle"] = current_bar["close"] < current_bar["open"]
-        
-        # CONDITION 8: Price Is Above VWAP (selling at premium)
-        conditions["8_above_vwap"] = current_price > vwap
-        
-        # CONDITION 9: Regime Allows Trading - RELAXED to allow more regimes
-        # Now allows NORMAL regimes too, to catch daily reversals
-        tradeable_regimes = {"HIGH_VOL_TRENDING", "HIGH_VOL_CHOPPY", "NORMAL_TRENDING", "NORMAL_CHOPPY", "NORMAL"}
-        conditions["9_regime_allows"] = regime in tradeable_regimes
+        conditions = dict(zip(SHORT_CONDITION_NAMES, check.short_conditions))
         
         # ALL 9 CONDITIONS MUST BE TRUE
-        all_passed = all(conditions.values())
+        all_passed = check.short_passed
+        
+        rsi = check.rsi
+        vwap = check.vwap
+        regime = check.regime
+        flush_range_ticks = check.flush_range_ticks
+        velocity = check.velocity
+        distance_from_high = check.distance_from_high
+        current_volume = check.current_volume
+        avg_volume_20 = check.avg_volume_20
         
         # Build result details
         details = {
@@ -350,24 +531,17 @@ class CapitulationDetector:
             "velocity": velocity,
             "distance_from_high_ticks": distance_from_high,
             "rsi": rsi,
-            "volume_ratio": current_volume / avg_volume_20 if avg_volume_20 > 0 else 0,
-            "flush_low": lowest_low,
-            "flush_high": highest_high,
+            "volume_ratio": check.volume_ratio,
+            "flush_low": check.flush_low,
+            "flush_high": check.flush_high,
             "vwap": vwap,
             "regime": regime
         }
         
         if all_passed:
             # Store flush info for stop calculation
-            self.last_flush = FlushEvent(
-                direction="UP",
-                flush_low=lowest_low,
-                flush_high=highest_high,
-                flush_size_ticks=flush_range_ticks,
-                flush_velocity=velocity,
-                bar_count=bar_count
-            )
-            details["stop_price"] = highest_high + (self.STOP_BUFFER_TICKS * self.tick_size)
+            self.last_flush = check.flush_event("UP")
+            details["stop_price"] = check.flush_high + (self.STOP_BUFFER_TICKS * self.tick_size)
             details["target_price"] = vwap
             
             # Log the entry signal
@@ -379,6 +553,8 @@ class CapitulationDetector:
                 logger.info(f"  {status} {key}: {value}")
             logger.info(f"  Pump: {flush_range_ticks:.0f} ticks UP")
             logger.info(f"  Velocity: {velocity:.1f} ticks/bar")
+            if check.timeframe > 1:
+                logger.info(f"  Timeframe: {check.timeframe}-minute bars")
             logger.info(f"  RSI: {rsi:.1f}" if rsi else "  RSI: N/A")
             logger.info(f"  Stop: ${details['stop_price']:.2f} | Target: ${vwap:.2f}")
             logger.info("=" * 60)
@@ -387,37 +563,39 @@ class CapitulationDetector:
             failed = [k for k, v in conditions.items() if not v]
             details["failed_conditions"] = failed
             details["reason"] = f"Failed conditions: {', '.join(failed)}"
-            # Log when CLOSE to signal (8 or 9 conditions passed)
             passed_count = 9 - len(failed)
-            if passed_count >= 8:
-                logger.info(f"🎯 CLOSE TO SHORT SIGNAL! {passed_count}/9 passed. Failed: {', '.join(failed)}")
-                rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
-                logger.info(f"   pump={flush_range_ticks:.1f}t, vel={velocity:.2f}, rsi={rsi_str}, vol={current_volume:.0f} (avg={avg_volume_20:.0f})")
             
-            # ENHANCED DIAGNOSTIC: Log ALL 9 conditions with actual values every 10 checks
-            import random
-            # Check if shutdown is in progress (avoid logging during shutdown)
-            try:
-                from quotrading_engine import _shutdown_in_progress as shutdown_flag
-                skip_diagnostic = shutdown_flag
-            except (ImportError, AttributeError):
-                skip_diagnostic = False
+            # Verbose diagnostics - skipped before any formatting in quiet mode
+            if not diagnostics.QUIET:
+                # Log when CLOSE to signal (8 or 9 conditions passed)
+                if passed_count >= 8:
+                    logger.info(f"🎯 CLOSE TO SHORT SIGNAL! {passed_count}/9 passed. Failed: {', '.join(failed)}")
+                    rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
+                    logger.info(f"   pump={flush_range_ticks:.1f}t, vel={velocity:.2f}, rsi={rsi_str}, vol={current_volume:.0f} (avg={avg_volume_20:.0f})")
+            
+                # ENHANCED DIAGNOSTIC: Log ALL 9 conditions with actual values every 10 checks
+                # Check if shutdown is in progress (avoid logging during shutdown)
+                try:
+                    from quotrading_engine import _shutdown_in_progress as shutdown_flag
+                    skip_diagnostic = shutdown_flag
+                except (ImportError, AttributeError):
+                    skip_diagnostic = False
             
-            diagnostic_sample = (random.random() < 0.1 or passed_count >= 7) and not skip_diagnostic  # 10% sample OR close to signal
-            if diagnostic_sample:
-                rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
-                print(f"\n🔍 SHORT SIGNAL CHECK DIAGNOSTIC (Passed: {passed_count}/9)")
-                print(f"   1. Pump Size: {flush_range_ticks:.1f}t (need >={self.MIN_FLUSH_TICKS}) {'✅' if conditions.get('1_pump_happened') else '❌'}")
-                print(f"   2. Velocity: {velocity:.2f} t/bar (need >={self.MIN_VELOCITY_TICKS_PER_BAR}) {'✅' if conditions.get('2_fast_pump') else '❌'}")
-                print(f"   3. Near Extreme: {distance_from_high:.1f}t from high (need <={self.NEAR_EXTREME_TICKS}) {'✅' if conditions.get('3_near_top') else '❌'}")
-                print(f"   4. RSI: {rsi_str} (need >{self.RSI_OVERBOUGHT_EXTREME}) {'✅' if conditions.get('4_rsi_overbought') else '❌'}")
-                print(f"   5. Volume Spike: {current_volume:.0f} / {avg_volume_20:.0f} = {current_volume/avg_volume_20 if avg_volume_20 > 0 else 0:.2f}x (need >={self.VOLUME_SPIKE_THRESHOLD}x) {'✅' if conditions.get('5_volume_spike') else '❌'}")
-                print(f"   6. Stopped New Highs: cur_high={current_bar['high']:.2f} <= prev_high={prev_bar['high']:.2f} {'✅' if conditions.get('6_stopped_new_highs') else '❌'}")
-                print(f"   7. Reversal Candle: close={current_bar['close']:.2f} < open={current_bar['open']:.2f} {'✅' if conditions.get('7_reversal_candle') else '❌'}")
-                print(f"   8. Above VWAP: close={current_bar['close']:.2f} > vwap={vwap:.2f} {'✅' if conditions.get('8_above_vwap') else '❌'}")
-                print(f"   9. Regime: {regime} (allowed: HIGH_VOL*, NORMAL*) {'✅' if conditions.get('9_regime_allows') else '❌'}")
-                if passed_count >= 7:
-                    print(f"   ⚠️  VERY CLOSE! Only {9-passed_count} condition(s) away from signal!")
+                diagnostic_sample = (_diagnostic_rng.random() < 0.1 or passed_count >= 7) and not skip_diagnostic  # 10% sample OR close to signal
+                if diagnostic_sample:
+                    rsi_str = f"{rsi:.1f}" if rsi is not None else "N/A"
+                    print(f"\n🔍 SHORT SIGNAL CHECK DIAGNOSTIC (Passed: {passed_count}/9)")
+                    print(f"   1. Pump Size: {flush_range_ticks:.1f}t (need >={self.MIN_FLUSH_TICKS}) {'✅' if conditions.get('1_pump_happened') else '❌'}")
+                    print(f"   2. Velocity: {velocity:.2f} t/bar (need >={self.MIN_VELOCITY_TICKS_PER_BAR}) {'✅' if conditions.get('2_fast_pump') else '❌'}")
+                    print(f"   3. Near Extreme: {distance_from_high:.1f}t from high (need <={self.NEAR_EXTREME_TICKS}) {'✅' if conditions.get('3_near_top') else '❌'}")
+                    print(f"   4. RSI: {rsi_str} (need >{self.RSI_OVERBOUGHT_EXTREME}) {'✅' if conditions.get('4_rsi_overbought') else '❌'}")
+                    print(f"   5. Volume Spike: {current_volume:.0f} / {avg_volume_20:.0f} = {current_volume/avg_volume_20 if avg_volume_20 > 0 else 0:.2f}x (need >={self.VOLUME_SPIKE_THRESHOLD}x) {'✅' if conditions.get('5_volume_spike') else '❌'}")
+                    print(f"   6. Stopped New Highs: cur_high={check.bar_high:.2f} <= prev_high={check.prev_high:.2f} {'✅' if conditions.get('6_stopped_new_highs') else '❌'}")
+                    print(f"   7. Reversal Candle: close={check.bar_close:.2f} < open={check.bar_open:.2f} {'✅' if conditions.get('7_reversal_candle') else '❌'}")
+                    print(f"   8. Above VWAP: close={check.bar_close:.2f} > vwap={vwap:.2f} {'✅' if conditions.get('8_above_vwap') else '❌'}")
+                    print(f"   9. Regime: {regime} (allowed: HIGH_VOL*, NORMAL*) {'✅' if conditions.get('9_regime_allows') else '❌'}")
+                    if passed_count >= 7:
+                        print(f"   ⚠️  VERY CLOSE! Only {9-passed_count} condition(s) away from signal!")
         
         return all_passed, details
     
@@ -518,12 +696,120 @@ class CapitulationDetector:
         """
         return bars_held >= self.MAX_HOLD_BARS
     
+    @classmethod
+    def default_parameters(cls) -> Dict[str, float]:
+        """
+        Get the default value of every tunable parameter.
+        
+        Returns:
+            Dict of parameter name -> class default
+        """
+        return {name: getattr(cls, name) for name in cls.TUNABLE_PARAMETERS}
+    
     def reset(self):
         """Reset detector state for new session."""
         self.last_flush = None
         self.bars_since_flush = 0
 
 
+class FlushTracker:
+    """
+    Flush window state for one symbol, updated once per finalized 1-minute bar.
+    
+    Keeps the highest high / lowest low of the last FLUSH_LOOKBACK_BARS bars in
+    monotonic deques and the 20-bar volume as a rolling sum, so a signal check
+    never rereads the bar history. Values match the window the detector reads
+    from the bars (tail of the lookback, 20-bar volume including the current
+    bar, or all bars while fewer than 20 are available).
+    
+    Higher timeframes (e.g. 3 and 5 minutes) are rolled up from the same bars
+    by a shared BarAggregator. Their window is the last lookback_bars bars of
+    that timeframe, the still-forming bar included, so a flush spread over
+    several minutes is measured the same way as a fast one on 1-minute bars.
+    """
+    
+    def __init__(self, lookback_bars: int = CapitulationDetector.FLUSH_LOOKBACK_BARS,
+                 volume_bars: int = 20, timeframes: Sequence[int] = (1,)):
+        """
+        Initialize tracker.
+        
+        Args:
+            lookback_bars: Flush lookback window (bars of each timeframe)
+            volume_bars: Average volume window (1-minute bars)
+            timeframes: Flush timeframes in minutes (1 is always tracked)
+        """
+        self.lookback_bars = lookback_bars
+        self.volume_bars = volume_bars
+        self.timeframes: Tuple[int, ...] = tuple(sorted({1, *(int(tf) for tf in timeframes)}))
+        self.reset()
+    
+    def reset(self) -> None:
+        """Discard all bar history."""
+        self._highest = RollingExtreme(self.lookback_bars, maximum=True)
+        self._lowest = RollingExtreme(self.lookback_bars, maximum=False)
+        self._volume = RollingMean(self.volume_bars)
+        self._aggregator = BarAggregator(self.timeframes)
+        # Completed bars of each higher timeframe (the forming bar comes from the aggregator)
+        history = max(self.lookback_bars - 1, 1)
+        self._completed: Dict[int, Tuple[RollingExtreme, RollingExtreme]] = {
+            tf: (RollingExtreme(history, maximum=True), RollingExtreme(history, maximum=False))
+            for tf in self._aggregator.timeframes
+        }
+        self.bars_seen = 0
+    
+    def update(self, bar: Dict[str, Any]) -> None:
+        """
+        Add a finalized bar.
+        
+        Args:
+            bar: Bar dict with 'high', 'low', 'volume' (and 'timestamp' when
+                 higher timeframes are tracked)
+        """
+        self._highest.update(bar["high"])
+        self._lowest.update(bar["low"])
+        self._volume.update(int(bar.get("volume", 0)))  # Stored as int like BarStore
+        if self._completed:
+            for tf, completed_bar in self._aggregator.update(bar):
+                highest, lowest = self._completed[tf]
+                highest.update(completed_bar["high"])
+                lowest.update(completed_bar["low"])
+        self.bars_seen += 1
+    
+    @property
+    def window(self) -> Tuple[float, float, int]:
+        """Highest high, lowest low and bar count of the flush window."""
+        return self._highest.value, self._lowest.value, self._highest.count
+    
+    def timeframe_window(self, timeframe: int) -> Tuple[float, float, int]:
+        """
+        Flush window on a timeframe.
+        
+        Args:
+            timeframe: Bar size in minutes (one of self.timeframes)
+        
+        Returns:
+            Highest high, lowest low and bar count (the forming bar counts as one)
+        """
+        if timeframe == 1:
+            return self.window
+        current = self._aggregator.current_high_low(timeframe)
+        if current is None:
+            return None, None, 0
+        high, low = current
+        if self.lookback_bars == 1:
+            return high, low, 1
+        highest, lowest = self._completed[timeframe]
+        if highest.count == 0:
+            return high, low, 1
+        return max(highest.value, high), min(lowest.value, low), highest.count + 1
+    
+    @property
+    def avg_volume(self) -> float:
+        """Average volume over the last volume_bars bars (1 before any bar)."""
+        mean = self._volume.mean
+        return 1 if mean is None else mean
+
+
 # Singleton instance
 _detector: Optional[CapitulationDetector] = None
 
@@ -551,3 +837,13 @@ def reset_capitulation_detector():
     global _detector
     if _detector is not None:
         _detector.reset()
+
+
+def seed_diagnostic_sampling(seed: Optional[int]) -> None:
+    """
+    Seed the diagnostic sampling RNG (reproducible backtest output).
+    
+    Args:
+        seed: Seed value (None = reseed from system entropy)
+    """
+    _diagnostic_rng.seed(seed)
@@ -6,6 +6,8 @@ Bots make decisions locally using their own RL brain.
 """
 
 import logging
+import queue
+import threading
 import requests
 import aiohttp
 import asyncio
@@ -114,7 +116,7 @@ class CloudAPIClient:
                 
         except Exception as e:
             pass  # Silent - cloud sync failure is non-critical
-            return False
+            return False
 
     async def report_trade_outcome_async(self, state: Dict, took_trade: bool, pnl: float, duration: float, execution_data: Optional[Dict] = None) -> bool:
         """
@@ -168,3 +170,85 @@ class CloudAPIClient:
         self.license_valid = valid
         status = "valid" if valid else "invalid"
         pass  # Silent - license status is internal
+
+
+class OutcomeReporter:
+    """
+    Fire-and-forget trade outcome reporting.
+    
+    Outcomes are put on a bounded queue and sent by one long-lived background
+    thread that owns a single asyncio event loop (and therefore one reusable
+    aiohttp session). The trading thread never waits on the network; if the
+    queue is full the outcome is dropped with a warning rather than blocking.
+    """
+    
+    def __init__(self, client: CloudAPIClient, max_pending: int = 100):
+        """
+        Initialize outcome reporter.
+        
+        Args:
+            client: Cloud API client used to send outcomes
+            max_pending: Maximum queued outcomes before new ones are dropped
+        """
+        self.client = client
+        self.queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.dropped = 0
+    
+    def start(self) -> None:
+        """Start the background reporting thread."""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="cloud-outcome-reporter", daemon=True)
+        self.thread.start()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the reporting thread after it sends what is already queued.
+        
+        Args:
+            timeout: Seconds to wait for pending outcomes to be sent
+        """
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=timeout)
+    
+    def submit(self, state: Dict, took_trade: bool, pnl: float, duration: float,
+               execution_data: Optional[Dict] = None) -> bool:
+        """
+        Queue an outcome for reporting (never blocks).
+        
+        Returns:
+            True if queued, False if dropped because the queue is full
+        """
+        try:
+            self.queue.put_nowait((state, took_trade, pnl, duration, execution_data))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Cloud outcome queue full - dropped trade outcome ({self.dropped} dropped)")
+            return False
+    
+    def _run(self) -> None:
+        """Reporter thread: drain the queue on one persistent event loop."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            while self.running or not self.queue.empty():
+                try:
+                    outcome = self.queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                try:
+                    loop.run_until_complete(self.client.report_trade_outcome_async(*outcome))
+                except Exception as e:
+                    logger.debug(f"Cloud outcome report failed: {e}")
+        finally:
+            try:
+                loop.run_until_complete(self.client.close())
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            except Exception:
+                pass
+            loop.close()
@@ -292,6 +292,9 @@ class BotConfiguration:
     # Operational Parameters
     shadow_mode: bool = False  # Signal-only mode - shows trading signals without executing trades (manual trading)
     max_bars_storage: int = 200
+    coalesce_ticks: bool = True  # Apply bursts of queued ticks as one bar update (intrabar stops still checked against burst high/low)
+    flush_timeframes: list = field(default_factory=lambda: [1])  # Bar sizes (minutes) scanned for flushes, e.g. [1, 3, 5]
+    quotes_as_ticks: bool = True  # Also feed each quote's last price into the bars as a 1-contract tick (disable when the broker streams real trades)
     
     # Bid/Ask Trading Strategy Parameters
     passive_order_timeout: int = 10  # Seconds to wait for passive order fill
@@ -429,6 +432,12 @@ class BotConfiguration:
         if self.daily_loss_limit <= 0:
             errors.append(f"daily_loss_limit must be positive, got {self.daily_loss_limit}")
         
+        # Validate flush scanning timeframes (minutes)
+        if not self.flush_timeframes or any(
+            not isinstance(tf, int) or isinstance(tf, bool) or tf <= 0 for tf in self.flush_timeframes
+        ):
+            errors.append(f"flush_timeframes must be a list of positive whole minutes, got {self.flush_timeframes}")
+        
         
         # Validate broker configuration - API token is required unless in backtest mode
         # Shadow mode needs API token for live data streaming (but no account login)
@@ -492,6 +501,9 @@ class BotConfiguration:
             # Operational Mode
             "shadow_mode": self.shadow_mode,
             "max_bars_storage": self.max_bars_storage,
+            "coalesce_ticks": self.coalesce_ticks,
+            "flush_timeframes": list(self.flush_timeframes),
+            "quotes_as_ticks": self.quotes_as_ticks,
             
             # Exit Management - HARDCODED (trailing stop handles all exits)
             "breakeven_enabled": self.breakeven_enabled,
@@ -612,6 +624,15 @@ def load_from_env() -> BotConfiguration:
     if os.getenv("BOT_SHADOW_MODE"):
         config.shadow_mode = os.getenv("BOT_SHADOW_MODE").lower() in ("true", "1", "yes")
     
+    if os.getenv("BOT_COALESCE_TICKS"):
+        config.coalesce_ticks = os.getenv("BOT_COALESCE_TICKS").lower() in ("true", "1", "yes")
+    
+    if os.getenv("BOT_FLUSH_TIMEFRAMES"):
+        config.flush_timeframes = [int(tf) for tf in os.getenv("BOT_FLUSH_TIMEFRAMES").split(",") if tf.strip()]
+    
+    if os.getenv("BOT_QUOTES_AS_TICKS"):
+        config.quotes_as_ticks = os.getenv("BOT_QUOTES_AS_TICKS").lower() in ("true", "1", "yes")
+    
     # Time-Based Exit (USER CONFIGURABLE via GUI checkbox)
     if os.getenv("BOT_TIME_EXIT_ENABLED"):
         config.time_stop_enabled = os.getenv("BOT_TIME_EXIT_ENABLED").lower() in ("true", "1", "yes")
@@ -784,6 +805,12 @@ def load_config(environment: Optional[str] = None, backtest_mode: bool = False)
         env_vars_set.add("dry_run")
     if os.getenv("BOT_SHADOW_MODE"):
         env_vars_set.add("shadow_mode")
+    if os.getenv("BOT_COALESCE_TICKS"):
+        env_vars_set.add("coalesce_ticks")
+    if os.getenv("BOT_FLUSH_TIMEFRAMES"):
+        env_vars_set.add("flush_timeframes")
+    if os.getenv("BOT_QUOTES_AS_TICKS"):
+        env_vars_set.add("quotes_as_ticks")
     if os.getenv("BOT_ENVIRONMENT"):
         env_vars_set.add("environment")
     if os.getenv("BOT_BROKER") or os.getenv("BROKER"):
@@ -0,0 +1,42 @@
+"""
+Diagnostics Switch
+==================
+Process-wide flag that turns off verbose per-bar diagnostics: the condition
+dumps and near-miss prints in the capitulation detector, the RL decision
+prints, and the periodic signal-check logs in the engine.
+
+Call sites check the flag before building any message, so in quiet mode the
+f-strings are never formatted - unlike redirecting stdout or raising the log
+level, which still pay for formatting every string. Trade, order and error
+logging is not affected.
+
+Quiet mode is meant for benchmarks, parameter sweeps and repeated backtests:
+
+    import diagnostics
+    diagnostics.set_quiet(True)
+
+or set BOT_QUIET_DIAGNOSTICS=true before the bot modules are imported.
+Call sites read the attribute at run time (diagnostics.QUIET), so the flag
+can be changed at any point.
+"""
+
+import os
+
+# True = skip verbose diagnostics (checked before any formatting)
+QUIET: bool = os.getenv("BOT_QUIET_DIAGNOSTICS", "").lower() in ("true", "1", "yes")
+
+
+def set_quiet(quiet: bool) -> None:
+    """
+    Enable or disable quiet mode.
+
+    Args:
+        quiet: True to skip verbose diagnostics
+    """
+    global QUIET
+    QUIET = quiet
+
+
+def is_quiet() -> bool:
+    """Whether verbose diagnostics are currently disabled."""
+    return QUIET
@@ -7,8 +7,9 @@ import logging
 import signal
 import time
 import threading
+from collections import deque
 from queue import Queue, PriorityQueue, Empty
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from datetime import datetime
 from enum import IntEnum
 from dataclasses import dataclass, field
@@ -40,6 +41,7 @@ class EventType(IntEnum):
     POSITION_RECONCILIATION = 14  # New: Periodic position sync check
     CONNECTION_HEALTH = 15  # New: Periodic broker connection health check
     LICENSE_CHECK = 16  # New: Periodic license validation check
+    ORDER_ESCALATION = 17  # Passive order to cancel and resend aggressively (PassiveOrderTracker)
     
     # Medium priority events
     TICK_DATA = 20
@@ -60,12 +62,79 @@ class Event:
     data: Dict[str, Any] = field(default_factory=dict, compare=False)
 
 
+# (symbol, price, volume, timestamp_ms)
+Tick = Tuple[str, float, int, int]
+
+
+class TickRingBuffer:
+    """
+    Bounded tick buffer between the market-data callback and the event loop.
+    
+    Ticks are stored as plain tuples in a deque, whose append/popleft are atomic
+    so producers never take a lock. The event loop drains ticks in batches.
+    When the buffer is full new ticks are dropped and counted (same policy as
+    the bounded event queue it replaces for tick data).
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        """
+        Initialize tick buffer.
+        
+        Args:
+            capacity: Maximum buffered ticks before new ticks are dropped
+        """
+        self.capacity = capacity
+        self._ticks: deque = deque()
+        self.dropped = 0
+        self.max_depth = 0
+    
+    def push(self, symbol: str, price: float, volume: int, timestamp_ms: int) -> bool:
+        """
+        Buffer one tick (called from the market-data thread).
+        
+        Returns:
+            True if buffered, False if dropped because the buffer is full
+        """
+        depth = len(self._ticks)
+        if depth >= self.capacity:
+            self.dropped += 1
+            return False
+        self._ticks.append((symbol, price, volume, timestamp_ms))
+        if depth >= self.max_depth:
+            self.max_depth = depth + 1
+        return True
+    
+    def drain(self, max_ticks: int) -> List[Tick]:
+        """
+        Remove and return up to max_ticks ticks in arrival order.
+        
+        Args:
+            max_ticks: Batch size limit
+        
+        Returns:
+            List of (symbol, price, volume, timestamp_ms) tuples
+        """
+        ticks = self._ticks
+        count = min(len(ticks), max_ticks)
+        popleft = ticks.popleft
+        return [popleft() for _ in range(count)]
+    
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+
 class EventLoop:
     """
     Event-driven architecture for the trading bot.
     Handles market data, orders, timers, and graceful shutdown.
+    
+    Tick data bypasses the priority queue: on_tick writes into a TickRingBuffer
+    and the loop drains it in batches after servicing timer/control events.
     """
     
+    # Max ticks handed to the tick handler per loop iteration
+    TICK_BATCH_SIZE = 500
+    
     def __init__(self, bot_status: Dict[str, Any], config: Dict[str, Any]):
         """
         Initialize event loop.
@@ -77,11 +146,17 @@ class EventLoop:
         self.bot_status = bot_status
         self.config = config
         self.event_queue: PriorityQueue = PriorityQueue(maxsize=10000)
+        self.tick_buffer = TickRingBuffer(capacity=10000)
         self.running = False
+        
+        # Set by producers to wake the loop when it is idle (only signalled while waiting)
+        self._wakeup = threading.Event()
+        self._waiting = False
         self.shutdown_requested = False
         
         # Event handlers registry
         self.handlers: Dict[EventType, Callable] = {}
+        self.tick_handler: Optional[Callable[[List[Tick]], None]] = None
         
         # Monitoring metrics
         self.metrics = {
@@ -92,6 +167,9 @@ class EventLoop:
             "total_processing_time_ms": 0.0,
             "stall_count": 0,
             "last_iteration_time": None,
+            "ticks_processed": 0,
+            "ticks_dropped": 0,
+            "max_tick_backlog": 0,
         }
         
         # Shutdown handlers
@@ -121,6 +199,15 @@ class EventLoop:
         self.handlers[event_type] = handler
         pass  # Silent - handler registered
     
+    def register_tick_handler(self, handler: Callable[[List[Tick]], None]) -> None:
+        """
+        Register the batch handler for buffered ticks.
+        
+        Args:
+            handler: Callable receiving a list of (symbol, price, volume, timestamp_ms)
+        """
+        self.tick_handler = handler
+    
     def register_shutdown_handler(self, handler: Callable) -> None:
         """
         Register shutdown handler.
@@ -162,11 +249,36 @@ class EventLoop:
             if queue_depth > self.metrics["max_queue_depth"]:
                 self.metrics["max_queue_depth"] = queue_depth
             
+            if self._waiting:
+                self._wakeup.set()
+            
             return True
         except Exception as e:
             logger.error(f"Failed to post event {event_type.name}: {e}")
             return False
     
+    def post_tick(self, symbol: str, price: float, volume: int, timestamp_ms: int) -> bool:
+        """
+        Post a tick to the tick buffer (no Event/dict allocation, no lock).
+        
+        Args:
+            symbol: Instrument symbol
+            price: Tick price
+            volume: Tick volume
+            timestamp_ms: Timestamp in milliseconds
+        
+        Returns:
+            True if buffered, False if dropped (buffer full)
+        """
+        if not self.tick_buffer.push(symbol, price, volume, timestamp_ms):
+            # Log the first drop and then every 1000th to avoid flooding during a burst
+            if self.tick_buffer.dropped % 1000 == 1:
+                logger.error(f"Tick buffer full - dropped {self.tick_buffer.dropped} ticks")
+            return False
+        if self._waiting:
+            self._wakeup.set()
+        return True
+    
     def request_shutdown(self) -> None:
         """Request graceful shutdown of the event loop."""
         self.shutdown_requested = True
@@ -199,14 +311,18 @@ class EventLoop:
                     pass  # Silent shutdown request
                     break
                 
-                # Process events with timeout to prevent blocking
-                try:
-                    event = self.event_queue.get(timeout=0.1)
-                    self._process_event(event)
-                    self.event_queue.task_done()
-                except Empty:
-                    # No events in queue - this is normal
-                    pass
+                # Timer/control events first (priority order), then a batch of ticks
+                processed = self._process_queued_events()
+                if len(self.tick_buffer):
+                    processed += self._process_ticks()
+                
+                if not processed:
+                    # Idle - wait for a producer to post something (or 100ms for housekeeping)
+                    self._wakeup.clear()
+                    self._waiting = True
+                    if not len(self.tick_buffer) and self.event_queue.empty():
+                        self._wakeup.wait(0.1)
+                    self._waiting = False
                 
                 # Update metrics
                 iteration_time_ms = (time.time() - iteration_start) * 1000
@@ -222,15 +338,77 @@ class EventLoop:
                     logger.warning(f"Event loop stall detected: {iteration_time_ms:.2f}ms")
                 
                 self.metrics["last_iteration_time"] = time.time()
-                
-                # Small sleep to prevent busy-waiting
-                time.sleep(0.001)  # 1ms
         
         except Exception as e:
             logger.error(f"Event loop error: {e}", exc_info=True)
         finally:
             self._shutdown()
     
+    def _process_queued_events(self) -> int:
+        """
+        Process all events currently in the priority queue.
+        
+        Returns:
+            Number of events processed
+        """
+        count = 0
+        while True:
+            try:
+                event = self.event_queue.get_nowait()
+            except Empty:
+                return count
+            self._process_event(event)
+            self.event_queue.task_done()
+            count += 1
+            if self.shutdown_requested:
+                return count
+    
+    def _process_ticks(self) -> int:
+        """
+        Drain one batch of buffered ticks into the tick handler.
+        
+        Returns:
+            Number of ticks processed
+        """
+        ticks = self.tick_buffer.drain(self.TICK_BATCH_SIZE)
+        if not ticks:
+            return 0
+        
+        start_time = time.time()
+        try:
+            if self.tick_handler:
+                self.tick_handler(ticks)
+            else:
+                # No batch handler - deliver as individual TICK_DATA events
+                handler = self.handlers.get(EventType.TICK_DATA)
+                if handler is None:
+                    logger.warning(f"No handler registered for event type: {EventType.TICK_DATA.name}")
+                    return len(ticks)
+                for symbol, price, volume, timestamp_ms in ticks:
+                    handler(Event(
+                        priority=EventPriority.MEDIUM.value,
+                        event_type=EventType.TICK_DATA,
+                        timestamp=start_time,
+                        data={"symbol": symbol, "price": price, "volume": volume, "timestamp": timestamp_ms}
+                    ))
+            
+            self.metrics["events_processed"] += len(ticks)
+            self.metrics["ticks_processed"] += len(ticks)
+            
+            # Log slow batches
+            processing_time_ms = (time.time() - start_time) * 1000
+            if processing_time_ms > 100:  # 100ms
+                logger.warning(
+                    f"Slow event processing: {EventType.TICK_DATA.name} batch of {len(ticks)} "
+                    f"took {processing_time_ms:.2f}ms"
+                )
+        except Exception as e:
+            logger.error(f"Error processing tick batch: {e}", exc_info=True)
+        
+        self.metrics["ticks_dropped"] = self.tick_buffer.dropped
+        self.metrics["max_tick_backlog"] = self.tick_buffer.max_depth
+        return len(ticks)
+    
     def _process_event(self, event: Event) -> None:
         """
         Process a single event.
@@ -287,8 +465,8 @@ class EventLoop:
         pass  # Silent - metrics logged only for debugging, not for customers
     
     def get_queue_depth(self) -> int:
-        """Get current event queue depth."""
-        return self.event_queue.qsize()
+        """Get current event queue depth (control events plus buffered ticks)."""
+        return self.event_queue.qsize() + len(self.tick_buffer)
     
     def is_running(self) -> bool:
         """Check if event loop is running."""
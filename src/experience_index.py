@@ -0,0 +1,343 @@
+"""
+Experience Index - Columnar Similarity Search for RL Experiences
+================================================================
+Keeps the pattern-matching fields of every RL experience in NumPy columns so
+SignalConfidenceRL.find_similar_states can score all past trades with one
+vectorized pass and select the top matches with argpartition, instead of
+walking every experience dict in Python and sorting the full list.
+
+Numeric features are stored raw and scaled inside the distance expression,
+and categorical features (flush direction, regime, session, reversal candle,
+no new extreme) are stored as integer codes. The distance is accumulated in
+the same term order as the original loop, so scores and rankings are
+identical to the dict-based implementation.
+
+HistoricalConfidenceIndex keeps the replayed "confidence at the time" of
+every experience up to date as experiences are added, for
+SignalConfidenceRL._calculate_optimal_threshold.
+"""
+
+import bisect
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Pattern matching features in scoring order:
+# (field, default, kind, scale, weight)
+# - "numeric": abs(current - past) / scale * weight
+# - "category": weight if current != past else 0
+SIMILARITY_FEATURES = [
+    # Primary Flush Signals (50%)
+    ('flush_size_ticks', 0, 'numeric', 50.0, 0.20),
+    ('flush_velocity', 0, 'numeric', 10.0, 0.15),
+    ('volume_climax_ratio', 1, 'numeric', 3.0, 0.10),
+    ('flush_direction', 'NEUTRAL', 'category', None, 0.05),
+    # Entry Quality (25%)
+    ('rsi', 50, 'numeric', 100.0, 0.08),
+    ('distance_from_flush_low', 0, 'numeric', 20.0, 0.07),
+    ('reversal_candle', False, 'category', None, 0.05),
+    ('no_new_extreme', False, 'category', None, 0.05),
+    # Market Context (15%)
+    ('vwap_distance_ticks', 0, 'numeric', 100.0, 0.08),
+    ('regime', 'NORMAL', 'category', None, 0.07),
+    # Time Context (10%)
+    ('session', 'RTH', 'category', None, 0.06),
+    ('hour', 12, 'numeric', 24.0, 0.04),
+]
+
+
+class ExperienceIndex:
+    """
+    Append-only columnar index over experience dicts.
+
+    Row i of the index corresponds to experiences[i] in the owning list, so
+    query() returns positions into that list.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self._num_features = len(SIMILARITY_FEATURES)
+        # One vocabulary per categorical column: value -> integer code
+        self._vocab: List[Dict[Any, int]] = [{} for _ in SIMILARITY_FEATURES]
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all rows (vocabularies are kept)."""
+        self._columns = np.zeros((self._num_features, self.INITIAL_CAPACITY), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _encode(self, column: int, value: Any, add: bool) -> float:
+        """Return the code for a categorical value (-1 if unknown and add=False)."""
+        vocab = self._vocab[column]
+        code = vocab.get(value)
+        if code is None:
+            if not add:
+                return -1.0
+            code = len(vocab)
+            vocab[value] = code
+        return float(code)
+
+    def _row(self, experience: Dict, add: bool) -> List[float]:
+        """Extract the feature row for an experience or query state."""
+        row = []
+        for column, (field, default, kind, _, _) in enumerate(SIMILARITY_FEATURES):
+            value = experience.get(field, default)
+            if kind == 'numeric':
+                row.append(float(value))
+            else:
+                row.append(self._encode(column, value, add))
+        return row
+
+    def append(self, experience: Dict) -> None:
+        """
+        Add one experience as the next row.
+
+        Args:
+            experience: Flat experience dict
+        """
+        if self._size == self._columns.shape[1]:
+            grown = np.zeros((self._num_features, self._size * 2), dtype=np.float64)
+            grown[:, :self._size] = self._columns
+            self._columns = grown
+
+        self._columns[:, self._size] = self._row(experience, add=True)
+        self._size += 1
+
+    def rebuild(self, experiences: List[Dict]) -> None:
+        """
+        Replace the index contents with the given experiences.
+
+        Args:
+            experiences: Flat experience dicts, in list order
+        """
+        capacity = max(self.INITIAL_CAPACITY, len(experiences))
+        self._columns = np.zeros((self._num_features, capacity), dtype=np.float64)
+        self._size = 0
+        if experiences:
+            rows = [self._row(exp, add=True) for exp in experiences]
+            self._columns[:, :len(rows)] = np.asarray(rows, dtype=np.float64).T
+            self._size = len(rows)
+
+    def distances(self, current: Dict) -> np.ndarray:
+        """
+        Weighted distance from the current state to every row (lower = more similar).
+
+        Args:
+            current: Current market state dict
+
+        Returns:
+            Array of shape (len(self),)
+        """
+        n = self._size
+        query = self._row(current, add=False)
+        scores = np.zeros(n, dtype=np.float64)
+        for column, (_, _, kind, scale, weight) in enumerate(SIMILARITY_FEATURES):
+            values = self._columns[column, :n]
+            if kind == 'numeric':
+                scores += np.abs(query[column] - values) / scale * weight
+            else:
+                scores += (values != query[column]) * weight
+        return scores
+
+    def query(self, current: Dict, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar rows, most similar first.
+        Ties keep insertion order (same as a stable sort of the full list).
+
+        Args:
+            current: Current market state dict
+            k: Number of results
+
+        Returns:
+            (positions, scores) - row positions of the matches and the
+            distance array for all rows
+        """
+        n = self._size
+        if n == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        scores = self.distances(current)
+        if k < n:
+            # Everything scoring <= the k-th smallest value is a candidate;
+            # including the full tie group keeps the ordering stable.
+            kth_score = scores[np.argpartition(scores, k - 1)[k - 1]]
+            candidates = np.flatnonzero(scores <= kth_score)
+        else:
+            candidates = np.arange(n)
+
+        order = np.argsort(scores[candidates], kind='stable')
+        return candidates[order[:k]], scores
+
+
+class HistoricalConfidenceIndex:
+    """
+    Online replay of the confidence each taken experience would have had.
+
+    For every experience the "historical confidence" is the win rate of the
+    experiences that happened strictly earlier and had a similar RSI
+    (within RSI_WINDOW) and VWAP distance (within VWAP_WINDOW), provided at
+    least MIN_SIMILAR such experiences exist. This is what
+    SignalConfidenceRL._calculate_optimal_threshold replays.
+
+    Rows are kept sorted by timestamp so "earlier" and "later" are contiguous
+    slices found by bisection. Adding an experience computes its own
+    confidence from the earlier slice, updates the later experiences it is
+    similar to, and adjusts the per-threshold totals, so the threshold table
+    never has to be rebuilt from scratch.
+    """
+
+    THRESHOLDS = (0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9)
+    MIN_SIMILAR = 5
+    RSI_WINDOW = 10
+    VWAP_WINDOW = 0.5
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all experiences and reset the threshold table."""
+        capacity = self.INITIAL_CAPACITY
+        self._timestamps: List[Any] = []
+        self._rsi = np.zeros(capacity, dtype=np.float64)
+        self._vwap = np.zeros(capacity, dtype=np.float64)
+        self._reward = np.zeros(capacity, dtype=np.float64)
+        self._taken = np.zeros(capacity, dtype=bool)
+        self._similar = np.zeros(capacity, dtype=np.int64)  # similar earlier experiences
+        self._similar_wins = np.zeros(capacity, dtype=np.int64)
+
+        # Per-threshold totals over taken experiences whose confidence >= threshold
+        self._table_trades = np.zeros(len(self.THRESHOLDS), dtype=np.int64)
+        self._table_wins = np.zeros(len(self.THRESHOLDS), dtype=np.int64)
+        self._table_reward = np.zeros(len(self.THRESHOLDS), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def _grow(self) -> None:
+        capacity = self._rsi.shape[0] * 2
+        for name in ('_rsi', '_vwap', '_reward', '_taken', '_similar', '_similar_wins'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:old.shape[0]] = old
+            setattr(self, name, grown)
+
+    def _threshold_mask(self, similar: np.ndarray, wins: np.ndarray) -> np.ndarray:
+        """(rows, thresholds) bool matrix: confidence >= threshold for qualifying rows."""
+        qualifies = similar >= self.MIN_SIMILAR
+        confidence = np.divide(wins, similar, out=np.zeros(similar.shape, dtype=np.float64),
+                               where=qualifies)
+        thresholds = np.asarray(self.THRESHOLDS)
+        return qualifies[:, None] & (confidence[:, None] >= thresholds[None, :])
+
+    def _apply_to_table(self, mask: np.ndarray, rewards: np.ndarray, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) rows' contributions to the threshold table."""
+        if not mask.any():
+            return
+        self._table_trades += sign * mask.sum(axis=0)
+        self._table_wins += sign * (mask & (rewards[:, None] > 0)).sum(axis=0)
+        self._table_reward += sign * (mask * rewards[:, None]).sum(axis=0)
+
+    def add(self, experience: Dict) -> None:
+        """
+        Add one experience and update all affected confidences.
+
+        Args:
+            experience: Flat experience dict
+        """
+        timestamp = experience.get('timestamp', '')
+        rsi = experience.get('rsi', 50)
+        vwap = experience.get('vwap_distance', 1.0)
+        reward = experience.get('pnl', experience.get('reward', 0))
+        taken = bool(experience.get('took_trade', False))
+
+        n = len(self._timestamps)
+        if n == self._rsi.shape[0]:
+            self._grow()
+
+        earlier_end = bisect.bisect_left(self._timestamps, timestamp)
+        later_start = bisect.bisect_right(self._timestamps, timestamp)
+
+        # Confidence of the new experience from strictly earlier similar experiences
+        before = slice(0, earlier_end)
+        similar_before = ((np.abs(self._rsi[before] - rsi) < self.RSI_WINDOW) &
+                          (np.abs(self._vwap[before] - vwap) < self.VWAP_WINDOW))
+        similar_count = int(similar_before.sum())
+        similar_wins = int((similar_before & (self._reward[before] > 0)).sum())
+
+        # Later experiences similar to the new one gain it in their history
+        after = slice(later_start, n)
+        similar_after = np.flatnonzero(
+            (np.abs(self._rsi[after] - rsi) < self.RSI_WINDOW) &
+            (np.abs(self._vwap[after] - vwap) < self.VWAP_WINDOW)
+        ) + later_start
+        if len(similar_after):
+            # Only taken experiences contribute to the threshold table
+            taken_rows = similar_after[self._taken[similar_after]]
+            rewards = self._reward[taken_rows]
+            self._apply_to_table(
+                self._threshold_mask(self._similar[taken_rows], self._similar_wins[taken_rows]),
+                rewards, -1
+            )
+            self._similar[similar_after] += 1
+            if reward > 0:
+                self._similar_wins[similar_after] += 1
+            self._apply_to_table(
+                self._threshold_mask(self._similar[taken_rows], self._similar_wins[taken_rows]),
+                rewards, 1
+            )
+
+        # Insert the new row after any experiences with the same timestamp
+        position = later_start
+        for array, value in ((self._rsi, rsi), (self._vwap, vwap), (self._reward, reward),
+                             (self._taken, taken), (self._similar, similar_count),
+                             (self._similar_wins, similar_wins)):
+            array[position + 1:n + 1] = array[position:n]
+            array[position] = value
+        self._timestamps.insert(position, timestamp)
+
+        if taken:
+            self._apply_to_table(
+                self._threshold_mask(np.array([similar_count]), np.array([similar_wins])),
+                np.array([float(reward)]), 1
+            )
+
+    def rebuild(self, experiences: List[Dict]) -> None:
+        """
+        Replace the index contents with the given experiences.
+
+        Args:
+            experiences: Flat experience dicts
+        """
+        self.clear()
+        for experience in experiences:
+            self.add(experience)
+
+    def threshold_table(self) -> Dict[float, Dict[str, float]]:
+        """
+        Replayed results for each candidate threshold with at least one trade.
+
+        Returns:
+            {threshold: {'trades', 'win_rate', 'avg_profit', 'expected_value'}}
+        """
+        table = {}
+        for i, threshold in enumerate(self.THRESHOLDS):
+            trades = int(self._table_trades[i])
+            if trades == 0:
+                continue
+            avg_profit = float(self._table_reward[i]) / trades
+            table[threshold] = {
+                'expected_value': avg_profit,
+                'trades': trades,
+                'win_rate': int(self._table_wins[i]) / trades,
+                'avg_profit': avg_profit
+            }
+        return table
@@ -0,0 +1,458 @@
+"""
+Experience Store - Append-Only Binary Columnar Storage for RL Experiences
+==========================================================================
+Replaces rewriting the whole signal_experience.json (indent=2) every few
+trades with an append-only columnar directory next to it:
+
+    experiences/ES/signal_experience.cols/
+        schema.json      - column names/kinds, committed row count, stats
+        c0.col, c1.col   - fixed-width little-endian column data
+        c3.dict          - one JSON value per line (categorical dictionary)
+        overflow.jsonl   - values that don't fit their column's type
+
+Column kinds are picked from the first value seen for a field:
+    bool -> "bool" (uint8), int -> "i8", float -> "f8", str -> "cat" (int32 code)
+Anything else (None, nested values, an int in a float column, ...) goes to
+overflow.jsonl so every experience round-trips exactly.
+
+Appending N rows writes N fixed-width values per column plus any new
+dictionary entries, then rewrites the small schema.json with the new row
+count. Column data beyond the committed row count (interrupted append) is
+truncated the next time the store is opened. Columns are memory-mapped on load.
+
+The JSON file stays the interchange format: import_json() migrates it into
+the store and export_json() writes it back in the original layout.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+STORE_VERSION = 1
+SCHEMA_FILE = "schema.json"
+OVERFLOW_FILE = "overflow.jsonl"
+
+# kind -> (numpy dtype, missing-value sentinel)
+COLUMN_KINDS = {
+    "f8": (np.dtype("<f8"), np.nan),
+    "i8": (np.dtype("<i8"), np.iinfo(np.int64).min),
+    "bool": (np.dtype("u1"), 255),
+    "cat": (np.dtype("<i4"), -1),
+}
+
+
+def store_path_for(json_path: str) -> str:
+    """
+    Columnar store directory used for an experience JSON file.
+
+    Args:
+        json_path: Path to signal_experience.json
+
+    Returns:
+        Path of the sibling .cols directory
+    """
+    base, ext = os.path.splitext(json_path)
+    return (base if ext == ".json" else json_path) + ".cols"
+
+
+def _kind_for(value: Any) -> Optional[str]:
+    """Column kind for a value, or None if it can only live in overflow."""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "i8" if -2**63 < value < 2**63 else None
+    if isinstance(value, float):
+        return "f8" if value == value else None  # NaN marks missing in f8 columns
+    if isinstance(value, str):
+        return "cat"
+    return None
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    """(mtime_ns, size) of a file, used to detect external JSON edits."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def read_json_experiences(json_path: str) -> List[Dict]:
+    """
+    Read experiences from a JSON file (wrapped {'experiences': [...]} or bare list).
+
+    Args:
+        json_path: Path to experience JSON
+
+    Returns:
+        List of experience dicts
+    """
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return data.get('experiences', [])
+    return data
+
+
+class ExperienceStore:
+    """
+    Append-only columnar experience store rooted at a directory.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or prepare to create) a store.
+
+        Args:
+            path: Store directory (see store_path_for)
+        """
+        self.path = path
+        self.rows = 0
+        self.columns: List[Dict[str, str]] = []  # [{'name', 'kind'}] in first-seen order
+        self.stats: Dict = {}
+        self.source: Optional[List[int]] = None  # Signature of the JSON last imported/exported
+        self._column_index: Dict[str, int] = {}
+        self._dictionaries: Dict[int, List[Any]] = {}  # column -> code -> value
+        self._codes: Dict[int, Dict[Any, int]] = {}    # column -> value -> code
+        self._open()
+
+    # ------------------------------------------------------------------
+    # Layout helpers
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        """True if the store has been created on disk."""
+        return os.path.exists(os.path.join(self.path, SCHEMA_FILE))
+
+    def _column_file(self, index: int) -> str:
+        return os.path.join(self.path, f"c{index}.col")
+
+    def _dict_file(self, index: int) -> str:
+        return os.path.join(self.path, f"c{index}.dict")
+
+    def _open(self) -> None:
+        """Load schema and dictionaries, repairing any interrupted append."""
+        if not self.exists():
+            return
+
+        with open(os.path.join(self.path, SCHEMA_FILE), 'r') as f:
+            schema = json.load(f)
+        if schema.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported experience store version: {schema.get('version')}")
+
+        self.rows = schema.get("rows", 0)
+        self.columns = schema.get("columns", [])
+        self.stats = schema.get("stats", {})
+        self.source = schema.get("source")
+        self._column_index = {col["name"]: i for i, col in enumerate(self.columns)}
+
+        for i, col in enumerate(self.columns):
+            # Drop bytes written after the last committed row count
+            dtype = COLUMN_KINDS[col["kind"]][0]
+            expected = self.rows * dtype.itemsize
+            column_file = self._column_file(i)
+            if os.path.getsize(column_file) > expected:
+                with open(column_file, 'r+b') as f:
+                    f.truncate(expected)
+
+            if col["kind"] == "cat":
+                values = []
+                if os.path.exists(self._dict_file(i)):
+                    with open(self._dict_file(i), 'r') as f:
+                        values = [json.loads(line) for line in f if line.strip()]
+                self._dictionaries[i] = values
+                self._codes[i] = {value: code for code, value in enumerate(values)}
+
+        overflow_file = os.path.join(self.path, OVERFLOW_FILE)
+        if os.path.exists(overflow_file):
+            entries = self._read_overflow()
+            committed = [e for e in entries if e["row"] < self.rows]
+            if len(committed) != len(entries):
+                with open(overflow_file, 'w') as f:
+                    for entry in committed:
+                        f.write(json.dumps(entry) + "\n")
+
+    def _read_overflow(self) -> List[Dict]:
+        overflow_file = os.path.join(self.path, OVERFLOW_FILE)
+        if not os.path.exists(overflow_file):
+            return []
+        with open(overflow_file, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _write_schema(self) -> None:
+        """Atomically publish the schema (and with it the committed row count)."""
+        schema = {
+            "version": STORE_VERSION,
+            "rows": self.rows,
+            "columns": self.columns,
+            "stats": self.stats,
+            "source": self.source,
+        }
+        tmp_file = os.path.join(self.path, SCHEMA_FILE + ".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(schema, f)
+        os.replace(tmp_file, os.path.join(self.path, SCHEMA_FILE))
+
+    def _add_column(self, name: str, kind: str) -> int:
+        """Create a column, backfilling existing rows as missing."""
+        index = len(self.columns)
+        self.columns.append({"name": name, "kind": kind})
+        self._column_index[name] = index
+        dtype, missing = COLUMN_KINDS[kind]
+        np.full(self.rows, missing, dtype=dtype).tofile(self._column_file(index))
+        if kind == "cat":
+            self._dictionaries[index] = []
+            self._codes[index] = {}
+            if os.path.exists(self._dict_file(index)):
+                os.remove(self._dict_file(index))  # Left over from an interrupted append
+        return index
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, experiences: List[Dict], stats: Optional[Dict] = None) -> None:
+        """
+        Append experiences. Cost is proportional to len(experiences), not store size.
+
+        Args:
+            experiences: Flat experience dicts to append
+            stats: Optional stats dict to keep with the store (exported to JSON)
+        """
+        if stats is not None:
+            self.stats = stats
+        if not experiences and self.exists():
+            if stats is not None:
+                self._write_schema()
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        start = self.rows
+        count = len(experiences)
+        overflow = []
+
+        # Create any columns first seen in this batch
+        for exp in experiences:
+            for name, value in exp.items():
+                if name not in self._column_index:
+                    kind = _kind_for(value)
+                    if kind is not None:
+                        self._add_column(name, kind)
+
+        new_dict_entries: Dict[int, List[Any]] = {}
+        for index, col in enumerate(self.columns):
+            name, kind = col["name"], col["kind"]
+            dtype, missing = COLUMN_KINDS[kind]
+            data = np.full(count, missing, dtype=dtype)
+
+            for offset, exp in enumerate(experiences):
+                if name not in exp:
+                    continue
+                value = exp[name]
+                if _kind_for(value) != kind:
+                    overflow.append({"row": start + offset, "field": name, "value": value})
+                    continue
+                if kind == "cat":
+                    code = self._codes[index].get(value)
+                    if code is None:
+                        code = len(self._dictionaries[index])
+                        self._dictionaries[index].append(value)
+                        self._codes[index][value] = code
+                        new_dict_entries.setdefault(index, []).append(value)
+                    data[offset] = code
+                else:
+                    data[offset] = value
+
+            with open(self._column_file(index), 'ab') as f:
+                f.write(data.tobytes())
+
+        # Fields that never got a column (e.g. only ever None)
+        for offset, exp in enumerate(experiences):
+            for name, value in exp.items():
+                if name not in self._column_index:
+                    overflow.append({"row": start + offset, "field": name, "value": value})
+
+        for index, values in new_dict_entries.items():
+            with open(self._dict_file(index), 'a') as f:
+                for value in values:
+                    f.write(json.dumps(value) + "\n")
+
+        if overflow:
+            with open(os.path.join(self.path, OVERFLOW_FILE), 'a') as f:
+                for entry in overflow:
+                    f.write(json.dumps(entry) + "\n")
+
+        self.rows = start + count
+        self._write_schema()
+
+    def rewrite(self, experiences: List[Dict], stats: Optional[Dict] = None) -> None:
+        """
+        Replace the store contents (used for imports and compaction).
+
+        Args:
+            experiences: Full list of experiences
+            stats: Optional stats dict
+        """
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                os.remove(os.path.join(self.path, name))
+        self.rows = 0
+        self.columns = []
+        self._column_index = {}
+        self._dictionaries = {}
+        self._codes = {}
+        self.stats = {}
+        self.source = None
+        self.append(experiences, stats=stats if stats is not None else {})
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """
+        Memory-mapped raw column (categoricals as codes), or None if absent.
+
+        Args:
+            name: Field name
+
+        Returns:
+            Read-only array of length self.rows
+        """
+        index = self._column_index.get(name)
+        if index is None:
+            return None
+        if self.rows == 0:
+            return np.empty(0, dtype=COLUMN_KINDS[self.columns[index]["kind"]][0])
+        dtype = COLUMN_KINDS[self.columns[index]["kind"]][0]
+        return np.memmap(self._column_file(index), dtype=dtype, mode='r', shape=(self.rows,))
+
+    def read_all(self) -> List[Dict]:
+        """
+        Materialize all experiences as flat dicts.
+
+        Returns:
+            List of experience dicts in append order
+        """
+        experiences: List[Dict] = [{} for _ in range(self.rows)]
+        if self.rows == 0:
+            return experiences
+
+        for index, col in enumerate(self.columns):
+            name, kind = col["name"], col["kind"]
+            data = self.column(name)
+            missing = COLUMN_KINDS[kind][1]
+
+            if kind == "f8":
+                present = ~np.isnan(data)
+            else:
+                present = data != missing
+            rows = np.flatnonzero(present).tolist()
+            values = data[present].tolist()
+
+            if kind == "cat":
+                dictionary = self._dictionaries[index]
+                values = [dictionary[code] for code in values]
+            elif kind == "bool":
+                values = [bool(v) for v in values]
+
+            for row, value in zip(rows, values):
+                experiences[row][name] = value
+
+        for entry in self._read_overflow():
+            if entry["row"] < self.rows:
+                experiences[entry["row"]][entry["field"]] = entry["value"]
+
+        return experiences
+
+    # ------------------------------------------------------------------
+    # JSON shim
+    # ------------------------------------------------------------------
+
+    def import_json(self, json_path: str) -> None:
+        """
+        Replace the store contents with the experiences in a JSON file.
+
+        Args:
+            json_path: Path to experience JSON
+        """
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            experiences = data.get('experiences', [])
+            stats = data.get('stats', {})
+        else:
+            experiences, stats = data, {}
+        self.rewrite(experiences, stats=stats)
+        self.source = _file_signature(json_path)
+        self._write_schema()
+
+    def export_json(self, json_path: str, experiences: Optional[List[Dict]] = None) -> None:
+        """
+        Write the store to JSON in the original {'experiences', 'stats'} layout.
+
+        Args:
+            json_path: Destination path
+            experiences: Already-materialized rows (avoids re-reading the store)
+        """
+        if experiences is None:
+            experiences = self.read_all()
+        with open(json_path, 'w') as f:
+            json.dump({
+                'experiences': experiences,
+                'stats': self.stats
+            }, f, indent=2)
+        if self.exists():
+            self.source = _file_signature(json_path)
+            self._write_schema()
+
+    def is_current_with(self, json_path: str) -> bool:
+        """
+        True if the store already reflects json_path (it hasn't changed since
+        it was last imported into or exported from this store).
+
+        Args:
+            json_path: Path to experience JSON
+        """
+        if not self.exists():
+            return False
+        signature = _file_signature(json_path)
+        return signature is None or signature == self.source
+
+    def sync_from_json(self, json_path: str) -> None:
+        """
+        Import json_path if the store is missing or the JSON was changed externally.
+
+        Args:
+            json_path: Path to experience JSON
+        """
+        if self.is_current_with(json_path) or not os.path.exists(json_path):
+            return
+        if self.exists():
+            logger.warning(f"Experience JSON changed since last sync - re-importing {json_path}")
+        self.import_json(json_path)
+
+
+def load_experiences(json_path: str) -> List[Dict]:
+    """
+    Read experiences without modifying anything on disk.
+    Uses the columnar store when it is current, otherwise the JSON file.
+
+    Args:
+        json_path: Path to signal_experience.json
+
+    Returns:
+        List of experience dicts
+    """
+    store = ExperienceStore(store_path_for(json_path))
+    if store.is_current_with(json_path):
+        return store.read_all()
+    if os.path.exists(json_path):
+        return read_json_experiences(json_path)
+    return []
@@ -0,0 +1,262 @@
+"""
+Feature Cache - Precomputed Per-Bar Indicators for Backtests
+============================================================
+Every backtest replays the same bars through the streaming indicators and the
+regime detector. When neither the data nor the indicator settings changed,
+those per-bar values are identical from run to run, so they are computed once
+and stored on disk:
+
+    data/feature_cache/<key>.npy   (NumPy structured array, opened with mmap)
+
+The key hashes the data file contents, the exact bar slice being replayed
+(first/last timestamp and count) and the indicator settings, so any change
+produces a new cache file. Values are produced by the same IndicatorEngine and
+RegimeDetector the engine uses, so a cached run makes exactly the same
+decisions as an uncached one.
+
+The engine consumes the cache through attach_feature_cache() in backtest mode:
+inject_complete_bar() loads each bar's RSI/MACD/ATR/volume average into the
+IndicatorEngine and takes the regime from the cache instead of running the
+regime detector. VWAP is still computed live because its sessions depend on
+the engine's daily reset.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from indicator_engine import IndicatorEngine
+from regime_detection import StreamingRegimeDetector, REGIME_DEFINITIONS
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored columns or their meaning change
+FEATURE_VERSION = 1
+
+# Regime names by stored code
+REGIME_NAMES: List[str] = list(REGIME_DEFINITIONS)
+
+FEATURE_DTYPE = np.dtype([
+    ("timestamp_ns", "i8"),
+    ("rsi", "f8"),
+    ("macd", "f8"),
+    ("macd_signal", "f8"),
+    ("macd_histogram", "f8"),
+    ("atr", "f8"),
+    ("last_true_range", "f8"),
+    ("avg_volume", "f8"),
+    ("regime", "i2"),
+])
+
+# Bars required before the engine runs regime detection (update_current_regime)
+MIN_REGIME_BARS = 114
+
+
+def indicator_settings(config: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Indicator settings that affect cached values (same defaults as initialize_state).
+
+    Args:
+        config: Bot configuration dict
+
+    Returns:
+        Dict of indicator periods
+    """
+    return {
+        "rsi_period": config.get("rsi_period", 10),
+        "macd_fast": config.get("macd_fast", 12),
+        "macd_slow": config.get("macd_slow", 26),
+        "macd_signal": config.get("macd_signal", 9),
+        "atr_period": config.get("atr_period", 14),
+        "volume_lookback": config.get("volume_lookback", 20),
+    }
+
+
+def _timestamp_ns(timestamp: Any) -> int:
+    return int(round(timestamp.timestamp() * 1_000_000)) * 1000
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a file's contents.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def feature_cache_key(data_digest: str, bars: Sequence[Dict[str, Any]], config: Dict[str, Any]) -> str:
+    """
+    Cache key for a bar slice of a data file under given indicator settings.
+
+    Args:
+        data_digest: file_digest() of the source data file
+        bars: Bars that will be replayed (in order)
+        config: Bot configuration dict
+
+    Returns:
+        Hex key
+    """
+    key_data = {
+        "version": FEATURE_VERSION,
+        "data": data_digest,
+        "bars": len(bars),
+        "first": _timestamp_ns(bars[0]["timestamp"]) if bars else None,
+        "last": _timestamp_ns(bars[-1]["timestamp"]) if bars else None,
+        "indicators": indicator_settings(config),
+    }
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def compute_features(bars: Sequence[Dict[str, Any]], config: Dict[str, Any]) -> np.ndarray:
+    """
+    Compute per-bar features exactly as a fresh engine replaying these bars would.
+
+    Args:
+        bars: Bars in replay order
+        config: Bot configuration dict
+
+    Returns:
+        Structured array (FEATURE_DTYPE) with one row per bar; unavailable values are NaN
+    """
+    settings = indicator_settings(config)
+    indicators = IndicatorEngine(**settings)
+    regime_detector = StreamingRegimeDetector(settings["atr_period"])
+    regime_codes = {name: code for code, name in enumerate(REGIME_NAMES)}
+    normal = regime_codes["NORMAL"]
+    nan = float("nan")
+
+    features = np.zeros(len(bars), dtype=FEATURE_DTYPE)
+    for i, bar in enumerate(bars):
+        indicators.update(bar)
+        regime_detector.update(bar)
+
+        regime = normal
+        if regime_detector.bar_count >= MIN_REGIME_BARS and indicators.atr is not None:
+            detected = regime_detector.detect_regime(indicators.atr)
+            regime = regime_codes[detected.name]
+
+        macd = indicators.macd
+        features[i] = (
+            _timestamp_ns(bar["timestamp"]),
+            nan if indicators.rsi is None else indicators.rsi,
+            nan if macd is None else macd["macd"],
+            nan if macd is None else macd["signal"],
+            nan if macd is None else macd["histogram"],
+            nan if indicators.atr is None else indicators.atr,
+            nan if indicators.last_true_range is None else indicators.last_true_range,
+            nan if indicators.avg_volume is None else indicators.avg_volume,
+            regime,
+        )
+    return features
+
+
+class FeatureCache:
+    """
+    Per-bar features for one replay, consumed in order by the engine.
+    Columns are converted to Python lists once so per-bar reads are cheap.
+    """
+
+    def __init__(self, features: np.ndarray, settings: Dict[str, int]):
+        """
+        Initialize cache.
+
+        Args:
+            features: Structured array (FEATURE_DTYPE)
+            settings: indicator_settings() the features were computed with
+        """
+        self.settings = settings
+        self.timestamps: List[int] = features["timestamp_ns"].tolist()
+        self.regimes: List[str] = [REGIME_NAMES[code] for code in features["regime"].tolist()]
+        self._columns = {
+            name: [None if value != value else value for value in features[name].tolist()]
+            for name in ("rsi", "macd", "macd_signal", "macd_histogram", "atr", "last_true_range", "avg_volume")
+        }
+        self.position = 0  # Index of the next bar expected by the engine
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def next_row(self, timestamp: Any) -> Optional[int]:
+        """
+        Advance to the next bar if it matches the expected timestamp.
+
+        Args:
+            timestamp: Timestamp of the bar being injected
+
+        Returns:
+            Row index, or None if the bar is not the next cached one
+        """
+        row = self.position
+        if row >= len(self.timestamps) or self.timestamps[row] != _timestamp_ns(timestamp):
+            return None
+        self.position = row + 1
+        return row
+
+    def value(self, name: str, row: int) -> Optional[float]:
+        """Feature value for a row (None where unavailable)."""
+        return self._columns[name][row]
+
+    def macd(self, row: int) -> Optional[Dict[str, float]]:
+        """MACD dict in the engine's format (None until available)."""
+        macd = self._columns["macd"][row]
+        signal = self._columns["macd_signal"][row]
+        if macd is None or signal is None:
+            return None
+        return {"macd": macd, "signal": signal, "histogram": self._columns["macd_histogram"][row]}
+
+
+def load_or_build_feature_cache(bars: Sequence[Dict[str, Any]], config: Dict[str, Any],
+                                data_file: str, cache_dir: str) -> Optional[FeatureCache]:
+    """
+    Load the feature cache for these bars, computing and saving it on a miss.
+
+    Args:
+        bars: Bars that will be replayed (in order)
+        config: Bot configuration dict (indicator settings)
+        data_file: Source data file the bars were loaded from
+        cache_dir: Directory for cache files
+
+    Returns:
+        FeatureCache, or None if there are no bars or the data file is missing
+    """
+    if not bars or not os.path.exists(data_file):
+        return None
+
+    key = feature_cache_key(file_digest(data_file), bars, config)
+    path = os.path.join(cache_dir, f"{key}.npy")
+
+    features = None
+    if os.path.exists(path):
+        try:
+            features = np.load(path, mmap_mode="r")
+            if features.dtype != FEATURE_DTYPE or len(features) != len(bars):
+                features = None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable feature cache {path}: {e}")
+            features = None
+
+    if features is None:
+        features = compute_features(bars, config)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, features)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save feature cache {path}: {e}")
+
+    return FeatureCache(features, indicator_settings(config))
@@ -0,0 +1,525 @@
+"""
+Incremental Indicator Engine
+============================
+Streaming technical indicators for 1-minute bars.
+
+Every indicator here is updated in constant time per finalized bar, so the
+cost of a bar close no longer grows with the length of the bar history:
+- EMA (SMA-seeded, same convention as quotrading_engine.calculate_ema)
+- Wilder RSI
+- MACD line, signal line and histogram
+- ATR (simple average of the last N true ranges)
+- Rolling volume mean
+- Rolling mean and sample standard deviation (RollingStats, sliding Welford)
+- Rolling max/min over a fixed window (RollingExtreme)
+- Session VWAP with volume-weighted standard deviation (SessionVWAP)
+
+One IndicatorEngine is kept per symbol in state[symbol]["indicators"] and is
+fed from the same place bars are appended to state[symbol]["bars_1min"].
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalEMA:
+    """
+    Exponential moving average seeded with the SMA of the first `period` values.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2.0 / (period + 1)
+        self.value: Optional[float] = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+
+    def update(self, value: float) -> Optional[float]:
+        """
+        Add a value and return the current EMA (None until seeded).
+
+        Args:
+            value: New input value
+
+        Returns:
+            EMA value or None
+        """
+        if self.value is None:
+            self._seed_sum += value
+            self._seed_count += 1
+            if self._seed_count == self.period:
+                self.value = self._seed_sum / self.period
+            return self.value
+
+        self.value = (value - self.value) * self.multiplier + self.value
+        return self.value
+
+
+class WilderRSI:
+    """
+    Relative Strength Index with Wilder smoothing.
+    Seeds average gain/loss with the SMA of the first `period` changes.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.value: Optional[float] = None
+        self._prev_close: Optional[float] = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._seed_gain = 0.0
+        self._seed_loss = 0.0
+        self._change_count = 0
+
+    def update(self, close: float) -> Optional[float]:
+        """
+        Add a closing price and return the current RSI (None until seeded).
+
+        Args:
+            close: Bar closing price
+
+        Returns:
+            RSI value (0-100) or None
+        """
+        prev_close = self._prev_close
+        self._prev_close = close
+        if prev_close is None:
+            return None
+
+        change = close - prev_close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self._change_count += 1
+
+        if self._change_count <= self.period:
+            # Seed phase - simple average of the first `period` changes
+            self._seed_gain += gain
+            self._seed_loss += loss
+            if self._change_count < self.period:
+                return None
+            self._avg_gain = self._seed_gain / self.period
+            self._avg_loss = self._seed_loss / self.period
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        if self._avg_loss == 0:
+            self.value = 100.0
+        else:
+            rs = self._avg_gain / self._avg_loss
+            self.value = 100.0 - (100.0 / (1.0 + rs))
+        return self.value
+
+
+class IncrementalMACD:
+    """
+    MACD (fast EMA - slow EMA) with an EMA signal line of the MACD values.
+    """
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self._fast = IncrementalEMA(fast_period)
+        self._slow = IncrementalEMA(slow_period)
+        self._signal = IncrementalEMA(signal_period)
+        self.macd: Optional[float] = None
+        self.signal: Optional[float] = None
+        self.histogram: Optional[float] = None
+
+    def update(self, close: float) -> Optional[Dict[str, float]]:
+        """
+        Add a closing price and return the MACD dict (None until the signal line is seeded).
+
+        Args:
+            close: Bar closing price
+
+        Returns:
+            Dictionary with 'macd', 'signal', 'histogram' or None
+        """
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if fast is None or slow is None:
+            return None
+
+        self.macd = fast - slow
+        self.signal = self._signal.update(self.macd)
+        if self.signal is None:
+            return None
+
+        self.histogram = self.macd - self.signal
+        return self.as_dict()
+
+    def as_dict(self) -> Optional[Dict[str, float]]:
+        """Return the current MACD values in the engine's dict format."""
+        if self.signal is None:
+            return None
+        return {
+            "macd": self.macd,
+            "signal": self.signal,
+            "histogram": self.histogram
+        }
+
+
+class RollingMean:
+    """
+    Fixed-window simple moving average backed by a running sum.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, value: float) -> float:
+        """
+        Add a value and return the mean of the values currently in the window.
+
+        Args:
+            value: New value
+
+        Returns:
+            Mean over the (possibly partially filled) window
+        """
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+        return self._sum / len(self._values)
+
+    @property
+    def count(self) -> int:
+        """Number of values currently in the window."""
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        """True once the window holds `window` values."""
+        return len(self._values) == self.window
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Current mean, or None if no values yet."""
+        if not self._values:
+            return None
+        return self._sum / len(self._values)
+
+
+class RollingStats:
+    """
+    Fixed-window mean and sample variance, updated with Welford's recurrence.
+
+    Adding a value and evicting the oldest one adjusts the running mean and
+    sum of squared deviations directly, which stays accurate over long
+    streams (unlike a running sum of squares) and costs O(1) per value.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+
+    def update(self, value: float) -> None:
+        """
+        Add a value, evicting the oldest one once the window is full.
+
+        Args:
+            value: New value
+        """
+        values = self._values
+        if len(values) == self.window:
+            old = values[0]
+            values.append(value)
+            old_mean = self._mean
+            self._mean = old_mean + (value - old) / self.window
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0  # Rounding on a constant window
+        else:
+            values.append(value)
+            delta = value - self._mean
+            self._mean += delta / len(values)
+            self._m2 += delta * (value - self._mean)
+
+    @property
+    def values(self) -> deque:
+        """Values currently in the window, oldest first (do not modify)."""
+        return self._values
+
+    @property
+    def count(self) -> int:
+        """Number of values currently in the window."""
+        return len(self._values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Current mean, or None if no values yet."""
+        if not self._values:
+            return None
+        return self._mean
+
+    @property
+    def stdev(self) -> Optional[float]:
+        """Sample standard deviation, or None with fewer than 2 values."""
+        if len(self._values) < 2:
+            return None
+        return (self._m2 / (len(self._values) - 1)) ** 0.5
+
+
+class RollingExtreme:
+    """
+    Fixed-window maximum or minimum backed by a monotonic deque.
+    Each value is pushed and popped at most once, so updates are amortized O(1).
+    """
+
+    def __init__(self, window: int, maximum: bool = True):
+        """
+        Initialize window.
+
+        Args:
+            window: Number of most recent values covered
+            maximum: True for a rolling max, False for a rolling min
+        """
+        self.window = window
+        self.maximum = maximum
+        self._candidates: deque = deque()  # (sequence, value), best value first
+        self._count = 0
+
+    def update(self, value: float) -> float:
+        """
+        Add a value and return the extreme of the values currently in the window.
+
+        Args:
+            value: New value
+
+        Returns:
+            Max (or min) over the (possibly partially filled) window
+        """
+        candidates = self._candidates
+        if self.maximum:
+            while candidates and candidates[-1][1] <= value:
+                candidates.pop()
+        else:
+            while candidates and candidates[-1][1] >= value:
+                candidates.pop()
+        candidates.append((self._count, value))
+        if candidates[0][0] <= self._count - self.window:
+            candidates.popleft()
+        self._count += 1
+        return candidates[0][1]
+
+    @property
+    def count(self) -> int:
+        """Number of values currently in the window."""
+        return min(self._count, self.window)
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current extreme, or None if no values yet."""
+        if not self._candidates:
+            return None
+        return self._candidates[0][1]
+
+
+class IndicatorEngine:
+    """
+    Per-symbol streaming indicator state for 1-minute bars.
+
+    Call update() once per finalized bar. Indicator values are exposed as
+    attributes and follow the same availability rules as the original
+    full-recompute functions (e.g. MACD only after slow + signal bars).
+    """
+
+    def __init__(self, rsi_period: int = 14, macd_fast: int = 12, macd_slow: int = 26,
+                 macd_signal: int = 9, atr_period: int = 14, volume_lookback: int = 20):
+        """
+        Initialize indicator engine.
+
+        Args:
+            rsi_period: RSI period
+            macd_fast: MACD fast EMA period
+            macd_slow: MACD slow EMA period
+            macd_signal: MACD signal EMA period
+            atr_period: ATR period (number of true ranges averaged)
+            volume_lookback: Window for average volume
+        """
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.volume_lookback = volume_lookback
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all indicator state."""
+        self._rsi = WilderRSI(self.rsi_period)
+        self._macd = IncrementalMACD(self.macd_fast, self.macd_slow, self.macd_signal)
+        self._true_ranges = RollingMean(self.atr_period)
+        self._volumes = RollingMean(self.volume_lookback)
+        self._prev_close: Optional[float] = None
+
+        self.bar_count = 0
+        self.rsi: Optional[float] = None
+        self.macd: Optional[Dict[str, float]] = None
+        self.atr: Optional[float] = None
+        self.avg_volume: Optional[float] = None
+        self.last_true_range: Optional[float] = None
+
+    def update(self, bar: Dict[str, Any]) -> None:
+        """
+        Update all indicators with a finalized bar.
+
+        Args:
+            bar: Bar dict with 'high', 'low', 'close', 'volume'
+        """
+        high = bar["high"]
+        low = bar["low"]
+        close = bar["close"]
+        self.bar_count += 1
+
+        # RSI - available once rsi_period + 1 closes have been seen
+        rsi = self._rsi.update(close)
+        if rsi is not None:
+            self.rsi = rsi
+
+        # MACD - only published after slow + signal bars (matches calculate_macd guard)
+        macd = self._macd.update(close)
+        if macd is not None and self.bar_count >= self.macd_slow + self.macd_signal:
+            self.macd = macd
+
+        # ATR - simple average of the most recent true ranges (first bar has no TR)
+        if self._prev_close is not None:
+            prev_close = self._prev_close
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            self.last_true_range = tr
+            self.atr = self._true_ranges.update(tr)
+        self._prev_close = close
+
+        # Volume - rolling mean, published once the window is full
+        avg_volume = self._volumes.update(bar.get("volume", 0))
+        if self._volumes.full:
+            self.avg_volume = avg_volume
+
+    def load_cached(self, rsi: Optional[float], macd: Optional[Dict[str, float]], atr: Optional[float],
+                    last_true_range: Optional[float], avg_volume: Optional[float]) -> None:
+        """
+        Publish precomputed values for a finalized bar instead of calling update().
+
+        Used by backtests replaying a feature cache (see feature_cache). The
+        internal streaming state is not advanced, so reset() and replay the
+        bars before calling update() again.
+
+        Args:
+            rsi: RSI after this bar (None if not yet available)
+            macd: MACD dict after this bar (None if not yet available)
+            atr: ATR after this bar (None if not yet available)
+            last_true_range: True range of this bar (None for the first bar)
+            avg_volume: Rolling volume mean after this bar (None until the window is full)
+        """
+        self.bar_count += 1
+        if rsi is not None:
+            self.rsi = rsi
+        if macd is not None:
+            self.macd = macd
+        self.atr = atr
+        self.last_true_range = last_true_range
+        if avg_volume is not None:
+            self.avg_volume = avg_volume
+
+
+class SessionVWAP:
+    """
+    Session-anchored VWAP built from running sums.
+
+    Keeps cumulative volume, volume-weighted price and volume-weighted squared
+    price for the current session, so VWAP and its standard deviation update in
+    O(1) per bar and cover the whole session regardless of how many bars are
+    kept in memory. Sums are taken relative to the session's first typical
+    price to avoid cancellation when computing the variance.
+    """
+
+    def __init__(self, session: Any = None):
+        self.reset(session)
+
+    def reset(self, session: Any = None) -> None:
+        """
+        Start a new session.
+
+        Args:
+            session: Session identifier (e.g. trading date)
+        """
+        self.session = session
+        self.bar_count = 0
+        self._reference: Optional[float] = None
+        self._cum_volume = 0.0
+        self._cum_pv = 0.0   # sum(volume * (typical - reference))
+        self._cum_pv2 = 0.0  # sum(volume * (typical - reference)^2)
+
+    def update(self, bar: Dict[str, Any]) -> None:
+        """
+        Add a finalized bar to the session.
+
+        Args:
+            bar: Bar dict with 'high', 'low', 'close', 'volume'
+        """
+        typical_price = (bar["high"] + bar["low"] + bar["close"]) / 3.0
+        volume = bar.get("volume", 0)
+        if self._reference is None:
+            self._reference = typical_price
+
+        deviation = typical_price - self._reference
+        self._cum_volume += volume
+        self._cum_pv += deviation * volume
+        self._cum_pv2 += deviation * deviation * volume
+        self.bar_count += 1
+
+    @property
+    def vwap(self) -> Optional[float]:
+        """Session VWAP, or None if no volume yet."""
+        if self._cum_volume <= 0:
+            return None
+        return self._reference + self._cum_pv / self._cum_volume
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        """Volume-weighted standard deviation of typical price around VWAP."""
+        if self._cum_volume <= 0:
+            return None
+        mean_deviation = self._cum_pv / self._cum_volume
+        variance = self._cum_pv2 / self._cum_volume - mean_deviation * mean_deviation
+        return max(variance, 0.0) ** 0.5
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Serialize accumulator state (JSON-compatible).
+
+        Returns:
+            Dictionary that can be passed to restore()
+        """
+        return {
+            "session": str(self.session) if self.session is not None else None,
+            "bar_count": self.bar_count,
+            "reference": self._reference,
+            "cum_volume": self._cum_volume,
+            "cum_pv": self._cum_pv,
+            "cum_pv2": self._cum_pv2
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Restore accumulator state from snapshot().
+
+        Args:
+            snapshot: Dictionary produced by snapshot()
+        """
+        self.session = snapshot.get("session")
+        self.bar_count = snapshot.get("bar_count", 0)
+        self._reference = snapshot.get("reference")
+        self._cum_volume = snapshot.get("cum_volume", 0.0)
+        self._cum_pv = snapshot.get("cum_pv", 0.0)
+        self._cum_pv2 = snapshot.get("cum_pv2", 0.0)
@@ -91,9 +91,9 @@ from datetime import time as datetime_time  # Alias to avoid conflict with time.
 from collections import deque
 from typing import Any, Dict, List, Optional, Tuple, Callable
 import pytz
+import numpy as np
 import time as time_module  # Import time module with alias
 import statistics  # For calculating statistics like mean, median, etc.
-import asyncio
 import hashlib
 import signal
 import atexit
@@ -238,12 +238,16 @@ def get_data_file_path(filename: str) -> 'Path':
 from config import load_config, BotConfiguration, DEFAULT_MAX_STOP_LOSS_DOLLARS
 from event_loop import EventLoop, EventType, EventPriority, TimerManager
 from error_recovery import ErrorRecoveryManager, ErrorType as RecoveryErrorType
-from bid_ask_manager import BidAskManager, BidAskQuote
+from bid_ask_manager import BidAskManager, BidAskQuote, TrackedOrder
 from notifications import get_notifier
 from signal_confidence import SignalConfidenceRL
-from regime_detection import get_regime_detector, REGIME_DEFINITIONS, is_regime_tradeable
-from capitulation_detector import get_capitulation_detector, CapitulationDetector, FlushEvent
-from cloud_api import CloudAPIClient
+from regime_detection import get_regime_detector, REGIME_DEFINITIONS, RegimeParameters, StreamingRegimeDetector, is_regime_tradeable
+import diagnostics
+from capitulation_detector import get_capitulation_detector, CapitulationDetector, FlushEvent, FlushTracker, SignalCheck, seed_diagnostic_sampling
+from indicator_engine import IndicatorEngine, IncrementalMACD, SessionVWAP
+from bar_store import BarStore, TickStore, tail_true_ranges
+from feature_cache import FeatureCache, indicator_settings
+from cloud_api import CloudAPIClient, OutcomeReporter
 
 # Conditionally import broker (only needed for live trading, not backtesting)
 try:
@@ -255,49 +259,6 @@ except ImportError:
     BrokerSDKImplementation = None
 
 
-def _cleanup_event_loop(loop: asyncio.AbstractEventLoop) -> None:
-    """
-    Properly clean up an asyncio event loop to prevent Windows proactor errors.
-    
-    On Windows, the ProactorEventLoop can have its proactor set to None when
-    the loop is closed before all async operations complete, leading to:
-    AttributeError: 'NoneType' object has no attribute 'send'
-    
-    This method ensures all pending tasks are cancelled and async generators
-    are shut down before closing the loop.
-    
-    Args:
-        loop: The event loop to clean up
-    """
-    try:
-        # Check if loop is already closed
-        if loop.is_closed():
-            return
-        
-        # Cancel all pending tasks
-        pending = asyncio.all_tasks(loop)
-        for task in pending:
-            task.cancel()
-        
-        # Wait for all tasks to complete cancellation
-        if pending:
-            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
-        
-        # Shutdown async generators
-        loop.run_until_complete(loop.shutdown_asyncgens())
-        
-        # Now safe to close the loop
-        loop.close()
-    except Exception:
-        # If cleanup fails, still try to close the loop
-        # Suppress any errors as we're in cleanup
-        try:
-            if not loop.is_closed():
-                loop.close()
-        except Exception:
-            pass
-
-
 # ============================================================================
 # BACKTEST MODE UTILITIES
 # ============================================================================
@@ -569,6 +530,9 @@ rl_brain: Optional[SignalConfidenceRL] = None
 # Global cloud API client for reporting trade outcomes (data collection only)
 cloud_api_client: Optional[CloudAPIClient] = None
 
+# Background queue that sends trade outcomes to the cloud without blocking trading
+outcome_reporter: Optional[OutcomeReporter] = None
+
 # Global bid/ask manager
 bid_ask_manager: Optional[BidAskManager] = None
 
@@ -600,7 +564,7 @@ state: Dict[str, Any] = {}
 # Note: Cloud API may still be used for outcome reporting in live mode
 # Global variable to track simulation time during backtesting.
 # When None, get_current_time() uses real datetime.now()
-# When set (by handle_tick_event), get_current_time() uses this historical timestamp
+# When set (by process_tick), get_current_time() uses this historical timestamp
 backtest_current_time: Optional[datetime] = None
 
 # Global tracking for safety mechanisms (Phase 12)
@@ -657,7 +621,7 @@ def set_flatten_flags(symbol: str) -> None:
         symbol: Symbol being flattened
     """
     bot_status["flatten_in_progress"] = True
-    bot_status["flatten_in_progress_since"] = datetime.now()
+    bot_status["flatten_in_progress_since"] = get_current_time()
     bot_status["flatten_in_progress_symbol"] = symbol
 
 
@@ -810,13 +774,16 @@ logger = setup_logging()
 
 
 
-async def get_ml_confidence_async(rl_state: Dict[str, Any], side: str) -> Tuple[bool, float, str]:
+def get_ml_confidence(rl_state: Dict[str, Any], side: str) -> Tuple[bool, float, str]:
     """
     Get RL decision from local RL brain for both live and backtest modes.
     
     LIVE MODE: Uses local rl_brain for confidence decisions (no cloud dependency)
     BACKTEST MODE: Uses local rl_brain for learning and testing
     
+    The RL brain is local and synchronous, so this is called directly on the
+    signal path (no event loop setup between signal approval and execute_entry).
+    
     Returns: (take_signal, confidence, reason)
     """
     global rl_brain
@@ -830,18 +797,7 @@ async def get_ml_confidence_async(rl_state: Dict[str, Any], side: str) -> Tuple[
     return True, 0.65, "No RL brain initialized - default approval"
 
 
-def get_ml_confidence(rl_state: Dict[str, Any], side: str) -> Tuple[bool, float, str]:
-    """Synchronous wrapper for get_ml_confidence_async"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(get_ml_confidence_async(rl_state, side))
-    finally:
-        _cleanup_event_loop(loop)
-
-
-
-async def save_trade_experience_async(
+def save_trade_experience(
     rl_state: Dict[str, Any],
     side: str,
     pnl: float,
@@ -855,8 +811,11 @@ async def save_trade_experience_async(
     BACKTEST MODE: Saves to local RL brain only
     SHADOW MODE: Does NOT send to cloud (signal-only mode)
     AI MODE: Does NOT send to cloud (position management mode)
+    
+    Cloud reporting is fire-and-forget: the outcome is queued on outcome_reporter
+    and sent from its background thread, so closing a trade never waits on the network.
     """
-    global cloud_api_client, rl_brain
+    global cloud_api_client, rl_brain, outcome_reporter
     
     # BACKTEST MODE: Save to local RL brain only
     if is_backtest_mode() or CONFIG.get("backtest_mode", False):
@@ -883,11 +842,13 @@ async def save_trade_experience_async(
         # Convert duration to seconds
         duration_seconds = duration_minutes * 60.0
         
+        # Reporter is normally started with the cloud client; start lazily otherwise
+        if outcome_reporter is None:
+            outcome_reporter = OutcomeReporter(cloud_api_client)
+            outcome_reporter.start()
+        
         # Report to cloud in background (non-blocking) with execution_data
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            cloud_api_client.report_trade_outcome,
+        outcome_reporter.submit(
             state_with_context,
             True,  # took_trade
             pnl,
@@ -901,23 +862,6 @@ async def save_trade_experience_async(
         pass  # Silent - cloud sync is transparent to customer
 
 
-
-def save_trade_experience(
-    rl_state: Dict[str, Any],
-    side: str,
-    pnl: float,
-    duration_minutes: float,
-    execution_data: Dict[str, Any]
-) -> None:
-    """Synchronous wrapper for save_trade_experience_async"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        loop.run_until_complete(save_trade_experience_async(rl_state, side, pnl, duration_minutes, execution_data))
-    finally:
-        _cleanup_event_loop(loop)
-
-
 # ============================================================================
 # PHASE TWO: SDK Integration
 # ============================================================================
@@ -1424,7 +1368,7 @@ def place_market_order(symbol: str, side: str, quantity: int) -> Optional[Dict[s
     if is_backtest_mode():
         pass  # Silent - backtest order simulated
         return {
-            "order_id": f"BACKTEST_{datetime.now().timestamp()}",
+            "order_id": f"BACKTEST_{get_current_time().timestamp()}",
             "symbol": symbol,
             "side": side,
             "quantity": quantity,
@@ -1508,7 +1452,7 @@ def place_stop_order(symbol: str, side: str, quantity: int, stop_price: float) -
     if is_backtest_mode():
         pass  # Silent - backtest stop order simulated
         return {
-            "order_id": f"BACKTEST_STOP_{datetime.now().timestamp()}",
+            "order_id": f"BACKTEST_STOP_{get_current_time().timestamp()}",
             "symbol": symbol,
             "side": side,
             "quantity": quantity,
@@ -1523,7 +1467,7 @@ def place_stop_order(symbol: str, side: str, quantity: int, stop_price: float) -
     
     if shadow_mode:
         return {
-            "order_id": f"SHADOW_STOP_{datetime.now().timestamp()}",
+            "order_id": f"SHADOW_STOP_{get_current_time().timestamp()}",
             "symbol": symbol,
             "side": side,
             "quantity": quantity,
@@ -1578,7 +1522,7 @@ def place_limit_order(symbol: str, side: str, quantity: int, limit_price: float)
     if is_backtest_mode():
         pass  # Silent - backtest limit order simulated
         return {
-            "order_id": f"BACKTEST_LIMIT_{datetime.now().timestamp()}",
+            "order_id": f"BACKTEST_LIMIT_{get_current_time().timestamp()}",
             "symbol": symbol,
             "side": side,
             "quantity": quantity,
@@ -1593,7 +1537,7 @@ def place_limit_order(symbol: str, side: str, quantity: int, limit_price: float)
     
     if shadow_mode:
         return {
-            "order_id": f"SHADOW_LIMIT_{datetime.now().timestamp()}",
+            "order_id": f"SHADOW_LIMIT_{get_current_time().timestamp()}",
             "symbol": symbol,
             "side": side,
             "quantity": quantity,
@@ -1830,6 +1774,14 @@ def resubscribe_market_data_after_reconnect() -> bool:
         logger.error(f"  [RECONNECT] ❌ Failed to subscribe to quote data: {e}")
         success = False
     
+    # Re-subscribe to order fills (passive order tracking)
+    try:
+        if broker is not None:
+            broker.subscribe_order_fills(on_order_fill)
+    except Exception as e:
+        logger.error(f"  [RECONNECT] ❌ Failed to subscribe to order fills: {e}")
+        success = False
+    
     return success
 
 
@@ -1894,11 +1846,11 @@ def initialize_state(symbol: str) -> None:
     
     state[symbol] = {
         # Tick data storage
-        "ticks": deque(maxlen=CONFIG.get("max_tick_storage", 10000)),
+        "ticks": TickStore(CONFIG.get("max_tick_storage", 10000)),
         
         # Bar storage
-        "bars_1min": deque(maxlen=CONFIG.get("max_bars_storage", 200)),
-        "bars_15min": deque(maxlen=100),
+        "bars_1min": BarStore(CONFIG.get("max_bars_storage", 200)),
+        "bars_15min": BarStore(100),
         
         # Current incomplete bars
         "current_1min_bar": None,
@@ -1916,6 +1868,7 @@ def initialize_state(symbol: str) -> None:
         },
         "vwap_std_dev": None,
         "vwap_day": None,  # Phase Three: Track VWAP day separately
+        "vwap_accumulator": SessionVWAP(),  # Running session sums (PV, V, PV²) for O(1) VWAP
         
         # Trend filter
         "trend_ema": None,
@@ -1926,6 +1879,23 @@ def initialize_state(symbol: str) -> None:
         "macd": None,  # MACD data dict with 'macd', 'signal', 'histogram'
         "avg_volume": None,  # Average volume for spike detection
         "recent_volume_history": deque(maxlen=20),  # Last 20 bars for volume surge detection
+        # Streaming indicators (RSI, MACD, ATR, volume mean) - updated once per finalized 1-min bar
+        "indicators": IndicatorEngine(
+            rsi_period=CONFIG.get("rsi_period", 10),
+            macd_fast=CONFIG.get("macd_fast", 12),
+            macd_slow=CONFIG.get("macd_slow", 26),
+            macd_signal=CONFIG.get("macd_signal", 9),
+            atr_period=CONFIG.get("atr_period", 14),
+            volume_lookback=CONFIG.get("volume_lookback", 20)
+        ),
+        # Streaming regime state (baseline ATR, 20-bar extremes) - O(1) per finalized 1-min bar
+        "regime_engine": StreamingRegimeDetector(atr_period=CONFIG.get("atr_period", 14)),
+        # Flush window extremes and 20-bar volume for the capitulation checks
+        "flush_tracker": FlushTracker(timeframes=CONFIG.get("flush_timeframes", [1])),
+        "signal_check": None,  # SignalCheck of the latest signal evaluation (see evaluate_signal_conditions)
+        "signal_check_bar": None,  # FlushTracker.bars_seen when signal_check was evaluated
+        "feature_cache": None,  # Precomputed per-bar indicators/regime (backtest only, see attach_feature_cache)
+        "feature_row": None,  # Cache row of the latest injected bar
         
         # Signal tracking
         "last_signal": None,
@@ -2030,10 +2000,112 @@ def on_quote(symbol: str, bid_price: float, ask_price: float, bid_size: int,
             last_price=last_price,
             timestamp=timestamp_ms
         )
+        
+        # Passive orders whose price ran away or timed out: cancel/resend on the event loop
+        escalations = bid_ask_manager.passive_orders.on_quote(symbol, bid_price, ask_price)
+        if escalations:
+            if event_loop:
+                event_loop.post_event(
+                    EventType.ORDER_ESCALATION,
+                    EventPriority.HIGH,
+                    {"orders": escalations}
+                )
+            else:
+                for tracked in escalations:
+                    escalate_passive_order(tracked)
+    
+    # Also process as tick data to build bars (unless disabled because the
+    # broker streams real trades). Use last_price and estimated volume of 1
+    # (quote updates don't have volume)
+    if CONFIG.get("quotes_as_ticks", True):
+        on_tick(symbol, last_price, 1, timestamp_ms)
+
+
+def on_order_fill(order_id: Any, symbol: str, quantity: int, price: float) -> None:
+    """
+    Handle a fill report from the broker's order updates.
+    Called from the broker's WebSocket thread - posts to the event loop so the
+    passive order tracker is updated in order with escalations.
+    
+    Args:
+        order_id: Broker order ID
+        symbol: Instrument symbol
+        quantity: Contracts filled by this report
+        price: Fill price
+    """
+    data = {"order_id": order_id, "symbol": symbol, "quantity": quantity, "price": price}
+    if event_loop:
+        event_loop.post_event(EventType.ORDER_FILL, EventPriority.HIGH, data)
+    else:
+        handle_order_fill_event(data)
+
+
+def escalate_passive_order(tracked: TrackedOrder) -> None:
+    """
+    Cancel a passive order the tracker gave up on and send the unfilled
+    remainder aggressively.
+    
+    Runs on the event loop (ORDER_ESCALATION events and timer checks), never
+    waits for fills. Mirrors QueuePositionMonitor.monitor_limit_order_queue:
+    if the cancel fails, no new order is placed, since the original order may
+    still fill.
     
-    # Also process as tick data to build bars
-    # Use last_price and estimated volume of 1 (quote updates don't have volume)
-    on_tick(symbol, last_price, 1, timestamp_ms)
+    Args:
+        tracked: TrackedOrder returned by the passive order tracker
+    """
+    symbol = tracked.symbol
+    try:
+        # Filled while the escalation was queued - nothing to cancel
+        if tracked.remaining == 0:
+            logger.info("✓ Passive exit filled completely")
+            return
+        
+        if tracked.reason == "price_moved_away":
+            logger.warning(f"  ⚠️ Price moved away {tracked.context.get('price_distance', 0):.1f} ticks - "
+                           f"cancelling passive {tracked.order_side} @ ${tracked.limit_price:.2f}")
+        else:
+            logger.warning(f"  ⏱️ Passive {tracked.order_side} @ ${tracked.limit_price:.2f} "
+                           f"not filled within {tracked.timeout}s - cancelling")
+        
+        if tracked.order_id is None:
+            # Placement timed out (status UNKNOWN) - no ID to cancel, and the
+            # order may be live; leave it to position reconciliation
+            logger.error(f"  [WARN] Passive order status unknown - not switching to aggressive")
+            return
+        
+        if not cancel_order(symbol, tracked.order_id):
+            # CRITICAL: Cancel failed - do not place another order!
+            logger.error(f"  [ERROR] Cancel failed - original order may still be pending!")
+            logger.error(f"  [WARN] Not switching to aggressive to avoid duplicate orders")
+            return
+        
+        # Check what is left (handle partial fills). The tracker counts the
+        # order's fill reports; the broker position also covers fills whose
+        # report has not arrived yet (no new entries while the order works)
+        remaining_contracts = min(tracked.remaining, abs(get_position_quantity(symbol)))
+        if remaining_contracts == 0:
+            logger.info("✓ Passive exit filled completely")
+            return
+        
+        if remaining_contracts < tracked.quantity:
+            filled = tracked.quantity - remaining_contracts
+            logger.warning(f"  [PARTIAL FILL] {filled} of {tracked.quantity} contracts filled")
+            logger.warning(f"  [REMAINING] {remaining_contracts} contracts - using aggressive for remainder")
+        else:
+            logger.warning("✗ Passive exit not filled, using aggressive")
+        
+        fallback_price = tracked.context.get("fallback_price")
+        if fallback_price is not None:
+            order = place_limit_order(symbol, tracked.order_side, remaining_contracts, fallback_price)
+        else:
+            order = place_market_order(symbol, tracked.order_side, remaining_contracts)
+        if order:
+            logger.info(f"Exit order placed: {order.get('order_id')}")
+    except Exception as e:
+        logger.error(f"Error escalating passive order {tracked.order_id}: {e}")
+    finally:
+        if bid_ask_manager is not None:
+            bid_ask_manager.passive_orders.finish(tracked.order_id)
 
 
 # ============================================================================
@@ -2078,6 +2150,8 @@ def save_position_state(symbol: str) -> None:
             "entry_time": position["entry_time"].isoformat() if position.get("entry_time") else None,
             "order_id": position.get("order_id"),
             "stop_order_id": position.get("stop_order_id"),
+            "vwap_session": state[symbol]["vwap_accumulator"].snapshot(),
+            "vwap_session_date": get_vwap_session_date(get_current_time()).isoformat(),
             "last_updated": datetime.now().isoformat(),
         }
         
@@ -2171,6 +2245,18 @@ def load_position_state(symbol: str) -> bool:
         if saved_state.get("entry_time"):
             state[symbol]["position"]["entry_time"] = datetime.fromisoformat(saved_state["entry_time"])
         
+        # Restore running VWAP sums so the session VWAP survives the restart,
+        # but only within the same session - otherwise start a fresh one
+        current_time = get_current_time()
+        session_date = get_vwap_session_date(current_time)
+        if saved_state.get("vwap_session") and saved_state.get("vwap_session_date") == session_date.isoformat():
+            state[symbol]["vwap_accumulator"].restore(saved_state["vwap_session"])
+            calculate_vwap(symbol)
+        elif saved_state.get("vwap_session"):
+            logger.warning(f"  Saved VWAP is from session {saved_state.get('vwap_session_date')} - "
+                           f"starting fresh VWAP for {session_date}")
+            perform_vwap_reset(symbol, session_date, current_time)
+        
         logger.warning(f"  Position restored successfully")
         logger.warning(SEPARATOR_LINE)
         return True
@@ -2190,27 +2276,128 @@ def on_tick(symbol: str, price: float, volume: int, timestamp_ms: int) -> None:
         volume: Tick volume
         timestamp_ms: Timestamp in milliseconds
     """
-    # Post tick data to event loop for processing
+    # Post tick data to the event loop's tick buffer (drained in batches)
     if event_loop:
-        event_loop.post_event(
-            EventType.TICK_DATA,
-            EventPriority.MEDIUM,
-            {
-                "symbol": symbol,
-                "price": price,
-                "volume": volume,
-                "timestamp": timestamp_ms
-            }
-        )
+        event_loop.post_tick(symbol, price, volume, timestamp_ms)
     else:
         # Fallback if event loop not initialized (backtesting mode)
         # Suppress warning spam during backtests - this is expected behavior
-        handle_tick_event({
-            "symbol": symbol,
-            "price": price,
-            "volume": volume,
-            "timestamp": timestamp_ms
-        })
+        process_tick(symbol, price, volume, timestamp_ms)
+
+
+def append_1min_bar(symbol: str, bar: Dict[str, Any], cache_row: Optional[int] = None) -> None:
+    """
+    Store a finalized 1-minute bar and feed it to the streaming indicators.
+    All finalized bars must go through here so the indicator state stays
+    in sync with state[symbol]["bars_1min"].
+    
+    Args:
+        symbol: Instrument symbol
+        bar: Complete bar dict with timestamp, open, high, low, close, volume
+        cache_row: Row of this bar in the attached feature cache (indicator
+                   values are loaded from it instead of being recomputed)
+    """
+    if cache_row is None and state[symbol]["feature_cache"] is not None:
+        detach_feature_cache(symbol)
+    
+    state[symbol]["bars_1min"].append(bar)
+    state[symbol]["feature_row"] = cache_row
+    if cache_row is None:
+        state[symbol]["indicators"].update(bar)
+    else:
+        cache = state[symbol]["feature_cache"]
+        state[symbol]["indicators"].load_cached(
+            rsi=cache.value("rsi", cache_row),
+            macd=cache.macd(cache_row),
+            atr=cache.value("atr", cache_row),
+            last_true_range=cache.value("last_true_range", cache_row),
+            avg_volume=cache.value("avg_volume", cache_row)
+        )
+    state[symbol]["regime_engine"].update(bar)
+    state[symbol]["flush_tracker"].update(bar)
+    state[symbol]["vwap_accumulator"].update(bar)
+
+
+def seed_backtest(seed: Optional[int]) -> None:
+    """
+    Seed every random source the engine consumes so a backtest replays identically.
+    
+    RL exploration and the capitulation diagnostics each get their own
+    generator, so diagnostic output never changes which signals are explored.
+    Simulation time already comes from the replayed bars (get_current_time).
+    
+    Args:
+        seed: Base seed (None = unseeded)
+    """
+    if rl_brain is not None:
+        rl_brain.rng.seed(seed)
+    seed_diagnostic_sampling(None if seed is None else seed + 1)
+
+
+def attach_feature_cache(symbol: str, cache: FeatureCache) -> bool:
+    """
+    Use precomputed per-bar features for the bars about to be injected (backtest only).
+    
+    The cache must be built from exactly the bars that will be passed to
+    inject_complete_bar(), in order, starting right after initialize_state().
+    
+    Args:
+        symbol: Instrument symbol
+        cache: Feature cache for the replay
+    
+    Returns:
+        True if attached, False if not in backtest mode or settings differ
+    """
+    if not is_backtest_mode():
+        return False
+    if cache.settings != indicator_settings(CONFIG):
+        logger.warning("Feature cache ignored - indicator settings differ from current config")
+        return False
+    if len(state[symbol]["bars_1min"]) > 0:
+        logger.warning("Feature cache ignored - bars were already injected")
+        return False
+    cache.position = 0
+    state[symbol]["feature_cache"] = cache
+    state[symbol]["feature_row"] = None
+    return True
+
+
+def detach_feature_cache(symbol: str) -> None:
+    """
+    Stop using the feature cache and rebuild the streaming indicators from stored bars.
+    
+    Args:
+        symbol: Instrument symbol
+    """
+    cache = state[symbol].get("feature_cache")
+    state[symbol]["feature_cache"] = None
+    state[symbol]["feature_row"] = None
+    if cache is None or cache.position == 0:
+        return
+    
+    logger.warning("Feature cache out of sync with injected bars - recomputing indicators")
+    indicators = state[symbol]["indicators"]
+    indicators.reset()
+    for stored_bar in state[symbol]["bars_1min"]:
+        indicators.update(stored_bar)
+
+
+def detect_current_regime(symbol: str, atr: float) -> RegimeParameters:
+    """
+    Regime for the latest 1-minute bar.
+    Uses the feature cache when attached, otherwise the streaming regime detector.
+    
+    Args:
+        symbol: Instrument symbol
+        atr: Current 1-minute ATR
+    
+    Returns:
+        RegimeParameters for the detected regime
+    """
+    cache_row = state[symbol].get("feature_row")
+    if cache_row is not None:
+        return REGIME_DEFINITIONS[state[symbol]["feature_cache"].regimes[cache_row]]
+    return state[symbol]["regime_engine"].detect_regime(atr)
 
 
 def update_1min_bar(symbol: str, price: float, volume: int, dt: datetime) -> None:
@@ -2231,9 +2418,14 @@ def update_1min_bar(symbol: str, price: float, volume: int, dt: datetime) -> Non
     if current_bar is None or current_bar["timestamp"] != minute_boundary:
         # Finalize previous bar if exists
         if current_bar is not None:
-            state[symbol]["bars_1min"].append(current_bar)
+            append_1min_bar(symbol, current_bar)
             bar_count = len(state[symbol]["bars_1min"])
             
+            # Update indicators from the streaming engine (same as historical replay)
+            update_macd(symbol)
+            update_rsi(symbol)
+            update_volume_average(symbol)
+            
             # Calculate VWAP after new bar is added
             calculate_vwap(symbol)
             
@@ -2336,10 +2528,42 @@ def update_1min_bar(symbol: str, price: float, volume: int, dt: datetime) -> Non
         # CRITICAL FOR LIVE TRADING: Check exits on EVERY TICK (intrabar)
         # Don't wait for bar close - exit immediately if stop/target hit
         if state[symbol]["position"]["active"]:
+            if check_intrabar_stop(symbol, price, price):
+                return
             check_exit_conditions(symbol)
 
 
-def inject_complete_bar(symbol: str, bar: Dict[str, Any]) -> None:
+def check_intrabar_stop(symbol: str, low: float, high: float) -> bool:
+    """
+    Exit immediately if the stop was touched within a tick price range.
+    check_exit_conditions only sees completed bars, so intrabar stop touches
+    (single ticks or a coalesced burst's min/max) are checked here.
+    
+    Backtest only: live, the broker stop order placed at entry (and its
+    breakeven/trailing replacements) is still resting, and a market exit here
+    could fill alongside it and reverse the position.
+    
+    Args:
+        symbol: Instrument symbol
+        low: Lowest traded price in the range
+        high: Highest traded price in the range
+    
+    Returns:
+        True if the stop was hit and the position was exited
+    """
+    if not is_backtest_mode():
+        return False
+    position = state[symbol]["position"]
+    if position.get("stop_price") is None:
+        return False
+    stop_hit, stop_price = check_stop_hit(symbol, {"low": low, "high": high}, position)
+    if stop_hit:
+        execute_exit(symbol, stop_price, "stop_loss")
+        return True
+    return False
+
+
+def inject_complete_bar(symbol: str, bar: Dict[str, Any], check_signals: bool = True) -> None:
     """
     Inject a complete OHLCV bar directly (historical data replay).
     This preserves accurate high/low ranges for ATR calculation.
@@ -2347,13 +2571,15 @@ def inject_complete_bar(symbol: str, bar: Dict[str, Any]) -> None:
     Args:
         symbol: Instrument symbol
         bar: Complete bar dict with timestamp, open, high, low, close, volume
+        check_signals: Look for new entries on this bar (False for warm-up bars
+                       and for bars replayed only to manage an open position)
     """
     global backtest_current_time
     
     # DEBUG: Confirm bars are being injected
     inject_count = state[symbol].get("inject_count", 0) + 1
     state[symbol]["inject_count"] = inject_count
-    if inject_count <= 3:
+    if inject_count <= 3 and not diagnostics.QUIET:
         print(f"DEBUG: inject_complete_bar called #{inject_count}, timestamp={bar.get('timestamp')}")
     
     # BACKTEST MODE: Update simulation time so all time-based logic uses historical time
@@ -2364,13 +2590,19 @@ def inject_complete_bar(symbol: str, bar: Dict[str, Any]) -> None:
     if len(state[symbol]["bars_1min"]) == 0:
         pass  # Silent - bar injection internal (backtest mode)
     
+    # Feature cache row for this bar (None detaches the cache if it no longer lines up)
+    cache_row = None
+    cache = state[symbol]["feature_cache"]
+    if cache is not None and state[symbol]["current_1min_bar"] is None and 'timestamp' in bar:
+        cache_row = cache.next_row(bar['timestamp'])
+    
     # Finalize any pending bar first
     if state[symbol]["current_1min_bar"] is not None:
-        state[symbol]["bars_1min"].append(state[symbol]["current_1min_bar"])
+        append_1min_bar(symbol, state[symbol]["current_1min_bar"])
         state[symbol]["current_1min_bar"] = None
     
     # Add the complete bar with proper OHLC
-    state[symbol]["bars_1min"].append(bar)
+    append_1min_bar(symbol, bar, cache_row)
     
     # Update current regime after adding new bar
     update_current_regime(symbol)
@@ -2383,7 +2615,8 @@ def inject_complete_bar(symbol: str, bar: Dict[str, Any]) -> None:
     # Update VWAP and check conditions
     calculate_vwap(symbol)
     check_exit_conditions(symbol)
-    check_for_signals(symbol)
+    if check_signals:
+        check_for_signals(symbol)
 
 
 
@@ -2442,7 +2675,7 @@ def update_trend_filter(symbol: str) -> None:
         return
     
     # Calculate EMA
-    closes = [bar["close"] for bar in bars]
+    closes = bars.tail("close").tolist()
     ema = calculate_ema(closes, period)
     
     if ema is not None:
@@ -2545,42 +2778,14 @@ def calculate_macd(prices: List[float], fast_period: int = 12,
     if len(prices) < slow_period + signal_period:
         return None
     
-    # Calculate fast and slow EMAs
-    fast_ema = calculate_ema(prices, fast_period)
-    slow_ema = calculate_ema(prices, slow_period)
-    
-    if fast_ema is None or slow_ema is None:
-        return None
-    
-    # Calculate MACD line
-    macd_line = fast_ema - slow_ema
-    
-    # Calculate MACD values for signal line
-    # We need to calculate MACD for each point to get signal line
-    macd_values = []
-    for i in range(slow_period, len(prices) + 1):
-        fast = calculate_ema(prices[:i], fast_period)
-        slow = calculate_ema(prices[:i], slow_period)
-        if fast is not None and slow is not None:
-            macd_values.append(fast - slow)
-    
-    if len(macd_values) < signal_period:
-        return None
-    
-    # Calculate signal line (EMA of MACD)
-    signal_line = calculate_ema(macd_values, signal_period)
+    # Single pass: fast/slow EMAs and the signal EMA of the MACD line are all
+    # carried forward incrementally instead of re-running EMA on every prefix
+    macd = IncrementalMACD(fast_period, slow_period, signal_period)
+    macd_data = None
+    for price in prices:
+        macd_data = macd.update(price)
     
-    if signal_line is None:
-        return None
-    
-    # Calculate histogram
-    histogram = macd_line - signal_line
-    
-    return {
-        "macd": macd_line,
-        "signal": signal_line,
-        "histogram": histogram
-    }
+    return macd_data
 
 
 def calculate_atr(symbol: str, period: int = 14) -> Optional[float]:
@@ -2599,22 +2804,11 @@ def calculate_atr(symbol: str, period: int = 14) -> Optional[float]:
     if len(bars) < 2:
         return None
     
-    true_ranges = []
-    for i in range(1, len(bars)):
-        high = bars[i]["high"]
-        low = bars[i]["low"]
-        prev_close = bars[i-1]["close"]
-        
-        # True Range is the maximum of:
-        # 1. Current High - Current Low
-        # 2. abs(Current High - Previous Close)
-        # 3. abs(Current Low - Previous Close)
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
+    # True Range is the maximum of:
+    # 1. Current High - Current Low
+    # 2. abs(Current High - Previous Close)
+    # 3. abs(Current Low - Previous Close)
+    true_ranges = tail_true_ranges(bars).tolist()
     
     if not true_ranges:
         return None
@@ -2643,38 +2837,24 @@ def calculate_atr_1min(symbol: str, period: int = 14) -> Optional[float]:
     Returns:
         ATR value in price units, or None if not enough data
     """
+    # Streaming ATR: O(1) lookup when the period matches the engine's window
+    indicators = state[symbol].get("indicators")
+    if indicators is not None and indicators.atr_period == period:
+        return indicators.atr
+    
     bars = state[symbol]["bars_1min"]
     
     if len(bars) < 2:
         return None
     
-    true_ranges = []
-    for i in range(1, len(bars)):
-        high = bars[i]["high"]
-        low = bars[i]["low"]
-        prev_close = bars[i-1]["close"]
-        
-        # True Range is the maximum of:
-        # 1. Current High - Current Low
-        # 2. abs(Current High - Previous Close)
-        # 3. abs(Current Low - Previous Close)
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
+    # Only the last `period` true ranges are needed
+    true_ranges = tail_true_ranges(bars, period).tolist()
     
     if not true_ranges:
         return None
     
     # Calculate ATR (simple moving average of TR)
-    if len(true_ranges) >= period:
-        atr = sum(true_ranges[-period:]) / period
-    else:
-        atr = sum(true_ranges) / len(true_ranges)
-    
-    return atr
+    return sum(true_ranges) / len(true_ranges)
 
 
 def update_rsi(symbol: str) -> None:
@@ -2685,16 +2865,8 @@ def update_rsi(symbol: str) -> None:
     Args:
         symbol: Instrument symbol
     """
-    bars = state[symbol]["bars_1min"]  # Changed from 15-min to 1-min
-    rsi_period = CONFIG.get("rsi_period", 10)  # Iteration 3 - fast RSI
-    
-    if len(bars) < rsi_period + 1:
-        pass  # Silent - RSI calculation internal
-        return
-    
-    # Use recent bars for calculation
-    closes = [bar["close"] for bar in list(bars)[-100:]]
-    rsi = calculate_rsi(closes, rsi_period)
+    # Wilder RSI is carried forward by the streaming indicator engine (O(1) per bar)
+    rsi = state[symbol]["indicators"].rsi
     
     if rsi is not None:
         state[symbol]["rsi"] = rsi
@@ -2708,21 +2880,9 @@ def update_macd(symbol: str) -> None:
     Args:
         symbol: Instrument symbol
     """
-    # Use 1-minute bars for faster MACD calculation (faster initialization)
-    bars = state[symbol]["bars_1min"]
-    
-    # Get MACD parameters from config
-    fast_period = CONFIG.get("macd_fast", 12)
-    slow_period = CONFIG.get("macd_slow", 26)
-    signal_period = CONFIG.get("macd_signal", 9)
-    
-    if len(bars) < slow_period + signal_period:
-        pass  # Silent - MACD calculation internal
-        return
-    
-    # Use recent bars for calculation
-    closes = [bar["close"] for bar in list(bars)[-100:]]  # Use last 100 bars
-    macd_data = calculate_macd(closes, fast_period, slow_period, signal_period)
+    # MACD/signal/histogram are carried forward by the streaming indicator engine
+    # (periods come from CONFIG macd_fast/macd_slow/macd_signal at initialize_state)
+    macd_data = state[symbol]["indicators"].macd
     
     if macd_data is not None:
         state[symbol]["macd"] = macd_data
@@ -2737,18 +2897,13 @@ def update_volume_average(symbol: str) -> None:
     Args:
         symbol: Instrument symbol
     """
-    bars = state[symbol]["bars_1min"]  # Changed from 15-min to 1-min
-    lookback = CONFIG.get("volume_lookback", 20)
+    # Rolling mean over the lookback window from the streaming indicator engine
+    avg_volume = state[symbol]["indicators"].avg_volume
     
-    if len(bars) < lookback:
+    if avg_volume is None:
         pass  # Silent - volume calculation internal
         return
     
-    # Calculate average volume over lookback period
-    recent_bars = list(bars)[-lookback:]
-    volumes = [bar["volume"] for bar in recent_bars]
-    avg_volume = sum(volumes) / len(volumes)
-    
     state[symbol]["avg_volume"] = avg_volume
     
     # Track recent volume history for surge detection (last 20 1-min bars)
@@ -2818,12 +2973,7 @@ def check_market_divergence(symbol: str, position_side: str) -> Tuple[bool, str]
         return False, "Not enough bars for momentum check"
     
     # Check last 5 bars for momentum direction
-    recent_bars = list(bars)[-5:]
-    price_changes = []
-    
-    for i in range(1, len(recent_bars)):
-        change = recent_bars[i]["close"] - recent_bars[i-1]["close"]
-        price_changes.append(change)
+    price_changes = np.diff(bars.tail("close", 5)).tolist()
     
     # Count up/down moves
     up_moves = sum(1 for change in price_changes if change > 0)
@@ -2852,43 +3002,25 @@ def check_market_divergence(symbol: str, position_side: str) -> Tuple[bool, str]
 
 def calculate_vwap(symbol: str) -> None:
     """
-    Calculate VWAP and standard deviation bands from 1-minute bars.
-    VWAP is calculated per bar without logging.
+    Calculate session VWAP and standard deviation bands.
+    Reads the running session sums kept by state[symbol]["vwap_accumulator"],
+    so this is O(1) per bar and covers the whole session (not just the bars
+    still held in bars_1min). The accumulator is reset by perform_vwap_reset().
     
     Args:
         symbol: Instrument symbol
     """
-    bars = state[symbol]["bars_1min"]
-    
-    if len(bars) == 0:
-        return
+    accumulator = state[symbol]["vwap_accumulator"]
     
-    # Calculate cumulative VWAP
-    total_pv = 0.0  # price * volume
-    total_volume = 0.0
-    
-    for bar in bars:
-        typical_price = (bar["high"] + bar["low"] + bar["close"]) / 3.0
-        pv = typical_price * bar["volume"]
-        total_pv += pv
-        total_volume += bar["volume"]
-    
-    if total_volume == 0:
+    vwap = accumulator.vwap
+    if vwap is None:
         return
     
     # VWAP = sum(price * volume) / sum(volume)
-    vwap = total_pv / total_volume
     state[symbol]["vwap"] = vwap
     
-    # Calculate standard deviation (volume-weighted)
-    variance_sum = 0.0
-    for bar in bars:
-        typical_price = (bar["high"] + bar["low"] + bar["close"]) / 3.0
-        squared_diff = (typical_price - vwap) ** 2
-        variance_sum += squared_diff * bar["volume"]
-    
-    variance = variance_sum / total_volume
-    std_dev = variance ** 0.5
+    # Volume-weighted standard deviation around VWAP
+    std_dev = accumulator.std_dev
     state[symbol]["vwap_std_dev"] = std_dev
     
     # Calculate bands using ITERATION 3 standard deviation multipliers
@@ -2977,6 +3109,11 @@ def validate_signal_requirements(symbol: str, bar_time: datetime) -> Tuple[bool,
         logger.debug("Position already active, skipping signal generation")
         return False, "Position active"
     
+    # Passive exit still working - the broker position is not closed yet
+    if bid_ask_manager is not None and bid_ask_manager.passive_orders.has_working(symbol):
+        logger.debug("Passive exit order working, skipping signal generation")
+        return False, "Passive exit working"
+    
     # Check daily trade limit (skip in backtest mode)
     if not is_backtest_mode() and state[symbol]["daily_trade_count"] >= CONFIG["max_trades_per_day"]:
         logger.debug(f"Daily trade limit reached ({CONFIG['max_trades_per_day']}), stopping for the day")
@@ -3148,8 +3285,72 @@ def validate_signal_requirements(symbol: str, bar_time: datetime) -> Tuple[bool,
     return True, None
 
 
+def evaluate_signal_conditions(symbol: str, prev_bar: Dict[str, Any],
+                               current_bar: Dict[str, Any]) -> SignalCheck:
+    """
+    Evaluate the capitulation conditions for both directions on the current bar.
+    
+    Flush extremes and the 20-bar average volume come from the symbol's
+    FlushTracker, so no bar history is reread. With flush_timeframes beyond
+    1 minute, the flush conditions are also checked on each higher timeframe
+    and the first check that passes is used (long before short, shorter
+    timeframes first); otherwise the 1-minute check is returned. The result is
+    kept in state[symbol]["signal_check"] for capture_market_state().
+    Callers must have checked that VWAP is available.
+    
+    Args:
+        symbol: Instrument symbol
+        prev_bar: Previous 1-minute bar
+        current_bar: Current 1-minute bar
+    
+    Returns:
+        SignalCheck for the current bar
+    """
+    tracker = state[symbol]["flush_tracker"]
+    cap_detector = get_capitulation_detector(CONFIG.get("tick_size", 0.25), CONFIG.get("tick_value", 12.50))
+    avg_volume_20 = tracker.avg_volume
+    rsi = state[symbol]["rsi"]
+    vwap = state[symbol]["vwap"]
+    regime = state[symbol].get("current_regime", "NORMAL")
+    
+    signal_check = None
+    short_check = None
+    for timeframe in tracker.timeframes:
+        highest_high, lowest_low, bar_count = tracker.timeframe_window(timeframe)
+        if timeframe > 1 and bar_count == 0:
+            continue  # No bar on this timeframe yet
+        check = cap_detector.evaluate_bar(
+            highest_high=highest_high,
+            lowest_low=lowest_low,
+            bar_count=bar_count,
+            avg_volume_20=avg_volume_20,
+            current_bar=current_bar,
+            prev_bar=prev_bar,
+            rsi=rsi,
+            current_price=current_bar["close"],
+            vwap=vwap,
+            regime=regime,
+            timeframe=timeframe
+        )
+        if signal_check is None:
+            signal_check = check  # 1-minute check is the fallback
+        if check.long_passed:
+            signal_check = check
+            short_check = None
+            break
+        if short_check is None and check.short_passed:
+            short_check = check
+    if short_check is not None:
+        signal_check = short_check
+    
+    state[symbol]["signal_check"] = signal_check
+    state[symbol]["signal_check_bar"] = tracker.bars_seen
+    return signal_check
+
+
 def check_long_signal_conditions(symbol: str, prev_bar: Dict[str, Any], 
-                                 current_bar: Dict[str, Any]) -> bool:
+                                 current_bar: Dict[str, Any],
+                                 signal_check: Optional[SignalCheck] = None) -> bool:
     """
     Check if long signal conditions are met - CAPITULATION REVERSAL STRATEGY.
     
@@ -3168,14 +3369,13 @@ def check_long_signal_conditions(symbol: str, prev_bar: Dict[str, Any],
         symbol: Instrument symbol
         prev_bar: Previous 1-minute bar
         current_bar: Current 1-minute bar
+        signal_check: This bar's evaluate_signal_conditions() result (evaluated if None)
     
     Returns:
         True if ALL 9 conditions are met
     """
     vwap = state[symbol]["vwap"]
     bars = state[symbol]["bars_1min"]
-    rsi = state[symbol]["rsi"]
-    current_regime = state[symbol].get("current_regime", "NORMAL")
     
     # VWAP check (still calculated for reference)
     if vwap is None or vwap <= 0:
@@ -3187,41 +3387,20 @@ def check_long_signal_conditions(symbol: str, prev_bar: Dict[str, Any],
         logger.debug("Long rejected - insufficient bars for flush detection")
         return False
     
-    # Calculate 20-bar average volume
-    if len(bars) >= 20:
-        recent_volumes = [bar.get("volume", 0) for bar in list(bars)[-20:]]
-        avg_volume_20 = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 1
-    else:
-        # If less than 20 bars, use available bars for average (not current bar)
-        if len(bars) > 0:
-            recent_volumes = [bar.get("volume", 0) for bar in list(bars)]
-            avg_volume_20 = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 1
-        else:
-            avg_volume_20 = 1
-    
-    # Get capitulation detector
-    tick_size = CONFIG.get("tick_size", 0.25)
-    tick_value = CONFIG.get("tick_value", 12.50)
-    cap_detector = get_capitulation_detector(tick_size, tick_value)
+    # Flush metrics and both directions' conditions are evaluated once per bar
+    if signal_check is None:
+        signal_check = evaluate_signal_conditions(symbol, prev_bar, current_bar)
     
     # Check ALL 9 conditions
-    all_passed, details = cap_detector.check_all_long_conditions(
-        bars=bars,
-        current_bar=current_bar,
-        prev_bar=prev_bar,
-        rsi=rsi,
-        avg_volume_20=avg_volume_20,
-        current_price=current_bar["close"],
-        vwap=vwap,
-        regime=current_regime
-    )
+    cap_detector = get_capitulation_detector(CONFIG.get("tick_size", 0.25), CONFIG.get("tick_value", 12.50))
+    all_passed, details = cap_detector.long_result(signal_check)
     
     # Store entry details for both success and failure (for diagnostic logging)
     state[symbol]["entry_details"] = details
     
     if not all_passed:
         # Log periodically which conditions are failing (for debugging)
-        if details.get("reason"):
+        if details.get("reason") and not diagnostics.QUIET:
             logger.debug(f"Long rejected: {details['reason']}")
         return False
     
@@ -3233,7 +3412,8 @@ def check_long_signal_conditions(symbol: str, prev_bar: Dict[str, Any],
 
 
 def check_short_signal_conditions(symbol: str, prev_bar: Dict[str, Any], 
-                                  current_bar: Dict[str, Any]) -> bool:
+                                  current_bar: Dict[str, Any],
+                                  signal_check: Optional[SignalCheck] = None) -> bool:
     """
     Check if short signal conditions are met - CAPITULATION REVERSAL STRATEGY.
     
@@ -3252,14 +3432,13 @@ def check_short_signal_conditions(symbol: str, prev_bar: Dict[str, Any],
         symbol: Instrument symbol
         prev_bar: Previous 1-minute bar
         current_bar: Current 1-minute bar
+        signal_check: This bar's evaluate_signal_conditions() result (evaluated if None)
     
     Returns:
         True if ALL 9 conditions are met
     """
     vwap = state[symbol]["vwap"]
     bars = state[symbol]["bars_1min"]
-    rsi = state[symbol]["rsi"]
-    current_regime = state[symbol].get("current_regime", "NORMAL")
     
     # VWAP check (still calculated for reference)
     if vwap is None or vwap <= 0:
@@ -3271,41 +3450,20 @@ def check_short_signal_conditions(symbol: str, prev_bar: Dict[str, Any],
         logger.debug("Short rejected - insufficient bars for flush detection")
         return False
     
-    # Calculate 20-bar average volume
-    if len(bars) >= 20:
-        recent_volumes = [bar.get("volume", 0) for bar in list(bars)[-20:]]
-        avg_volume_20 = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 1
-    else:
-        # If less than 20 bars, use available bars for average (not current bar)
-        if len(bars) > 0:
-            recent_volumes = [bar.get("volume", 0) for bar in list(bars)]
-            avg_volume_20 = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 1
-        else:
-            avg_volume_20 = 1
-    
-    # Get capitulation detector
-    tick_size = CONFIG.get("tick_size", 0.25)
-    tick_value = CONFIG.get("tick_value", 12.50)
-    cap_detector = get_capitulation_detector(tick_size, tick_value)
+    # Flush metrics and both directions' conditions are evaluated once per bar
+    if signal_check is None:
+        signal_check = evaluate_signal_conditions(symbol, prev_bar, current_bar)
     
     # Check ALL 9 conditions
-    all_passed, details = cap_detector.check_all_short_conditions(
-        bars=bars,
-        current_bar=current_bar,
-        prev_bar=prev_bar,
-        rsi=rsi,
-        avg_volume_20=avg_volume_20,
-        current_price=current_bar["close"],
-        vwap=vwap,
-        regime=current_regime
-    )
+    cap_detector = get_capitulation_detector(CONFIG.get("tick_size", 0.25), CONFIG.get("tick_value", 12.50))
+    all_passed, details = cap_detector.short_result(signal_check)
     
     # Store entry details for both success and failure (for diagnostic logging)
     state[symbol]["entry_details"] = details
     
     if not all_passed:
         # Log periodically which conditions are failing (for debugging)
-        if details.get("reason"):
+        if details.get("reason") and not diagnostics.QUIET:
             logger.debug(f"Short rejected: {details['reason']}")
         return False
     
@@ -3408,46 +3566,8 @@ def get_volatility_regime(atr: float, symbol: str) -> str:
     Returns:
         "LOW", "MEDIUM", or "HIGH"
     """
-    # Get historical ATR values for comparison
-    bars = state[symbol]["bars_1min"]
-    if len(bars) < 100:
-        return "MEDIUM"
-    
-    # Calculate average ATR over last 100 bars
-    recent_bars = list(bars)[-100:]
-    atr_values = []
-    
-    for i in range(14, len(recent_bars)):  # Need 14 bars for ATR
-        bars_slice = recent_bars[i-14:i+1]
-        true_ranges = []
-        
-        for j in range(1, len(bars_slice)):
-            high = bars_slice[j]["high"]
-            low = bars_slice[j]["low"]
-            prev_close = bars_slice[j-1]["close"]
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        if true_ranges:
-            atr_values.append(sum(true_ranges) / len(true_ranges))
-    
-    if not atr_values:
-        return "MEDIUM"
-    
-    avg_atr = sum(atr_values) / len(atr_values)
-    
-    # Classify based on deviation from average
-    if atr < avg_atr * 0.75:
-        return "LOW"
-    elif atr > avg_atr * 1.25:
-        return "HIGH"
-    else:
-        return "MEDIUM"
+    # Average of the 14-bar ATRs over the last 100 bars, kept as a rolling sum
+    return state[symbol]["regime_engine"].volatility_level(atr)
 
 
 def capture_market_state(symbol: str, current_price: float) -> Dict[str, Any]:
@@ -3500,15 +3620,22 @@ def capture_market_state(symbol: str, current_price: float) -> Dict[str, Any]:
     
     # Get tick size
     tick_size = CONFIG.get("tick_size", 0.25)
-    tick_value = CONFIG.get("tick_value", 12.50)
     
-    # Calculate volume_climax_ratio (current volume vs 20-bar average)
+    # Flush metrics of the current bar's signal evaluation (None if not evaluated on this bar)
     bars_1min = state[symbol]["bars_1min"]
+    signal_check = state[symbol].get("signal_check")
+    if state[symbol].get("signal_check_bar") != state[symbol]["flush_tracker"].bars_seen:
+        signal_check = None
+    
+    # Calculate volume_climax_ratio (current volume vs 20-bar average)
     if len(bars_1min) >= 20:
-        recent_volumes = [bar.get("volume", 0) for bar in list(bars_1min)[-20:]]
-        avg_volume_20 = sum(recent_volumes) / len(recent_volumes) if recent_volumes else 1
-        current_bar = bars_1min[-1] if bars_1min else {"volume": 0}
-        volume_climax_ratio = current_bar.get("volume", 0) / avg_volume_20 if avg_volume_20 > 0 else 1.0
+        if signal_check is not None:
+            current_volume = signal_check.current_volume
+            avg_volume_20 = signal_check.avg_volume_20
+        else:
+            current_volume = bars_1min[-1]["volume"]
+            avg_volume_20 = state[symbol]["flush_tracker"].avg_volume
+        volume_climax_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 1.0
     else:
         volume_climax_ratio = 1.0
     
@@ -3516,21 +3643,18 @@ def capture_market_state(symbol: str, current_price: float) -> Dict[str, Any]:
     vwap_actual = state[symbol].get("vwap", current_price)
     vwap_distance_ticks = (current_price - vwap_actual) / tick_size if tick_size > 0 else 0
     
-    # Get capitulation detector state for flush metrics
-    cap_detector = get_capitulation_detector(tick_size, tick_value)
-    
     # Initialize flush-related fields
     flush_size_ticks = 0.0
     flush_velocity = 0.0
     flush_direction = "NONE"
     distance_from_flush_low = 0.0
     
-    if cap_detector.last_flush:
-        flush = cap_detector.last_flush
-        flush_size_ticks = flush.flush_size_ticks
-        flush_velocity = flush.flush_velocity
-        flush_direction = flush.direction
-        distance_from_flush_low = (current_price - flush.flush_low) / tick_size if tick_size > 0 else 0
+    # Flush of the setup that passed on this bar (long is checked first)
+    if signal_check is not None and (signal_check.long_passed or signal_check.short_passed):
+        flush_size_ticks = signal_check.flush_range_ticks
+        flush_velocity = signal_check.velocity / signal_check.timeframe  # Ticks per minute
+        flush_direction = "DOWN" if signal_check.long_passed else "UP"
+        distance_from_flush_low = (current_price - signal_check.flush_low) / tick_size if tick_size > 0 else 0
     
     # Reversal candle detection (current bar closes green for longs, red for shorts)
     reversal_candle = False
@@ -3590,19 +3714,19 @@ def check_for_signals(symbol: str) -> None:
     # DEBUG: Confirm function is being called
     call_count = state[symbol].get("check_for_signals_count", 0) + 1
     state[symbol]["check_for_signals_count"] = call_count
-    if call_count <= 5:
+    if call_count <= 5 and not diagnostics.QUIET:
         print(f"DEBUG: check_for_signals called #{call_count}")
     
     # Check safety conditions first
     is_safe, reason = check_safety_conditions(symbol)
     if not is_safe:
         # SILENCE DURING MAINTENANCE - no spam in logs
-        if not bot_status.get("maintenance_idle", False):
+        if not bot_status.get("maintenance_idle", False) and not diagnostics.QUIET:
             logger.info(f"[SIGNAL CHECK] Safety check failed: {reason}")
         # DEBUG: Log first few safety failures
         safety_fail_count = state[symbol].get("safety_fail_count", 0) + 1
         state[symbol]["safety_fail_count"] = safety_fail_count
-        if safety_fail_count <= 3:
+        if safety_fail_count <= 3 and not diagnostics.QUIET:
             print(f"DEBUG: Safety check failed - {reason}")
         return
     
@@ -3623,11 +3747,11 @@ def check_for_signals(symbol: str) -> None:
         state[symbol]["validation_fail_counter"] = validation_fail_counter
         
         # DEBUG: Log first few validation failures
-        if validation_fail_counter <= 5:
+        if validation_fail_counter <= 5 and not diagnostics.QUIET:
             print(f"DEBUG: Validation failed - {reason}")
         
         # Log every 15 minutes (15 bars) - just show the reason, not strategy details
-        if validation_fail_counter % 15 == 0:
+        if validation_fail_counter % 15 == 0 and not diagnostics.QUIET:
             logger.info(f"📋 Signal check: {reason} - bot is monitoring and will trade when conditions allow")
         return
     
@@ -3640,15 +3764,16 @@ def check_for_signals(symbol: str) -> None:
     vwap = state[symbol].get("vwap", 0)
     regime = state[symbol].get("current_regime", "NORMAL")
     
-    logger.debug(f"Signal check: regime={regime}, prev_low={prev_bar['low']:.2f}, "
-                f"current_close={current_bar['close']:.2f}, vwap={vwap:.2f}")
+    if not diagnostics.QUIET:
+        logger.debug(f"Signal check: regime={regime}, prev_low={prev_bar['low']:.2f}, "
+                    f"current_close={current_bar['close']:.2f}, vwap={vwap:.2f}")
     
     # PERIODIC HEARTBEAT: Show bot is actively scanning for signals (every 15 minutes)
     # Does NOT reveal strategy details - just confirms bot is running
     signal_check_counter = state[symbol].get("signal_check_counter", 0) + 1
     state[symbol]["signal_check_counter"] = signal_check_counter
     
-    if signal_check_counter % 15 == 0:  # Every 15 minutes
+    if signal_check_counter % 15 == 0 and not diagnostics.QUIET:  # Every 15 minutes
         price = current_bar["close"]
         logger.info(f"📊 Bot active | Price: ${price:.2f} | Scanning for entry signals...")
     
@@ -3656,23 +3781,29 @@ def check_for_signals(symbol: str) -> None:
     # This helps users understand why signals aren't being generated
     diagnostic_counter = state[symbol].get("diagnostic_counter", 0) + 1
     state[symbol]["diagnostic_counter"] = diagnostic_counter
-    should_log_diagnostic = (diagnostic_counter % 30 == 0)
+    should_log_diagnostic = (diagnostic_counter % 30 == 0) and not diagnostics.QUIET
     
     # Declare global RL brain for both signal checks
     global rl_brain
     
+    # Evaluate both directions in one pass (the long and short checks share it)
+    signal_check = None
+    if vwap is not None and vwap > 0 and len(state[symbol]["bars_1min"]) >= 10:
+        signal_check = evaluate_signal_conditions(symbol, prev_bar, current_bar)
+    
     # Check for long signal
-    long_passed = check_long_signal_conditions(symbol, prev_bar, current_bar)
+    long_passed = check_long_signal_conditions(symbol, prev_bar, current_bar, signal_check)
     if long_passed:
         # MARKET STATE CAPTURE - Record comprehensive market conditions
         # Capture current market state (flat structure with all 16 indicators)
         market_state = capture_market_state(symbol, current_bar["close"])
         
         # DEBUG: Log market state to diagnose why pattern matching may fail
-        logger.info(f"🔍 [MARKET STATE] Long - flush_dir={market_state.get('flush_direction')}, "
-                    f"size={market_state.get('flush_size_ticks'):.1f}t, "
-                    f"vel={market_state.get('flush_velocity'):.2f}, "
-                    f"rsi={market_state.get('rsi'):.1f}")
+        if not diagnostics.QUIET:
+            logger.info(f"🔍 [MARKET STATE] Long - flush_dir={market_state.get('flush_direction')}, "
+                        f"size={market_state.get('flush_size_ticks'):.1f}t, "
+                        f"vel={market_state.get('flush_velocity'):.2f}, "
+                        f"rsi={market_state.get('rsi'):.1f}")
         
         # Ask cloud RL API for decision (or local RL as fallback)
         # Market state has all fields needed: rsi, vwap_distance, atr, volume_ratio, etc.
@@ -3717,7 +3848,7 @@ def check_for_signals(symbol: str) -> None:
                 logger.info(f"💡 Long signal check - no signal detected (may be insufficient data or all conditions failed)")
     
     # Enhanced diagnostic every 15 minutes (more frequent than 30)
-    if not _shutdown_in_progress:
+    if not _shutdown_in_progress and not diagnostics.QUIET:
         diagnostic_counter_15 = state[symbol].get("diagnostic_counter_15", 0) + 1
         state[symbol]["diagnostic_counter_15"] = diagnostic_counter_15
         if diagnostic_counter_15 % 15 == 0:
@@ -3727,17 +3858,18 @@ def check_for_signals(symbol: str) -> None:
                 logger.info(f"🔍 Near-signal: {9 - len(failed_conditions)}/9 conditions passed. Missing: {', '.join(failed_conditions)}")
     
     # Check for short signal
-    short_passed = check_short_signal_conditions(symbol, prev_bar, current_bar)
+    short_passed = check_short_signal_conditions(symbol, prev_bar, current_bar, signal_check)
     if short_passed:
         # MARKET STATE CAPTURE - Record comprehensive market conditions
         # Capture current market state (flat structure with all 16 indicators)
         market_state = capture_market_state(symbol, current_bar["close"])
         
         # DEBUG: Log market state to diagnose why pattern matching may fail
-        logger.info(f"🔍 [MARKET STATE] Short - flush_dir={market_state.get('flush_direction')}, "
-                    f"size={market_state.get('flush_size_ticks'):.1f}t, "
-                    f"vel={market_state.get('flush_velocity'):.2f}, "
-                    f"rsi={market_state.get('rsi'):.1f}")
+        if not diagnostics.QUIET:
+            logger.info(f"🔍 [MARKET STATE] Short - flush_dir={market_state.get('flush_direction')}, "
+                        f"size={market_state.get('flush_size_ticks'):.1f}t, "
+                        f"vel={market_state.get('flush_velocity'):.2f}, "
+                        f"rsi={market_state.get('rsi'):.1f}")
         
         # Ask cloud RL API for decision (or local RL as fallback)
         # Market state has all fields needed: rsi, vwap_distance, atr, volume_ratio, etc.
@@ -3863,12 +3995,10 @@ def calculate_position_size(symbol: str, side: str, entry_price: float, rl_confi
     stop_distance = max_stop_ticks * tick_size  # Convert ticks to price distance
     
     # Detect current regime for entry (for logging purposes)
-    regime_detector = get_regime_detector()
-    bars = state[symbol]["bars_1min"]
     atr = calculate_atr_1min(symbol, CONFIG.get("atr_period", 14))
     
     if atr is not None:
-        entry_regime = regime_detector.detect_regime(bars, atr, CONFIG.get("atr_period", 14))
+        entry_regime = detect_current_regime(symbol, atr)
         logger.info(f"Fixed stop: {max_stop_ticks:.0f} ticks (${max_stop_dollars:.2f}) - Regime: {entry_regime.name}")
     else:
         logger.info(f"Fixed stop: {max_stop_ticks:.0f} ticks (${max_stop_dollars:.2f})")
@@ -4029,11 +4159,10 @@ def is_market_moving_too_fast(symbol: str) -> Tuple[bool, str]:
     if len(bars) < 5:
         return False, "Not enough data"
     
-    # Convert deque to list for slicing
-    recent_bars = list(bars)[-5:]
-    price_ranges = [(b["high"] - b["low"]) for b in recent_bars]
+    # Zero-copy views of the last 5 bars
+    price_ranges = (bars.tail("high", 5) - bars.tail("low", 5)).tolist()
     avg_range = statistics.mean(price_ranges)
-    current_range = recent_bars[-1]["high"] - recent_bars[-1]["low"]
+    current_range = price_ranges[-1]
     
     # If current bar range is > multiplier * average, market is moving fast
     volatility_mult = CONFIG.get("fast_market_volatility_multiplier", 2.0)
@@ -4199,7 +4328,7 @@ def execute_entry(symbol: str, side: str, entry_price: float) -> None:
     logger.info(f"  Stop Loss: ${stop_price:.2f}")
     
     # Track order execution details for post-trade analysis
-    fill_start_time = datetime.now()
+    fill_start_time = get_current_time()
     order_type_used = "market"  # Always market order
     
     # Prepare order parameters
@@ -4210,7 +4339,7 @@ def execute_entry(symbol: str, side: str, entry_price: float) -> None:
     # CRITICAL FIX: Set entry order pending flag BEFORE placing order
     # This prevents position reconciliation from clearing state while order is inflight
     bot_status["entry_order_pending"] = True
-    bot_status["entry_order_pending_since"] = datetime.now()
+    bot_status["entry_order_pending_since"] = get_current_time()
     bot_status["entry_order_pending_symbol"] = symbol
     bot_status["entry_order_pending_id"] = None  # Will be set after order is placed
     
@@ -4304,7 +4433,7 @@ def execute_entry(symbol: str, side: str, entry_price: float) -> None:
     # Record trade execution for cost tracking (Requirement 5)
     if bid_ask_manager is not None:
         try:
-            fill_time_seconds = (datetime.now() - fill_start_time).total_seconds()
+            fill_time_seconds = (get_current_time() - fill_start_time).total_seconds()
             bid_ask_manager.record_trade_execution(
                 symbol=symbol,
                 side=side,
@@ -4336,14 +4465,12 @@ def execute_entry(symbol: str, side: str, entry_price: float) -> None:
     stop_distance_ticks = abs(actual_fill_price - stop_price) / CONFIG["tick_size"]
     
     # Detect entry regime
-    regime_detector = get_regime_detector()
-    bars = state[symbol]["bars_1min"]
     atr = calculate_atr_1min(symbol, CONFIG.get("atr_period", 14))
     if atr is None:
         atr = DEFAULT_FALLBACK_ATR  # Use constant instead of magic number
         logger.warning(f"ATR not calculable, using fallback value: {DEFAULT_FALLBACK_ATR}")
     
-    entry_regime = regime_detector.detect_regime(bars, atr, CONFIG.get("atr_period", 14))
+    entry_regime = detect_current_regime(symbol, atr)
     
     # CAPITULATION REVERSAL: Fixed trade management rules (no regime adjustments)
     breakeven_trigger = CONFIG.get("breakeven_trigger_ticks", 12)
@@ -5221,7 +5348,6 @@ def update_current_regime(symbol: str) -> None:
     Args:
         symbol: Instrument symbol
     """
-    regime_detector = get_regime_detector()
     bars = state[symbol]["bars_1min"]
     
     # Need enough bars for regime detection (114 = 100 baseline + 14 current)
@@ -5238,7 +5364,7 @@ def update_current_regime(symbol: str) -> None:
     prev_regime = state[symbol].get("current_regime", "NORMAL")
     
     # Detect and store current regime
-    detected_regime = regime_detector.detect_regime(bars, current_atr, CONFIG.get("atr_period", 14))
+    detected_regime = detect_current_regime(symbol, current_atr)
     state[symbol]["current_regime"] = detected_regime.name
     
     # Log regime changes for customers (not just backtest)
@@ -5280,14 +5406,13 @@ def check_regime_change(symbol: str, current_price: float) -> None:
     
     # Detect current regime
     regime_detector = get_regime_detector()
-    bars = state[symbol]["bars_1min"]
     current_atr = calculate_atr_1min(symbol, CONFIG.get("atr_period", 14))
     
     if current_atr is None:
         logger.debug("ATR not calculable, skipping regime change check")
         return  # Can't detect regime without ATR
     
-    current_regime = regime_detector.detect_regime(bars, current_atr, CONFIG.get("atr_period", 14))
+    current_regime = detect_current_regime(symbol, current_atr)
     
     # Check if regime has changed
     has_changed, new_regime = regime_detector.check_regime_change(
@@ -5382,7 +5507,7 @@ def check_exit_conditions(symbol: str) -> None:
         if bot_status.get("flatten_in_progress", False):
             flatten_since = bot_status.get("flatten_in_progress_since")
             if flatten_since:
-                elapsed = (datetime.now() - flatten_since).total_seconds()
+                elapsed = (get_current_time() - flatten_since).total_seconds()
                 # Allow up to FLATTEN_IN_PROGRESS_TIMEOUT seconds for flatten to complete before retrying
                 if elapsed < FLATTEN_IN_PROGRESS_TIMEOUT:
                     logger.debug(f"Flatten already in progress for {elapsed:.1f}s - skipping duplicate attempt")
@@ -5961,32 +6086,20 @@ def handle_exit_orders(symbol: str, position: Dict[str, Any], exit_price: float,
                 order = place_limit_order(symbol, order_side, contracts, limit_price)
                 
                 if order and strategy.get('timeout', 0) > 0:
-                    # Wait for fill with timeout
-                    time_module.sleep(strategy['timeout'])
-                    
-                    # Check if filled (handle partial fills)
-                    current_position = abs(get_position_quantity(symbol))
-                    if current_position == 0:
-                        logger.info("✓ Passive exit filled completely")
-                        return
-                    elif current_position < abs(position["quantity"]):
-                        # Partial fill detected
-                        filled = abs(position["quantity"]) - current_position
-                        logger.warning(f"  [PARTIAL FILL] {filled} of {contracts} contracts filled")
-                        logger.warning(f"  [REMAINING] {current_position} contracts - using aggressive for remainder")
-                        remaining_contracts = current_position
-                        # Place aggressive order for remaining
-                        if 'fallback_price' in strategy:
-                            order = place_limit_order(symbol, order_side, remaining_contracts, strategy['fallback_price'])
-                        else:
-                            order = place_market_order(symbol, order_side, remaining_contracts)
-                    else:
-                        # Not filled at all, use fallback
-                        logger.warning("✗ Passive exit not filled, using aggressive")
-                        if 'fallback_price' in strategy:
-                            order = place_limit_order(symbol, order_side, contracts, strategy['fallback_price'])
-                        else:
-                            order = place_market_order(symbol, order_side, contracts)
+                    # Don't wait for the fill here - that would stall tick processing
+                    # and exit checks. The passive order tracker cancels the order and
+                    # sends the remainder aggressively on timeout or when price moves
+                    # away (see escalate_passive_order)
+                    bid_ask_manager.passive_orders.track(
+                        order_id=order.get("order_id"),
+                        symbol=symbol,
+                        order_side=order_side,
+                        quantity=contracts,
+                        limit_price=limit_price,
+                        timeout=strategy['timeout'],
+                        context={"fallback_price": strategy.get('fallback_price')}
+                    )
+                    return
                 else:
                     # No timeout or order failed, go aggressive
                     order = place_market_order(symbol, order_side, contracts)
@@ -6488,12 +6601,40 @@ def check_vwap_reset(symbol: str, current_time: datetime) -> None:
     pass  # Function disabled - not part of current strategy
 
 
+def get_vwap_session_date(current_time: datetime) -> Any:
+    """
+    Trading date of the VWAP session containing current_time.
+    Sessions start at 6:00 PM ET and are labelled with that evening's date
+    (see check_daily_reset), so earlier times belong to the previous day's session.
+    
+    Args:
+        current_time: Current datetime in Eastern Time
+    
+    Returns:
+        Session date
+    """
+    if current_time.time() >= datetime_time(18, 0):
+        return current_time.date()
+    return (current_time - timedelta(days=1)).date()
+
+
 def perform_vwap_reset(symbol: str, new_date: Any, reset_time: datetime) -> None:
     """
-    DEPRECATED: VWAP reset not used in current strategy.
-    Function kept for compatibility but does nothing.
+    Start a new VWAP session.
+    Clears the running VWAP sums so VWAP and bands rebuild from the next bar.
+    Called from perform_daily_reset() at the futures trading day start.
+    
+    Args:
+        symbol: Instrument symbol
+        new_date: The new trading date
+        reset_time: Time the reset happened
     """
-    pass  # Function disabled - not part of current strategy
+    state[symbol]["vwap_accumulator"].reset(session=new_date)
+    state[symbol]["vwap_day"] = new_date
+    state[symbol]["vwap"] = None
+    state[symbol]["vwap_std_dev"] = None
+    for band in state[symbol]["vwap_bands"]:
+        state[symbol]["vwap_bands"][band] = None
 
 
 def check_daily_reset(symbol: str, current_time: datetime) -> None:
@@ -6542,6 +6683,9 @@ def perform_daily_reset(symbol: str, new_date: Any) -> None:
     state[symbol]["trading_day"] = new_date
     state[symbol]["loss_limit_alerted"] = False  # Reset alert flag
     
+    # New trading day = new VWAP session
+    perform_vwap_reset(symbol, new_date, get_current_time())
+    
     # Reset session stats
     state[symbol]["session_stats"] = {
         "trades": [],
@@ -7225,8 +7369,28 @@ def get_current_time() -> datetime:
         return backtest_current_time
     else:
         # Live mode: use real time
-        tz = pytz.timezone(CONFIG["timezone"])
-        return datetime.now(tz)
+        return datetime.now(get_trading_timezone())
+
+
+# Cached pytz timezone for CONFIG["timezone"] (looked up on every tick)
+_trading_tz_name: Optional[str] = None
+_trading_tz = None
+
+
+def get_trading_timezone():
+    """
+    Get the pytz timezone for CONFIG["timezone"], cached across calls.
+    
+    Returns:
+        pytz timezone object
+    """
+    global _trading_tz_name, _trading_tz
+    
+    name = CONFIG["timezone"]
+    if name != _trading_tz_name:
+        _trading_tz = pytz.timezone(name)
+        _trading_tz_name = name
+    return _trading_tz
 
 
 def get_trading_state(dt: datetime = None) -> str:
@@ -7592,7 +7756,7 @@ def main(symbol_override: str = None) -> None:
         symbol_override: Optional symbol to trade (overrides CONFIG["instrument"])
                         Used for multi-symbol bot instances
     """
-    global event_loop, timer_manager, bid_ask_manager, cloud_api_client, rl_brain, current_trading_symbol
+    global event_loop, timer_manager, bid_ask_manager, cloud_api_client, outcome_reporter, rl_brain, current_trading_symbol
     
     # CRITICAL: Determine trading symbol FIRST, before license validation
     # This enables symbol-specific sessions for multi-symbol support
@@ -7667,6 +7831,8 @@ def main(symbol_override: str = None) -> None:
                 license_key=license_key,
                 timeout=10
             )
+            outcome_reporter = OutcomeReporter(cloud_api_client)
+            outcome_reporter.start()
             pass  # Silent - cloud API initialized
         else:
             logger.warning(f"No license key - cloud outcome reporting disabled")
@@ -7720,11 +7886,15 @@ def main(symbol_override: str = None) -> None:
     
     # Register event handlers
     event_loop.register_handler(EventType.TICK_DATA, handle_tick_event)
+    event_loop.register_tick_handler(handle_tick_batch)
     event_loop.register_handler(EventType.TIME_CHECK, handle_time_check_event)
     event_loop.register_handler(EventType.VWAP_RESET, handle_vwap_reset_event)
     event_loop.register_handler(EventType.POSITION_RECONCILIATION, handle_position_reconciliation_event)
     event_loop.register_handler(EventType.CONNECTION_HEALTH, handle_connection_health_event)
     event_loop.register_handler(EventType.LICENSE_CHECK, handle_license_check_event)
+    event_loop.register_handler(EventType.ORDER_FILL, handle_order_fill_event)
+    event_loop.register_handler(EventType.ORDER_PARTIAL_FILL, handle_order_fill_event)
+    event_loop.register_handler(EventType.ORDER_ESCALATION, handle_order_escalation_event)
     event_loop.register_handler(EventType.SHUTDOWN, handle_shutdown_event)
     
     # Register shutdown handlers for cleanup
@@ -7763,6 +7933,14 @@ def main(symbol_override: str = None) -> None:
             logger.warning(f"Failed to subscribe to quotes: {e}")
             logger.warning("Continuing without bid/ask quote data")
     
+    # Subscribe to order fills so passive exits see their fills
+    if broker is not None:
+        try:
+            broker.subscribe_order_fills(on_order_fill)
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to order fills: {e}")
+            logger.warning("Passive exits will rely on timeouts and price checks")
+    
     # RL is CLOUD-ONLY - no local RL components
     # Users get confidence from cloud, contribute to cloud hive mind
     # Only the dev (Kevin) gets the experience data saved to cloud
@@ -7798,22 +7976,62 @@ def main(symbol_override: str = None) -> None:
 
 def handle_tick_event(event) -> None:
     """Handle tick data event from event loop"""
-    global backtest_current_time
-    
     # Extract data from Event object
     data = event.data if hasattr(event, 'data') else event
     
-    symbol = data["symbol"]
-    price = data["price"]
-    volume = data["volume"]
-    timestamp_ms = data["timestamp"]
+    process_tick(data["symbol"], data["price"], data["volume"], data["timestamp"])
+
+
+def handle_tick_batch(ticks: List[Tuple[str, float, int, int]]) -> None:
+    """
+    Handle a batch of buffered ticks from the event loop.
+    
+    With CONFIG["coalesce_ticks"] (default on), consecutive ticks for the same
+    symbol and minute are applied as one OHLCV delta (see process_tick_burst).
+    Otherwise each tick is processed individually.
+    
+    Args:
+        ticks: List of (symbol, price, volume, timestamp_ms) in arrival order
+    """
+    if not CONFIG.get("coalesce_ticks", True):
+        for symbol, price, volume, timestamp_ms in ticks:
+            process_tick(symbol, price, volume, timestamp_ms)
+        return
+    
+    # Split into runs of ticks sharing symbol and 1-minute bucket
+    start = 0
+    count = len(ticks)
+    while start < count:
+        symbol = ticks[start][0]
+        minute = ticks[start][3] // 60000
+        end = start + 1
+        while end < count and ticks[end][0] == symbol and ticks[end][3] // 60000 == minute:
+            end += 1
+        if end - start == 1:
+            tick = ticks[start]
+            process_tick(tick[0], tick[1], tick[2], tick[3])
+        else:
+            process_tick_burst(ticks[start:end])
+        start = end
+
+
+def process_tick(symbol: str, price: float, volume: int, timestamp_ms: int) -> None:
+    """
+    Process one tick: update tick storage and 1/15-minute bars.
+    
+    Args:
+        symbol: Instrument symbol
+        price: Tick price
+        volume: Tick volume
+        timestamp_ms: Timestamp in milliseconds
+    """
+    global backtest_current_time
     
     if symbol not in state:
         initialize_state(symbol)
     
     # Phase 12: Update last tick time for connection health check
-    tz = pytz.timezone(CONFIG["timezone"])
-    dt = datetime.fromtimestamp(timestamp_ms / 1000.0, tz=tz)
+    dt = datetime.fromtimestamp(timestamp_ms / 1000.0, tz=get_trading_timezone())
     bot_status["last_tick_time"] = dt
     
     # BACKTEST MODE: Update simulation time so all time-based logic uses historical time
@@ -7827,15 +8045,8 @@ def handle_tick_event(event) -> None:
     
     # Market monitoring is now done on every 1-minute bar close (see update_bars_1min function)
     
-    # Create tick object
-    tick = {
-        "price": price,
-        "volume": volume,
-        "timestamp": timestamp_ms
-    }
-    
-    # Append to tick storage
-    state[symbol]["ticks"].append(tick)
+    # Append to tick storage (columnar ring - no per-tick dict)
+    state[symbol]["ticks"].append_tick(price, volume, timestamp_ms)
     
     # Update 1-minute bars
     update_1min_bar(symbol, price, volume, dt)
@@ -7844,8 +8055,90 @@ def handle_tick_event(event) -> None:
     update_15min_bar(symbol, price, volume, dt)
 
 
+def process_tick_burst(ticks: List[Tuple[str, float, int, int]]) -> None:
+    """
+    Apply a burst of ticks for one symbol within one minute as a single OHLCV delta.
+    
+    The first tick goes through process_tick so bar rollover (bar close, signal
+    and exit checks) behaves exactly as it does tick by tick. The remaining
+    ticks are folded into the current 1-minute and 15-minute bars in one step,
+    and exits are checked once - with the stop tested against the burst's
+    min/max price so no intrabar stop touch is missed.
+    
+    Args:
+        ticks: (symbol, price, volume, timestamp_ms) tuples, same symbol and minute
+    """
+    global backtest_current_time
+    
+    symbol, price, volume, timestamp_ms = ticks[0]
+    process_tick(symbol, price, volume, timestamp_ms)
+    
+    rest = ticks[1:]
+    prices = [tick[1] for tick in rest]
+    high = max(prices)
+    low = min(prices)
+    close = prices[-1]
+    burst_volume = sum(tick[2] for tick in rest)
+    last_timestamp_ms = rest[-1][3]
+    
+    dt = datetime.fromtimestamp(last_timestamp_ms / 1000.0, tz=get_trading_timezone())
+    bot_status["last_tick_time"] = dt
+    if is_backtest_mode():
+        backtest_current_time = dt
+    
+    symbol_state = state[symbol]
+    symbol_state["total_ticks_received"] += len(rest)
+    append_tick = symbol_state["ticks"].append_tick
+    for tick in rest:
+        append_tick(tick[1], tick[2], tick[3])
+    
+    # Same minute as the first tick, so both bars already exist - merge the delta
+    for key in ("current_1min_bar", "current_15min_bar"):
+        bar = symbol_state[key]
+        if bar["high"] < high:
+            bar["high"] = high
+        if bar["low"] > low:
+            bar["low"] = low
+        bar["close"] = close
+        bar["volume"] += burst_volume
+    
+    # Intrabar exit check once per burst (see update_1min_bar)
+    if symbol_state["position"]["active"]:
+        if check_intrabar_stop(symbol, low, high):
+            return
+        check_exit_conditions(symbol)
+
+
+def handle_order_fill_event(event) -> None:
+    """
+    Handle order fill events.
+    Fill reports from the broker (on_order_fill) update passive orders watched
+    by the passive order tracker; market order placement results carry no
+    order_id/quantity and are ignored here.
+    """
+    data = event.data if hasattr(event, 'data') else event
+    if bid_ask_manager is None or data.get("order_id") is None:
+        return
+    
+    tracked = bid_ask_manager.passive_orders.on_fill(data["order_id"], data.get("quantity", 0))
+    if tracked is not None and tracked.status == "filled":
+        logger.info(f"✓ Passive {tracked.order_side} @ ${tracked.limit_price:.2f} filled ({tracked.quantity} contracts)")
+
+
+def handle_order_escalation_event(event) -> None:
+    """Handle passive orders the tracker flagged on a quote update (price moved away or timeout)."""
+    data = event.data if hasattr(event, 'data') else event
+    for tracked in data.get("orders", ()):
+        escalate_passive_order(tracked)
+
+
 def handle_time_check_event(data: Dict[str, Any]) -> None:
     """Handle time-based checks event"""
+    # Passive orders past their timeout while no quotes arrived
+    if bid_ask_manager is not None:
+        for tracked in bid_ask_manager.passive_orders.check_timeouts():
+            escalate_passive_order(tracked)
+    
     symbol = CONFIG["instrument"]
     if symbol in state:
         tz = pytz.timezone(CONFIG["timezone"])
@@ -7956,7 +8249,7 @@ def handle_position_reconciliation_event(data: Dict[str, Any]) -> None:
     if bot_status.get("entry_order_pending", False):
         pending_since = bot_status.get("entry_order_pending_since")
         if pending_since:
-            elapsed = (datetime.now() - pending_since).total_seconds()
+            elapsed = (get_current_time() - pending_since).total_seconds()
             # Give orders up to 60 seconds to complete before forcing reconciliation
             # Note: This timeout could be made configurable via CONFIG if needed
             max_pending_seconds = 60
@@ -7979,6 +8272,13 @@ def handle_position_reconciliation_event(data: Dict[str, Any]) -> None:
     if symbol not in state:
         return
     
+    # Skip while a passive exit is working - the bot is already flat but the
+    # broker position closes only when the limit order fills. The passive order
+    # tracker resolves it within the order timeout (fill, or cancel + aggressive)
+    if bid_ask_manager is not None and bid_ask_manager.passive_orders.has_working(symbol):
+        logger.debug("Skipping reconciliation - passive order working")
+        return
+    
     try:
         # Get broker's actual position
         broker_position = get_position_quantity(symbol)
@@ -8857,6 +9157,13 @@ def cleanup_on_shutdown() -> None:
             cleanup_success = False
             logger.debug(f"Failed to stop timer: {e}")
     
+    # Send any queued trade outcomes to the cloud
+    if outcome_reporter:
+        try:
+            outcome_reporter.stop()
+        except Exception as e:
+            logger.debug(f"Failed to stop outcome reporter: {e}")
+    
     # Log session summary with logout status
     symbol = CONFIG["instrument"]
     if symbol in state:
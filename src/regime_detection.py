@@ -28,6 +28,11 @@ import logging
 from typing import Dict, Optional, Tuple
 from collections import deque
 
+import numpy as np
+
+from bar_store import tail_column
+from indicator_engine import RollingExtreme
+
 logger = logging.getLogger(__name__)
 
 
@@ -122,13 +127,38 @@ class RegimeDetector:
             return REGIME_DEFINITIONS["NORMAL"]
         
         # Get bars: use 15-114 for baseline (100 bars), last 20 for price action
-        all_bars = list(bars)
-        baseline_bars = all_bars[-114:-14]  # Bars 15-114 from end (100 bars)
-        recent_bars = all_bars[-20:]  # Last 20 for price action analysis
+        # (column tails instead of copying the whole bar history into a list)
+        highs = tail_column(bars, "high", 114)
+        lows = tail_column(bars, "low", 114)
+        closes = tail_column(bars, "close", 114)
         
         # Calculate baseline ATR from earlier period (NOT including current 14 bars)
-        avg_atr = self._calculate_average_atr(baseline_bars, atr_period)
+        # Bars 15-114 from end (100 bars)
+        avg_atr = self._calculate_average_atr(highs[:-14], lows[:-14], closes[:-14], atr_period)
+        
+        # Price action over the last 20 bars
+        return self.classify(current_atr, avg_atr, float(highs[-20:].max()), float(lows[-20:].min()),
+                             float(closes[-20]), float(closes[-1]))
+    
+    def classify(self, current_atr: float, avg_atr: float, highest: float, lowest: float,
+                 first_close: float, last_close: float) -> RegimeParameters:
+        """
+        Classify the regime from precomputed inputs.
+        
+        Shared by detect_regime() and StreamingRegimeDetector so both apply
+        exactly the same thresholds.
+        
+        Args:
+            current_atr: Current ATR
+            avg_atr: Baseline ATR
+            highest: Highest high of the price action window
+            lowest: Lowest low of the price action window
+            first_close: First close of the price action window
+            last_close: Last close of the price action window
         
+        Returns:
+            RegimeParameters for the detected regime
+        """
         if avg_atr == 0:
             logger.debug("Average ATR is 0, using NORMAL regime")
             return REGIME_DEFINITIONS["NORMAL"]
@@ -144,7 +174,7 @@ class RegimeDetector:
             volatility = "NORMAL"
         
         # Classify price action: trending, choppy, or ranging
-        price_action = self._classify_price_action(recent_bars)
+        price_action = self._classify_range(highest, lowest, first_close, last_close)
         
         # Map to regime
         regime = self._map_to_regime(volatility, price_action)
@@ -154,7 +184,8 @@ class RegimeDetector:
         
         return regime
     
-    def _calculate_average_atr(self, bars: list, period: int = 14) -> float:
+    def _calculate_average_atr(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+                               period: int = 14) -> float:
         """
         Calculate average ATR over the given bars.
         
@@ -163,28 +194,22 @@ class RegimeDetector:
         as regime detection needs higher-resolution data for accurate volatility classification.
         
         Args:
-            bars: List of bars (must have 'high', 'low', 'close')
+            highs: Bar highs, oldest first
+            lows: Bar lows
+            closes: Bar closes
             period: ATR period
         
         Returns:
             Average ATR value
         """
-        if len(bars) < period + 1:
+        if len(highs) < period + 1:
             return 0.0
         
-        true_ranges = []
-        
-        for i in range(1, len(bars)):
-            high = bars[i]["high"]
-            low = bars[i]["low"]
-            prev_close = bars[i-1]["close"]
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
+        prev_closes = closes[:-1]
+        true_ranges = np.maximum(
+            highs[1:] - lows[1:],
+            np.maximum(np.abs(highs[1:] - prev_closes), np.abs(lows[1:] - prev_closes))
+        ).tolist()
         
         if len(true_ranges) < period:
             return sum(true_ranges) / len(true_ranges) if true_ranges else 0.0
@@ -192,7 +217,7 @@ class RegimeDetector:
         # Average of last 'period' true ranges
         return sum(true_ranges[-period:]) / period
     
-    def _classify_price_action(self, bars: list) -> str:
+    def _classify_price_action(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> str:
         """
         Classify price action as trending, choppy, or ranging.
         
@@ -201,25 +226,38 @@ class RegimeDetector:
         - Choppy/Ranging: Directional move < 60% of range
         
         Args:
-            bars: List of bars (must have 'high', 'low', 'open', 'close')
+            highs: Bar highs, oldest first
+            lows: Bar lows
+            closes: Bar closes
         
         Returns:
             "TRENDING", "CHOPPY", or "RANGING"
         """
-        if not bars:
+        if len(highs) == 0:
             return "CHOPPY"
         
+        return self._classify_range(float(highs.max()), float(lows.min()), float(closes[0]), float(closes[-1]))
+    
+    def _classify_range(self, highest: float, lowest: float, first_close: float, last_close: float) -> str:
+        """
+        Classify price action from the window's extremes and end closes.
+        
+        Args:
+            highest: Highest high
+            lowest: Lowest low
+            first_close: First close of the window
+            last_close: Last close of the window
+        
+        Returns:
+            "TRENDING", "CHOPPY", or "RANGING"
+        """
         # Calculate price range (highest high - lowest low)
-        highest = max(bar["high"] for bar in bars)
-        lowest = min(bar["low"] for bar in bars)
         price_range = highest - lowest
         
         if price_range == 0:
             return "RANGING"
         
         # Calculate directional move (net change from first to last)
-        first_close = bars[0]["close"]
-        last_close = bars[-1]["close"]
         directional_move = abs(last_close - first_close)
         
         # Calculate percentage of range that's directional
@@ -285,6 +323,185 @@ class RegimeDetector:
         return True, current_regime
 
 
+# Window layout shared by RegimeDetector.detect_regime and StreamingRegimeDetector
+REGIME_HISTORY_BARS = 114  # Bars required before a regime is detected
+CURRENT_ATR_BARS = 14  # Most recent bars excluded from the baseline ATR
+PRICE_ACTION_BARS = 20  # Bars used for trending/choppy classification
+
+# get_volatility_regime: 14-bar ATRs over the true ranges of the last 100 bars
+VOLATILITY_HISTORY_BARS = 100
+VOLATILITY_ATR_BARS = 14
+
+# Rolling sums are recomputed from the buffers this often to cancel float drift
+RESYNC_INTERVAL = 1000
+
+
+class StreamingRegimeDetector:
+    """
+    Per-symbol regime state updated in O(1) per finalized 1-minute bar.
+    
+    Produces the same result as RegimeDetector.detect_regime() on the last
+    114 bars without rereading them:
+    - true ranges are kept in a small ring buffer
+    - the baseline ATR (true ranges 15-28 bars back for a 14-bar period) and
+      the 14-bar ATR windows used by get_volatility_regime are rolling sums
+    - the 20-bar highest high / lowest low come from monotonic deques
+    
+    The last classification is memoized per bar and ATR, so every caller on
+    the same bar (regime update, entry, regime-change check) shares it.
+    """
+    
+    def __init__(self, atr_period: int = 14, detector: Optional[RegimeDetector] = None):
+        """
+        Initialize streaming detector.
+        
+        Args:
+            atr_period: ATR period of the baseline window
+            detector: Detector whose thresholds are applied (default: global detector)
+        """
+        self.atr_period = atr_period
+        self.detector = detector or get_regime_detector()
+        # Baseline ATR averages the last `period` of the 99 true ranges before the current bars
+        self.baseline_period = atr_period
+        self.volatility_windows = VOLATILITY_HISTORY_BARS - 1 - VOLATILITY_ATR_BARS + 1
+        self.reset()
+    
+    def reset(self) -> None:
+        """Discard all bar history."""
+        lag = max(CURRENT_ATR_BARS + self.baseline_period, VOLATILITY_ATR_BARS)
+        self._true_ranges: deque = deque(maxlen=lag + 1)
+        self._prev_close: Optional[float] = None
+        self.bar_count = 0
+        
+        self._baseline_sum = 0.0  # Sum of the true ranges in the baseline window
+        self._window_sum = 0.0  # Sum of the last VOLATILITY_ATR_BARS true ranges
+        self._window_atrs: deque = deque(maxlen=self.volatility_windows)
+        self._window_atr_sum = 0.0
+        
+        self._highest = RollingExtreme(PRICE_ACTION_BARS, maximum=True)
+        self._lowest = RollingExtreme(PRICE_ACTION_BARS, maximum=False)
+        self._closes: deque = deque(maxlen=PRICE_ACTION_BARS)
+        
+        self._cached_key: Optional[Tuple[int, float]] = None
+        self._cached_regime: Optional[RegimeParameters] = None
+    
+    def update(self, bar: Dict) -> None:
+        """
+        Add a finalized bar.
+        
+        Args:
+            bar: Bar dict with 'high', 'low', 'close'
+        """
+        high = bar["high"]
+        low = bar["low"]
+        close = bar["close"]
+        self.bar_count += 1
+        
+        # 20-bar extremes
+        self._highest.update(high)
+        self._lowest.update(low)
+        self._closes.append(close)
+        
+        prev_close = self._prev_close
+        self._prev_close = close
+        if prev_close is None:
+            return  # First bar has no true range
+        
+        true_ranges = self._true_ranges
+        true_ranges.append(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+        count = len(true_ranges)
+        
+        # Current 14-bar window (get_volatility_regime)
+        self._window_sum += true_ranges[-1]
+        if count > VOLATILITY_ATR_BARS:
+            self._window_sum -= true_ranges[-1 - VOLATILITY_ATR_BARS]
+        if count >= VOLATILITY_ATR_BARS:
+            window_atr = self._window_sum / VOLATILITY_ATR_BARS
+            if len(self._window_atrs) == self.volatility_windows:
+                self._window_atr_sum -= self._window_atrs[0]
+            self._window_atrs.append(window_atr)
+            self._window_atr_sum += window_atr
+        
+        # Baseline window: true ranges CURRENT_ATR_BARS+1 .. CURRENT_ATR_BARS+period bars back
+        if count > CURRENT_ATR_BARS:
+            self._baseline_sum += true_ranges[-1 - CURRENT_ATR_BARS]
+            if count > CURRENT_ATR_BARS + self.baseline_period:
+                self._baseline_sum -= true_ranges[-1 - CURRENT_ATR_BARS - self.baseline_period]
+        
+        if self.bar_count % RESYNC_INTERVAL == 0:
+            self._resync()
+    
+    def _resync(self) -> None:
+        """Recompute the rolling sums from the buffers (bounds float drift)."""
+        true_ranges = list(self._true_ranges)
+        self._window_sum = sum(true_ranges[-VOLATILITY_ATR_BARS:])
+        baseline = true_ranges[:-CURRENT_ATR_BARS][-self.baseline_period:]
+        self._baseline_sum = sum(baseline)
+        self._window_atr_sum = sum(self._window_atrs)
+    
+    @property
+    def ready(self) -> bool:
+        """True once enough bars were seen to detect a regime."""
+        return self.bar_count >= REGIME_HISTORY_BARS
+    
+    @property
+    def baseline_atr(self) -> float:
+        """Baseline ATR (0.0 until ready)."""
+        if not self.ready or self.baseline_period >= REGIME_HISTORY_BARS - CURRENT_ATR_BARS:
+            return 0.0  # Same as _calculate_average_atr with too few bars
+        return self._baseline_sum / self.baseline_period
+    
+    def detect_regime(self, current_atr: float) -> RegimeParameters:
+        """
+        Regime for the latest bar (same result as RegimeDetector.detect_regime).
+        
+        Args:
+            current_atr: Current ATR value
+        
+        Returns:
+            RegimeParameters for the detected regime
+        """
+        if not self.ready:
+            return REGIME_DEFINITIONS["NORMAL"]
+        
+        key = (self.bar_count, current_atr)
+        if key == self._cached_key:
+            return self._cached_regime
+        
+        regime = self.detector.classify(
+            current_atr,
+            self.baseline_atr,
+            self._highest.value,
+            self._lowest.value,
+            self._closes[0],
+            self._closes[-1]
+        )
+        self._cached_key = key
+        self._cached_regime = regime
+        return regime
+    
+    def volatility_level(self, atr: float) -> str:
+        """
+        Compare an ATR with the mean 14-bar ATR of the last 100 bars.
+        
+        Args:
+            atr: Current ATR value
+        
+        Returns:
+            "LOW", "MEDIUM", or "HIGH"
+        """
+        if self.bar_count < VOLATILITY_HISTORY_BARS or not self._window_atrs:
+            return "MEDIUM"
+        
+        avg_atr = self._window_atr_sum / len(self._window_atrs)
+        if atr < avg_atr * 0.75:
+            return "LOW"
+        elif atr > avg_atr * 1.25:
+            return "HIGH"
+        else:
+            return "MEDIUM"
+
+
 def is_regime_tradeable(regime_name: str) -> bool:
     """
     Check if a regime is tradeable for the Capitulation Reversal Strategy.
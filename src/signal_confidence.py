@@ -12,13 +12,15 @@ Learns from every trade outcome to improve decision-making.
 """
 
 import logging
-import json
-import os
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from collections import deque
 import random
 
+import diagnostics
+from experience_index import ExperienceIndex, HistoricalConfidenceIndex
+from experience_store import ExperienceStore, load_experiences, store_path_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +36,7 @@ class SignalConfidenceRL:
     Reward: Profit/loss from trade outcome
     """
     
-    def __init__(self, experience_file: str = None, backtest_mode: bool = False, confidence_threshold: Optional[float] = None, exploration_rate: Optional[float] = None, min_exploration: Optional[float] = None, exploration_decay: Optional[float] = None, save_local: bool = True):
+    def __init__(self, experience_file: str = None, backtest_mode: bool = False, confidence_threshold: Optional[float] = None, exploration_rate: Optional[float] = None, min_exploration: Optional[float] = None, exploration_decay: Optional[float] = None, save_local: bool = True, seed: Optional[int] = None):
         """
         Initialize RL confidence scorer.
         
@@ -48,6 +50,7 @@ class SignalConfidenceRL:
             min_exploration: Minimum exploration rate (0.0-1.0). Default: 0.05 (5%)
             exploration_decay: Decay factor for exploration rate. Default: 0.995
             save_local: Whether to save experiences locally (False for live mode cloud-only saving)
+            seed: Seed for exploration decisions (None = unseeded; set for reproducible backtests)
         """
         # Default to no local experience file for production (cloud-based RL)
         # Only load local file for backtesting or if explicitly provided
@@ -57,12 +60,17 @@ class SignalConfidenceRL:
             self.experience_file = experience_file
         self.experiences = []  # All past (state, action, reward) tuples
         self.experience_keys = set()  # Set for O(1) duplicate detection
+        self.similarity_index = ExperienceIndex()  # Columnar copy of pattern fields for vectorized k-NN
+        self.confidence_history = HistoricalConfidenceIndex()  # Timestamp-sorted replay for adaptive threshold
+        self.experience_store = None  # Columnar on-disk store (set by load_experience)
+        self.saved_experience_count = 0  # Experiences already appended to the store
         self.recent_trades = deque(maxlen=20)  # Last 20 outcomes
         self.backtest_mode = backtest_mode
         self.freeze_learning = False  # LEARNING ENABLED - Brain 2 learns during backtests
         self.save_local = save_local  # Whether to save experiences locally
         
-        # Random exploration enabled - no fixed seed for natural learning
+        # Exploration RNG - unseeded for natural learning unless a seed is given
+        self.rng = random.Random(seed)
         
         # Learning parameters - use config values or defaults
         self.exploration_rate = exploration_rate if exploration_rate is not None else 0.05  # Default 5%
@@ -235,17 +243,19 @@ class SignalConfidenceRL:
         logger.info(f"[RL Confidence] Signal confidence: {confidence:.1%} vs threshold {optimal_threshold:.1%} ({threshold_source}) - {reason}")
         
         # Print for diagnostics
-        print(f"[RL Decision Check] Confidence {confidence*100:.1f}% vs Threshold {optimal_threshold*100:.1f}% = {'PASS' if take else 'FAIL'}")
+        if not diagnostics.QUIET:
+            print(f"[RL Decision Check] Confidence {confidence*100:.1f}% vs Threshold {optimal_threshold*100:.1f}% = {'PASS' if take else 'FAIL'}")
         
         # Exploration: Give rejected signals a chance to be taken
         # This allows the system to learn from signals it would normally skip
-        if not take and random.random() < effective_exploration:
+        if not take and self.rng.random() < effective_exploration:
             # This signal was rejected, but exploration gives it a chance
             take = True
             reason = f"Exploring ({effective_exploration*100:.0f}% chance for rejected signals, {len(self.experiences)} exp) | Threshold: {optimal_threshold:.1%} ({threshold_source})"
             self.signals_taken += 1
             logger.info(f"[RL Decision] EXPLORATION TRADE TAKEN - {reason}")
-            print(f"[RL Decision] ✅ EXPLORATION TRADE (was rejected but exploring)")
+            if not diagnostics.QUIET:
+                print(f"[RL Decision] ✅ EXPLORATION TRADE (was rejected but exploring)")
             return take, confidence, reason
         
         # Normal behavior: use threshold decision
@@ -253,12 +263,14 @@ class SignalConfidenceRL:
             self.signals_taken += 1
             reason += f" APPROVED ({confidence:.1%} > {optimal_threshold:.1%})"
             logger.info(f"[RL Decision] ✅ SIGNAL APPROVED - {reason}")
-            print(f"[RL Decision] ✅ TRADE APPROVED (confidence > threshold)")
+            if not diagnostics.QUIET:
+                print(f"[RL Decision] ✅ TRADE APPROVED (confidence > threshold)")
         else:
             self.signals_skipped += 1
             reason += f" REJECTED ({confidence:.1%} < {optimal_threshold:.1%})"
             logger.info(f"[RL Decision] ❌ SIGNAL REJECTED - {reason}")
-            print(f"[RL Decision] ❌ TRADE REJECTED (confidence < threshold)")
+            if not diagnostics.QUIET:
+                print(f"[RL Decision] ❌ TRADE REJECTED (confidence < threshold)")
         
         # Decay exploration over time
         self.exploration_rate = max(self.min_exploration, 
@@ -302,7 +314,8 @@ class SignalConfidenceRL:
                         f"rsi={current_state.get('rsi')}, "
                         f"regime={current_state.get('regime')}")
             # Print to console for diagnostics
-            print(f"[RL Confidence] 35.0% (DEFAULT) - No similar trades found despite {len(self.experiences)} experiences")
+            if not diagnostics.QUIET:
+                print(f"[RL Confidence] 35.0% (DEFAULT) - No similar trades found despite {len(self.experiences)} experiences")
             return 0.35, "No similar situations - safety default"
         
         # Step 2: Calculate metrics from similar trades
@@ -333,7 +346,8 @@ class SignalConfidenceRL:
         logger.debug(f"[RL] Calculated confidence: {confidence:.1%} - {reason}")
         
         # Print to console for diagnostics (shows in backtest)
-        print(f"[RL Confidence] {confidence*100:.1f}% - {reason}")
+        if not diagnostics.QUIET:
+            print(f"[RL Confidence] {confidence*100:.1f}% - {reason}")
         
         return confidence, reason
     
@@ -380,89 +394,15 @@ class SignalConfidenceRL:
                     f"rsi={current.get('rsi', 50):.1f}, "
                     f"regime={current.get('regime', 'NORMAL')}")
         
-        # Calculate similarity score for each past experience
-        scored = []
-        for exp in self.experiences:
-            # FLAT FORMAT: All fields are at top level
-            past = exp
-            
-            # Calculate distance for each feature (normalized to 0-1 range)
-            # Lower score = more similar
-            
-            # === PRIMARY FLUSH SIGNALS (50% total) ===
-            
-            # Flush Size (20%) - Normalize by dividing difference by 50
-            flush_size_diff = abs(current.get('flush_size_ticks', 0) - past.get('flush_size_ticks', 0)) / 50.0
-            
-            # Velocity (15%) - Normalize by dividing difference by 10
-            flush_velocity_diff = abs(current.get('flush_velocity', 0) - past.get('flush_velocity', 0)) / 10.0
-            
-            # Volume Climax (10%) - Normalize by dividing difference by 3
-            volume_climax_diff = abs(current.get('volume_climax_ratio', 1) - past.get('volume_climax_ratio', 1)) / 3.0
-            
-            # Flush Direction (5%) - Score 0 if match, score 1 if different
-            flush_direction_match = 0.0 if current.get('flush_direction', 'NEUTRAL') == past.get('flush_direction', 'NEUTRAL') else 1.0
-            
-            # === ENTRY QUALITY (25% total) ===
-            
-            # RSI (8%) - Normalize by dividing difference by 100
-            rsi_diff = abs(current.get('rsi', 50) - past.get('rsi', 50)) / 100.0
-            
-            # Distance From Flush Low (7%) - Normalize by dividing difference by 20
-            distance_from_low_diff = abs(current.get('distance_from_flush_low', 0) - past.get('distance_from_flush_low', 0)) / 20.0
-            
-            # Reversal Candle (5%) - Score 0 if both match, score 1 if different
-            reversal_candle_match = 0.0 if current.get('reversal_candle', False) == past.get('reversal_candle', False) else 1.0
-            
-            # No New Extreme (5%) - Score 0 if both match, score 1 if different
-            no_new_extreme_match = 0.0 if current.get('no_new_extreme', False) == past.get('no_new_extreme', False) else 1.0
-            
-            # === MARKET CONTEXT (15% total) ===
-            
-            # VWAP Distance (8%) - Normalize by dividing absolute difference by 100
-            vwap_distance_diff = abs(current.get('vwap_distance_ticks', 0) - past.get('vwap_distance_ticks', 0)) / 100.0
-            
-            # Regime Match (7%) - Score 0 if regimes match, score 1 if different
-            regime_match = 0.0 if current.get('regime', 'NORMAL') == past.get('regime', 'NORMAL') else 1.0
-            
-            # === TIME CONTEXT (10% total) ===
-            
-            # Session (6%) - Score 0 if both ETH or both RTH, score 1 if different
-            session_match = 0.0 if current.get('session', 'RTH') == past.get('session', 'RTH') else 1.0
-            
-            # Hour (4%) - Normalize by dividing difference by 24
-            hour_diff = abs(current.get('hour', 12) - past.get('hour', 12)) / 24.0
-            
-            # Weighted similarity score (lower is more similar)
-            similarity = (
-                # Primary Flush Signals (50%)
-                flush_size_diff * 0.20 +           # 20%
-                flush_velocity_diff * 0.15 +       # 15%
-                volume_climax_diff * 0.10 +        # 10%
-                flush_direction_match * 0.05 +     # 5%
-                # Entry Quality (25%)
-                rsi_diff * 0.08 +                  # 8%
-                distance_from_low_diff * 0.07 +    # 7%
-                reversal_candle_match * 0.05 +     # 5%
-                no_new_extreme_match * 0.05 +      # 5%
-                # Market Context (15%)
-                vwap_distance_diff * 0.08 +        # 8%
-                regime_match * 0.07 +              # 7%
-                # Time Context (10%)
-                session_match * 0.06 +             # 6%
-                hour_diff * 0.04                   # 4%
-            )
-            
-            scored.append((similarity, exp))
-        
-        # Sort by similarity (most similar first)
-        scored.sort(key=lambda x: x[0])
+        # Score every past experience in one vectorized pass (see experience_index.SIMILARITY_FEATURES
+        # for the weights above) and pick the top N with argpartition
+        top_positions, scores = self.similarity_index.query(current, max_results)
         
         # DEBUG: Show similarity scores of top matches
-        if scored:
-            top_5 = scored[:min(5, len(scored))]
-            logger.debug(f"[RL Pattern Matching] Top 5 similarity scores: {[f'{s:.3f}' for s, _ in top_5]}")
-            best_match = top_5[0][1]
+        if len(top_positions):
+            top_5 = top_positions[:5]
+            logger.debug(f"[RL Pattern Matching] Top 5 similarity scores: {[f'{scores[i]:.3f}' for i in top_5]}")
+            best_match = self.experiences[top_5[0]]
             logger.debug(f"[RL Pattern Matching] Best match: flush_size={best_match.get('flush_size_ticks', 0):.1f}, "
                         f"velocity={best_match.get('flush_velocity', 0):.1f}, "
                         f"direction={best_match.get('flush_direction', 'NONE')}, "
@@ -472,7 +412,7 @@ class SignalConfidenceRL:
             logger.warning(f"[RL Pattern Matching] No scored experiences - this should not happen!")
         
         # Return top N most similar (default 10)
-        return [exp for _, exp in scored[:max_results]]
+        return [self.experiences[i] for i in top_positions]
     
     def _calculate_optimal_threshold(self) -> float:
         """
@@ -488,67 +428,16 @@ class SignalConfidenceRL:
         
         # Test different thresholds and see which gives best profit per trade
         # CONSERVATIVE APPROACH: Only test higher thresholds (50%+) for quality over quantity
-        threshold_results = {}
-        
-        # OPTIMIZATION: Pre-calculate confidences once instead of for each threshold
-        # This avoids O(n²) complexity by doing the expensive work upfront
-        experience_confidences = []
-        for exp in self.experiences:
-            # FLAT FORMAT: 'took_trade' is at top level
-            if not exp.get('took_trade', False):
-                continue  # Skip experiences where trade wasn't taken
-            
-            # Calculate what confidence this trade would have had
-            # (based on similar past trades at the time)
-            # FLAT FORMAT: All fields are at top level
-            state = exp
-            
-            similar_before = [
-                e for e in self.experiences 
-                if e.get('timestamp', '') < exp.get('timestamp', '') and 
-                   abs(e.get('rsi', 50) - state.get('rsi', 50)) < 10 and
-                   abs(e.get('vwap_distance', 1.0) - state.get('vwap_distance', 1.0)) < 0.5
-            ]
-            
-            if len(similar_before) < 5:
-                continue  # Not enough similar trades to calculate confidence
-            
-            # Calculate win rate of similar trades
-            # FLAT FORMAT: 'pnl' is at top level (not 'reward')
-            wins = sum(1 for e in similar_before if e.get('pnl', e.get('reward', 0)) > 0)
-            confidence = wins / len(similar_before) if similar_before else 0.5
-            
-            # FLAT FORMAT: 'pnl' is at top level (not 'reward')
-            pnl_value = exp.get('pnl', exp.get('reward', 0))
-            
-            experience_confidences.append({
-                'confidence': confidence,
-                'reward': pnl_value  # Keep 'reward' key for consistency in threshold calculation
-            })
-        
-        
-        # Now test each threshold quickly using pre-calculated confidences
-        # CONSERVATIVE RANGE: Start at 50% minimum (don't test low thresholds that lead to overtrading)
-        for test_threshold in [0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9]:
-            trades_at_threshold = []
-            
-            # Would we have taken this trade with the test threshold?
-            for exp_conf in experience_confidences:
-                if exp_conf['confidence'] >= test_threshold:
-                    trades_at_threshold.append(exp_conf['reward'])
-            
-            # Calculate expected value at this threshold
-            if len(trades_at_threshold) >= 10:  # Need minimum sample
-                win_rate = sum(1 for r in trades_at_threshold if r > 0) / len(trades_at_threshold)
-                avg_profit = sum(trades_at_threshold) / len(trades_at_threshold)
-                expected_value = avg_profit  # Simpler: just use average profit per trade
-                
-                threshold_results[test_threshold] = {
-                    'expected_value': expected_value,
-                    'trades': len(trades_at_threshold),
-                    'win_rate': win_rate,
-                    'avg_profit': avg_profit
-                }
+        #
+        # For each taken trade, its confidence is the win rate of earlier trades with similar
+        # RSI (within 10) and VWAP distance (within 0.5), once at least 5 exist. The per-threshold
+        # results are maintained incrementally by self.confidence_history as experiences are added,
+        # instead of replaying every experience against every other one here.
+        all_results = self.confidence_history.threshold_table()
+        threshold_results = {
+            t: r for t, r in all_results.items()
+            if r['trades'] >= 10  # Need minimum sample
+        }
         
         # Find threshold that maximizes PROFIT PER TRADE (quality), not total volume
         # We want the threshold that gives us:
@@ -666,6 +555,8 @@ class SignalConfidenceRL:
             # Not a duplicate - add to experiences and update all related state
             self.experience_keys.add(exp_key)
             self.experiences.append(experience)
+            self.similarity_index.append(experience)
+            self.confidence_history.add(experience)
             self.recent_trades.append(pnl)
             
             # Update win/loss streaks for non-duplicate trades
@@ -684,7 +575,30 @@ class SignalConfidenceRL:
             outcome = "WIN" if pnl > 0 else "LOSS"
             log_msg = f"πΎ [16-FIELD] Recorded {outcome}: ${pnl:.2f} | Streak: W{self.current_win_streak}/L{self.current_loss_streak}"
             pass  # Silent - learning progress is internal (not customer-facing)
-    
+
+    def merge_experiences(self, experiences: List[Dict]) -> int:
+        """
+        Add experiences recorded by another RL brain (e.g. a backtest worker).
+        Duplicates are skipped; nothing is saved until save_experience() is called.
+
+        Args:
+            experiences: Experiences in the order they should be appended
+
+        Returns:
+            Number of experiences added
+        """
+        added = 0
+        for experience in experiences:
+            exp_key = self._generate_experience_key(experience)
+            if exp_key in self.experience_keys:
+                continue
+            self.experience_keys.add(exp_key)
+            self.experiences.append(experience)
+            self.similarity_index.append(experience)
+            self.confidence_history.add(experience)
+            added += 1
+        return added
+
     def get_stats(self) -> Dict:
         """Get current performance statistics."""
         if not self.recent_trades:
@@ -711,45 +625,68 @@ class SignalConfidenceRL:
         }
     
     def load_experience(self):
-        """Load past experiences from file."""
+        """
+        Load past experiences.
+        
+        Experiences live in an append-only columnar store next to the JSON file
+        (see experience_store). When saving locally, the JSON is imported into the
+        store on first use or after it was changed externally; read-only instances
+        use the store if it is current and fall back to the JSON otherwise.
+        """
         # Skip loading if no experience file is configured (cloud-based RL)
         if self.experience_file is None:
             return
         
-        if os.path.exists(self.experience_file):
-            try:
-                with open(self.experience_file, 'r') as f:
-                    data = json.load(f)
-                    self.experiences = data.get('experiences', [])
-                    
-                    # Populate experience_keys set for O(1) duplicate detection
-                    # Use helper method to ensure consistency with record_outcome
-                    self.experience_keys = set()
-                    for exp in self.experiences:
-                        exp_key = self._generate_experience_key(exp)
-                        self.experience_keys.add(exp_key)
-                    
-                    pass  # Silent - experiences loaded
-            except Exception as e:
-                logger.error(f"Failed to load experiences: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+        try:
+            if self.save_local:
+                self.experience_store = ExperienceStore(store_path_for(self.experience_file))
+                self.experience_store.sync_from_json(self.experience_file)
+                self.experiences = self.experience_store.read_all()
+            else:
+                self.experiences = load_experiences(self.experience_file)
+            self.saved_experience_count = len(self.experiences)
+            
+            # Populate experience_keys set for O(1) duplicate detection
+            # Use helper method to ensure consistency with record_outcome
+            self.experience_keys = set()
+            for exp in self.experiences:
+                exp_key = self._generate_experience_key(exp)
+                self.experience_keys.add(exp_key)
+            
+            # Rebuild columnar feature index used by find_similar_states
+            self.similarity_index.rebuild(self.experiences)
+            self.confidence_history.rebuild(self.experiences)
+            
+            pass  # Silent - experiences loaded
+        except Exception as e:
+            logger.error(f"Failed to load experiences: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
     
-    def save_experience(self):
-        """Save experiences to file."""
+    def save_experience(self, export_json: bool = False):
+        """
+        Save experiences.
+        
+        Appends only the experiences recorded since the last save to the columnar
+        store, so the cost does not grow with the number of stored experiences.
+        
+        Args:
+            export_json: Also rewrite the JSON file (end of run / interchange)
+        """
         # Skip saving if disabled (e.g., live mode with cloud-only saving)
         if not self.save_local:
             return
         
         # Skip saving if no experience file is configured (cloud-based RL)
-        if self.experience_file is None:
+        if self.experience_file is None or self.experience_store is None:
             return
         
         try:
-            with open(self.experience_file, 'w') as f:
-                json.dump({
-                    'experiences': self.experiences,
-                    'stats': self.get_stats()
-                }, f, indent=2)
+            new_experiences = self.experiences[self.saved_experience_count:]
+            self.experience_store.append(new_experiences, stats=self.get_stats())
+            self.saved_experience_count = len(self.experiences)
+            
+            if export_json:
+                self.experience_store.export_json(self.experience_file, self.experiences)
         except Exception as e:
             logger.error(f"Failed to save experiences: {e}")
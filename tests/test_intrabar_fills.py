@@ -0,0 +1,99 @@
+"""
+Tests for intrabar limit order simulation
+Validates queue position, partial fills, cancellation and passive backtest exits
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytz
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'dev'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from backtesting import BacktestConfig, BacktestEngine, IntrabarFillSimulator
+
+START = datetime(2025, 1, 2, 15, 0, tzinfo=pytz.UTC)
+BOT_CONFIG = {'tick_size': 0.25, 'tick_value': 12.5, 'max_queue_size': 100, 'passive_order_timeout': 10}
+
+
+def _simulator():
+    return IntrabarFillSimulator(tick_size=0.25, tick_value=12.5, config=BOT_CONFIG, level_size=20)
+
+
+def _path(*points):
+    """(seconds after START, price, volume) -> path points"""
+    return [(START + timedelta(seconds=s), price, volume) for s, price, volume in points]
+
+
+def test_limit_order_waits_behind_queue():
+    """Volume at the limit fills the queue ahead first, then the order (partially)."""
+    sim = _simulator()
+    fill = sim.simulate_limit_order('SELL', 5, 100.0, START, _path((1, 100.0, 15), (2, 100.0, 8)))
+
+    assert fill.queue_ahead == 0
+    assert fill.filled_quantity == 3
+    assert fill.status == 'partial'
+    assert fill.working
+
+
+def test_queue_is_capped_by_max_queue_size():
+    sim = IntrabarFillSimulator(tick_size=0.25, tick_value=12.5,
+                                config=dict(BOT_CONFIG, max_queue_size=10), level_size=50)
+    fill = sim.simulate_limit_order('BUY', 2, 100.0, START, _path((1, 100.0, 12)))
+
+    assert fill.status == 'filled'
+    assert not fill.working
+
+
+def test_trading_through_fills_the_rest():
+    sim = _simulator()
+    fill = sim.simulate_limit_order('SELL', 4, 100.0, START, _path((1, 100.0, 21), (2, 100.25, 1)))
+
+    assert fill.fills[-1][1:] == (100.0, 3)
+    assert fill.status == 'filled'
+
+
+def test_order_cancelled_after_timeout():
+    """Points past the timeout cancel the order; work continues across calls until then."""
+    sim = _simulator()
+    fill = sim.simulate_limit_order('SELL', 2, 100.0, START, _path((4, 100.0, 5)), timeout=5)
+    assert fill.working
+
+    cancel_index = sim.work_limit_order(fill, _path((5, 100.0, 5), (6, 100.0, 50)))
+    assert cancel_index == 1
+    assert not fill.working
+    assert fill.status == 'unfilled'
+
+
+def test_order_cancelled_when_price_moves_away():
+    sim = _simulator()
+    fill = sim.simulate_limit_order('SELL', 1, 100.0, START, _path((1, 99.75, 5), (2, 99.25, 5)))
+
+    assert not fill.working
+    assert fill.status == 'unfilled'
+
+
+def test_passive_exit_rests_and_falls_back_to_market():
+    """An early profit lock rests at the ask; the unfilled rest goes to market on timeout."""
+    engine = BacktestEngine(BacktestConfig(START, START, symbols=['ES'], intrabar_fills=True), BOT_CONFIG)
+    entry_bar = dict(timestamp=START, open=99.0, high=99.5, low=99.0, close=99.5, volume=100)
+    engine.open_bot_position('ES', {'side': 'long', 'quantity': 1, 'entry_price': 99.5,
+                                    'entry_time': START}, START, entry_bar)
+
+    exit_bar = dict(timestamp=START + timedelta(minutes=1), open=99.5, high=100.0, low=99.5, close=100.0, volume=100)
+    engine.close_bot_position(START + timedelta(minutes=2), 100.0, 'early_profit_lock', exit_bar)
+    assert engine.pending_exit is not None
+    assert engine.pending_exit['order'].limit_price == 100.25
+    assert not engine.metrics.trades
+
+    quiet_bar = dict(timestamp=START + timedelta(minutes=2), open=100.0, high=100.0, low=100.0, close=100.0, volume=10)
+    engine.work_pending_exit(quiet_bar)
+    engine.work_pending_exit(dict(quiet_bar, timestamp=START + timedelta(minutes=3)))
+
+    assert engine.pending_exit is None
+    trade = engine.metrics.trades[-1]
+    assert trade.exit_reason == 'early_profit_lock'
+    assert trade.exit_price < 100.25
@@ -0,0 +1,51 @@
+"""
+Tests for the backtest result cache key
+Validates that every input the RL brain reads takes part in the key
+"""
+
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'dev'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+
+from experience_store import ExperienceStore, store_path_for
+from feature_cache import file_digest
+from result_cache import result_cache_key
+
+
+def _experience(pnl):
+    return {'rsi': 30.0, 'vwap_distance': 1.5, 'side': 'long', 'took_trade': True, 'pnl': pnl}
+
+
+def test_store_only_write_invalidates_key(tmp_path):
+    """An experience appended to the columnar store alone must change the key."""
+    json_path = str(tmp_path / 'signal_experience.json')
+    with open(json_path, 'w') as f:
+        json.dump({'experiences': [_experience(50.0)]}, f)
+
+    store = ExperienceStore(store_path_for(json_path))
+    store.import_json(json_path)
+
+    data_files = [json_path, store_path_for(json_path)]
+    key_before = result_cache_key(data_files, {'tick_size': 0.25}, {'symbol': 'ES'}, 42)
+    json_digest = file_digest(json_path)
+
+    # save_experience() autosaves only to the store
+    store.append([_experience(-25.0)])
+
+    assert file_digest(json_path) == json_digest
+    assert result_cache_key(data_files, {'tick_size': 0.25}, {'symbol': 'ES'}, 42) != key_before
+
+
+def test_key_is_stable_for_identical_inputs(tmp_path):
+    """Unchanged inputs give the same key, missing paths included."""
+    json_path = str(tmp_path / 'signal_experience.json')
+    with open(json_path, 'w') as f:
+        json.dump({'experiences': [_experience(50.0)]}, f)
+    ExperienceStore(store_path_for(json_path)).import_json(json_path)
+
+    data_files = [json_path, store_path_for(json_path), str(tmp_path / 'ES_ticks.csv')]
+    assert result_cache_key(data_files, {}, {}, 7) == result_cache_key(data_files, {}, {}, 7)